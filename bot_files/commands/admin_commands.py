@@ -94,6 +94,8 @@ class AdminCommands(BaseCommand):
         self.bot_instance.admin_ids.add(user_id)  # Set operation O(1)
         self.bot_instance.mark_for_save()  # Batch save
         
+        self.bot_instance.refresh_auth_index()
+        
         embed = discord.Embed(
             title="✅ Đã thêm Admin",
             description=f"User ID `{user_id}` đã được thêm vào danh sách admin.",
@@ -121,6 +123,8 @@ class AdminCommands(BaseCommand):
         self.bot_instance.admin_ids.discard(user_id)  # Set operation O(1)
         self.bot_instance.mark_for_save()  # Batch save
         
+        self.bot_instance.refresh_auth_index()
+        
         embed = discord.Embed(
             title="✅ Đã xóa Admin",
             description=f"User ID `{user_id}` đã được xóa khỏi danh sách admin.",
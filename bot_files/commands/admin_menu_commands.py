@@ -94,6 +94,9 @@ class AdminMenuCommands:
                         "`;supremeadmin` - Supreme admin\n"
                         "`;warn @user <lý do>` - Cảnh báo user\n"
                         "`;warnings @user` - Xem cảnh báo\n"
+                        "`;warnladder` - Bậc xử phạt warnings\n"
+                        "`;antispam on/off/set` - Chống spam/raid\n"
+                        "`;rolesync [rule|give|take]` - Đồng bộ role hàng loạt\n"
                         "`;mute @user <time> <lý do>` - Mute user\n"
                         "`;unmute @user` - Unmute user\n"
                         "`;checkpermissions` - Quản lý quyền\n"
@@ -111,6 +114,7 @@ class AdminMenuCommands:
                         "`;preview <link>` - Preview code với AI\n"
                         "@bot <tin nhắn>` - Chat với AI (mention bot)\n"
                         "`;status` - Trạng thái bot (CPU, RAM, ping)\n"
+                        "`;ready` - Trạng thái sẵn sàng (startup job, reconnect)\n"
                         "`;nhom` - Giới thiệu về bot creator\n"
                         "`;help` - Hướng dẫn sử dụng bot\n"
                         "`;ping` - Kiểm tra bot hoạt động"
@@ -212,6 +216,7 @@ class AdminMenuCommands:
                         "`;gitconfig` - Cấu hình Git\n"
                         "`;reload` - Reload modules (Supreme)\n"
                         "`;modules` - Danh sách modules\n"
+                        "`;slashsync` - Sync slash commands (Supreme)\n"
                         "`;viewdms` - Xem DM (Supreme)\n"
                         "`;cleandms` - Xóa DM cũ (Supreme)"
                     ),
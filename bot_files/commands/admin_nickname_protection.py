@@ -8,6 +8,8 @@ import logging
 import re
 import unicodedata
 
+from utils.metrics import AI_REQUEST, AI_ERRORS
+
 logger = logging.getLogger(__name__)
 
 class AdminNicknameProtection:
@@ -471,13 +473,12 @@ class AdminNicknameProtection:
     async def ask_ai_about_name(self, nickname, protected_name="Claude"):
         """Hỏi AI xem nickname có phải là biến thể của tên được bảo vệ không"""
         try:
-            # Kiểm tra AI commands có sẵn không
-            if not hasattr(self.bot_instance, 'ai_commands'):
+            # Kiểm tra AI commands có sẵn không (module lazy - tải nếu chưa có)
+            ai_commands = await self.bot_instance.module_registry.ensure_loaded('ai_commands')
+            if ai_commands is None:
                 logger.warning("AI Commands không có sẵn, sử dụng phương pháp cơ bản")
                 return False
             
-            ai_commands = self.bot_instance.ai_commands
-            
             # Tạo prompt để hỏi AI
             prompt = f"""
 Phân tích nickname sau và cho biết có phải là biến thể của tên "{protected_name}" không:
@@ -501,28 +502,32 @@ Không giải thích thêm, chỉ trả lời YES hoặc NO."""
             # Gọi AI để phân tích
             if ai_commands.current_provider == "gemini" and ai_commands.gemini_model:
                 try:
-                    response = ai_commands.gemini_model.generate_content(prompt)
+                    with AI_REQUEST.time(provider='gemini'):
+                        response = ai_commands.gemini_model.generate_content(prompt)
                     ai_response = response.text.strip().upper()
                     logger.info(f"AI Gemini response for '{nickname}' vs '{protected_name}': {ai_response}")
                     return "YES" in ai_response
                 except Exception as e:
+                    AI_ERRORS.inc(provider='gemini')
                     logger.error(f"Error calling Gemini AI: {e}")
             
             elif ai_commands.current_provider == "grok" and ai_commands.grok_client:
                 try:
-                    response = ai_commands.grok_client.chat.completions.create(
-                        model="grok-beta",
-                        messages=[
-                            {"role": "system", "content": "You are a text analysis assistant. Answer only YES or NO."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        max_tokens=10,
-                        temperature=0.1
-                    )
+                    with AI_REQUEST.time(provider='grok'):
+                        response = ai_commands.grok_client.chat.completions.create(
+                            model="grok-beta",
+                            messages=[
+                                {"role": "system", "content": "You are a text analysis assistant. Answer only YES or NO."},
+                                {"role": "user", "content": prompt}
+                            ],
+                            max_tokens=10,
+                            temperature=0.1
+                        )
                     ai_response = response.choices[0].message.content.strip().upper()
                     logger.info(f"AI Grok response for '{nickname}' vs '{protected_name}': {ai_response}")
                     return "YES" in ai_response
                 except Exception as e:
+                    AI_ERRORS.inc(provider='grok')
                     logger.error(f"Error calling Grok AI: {e}")
             
             # Fallback: sử dụng phương pháp cơ bản
@@ -12,6 +12,7 @@ import re
 import json
 from datetime import datetime
 from .base import BaseCommand
+from utils.metrics import AI_REQUEST, AI_ERRORS
 
 try:
     import google.generativeai as genai
@@ -285,9 +286,10 @@ Code:
 
 💡 Đưa ra code example để fix nếu cần. Trả lời trong 350 từ."""
                 
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None, lambda: self.gemini_model.generate_content(prompt)
-                )
+                with AI_REQUEST.time(provider='gemini'):
+                    response = await asyncio.get_event_loop().run_in_executor(
+                        None, lambda: self.gemini_model.generate_content(prompt)
+                    )
                 
                 # Cập nhật usage counter
                 if self.api_config:
@@ -298,6 +300,7 @@ Code:
                 return response.text if response.text else "🤖 AI không thể phân tích code này."
                 
             except Exception as e:
+                AI_ERRORS.inc(provider='gemini')
                 print(f"🔄 AI Analysis attempt {attempt + 1} failed: {e}")
                 
                 # Thử chuyển API nếu có lỗi nghiêm trọng
@@ -513,9 +516,10 @@ Hãy nhập vai em Gemini Cute - crush quốc dân với đầy đủ tiêu chu
 
 Hãy trả lời một cách tự nhiên và thân thiện nhất! Đừng quên kết thúc bằng câu đáng yêu của Gemini Cute nha! 💕"""
                 
-                response = await asyncio.get_event_loop().run_in_executor(
-                    None, lambda: self.gemini_model.generate_content(prompt)
-                )
+                with AI_REQUEST.time(provider='gemini'):
+                    response = await asyncio.get_event_loop().run_in_executor(
+                        None, lambda: self.gemini_model.generate_content(prompt)
+                    )
                 
                 # Cập nhật usage counter
                 if self.api_config:
@@ -526,6 +530,7 @@ Hãy trả lời một cách tự nhiên và thân thiện nhất! Đừng quên
                 return response.text if response.text else "👋 Xin chào! Rất vui được gặp bạn! 😊"
                 
             except Exception as e:
+                AI_ERRORS.inc(provider='gemini')
                 print(f"🔄 AI Mention attempt {attempt + 1} failed: {e}")
                 
                 # Thử chuyển API nếu có lỗi nghiêm trọng
@@ -561,17 +566,19 @@ User đã hỏi bạn: "{content}"
 - Thể hiện tính cách vui vẻ, thân thiện
 - Có thể đề cập đến sở thích nhiếp ảnh nếu phù hợp"""
 
-            response = await asyncio.get_event_loop().run_in_executor(
-                None, lambda: self.grok_client.chat.completions.create(
-                    model="x-ai/grok-2-1212",
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=500,
-                    temperature=0.8
+            with AI_REQUEST.time(provider='grok'):
+                response = await asyncio.get_event_loop().run_in_executor(
+                    None, lambda: self.grok_client.chat.completions.create(
+                        model="x-ai/grok-2-1212",
+                        messages=[{"role": "user", "content": prompt}],
+                        max_tokens=500,
+                        temperature=0.8
+                    )
                 )
-            )
             
             return response.choices[0].message.content.strip()
             
         except Exception as e:
+            AI_ERRORS.inc(provider='grok')
             print(f"❌ Grok mention error: {e}")
             return "👋 Xin chào! Rất vui được gặp bạn! 😊"
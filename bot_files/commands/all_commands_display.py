@@ -4,23 +4,19 @@ All Commands Display - Hiển thị tất cả lệnh dạng text
 """
 
 import discord
-from datetime import datetime
+from utils.embed_templates import embed_templates
 
-def create_all_commands_embed(user) -> discord.Embed:
+def _build_all_commands_embed() -> discord.Embed:
     """
-    Tạo embed hiển thị tất cả lệnh của bot dạng text
+    Build phần tĩnh của embed tất cả lệnh (chỉ chạy 1 lần khi load module)
     
-    Args:
-        user: User yêu cầu
-        
     Returns:
-        discord.Embed: Embed chứa tất cả lệnh
+        discord.Embed: Embed template với placeholder {user_name}, {user_avatar}
     """
     embed = discord.Embed(
         title="📋 Tất cả lệnh của Bot",
         description="Danh sách đầy đủ tất cả lệnh có sẵn trong bot",
-        color=discord.Color.blue(),
-        timestamp=datetime.now()
+        color=discord.Color.blue()
     )
     
     # Games & Giải trí
@@ -93,6 +89,9 @@ def create_all_commands_embed(user) -> discord.Embed:
             ";supremeadmin set/remove/info` - Supreme admin\n"
             ";warn @user <lý do>` - Cảnh báo user\n"
             ";warnings @user` - Xem cảnh báo\n"
+            ";warnladder [set|reset]` - Bậc xử phạt warnings\n"
+            ";antispam [on|off|set]` - Chống spam/raid\n"
+            ";rolesync [rule|give|take]` - Đồng bộ role hàng loạt\n"
             ";mute @user <time> <lý do>` - Mute user\n"
             ";unmute @user` - Unmute user\n"
             ";muteinfo [@user]` - Thông tin mute\n"
@@ -127,6 +126,7 @@ def create_all_commands_embed(user) -> discord.Embed:
             ";preview <link>` - Preview code với AI\n"
             "@bot <tin nhắn>` - Chat với AI (mention bot)\n"
             ";status` - Trạng thái bot (CPU, RAM, ping)\n"
+            ";ready` - Trạng thái sẵn sàng (startup job, reconnect)\n"
             ";nhom` - Giới thiệu về bot creator\n"
             ";help` - Hướng dẫn sử dụng bot\n"
             ";ping` - Kiểm tra bot hoạt động\n"
@@ -208,6 +208,7 @@ def create_all_commands_embed(user) -> discord.Embed:
             ";gitconfig` - Cấu hình Git\n"
             ";reload [module]` - Reload modules (Supreme)\n"
             ";modules` - Danh sách modules\n"
+            ";slashsync [force]` - Sync slash commands khi đổi (Supreme)\n"
             ";viewdms [số]` - Xem DM (Supreme)\n"
             ";cleandms` - Xóa DM cũ (Supreme)\n"
             ";feedbackstats` - Thống kê feedback (Supreme)"
@@ -259,8 +260,28 @@ def create_all_commands_embed(user) -> discord.Embed:
     )
     
     embed.set_footer(
-        text=f"Yêu cầu bởi {user.display_name} • Tổng cộng hơn 80+ lệnh",
-        icon_url=user.display_avatar.url
+        text="Yêu cầu bởi {user_name} • Tổng cộng hơn 80+ lệnh",
+        icon_url="{user_avatar}"
     )
     
     return embed
+
+
+ALL_COMMANDS_TEMPLATE = embed_templates.register('all_commands', _build_all_commands_embed)
+
+
+def create_all_commands_embed(user) -> discord.Embed:
+    """
+    Tạo embed hiển thị tất cả lệnh của bot dạng text
+    
+    Args:
+        user: User yêu cầu
+        
+    Returns:
+        discord.Embed: Embed chứa tất cả lệnh
+    """
+    return ALL_COMMANDS_TEMPLATE.render(
+        user_name=user.display_name,
+        user_avatar=user.display_avatar.url
+    )
+
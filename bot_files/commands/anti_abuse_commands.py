@@ -1,23 +1,265 @@
 import discord
 from discord.ext import commands
+import asyncio
+import json
+import os
 import logging
+from datetime import datetime, timedelta
+from utils.spam_detector import SpamDetector, DEFAULT_THRESHOLDS, RATE_WINDOW, CONTENT_WINDOW
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MUTE_SECONDS = 300
+
+# Tên ngắn dùng trong ;antispam set -> key ngưỡng
+THRESHOLD_ALIASES = {
+    'flood': 'flood_messages',
+    'duplicate': 'duplicate_messages',
+    'raid': 'raid_messages',
+    'channel': 'channel_flood_messages',
+}
+
+REASON_LABELS = {
+    'flood': "Gửi tin nhắn quá nhanh",
+    'duplicate': "Spam nội dung lặp lại",
+    'raid': "Raid: nhiều tài khoản gửi cùng nội dung",
+}
+
+
 class AntiAbuseCommands:
     def __init__(self, bot_instance):
         self.bot_instance = bot_instance
         self.bot = bot_instance.bot
+        self.config_file = os.path.join('data', 'anti_spam_config.json')
+        self.guild_settings = {}  # {guild_id: {'enabled': bool, 'thresholds': {...}, 'mute_seconds': int, 'raid_auto_delete': bool}}
+        self.detector = SpamDetector()
+        self.load_config()
         self.setup_commands()
     
-    def setup_commands(self):
-        """Setup anti-abuse commands"""
-        pass  # Placeholder for future anti-abuse features
+    def snapshot(self) -> dict:
+        """State giữ lại khi ;reload: cửa sổ tin nhắn gần đây của detector"""
+        return {'detector': self.detector}
+    
+    def restore(self, state: dict) -> None:
+        self.detector = state['detector']
+    
+    def load_config(self):
+        """Tải cấu hình anti-spam theo server"""
+        try:
+            if os.path.exists(self.config_file):
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                for guild_id, settings in data.get('guilds', {}).items():
+                    settings['thresholds'] = {**DEFAULT_THRESHOLDS, **settings.get('thresholds', {})}
+                    self.guild_settings[int(guild_id)] = settings
+                logger.info(f"Đã tải cấu hình anti-spam của {len(self.guild_settings)} server")
+        except Exception as e:
+            logger.error(f"Lỗi khi tải cấu hình anti-spam: {e}")
+    
+    def save_config(self):
+        """Lưu cấu hình anti-spam (ghi atomic)"""
+        try:
+            os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
+            data = {'guilds': {str(guild_id): settings for guild_id, settings in self.guild_settings.items()}}
+            tmp_file = f"{self.config_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, self.config_file)
+        except Exception as e:
+            logger.error(f"Lỗi khi lưu cấu hình anti-spam: {e}")
+    
+    def get_settings(self, guild_id: int) -> dict:
+        """Lấy (hoặc tạo mặc định) cấu hình của server"""
+        settings = self.guild_settings.get(guild_id)
+        if settings is None:
+            settings = self.guild_settings[guild_id] = {
+                'enabled': False,
+                'thresholds': dict(DEFAULT_THRESHOLDS),
+                'mute_seconds': DEFAULT_MUTE_SECONDS,
+                'raid_auto_delete': False,  # Auto Delete không tự hết hạn nên phải bật chủ động
+            }
+        return settings
+    
+    async def check_message_for_spam(self, message) -> bool:
+        """
+        Stage anti-spam đầu pipeline on_message
+        
+        Returns:
+            bool: True nếu tin nhắn bị xác định là spam/raid (đã giao xử lý, dừng pipeline)
+        """
+        if message.guild is None or message.author.bot:
+            return False
+        settings = self.guild_settings.get(message.guild.id)
+        if not settings or not settings.get('enabled'):
+            return False
+        
+        verdict = self.detector.observe(
+            message.guild.id,
+            message.channel.id,
+            message.author.id,
+            message.content,
+            settings['thresholds']
+        )
+        if verdict is None:
+            return False
+        
+        # Không xử lý admin
+        if self.bot_instance.has_warn_permission(message.author.id, message.author.guild_permissions):
+            return False
+        
+        asyncio.create_task(self._handle_offender(message, verdict, settings))
+        return True
+    
+    async def _handle_offender(self, message, verdict, settings: dict):
+        """Xóa tin nhắn vi phạm, timeout user và (raid) giao cho Auto Delete"""
+        member = message.author
+        reason = REASON_LABELS.get(verdict.reason, verdict.reason)
+        actions = []
+        
+        try:
+            await message.delete()
+            actions.append("🗑️ Đã xóa tin nhắn")
+        except (discord.NotFound, discord.Forbidden):
+            pass
+        except discord.HTTPException as e:
+            logger.warning(f"Anti-spam: không xóa được tin nhắn của {member.id}: {e}")
+        
+        duration = timedelta(seconds=settings.get('mute_seconds', DEFAULT_MUTE_SECONDS))
+        if isinstance(member, discord.Member) and not (member.timed_out_until and member.timed_out_until > datetime.now(member.timed_out_until.tzinfo)):
+            try:
+                await member.timeout(duration, reason=f"Anti-spam: {reason} ({verdict.count}/{verdict.threshold})")
+                actions.append(f"🔇 Timeout {self.bot_instance.mute_commands._format_duration(duration)}")
+            except discord.Forbidden:
+                actions.append("❌ Không có quyền timeout")
+                embed = discord.Embed(
+                    title="⚠️ Bot thiếu quyền Anti-Spam",
+                    description=f"Bot không thể timeout user spam trong **{message.guild.name}**!",
+                    color=discord.Color.orange()
+                )
+                embed.add_field(
+                    name="🔧 Cách khắc phục",
+                    value="Bật quyền **Moderate Members** cho role của bot và đặt role bot cao hơn role của member",
+                    inline=False
+                )
+                self.bot_instance.admin_notifier.notify(message.guild, 'anti_spam_forbidden', embed)
+            except discord.HTTPException as e:
+                logger.warning(f"Anti-spam: không timeout được {member.id}: {e}")
+        
+        if verdict.reason == 'raid' and settings.get('raid_auto_delete', False) and hasattr(self.bot_instance, 'auto_delete_commands'):
+            added = self.bot_instance.auto_delete_commands.add_auto_delete_users(
+                message.guild.id, [member.id], self.bot.user.id, f"Anti-spam: {reason}"
+            )
+            if added:
+                actions.append("🔥 Đã bật Auto Delete")
+        
+        logger.warning(
+            f"Anti-spam: {member} ({member.id}) trong #{message.channel} - {reason} "
+            f"({verdict.count}/{verdict.threshold}{', kênh đang flood' if verdict.channel_flood else ''}). {'; '.join(actions)}"
+        )
+        
+        embed = discord.Embed(
+            title="🛡️ Anti-Spam",
+            description=f"{member.mention}: **{reason}**",
+            color=discord.Color.red()
+        )
+        if actions:
+            embed.add_field(name="Xử lý", value="\n".join(actions), inline=False)
+        try:
+            await message.channel.send(embed=embed, delete_after=10)
+        except discord.HTTPException:
+            pass
     
     async def check_message_for_abuse(self, message):
         """Check message for abuse (placeholder)"""
         return False  # No abuse detected
     
+    def _build_status_embed(self, guild) -> discord.Embed:
+        settings = self.get_settings(guild.id)
+        thresholds = settings['thresholds']
+        embed = discord.Embed(
+            title="🛡️ Anti-Spam",
+            description=f"Trạng thái: {'🟢 Bật' if settings['enabled'] else '🔴 Tắt'}",
+            color=discord.Color.green() if settings['enabled'] else discord.Color.red()
+        )
+        embed.add_field(
+            name="📏 Ngưỡng",
+            value=(
+                f"`flood`: {thresholds['flood_messages']} tin / {RATE_WINDOW:g}s mỗi user\n"
+                f"`duplicate`: {thresholds['duplicate_messages']} tin giống nhau / {CONTENT_WINDOW:g}s mỗi user\n"
+                f"`raid`: {thresholds['raid_messages']} tin giống nhau / {CONTENT_WINDOW:g}s cả server\n"
+                f"`channel`: {thresholds['channel_flood_messages']} tin / {RATE_WINDOW:g}s mỗi kênh (vượt thì giảm nửa ngưỡng flood)"
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="⚙️ Xử lý",
+            value=(
+                f"`mute`: timeout {self.bot_instance.mute_commands._format_duration(timedelta(seconds=settings['mute_seconds']))}\n"
+                f"`autodelete`: raid → Auto Delete vĩnh viễn {'🟢' if settings.get('raid_auto_delete', False) else '🔴'}"
+            ),
+            inline=False
+        )
+        stats = self.detector.get_stats()
+        embed.set_footer(text=f"Đã quét {stats['observed']} tin nhắn • {stats['avg_observe_us']}µs/tin • {stats['sketch_memory_kb']}KB sketch")
+        return embed
+    
+    def setup_commands(self):
+        """Setup anti-abuse commands"""
+        
+        @self.bot.command(name='antispam', aliases=['antiraid'])
+        async def antispam_command(ctx, action: str = None, key: str = None, value: str = None):
+            """
+            Cấu hình anti-spam/raid của server (Admin only)
+            
+            Usage:
+            ;antispam - Xem trạng thái
+            ;antispam on/off - Bật/tắt
+            ;antispam set flood|duplicate|raid|channel <số> - Đổi ngưỡng
+            ;antispam set mute <thời gian> - Thời gian timeout
+            ;antispam set autodelete on/off - Raid thì bật Auto Delete cho user (mặc định tắt, không tự hết hạn)
+            """
+            if ctx.guild is None:
+                await ctx.reply("❌ Lệnh này chỉ dùng trong server!", mention_author=True)
+                return
+            if not self.bot_instance.has_warn_permission(ctx.author.id, ctx.author.guild_permissions):
+                await ctx.reply(f"{ctx.author.mention} ❌ Bạn không có quyền sử dụng lệnh này!", mention_author=True)
+                return
+            
+            settings = self.get_settings(ctx.guild.id)
+            action = (action or 'status').lower()
+            
+            try:
+                if action in ('on', 'off'):
+                    settings['enabled'] = action == 'on'
+                elif action == 'set' and key and value:
+                    key = key.lower()
+                    if key in THRESHOLD_ALIASES:
+                        number = int(value)
+                        if not 2 <= number <= 1000:
+                            raise ValueError("Ngưỡng phải từ 2 đến 1000")
+                        settings['thresholds'][THRESHOLD_ALIASES[key]] = number
+                    elif key == 'mute':
+                        seconds = int(self.bot_instance.mute_commands._parse_duration(value).total_seconds())
+                        if not 0 < seconds <= 28 * 86400:
+                            raise ValueError("Thời gian timeout phải trong khoảng 1 giây - 28 ngày")
+                        settings['mute_seconds'] = seconds
+                    elif key == 'autodelete':
+                        settings['raid_auto_delete'] = value.lower() in ('on', 'true', '1')
+                    else:
+                        raise ValueError(f"Không có tùy chọn `{key}`")
+                elif action != 'status':
+                    await ctx.reply(f"{ctx.author.mention} ❌ Sử dụng: `;antispam [on|off|set <tùy chọn> <giá trị>]`", mention_author=True)
+                    return
+            except ValueError as e:
+                await ctx.reply(f"{ctx.author.mention} ❌ Tham số không hợp lệ: {e}", mention_author=True)
+                return
+            
+            if action != 'status':
+                self.save_config()
+                logger.info(f"{ctx.author} ({ctx.author.id}) cập nhật anti-spam của {ctx.guild.name}: {action} {key or ''} {value or ''}")
+            
+            await ctx.reply(embed=self._build_status_embed(ctx.guild), mention_author=True)
+    
     def register_commands(self):
         """Register all commands"""
         logger.info("Anti-abuse commands đã được đăng ký")
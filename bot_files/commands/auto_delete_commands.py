@@ -83,6 +83,17 @@ class AutoDeleteCommands:
     
     def add_delete_history(self, guild_id: int, user_id: int, action: str, admin_id: int, reason: str = ""):
         """Thêm lịch sử auto delete vào file"""
+        self.add_delete_history_entries([{
+            'guild_id': guild_id,
+            'user_id': user_id,
+            'action': action,  # 'add' hoặc 'remove'
+            'admin_id': admin_id,
+            'reason': reason,
+            'timestamp': datetime.now().isoformat()
+        }])
+    
+    def add_delete_history_entries(self, entries: list):
+        """Thêm nhiều dòng lịch sử auto delete vào file (đọc/ghi file 1 lần)"""
         try:
             # Load existing data
             existing_data = {}
@@ -94,17 +105,7 @@ class AutoDeleteCommands:
             if 'delete_history' not in existing_data:
                 existing_data['delete_history'] = []
             
-            # Add new history entry
-            history_entry = {
-                'guild_id': guild_id,
-                'user_id': user_id,
-                'action': action,  # 'add' hoặc 'remove'
-                'admin_id': admin_id,
-                'reason': reason,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            existing_data['delete_history'].append(history_entry)
+            existing_data['delete_history'].extend(entries)
             
             # Keep only last 100 entries để tránh file quá lớn
             if len(existing_data['delete_history']) > 100:
@@ -138,6 +139,37 @@ class AutoDeleteCommands:
         self.save_auto_delete_config()
         self.add_delete_history(guild_id, user_id, 'add', admin_id)
     
+    def add_auto_delete_users(self, guild_id: int, user_ids: list, admin_id: int, reason: str = "") -> list:
+        """
+        Thêm nhiều user vào danh sách auto delete, chỉ lưu file 1 lần
+        
+        Returns:
+            list: Các user ID mới được thêm (bỏ qua user đã có)
+        """
+        guild_users = self.auto_delete_users.setdefault(guild_id, {})
+        timestamp = datetime.now().isoformat()
+        new_ids = [
+            user_id for user_id in dict.fromkeys(user_ids)
+            if not guild_users.get(user_id, {}).get('enabled', False)
+        ]
+        if not new_ids:
+            if not guild_users:
+                del self.auto_delete_users[guild_id]
+            return []
+        
+        for user_id in new_ids:
+            guild_users[user_id] = {
+                'enabled': True,
+                'added_by': admin_id,
+                'timestamp': timestamp
+            }
+        self.save_auto_delete_config()
+        self.add_delete_history_entries([
+            {'guild_id': guild_id, 'user_id': user_id, 'action': 'add', 'admin_id': admin_id, 'reason': reason, 'timestamp': timestamp}
+            for user_id in new_ids
+        ])
+        return new_ids
+    
     def remove_auto_delete_user(self, guild_id: int, user_id: int, admin_id: int):
         """Xóa user khỏi danh sách auto delete"""
         if guild_id in self.auto_delete_users and user_id in self.auto_delete_users[guild_id]:
@@ -189,38 +221,29 @@ class AutoDeleteCommands:
                     logger.info(f"Auto Delete: Đã xóa tin nhắn của user {user_id} trong guild {guild_id}")
                 except discord.Forbidden:
                     logger.warning(f"Auto Delete: Không có quyền xóa tin nhắn của user {user_id} trong guild {guild_id}")
-                    # Gửi thông báo cho admin về việc thiếu quyền
-                    try:
-                        # Tìm admin để thông báo
-                        for member in message.guild.members:
-                            if self.bot_instance.has_warn_permission(member.id, member.guild_permissions):
-                                embed = discord.Embed(
-                                    title="⚠️ Bot thiếu quyền Auto Delete",
-                                    description="Bot không thể xóa tin nhắn do thiếu quyền!",
-                                    color=discord.Color.orange()
-                                )
-                                embed.add_field(
-                                    name="🔧 Cách khắc phục nhanh:",
-                                    value=(
-                                        "1. **Server Settings** > **Roles**\n"
-                                        "2. Tìm role của bot\n"
-                                        "3. Bật quyền **Manage Messages** (chỉ cần quyền này!)\n"
-                                        "4. Auto Delete sẽ hoạt động ngay"
-                                    ),
-                                    inline=False
-                                )
-                                embed.add_field(
-                                    name="👤 User bị Auto Delete:",
-                                    value=f"<@{user_id}> (ID: {user_id})",
-                                    inline=False
-                                )
-                                try:
-                                    await member.send(embed=embed)
-                                    break
-                                except:
-                                    continue
-                    except:
-                        pass
+                    # Báo admin về việc thiếu quyền (chống lặp theo guild, gửi qua hàng đợi)
+                    embed = discord.Embed(
+                        title="⚠️ Bot thiếu quyền Auto Delete",
+                        description="Bot không thể xóa tin nhắn do thiếu quyền!",
+                        color=discord.Color.orange()
+                    )
+                    embed.add_field(
+                        name="🔧 Cách khắc phục nhanh:",
+                        value=(
+                            "1. **Server Settings** > **Roles**\n"
+                            "2. Tìm role của bot\n"
+                            "3. Bật quyền **Manage Messages** (chỉ cần quyền này!)\n"
+                            "4. Auto Delete sẽ hoạt động ngay"
+                        ),
+                        inline=False
+                    )
+                    embed.add_field(
+                        name="👤 User bị Auto Delete:",
+                        value=f"<@{user_id}> (ID: {user_id})",
+                        inline=False
+                    )
+                    embed.set_footer(text=f"Server: {message.guild.name} • Thông báo này gửi tối đa 1 lần/giờ")
+                    self.bot_instance.admin_notifier.notify(message.guild, 'auto_delete_forbidden', embed)
                 except discord.NotFound:
                     logger.warning(f"Auto Delete: Tin nhắn của user {user_id} đã bị xóa trước đó")
                 except Exception as e:
@@ -10,8 +10,23 @@ import logging
 import asyncio
 import subprocess
 import shutil
+import shlex
 from datetime import datetime
 from typing import Dict, Optional
+from utils.snapshot_store import SnapshotStore, DEFAULT_RETENTION
+from utils.git_runner import GitTaskRunner
+from utils.game_stats_store import game_stats
+from utils.shared_wallet import shared_wallet
+
+PROGRESS_EDIT_INTERVAL = 2.0  # Giây tối thiểu giữa 2 lần sửa embed tiến trình (tránh rate limit)
+
+# File dữ liệu tách ra khỏi các file JSON cũ (log append-only, cấu hình) - luôn snapshot kèm data_files trong config
+EXTRA_DATA_FILES = [
+    'data/ban_history.jsonl',
+    'data/warnings_log.jsonl',
+    'data/warning_escalation.json',
+    'data/role_members.json',
+]
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +49,12 @@ class BackupCommands:
         self.data_folder = 'data'
         self.ensure_data_folder()
         
+        # Snapshot store cho backup local (chunk nén, khử trùng lặp)
+        self.snapshots = SnapshotStore(os.path.join('data_backups', 'snapshots'))
+        
+        # Runner cho lệnh git (timeout mỗi lệnh, huỷ được bằng ;backup cancel)
+        self.git = GitTaskRunner(timeout=self.github_config.get('git_timeout', 120))
+        
         logger.info("Backup Commands đã được khởi tạo")
     
     def ensure_data_folder(self):
@@ -76,7 +97,7 @@ class BackupCommands:
             
             if moved_files:
                 logger.info(f"Đã di chuyển {len(moved_files)} files vào data folder")
-            
+        
         except Exception as e:
             logger.error(f"Lỗi khi tạo data folder: {e}")
     
@@ -128,7 +149,7 @@ class BackupCommands:
                         else:
                             # Nếu đã có trong data, xóa file gốc
                             os.remove(file)
-                            
+                    
                     except Exception as e:
                         logger.error(f"Lỗi migrate {file}: {e}")
             
@@ -137,7 +158,7 @@ class BackupCommands:
                 return migration_backup
             
             return None
-            
+        
         except Exception as e:
             logger.error(f"Lỗi trong migration: {e}")
             return None
@@ -172,7 +193,8 @@ class BackupCommands:
                         "data/auto_delete_config.json",
                         "data/fire_delete_config.json",
                         "data/afk_data.json",
-                        "data/banned_users.json"
+                        "data/banned_users.json",
+                        *game_stats.data_files()
                     ],
                     "backup_enabled": True,
                     "auto_backup_before_pull": True,
@@ -195,94 +217,150 @@ class BackupCommands:
         Args:
             user_id: ID của người dùng
             guild_permissions: Quyền trong guild
-            
+        
         Returns:
             bool: True nếu là admin
         """
         return self.bot_instance.has_warn_permission(user_id, guild_permissions)
     
-    async def run_git_command(self, command: str, cwd: str = None) -> tuple:
+    async def run_git_command(self, command: str, cwd: str = None, timeout: float = None) -> tuple:
         """
         Chạy lệnh git và trả về kết quả
         
         Args:
             command: Lệnh git cần chạy
             cwd: Thư mục làm việc
-            
+            timeout: Giây tối đa (mặc định git_timeout trong config)
+        
         Returns:
             tuple: (success, output, error)
         """
         try:
-            if cwd is None:
-                cwd = os.getcwd()
-            
-            process = await asyncio.create_subprocess_shell(
-                command,
-                cwd=cwd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            
-            stdout, stderr = await process.communicate()
-            
-            success = process.returncode == 0
-            output = stdout.decode('utf-8', errors='ignore').strip()
-            error = stderr.decode('utf-8', errors='ignore').strip()
-            
-            return success, output, error
-            
+            result = await self.git.run(shlex.split(command), timeout=timeout, cwd=cwd)
+            return result.success, result.output, result.error
         except Exception as e:
             logger.error(f"Lỗi khi chạy git command '{command}': {e}")
             return False, "", str(e)
     
-    def backup_current_data(self) -> str:
+    # ---------- Git task + embed tiến trình ----------
+    
+    def _build_progress_embed(self, title: str, task) -> discord.Embed:
+        icons = {'running': '⏳', 'done': '✅', 'failed': '❌'}
+        embed = discord.Embed(title=title, color=discord.Color.orange(), timestamp=datetime.now())
+        steps = "\n".join(
+            f"{icons[step['state']]} {step['name']}" + (f" ({step['ms']}ms)" if step['ms'] is not None else "")
+            for step in task.steps
+        )
+        embed.add_field(name=f"📋 Tiến trình ({task.elapsed:.0f}s)", value=steps or "⏳ Đang chuẩn bị...", inline=False)
+        if task.lines:
+            output = "\n".join(task.lines)[-1000:]
+            embed.add_field(name="📜 Output", value=f"```\n{output}\n```", inline=False)
+        embed.set_footer(text="Bấm ⛔ Huỷ hoặc dùng ;backup cancel để dừng")
+        return embed
+    
+    async def _report_progress(self, message, title: str, task, view) -> None:
+        """Sửa 1 embed tiến trình, tối đa 1 lần mỗi PROGRESS_EDIT_INTERVAL giây và chỉ khi có thay đổi"""
+        shown = task.version
+        while not task.done:
+            await asyncio.sleep(PROGRESS_EDIT_INTERVAL)
+            if task.version != shown and not task.done:
+                shown = task.version
+                try:
+                    await message.edit(embed=self._build_progress_embed(title, task), view=view)
+                except discord.HTTPException:
+                    pass
+    
+    async def _run_git_task(self, ctx, name: str, title: str, pipeline):
         """
-        Sao lưu dữ liệu hiện tại trước khi pull
+        Chạy pipeline(task) bằng git runner, hiển thị tiến trình trong 1 message có nút huỷ
         
         Returns:
-            str: Tên file backup
+            (task, kết quả pipeline, message) hoặc None nếu đang có git task khác
         """
         try:
-            # Tạo thư mục backup
-            backup_dir = 'data_backups'
-            if not os.path.exists(backup_dir):
-                os.makedirs(backup_dir)
-            
-            # Tạo tên backup với timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_name = f"pre_pull_backup_{timestamp}"
-            backup_path = os.path.join(backup_dir, backup_name)
-            os.makedirs(backup_path, exist_ok=True)
-            
-            # Copy các file data quan trọng
-            data_files = self.github_config.get('data_files', [])
-            backed_up_files = []
-            
-            for file in data_files:
-                if os.path.exists(file):
-                    try:
-                        shutil.copy2(file, backup_path)
-                        backed_up_files.append(file)
-                        logger.info(f"Backed up: {file}")
-                    except Exception as e:
-                        logger.error(f"Lỗi backup file {file}: {e}")
-            
-            # Tạo backup info
-            backup_info = {
-                'timestamp': timestamp,
-                'datetime': datetime.now().isoformat(),
-                'type': 'pre_pull_backup',
-                'files_backed_up': backed_up_files,
-                'total_files': len(backed_up_files)
-            }
-            
-            info_file = os.path.join(backup_path, 'backup_info.json')
-            with open(info_file, 'w', encoding='utf-8') as f:
-                json.dump(backup_info, f, indent=4, ensure_ascii=False)
-            
-            logger.info(f"Backup hoàn tất: {backup_name}")
-            return backup_name
-            
+            task = self.git.start(name, pipeline, ctx.author.id)
+        except RuntimeError as e:
+            await ctx.reply(f"⏳ {e}! Chờ xong hoặc dùng `;backup cancel`.", mention_author=True)
+            return None
+        
+        view = GitCancelView(self, task)
+        message = await ctx.reply(embed=self._build_progress_embed(title, task), view=view, mention_author=True)
+        reporter = asyncio.create_task(self._report_progress(message, title, task, view))
+        try:
+            result = await task.wait()
+        finally:
+            reporter.cancel()
+            view.stop()
+        return task, result, message
+    
+    async def _finish_git_task(self, ctx, message, embed: discord.Embed) -> None:
+        try:
+            await message.edit(embed=embed, view=None)
+        except discord.HTTPException:
+            await ctx.send(embed=embed)
+    
+    def _build_aborted_embed(self, task, backup_name: str) -> discord.Embed:
+        """Embed khi git task bị huỷ hoặc lỗi ngoài dự kiến (pipeline không trả về kết quả)"""
+        cancelled = task.state == 'cancelled'
+        embed = discord.Embed(
+            title="⛔ Đã huỷ" if cancelled else "❌ Lỗi hệ thống",
+            description=f"`{task.name}` dừng sau {task.elapsed:.1f}s",
+            color=discord.Color.dark_grey() if cancelled else discord.Color.red(),
+            timestamp=datetime.now()
+        )
+        steps = "\n".join(
+            f"{'✅' if step['state'] == 'done' else '⛔' if step['state'] == 'running' else '❌'} {step['name']}"
+            for step in task.steps
+        )
+        if steps:
+            embed.add_field(name="📋 Các bước", value=steps, inline=False)
+        if task.lines and not cancelled:
+            embed.add_field(name="🐛 Chi tiết", value=f"```\n{chr(10).join(task.lines)[-1000:]}\n```", inline=False)
+        if backup_name:
+            embed.add_field(name="📦 Backup an toàn", value=f"Dữ liệu đã được backup: `{backup_name}`", inline=False)
+        embed.add_field(
+            name="💡 Lưu ý",
+            value="Bước reset/merge không bị ngắt giữa chừng, working tree vẫn nguyên trạng. "
+                  "Kiểm tra lại bằng `backup status`.",
+            inline=False
+        )
+        return embed
+    
+    async def handle_cancel(self, ctx):
+        """Huỷ git task đang chạy"""
+        task = self.git.active
+        if task is None or task.done:
+            await ctx.reply("ℹ️ Không có thao tác git nào đang chạy.", mention_author=True)
+        elif self.git.cancel():
+            await ctx.reply(f"⛔ Đang huỷ `{task.name}`...", mention_author=True)
+        else:
+            await ctx.reply("⏳ Đang ở bước reset/merge (không thể ngắt giữa chừng), thử lại sau giây lát.", mention_author=True)
+    
+    @property
+    def snapshot_retention(self) -> Dict:
+        """Retention của snapshot (config_github.json -> snapshot_retention)"""
+        return {**DEFAULT_RETENTION, **self.github_config.get('snapshot_retention', {})}
+    
+    @property
+    def data_files(self) -> list:
+        """File dữ liệu cần backup/restore: data_files trong config + log/cấu hình tách riêng + store thống kê game"""
+        data_files = list(self.github_config.get('data_files', []))
+        data_files += [path for path in EXTRA_DATA_FILES + game_stats.data_files() if path not in data_files]
+        return data_files
+    
+    async def backup_current_data(self, label: str = 'pre_pull') -> str:
+        """
+        Snapshot dữ liệu hiện tại trước khi pull/restore (chạy trong worker thread)
+        
+        Returns:
+            str: ID snapshot ("" nếu lỗi)
+        """
+        try:
+            data_files = self.data_files
+            manifest = await self.snapshots.create_snapshot_async(
+                data_files, label, retention=self.snapshot_retention
+            )
+            return manifest['id']
         except Exception as e:
             logger.error(f"Lỗi khi backup dữ liệu: {e}")
             return ""
@@ -343,165 +421,44 @@ class BackupCommands:
             await ctx.reply(embed=embed, mention_author=True)
             return
         
-        embed = discord.Embed(
-            title="🔄 Đang khôi phục từ GitHub...",
-            description="Vui lòng chờ trong giây lát...",
-            color=discord.Color.orange(),
-            timestamp=datetime.now()
-        )
-        
-        embed.add_field(
-            name="📦 Bước 1/4",
-            value="Đang backup dữ liệu hiện tại...",
-            inline=False
-        )
-        
-        message = await ctx.reply(embed=embed, mention_author=True)
-        
-        backup_name = ""
+        branch = self.github_config.get('branch', 'main')
+        state = {'backup_name': ''}
         
-        try:
-            # Bước 1: Backup dữ liệu hiện tại
-            backup_name = self.backup_current_data()
-            
-            embed.add_field(
-                name="✅ Backup hoàn tất",
-                value=f"Đã backup: `{backup_name}`",
-                inline=False
+        async def pipeline(task):
+            # Snapshot chạy song song với fetch (fetch không đụng vào working tree)
+            fetched, state['backup_name'] = await asyncio.gather(
+                self.git.step(task, f"📥 git fetch origin {branch}", ['git', 'fetch', '--progress', 'origin', branch]),
+                self.git.call(task, "📦 Snapshot dữ liệu hiện tại", self.backup_current_data)
             )
-            embed.add_field(
-                name="🔄 Bước 2/4",
-                value="Đang reset working directory...",
-                inline=False
-            )
-            
-            try:
-                await message.edit(embed=embed)
-            except:
-                pass
-            
-            # Bước 2: Reset working directory (discard local changes)
-            # Kiểm tra xem có commit nào không trước khi reset
-            has_commits, _, _ = await self.run_git_command("git rev-parse --verify HEAD")
-            
-            if has_commits:
-                success, output, error = await self.run_git_command("git reset --hard HEAD")
-                if not success:
-                    raise Exception(f"Git reset failed: {error}")
+            if not fetched.success:
+                return fetched
+            
+            # Reset working directory (discard local changes), chưa có commit thì chỉ clean
+            has_commits = await self.git.run(['git', 'rev-parse', '--verify', 'HEAD'])
+            if has_commits.success:
+                reset = await self.git.step(task, "🧹 git reset --hard HEAD", ['git', 'reset', '--hard', 'HEAD'], cancellable=False)
+                if not reset.success:
+                    return reset
             else:
-                # Nếu chưa có commit, chỉ clean working directory
-                success, output, error = await self.run_git_command("git clean -fd")
-                if not success:
-                    logger.warning(f"Git clean warning: {error}")  # Clean có thể fail nếu không có gì để clean
-            
-            embed.add_field(
-                name="✅ Reset hoàn tất",
-                value="Đã reset working directory",
-                inline=False
-            )
-            embed.add_field(
-                name="📥 Bước 3/4",
-                value="Đang pull từ GitHub...",
-                inline=False
-            )
-            
-            try:
-                await message.edit(embed=embed)
-            except:
-                pass
-            
-            # Bước 3: Force pull từ GitHub
-            success, output, error = await self.run_git_command("git pull origin main --force")
-            
-            if not success:
-                raise Exception(f"Git pull failed: {error}")
-            
-            embed.add_field(
-                name="✅ Pull hoàn tất",
-                value="Đã tải code mới từ GitHub",
-                inline=False
-            )
-            embed.add_field(
-                name="📁 Bước 4/4",
-                value="Đang khôi phục data files...",
-                inline=False
-            )
-            
-            try:
-                await message.edit(embed=embed)
-            except:
-                pass
-            
-            # Bước 4: Khôi phục data files từ GitHub (nếu có)
-            data_files = self.github_config.get('data_files', [])
-            restored_files = []
-            missing_files = []
-            
-            for file in data_files:
-                if os.path.exists(file):
-                    # File tồn tại trên GitHub, đã được pull
-                    restored_files.append(file)
-                else:
-                    missing_files.append(file)
-            
-            # Tạo embed kết quả cuối cùng
-            embed = discord.Embed(
-                title="✅ Khôi phục từ GitHub thành công!",
-                color=discord.Color.green(),
-                timestamp=datetime.now()
-            )
-            
-            if backup_name:
-                embed.add_field(
-                    name="📦 Backup an toàn",
-                    value=f"Dữ liệu cũ đã được backup: `{backup_name}`",
-                    inline=False
-                )
+                clean = await self.git.step(task, "🧹 git clean -fd", ['git', 'clean', '-fd'], cancellable=False)
+                if not clean.success:
+                    logger.warning(f"Git clean warning: {clean.error}")  # Clean có thể fail nếu không có gì để clean
             
-            if restored_files:
-                files_text = '\n'.join([f"• `{file}`" for file in restored_files[:10]])
-                if len(restored_files) > 10:
-                    files_text += f"\n... và {len(restored_files) - 10} file khác"
-                
-                embed.add_field(
-                    name="📁 Files đã khôi phục",
-                    value=files_text,
-                    inline=False
-                )
-            
-            if missing_files:
-                files_text = '\n'.join([f"• `{file}`" for file in missing_files[:5]])
-                if len(missing_files) > 5:
-                    files_text += f"\n... và {len(missing_files) - 5} file khác"
-                
-                embed.add_field(
-                    name="⚠️ Files không tìm thấy trên GitHub",
-                    value=files_text,
-                    inline=False
-                )
-            
-            embed.add_field(
-                name="🔄 Bước tiếp theo",
-                value="Khởi động lại bot để áp dụng thay đổi (nếu cần)",
-                inline=False
+            return await self.git.step(
+                task, "🔀 git merge FETCH_HEAD", ['git', 'merge', '--no-edit', 'FETCH_HEAD'], cancellable=False
             )
-            
-            embed.add_field(
-                name="💡 Lưu ý",
-                value="• Tất cả thay đổi local đã bị ghi đè\n"
-                      "• Dữ liệu cũ đã được backup an toàn\n"
-                      "• Bot hiện đang chạy code từ GitHub",
-                inline=False
-            )
-            
-            try:
-                await message.edit(embed=embed)
-            except:
-                await ctx.send(embed=embed)
-            
-        except Exception as e:
-            logger.error(f"Lỗi trong handle_restore: {e}")
-            
+        
+        started = await self._run_git_task(ctx, 'restore', "🔄 Đang khôi phục từ GitHub...", pipeline)
+        if started is None:
+            return
+        task, result, message = started
+        backup_name = state['backup_name']
+        
+        if result is None:
+            await self._finish_git_task(ctx, message, self._build_aborted_embed(task, backup_name))
+            return
+        
+        if not result.success:
             embed = discord.Embed(
                 title="❌ Lỗi khi khôi phục từ GitHub",
                 description="Có lỗi xảy ra trong quá trình khôi phục!",
@@ -510,7 +467,7 @@ class BackupCommands:
             
             embed.add_field(
                 name="🐛 Chi tiết",
-                value=f"```\n{str(e)}\n```",
+                value=f"```\n{' '.join(result.args)}: {result.error[:900]}\n```",
                 inline=False
             )
             
@@ -530,10 +487,73 @@ class BackupCommands:
                 inline=False
             )
             
-            try:
-                await message.edit(embed=embed)
-            except:
-                await ctx.send(embed=embed)
+            await self._finish_git_task(ctx, message, embed)
+            return
+        
+        # Khôi phục data files từ GitHub (nếu có)
+        data_files = self.data_files
+        restored_files = []
+        missing_files = []
+        
+        for file in data_files:
+            if os.path.exists(file):
+                # File tồn tại trên GitHub, đã được pull
+                restored_files.append(file)
+            else:
+                missing_files.append(file)
+        
+        # Tạo embed kết quả cuối cùng
+        embed = discord.Embed(
+            title="✅ Khôi phục từ GitHub thành công!",
+            description=f"Hoàn tất trong {task.elapsed:.1f}s",
+            color=discord.Color.green(),
+            timestamp=datetime.now()
+        )
+        
+        if backup_name:
+            embed.add_field(
+                name="📦 Backup an toàn",
+                value=f"Dữ liệu cũ đã được backup: `{backup_name}`",
+                inline=False
+            )
+        
+        if restored_files:
+            files_text = '\n'.join([f"• `{file}`" for file in restored_files[:10]])
+            if len(restored_files) > 10:
+                files_text += f"\n... và {len(restored_files) - 10} file khác"
+            
+            embed.add_field(
+                name="📁 Files đã khôi phục",
+                value=files_text,
+                inline=False
+            )
+        
+        if missing_files:
+            files_text = '\n'.join([f"• `{file}`" for file in missing_files[:5]])
+            if len(missing_files) > 5:
+                files_text += f"\n... và {len(missing_files) - 5} file khác"
+            
+            embed.add_field(
+                name="⚠️ Files không tìm thấy trên GitHub",
+                value=files_text,
+                inline=False
+            )
+        
+        embed.add_field(
+            name="🔄 Bước tiếp theo",
+            value="Khởi động lại bot để áp dụng thay đổi (nếu cần)",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="💡 Lưu ý",
+            value="• Tất cả thay đổi local đã bị ghi đè\n"
+                  "• Dữ liệu cũ đã được backup an toàn\n"
+                  "• Bot hiện đang chạy code từ GitHub",
+            inline=False
+        )
+        
+        await self._finish_git_task(ctx, message, embed)
     
     async def handle_init(self, ctx):
         """Xử lý lệnh init - khởi tạo Git repository"""
@@ -696,7 +716,7 @@ class BackupCommands:
                           "• `backup restore` - Khôi phục từ GitHub",
                     inline=False
                 )
-                
+            
             else:
                 # Pull thất bại nhưng Git đã được init
                 embed = discord.Embed(
@@ -730,7 +750,7 @@ class BackupCommands:
                 await message.edit(embed=embed)
             except:
                 await ctx.send(embed=embed)
-            
+        
         except Exception as e:
             logger.error(f"Lỗi trong handle_init: {e}")
             
@@ -868,7 +888,7 @@ class BackupCommands:
             inline=True
         )
         
-        data_files = config.get('data_files', [])
+        data_files = self.data_files
         if data_files:
             files_text = '\n'.join([f"• `{file}`" for file in data_files[:10]])
             if len(data_files) > 10:
@@ -913,339 +933,364 @@ class BackupCommands:
             await ctx.reply(embed=embed, mention_author=True)
             return
         
-        # Tạo embed loading
-        embed = discord.Embed(
-            title="🔄 Đang đồng bộ từ GitHub...",
-            description="Vui lòng chờ trong giây lát...",
-            color=discord.Color.orange(),
-            timestamp=datetime.now()
-        )
+        branch = self.github_config.get('branch', 'main')
+        state = {'backup_name': ''}
         
-        if backup_first:
-            embed.add_field(
-                name="📦 Bước 1/3",
-                value="Đang backup dữ liệu hiện tại...",
-                inline=False
-            )
-        else:
-            embed.add_field(
-                name="📥 Bước 1/2",
-                value="Đang pull từ GitHub...",
-                inline=False
+        async def pipeline(task):
+            fetch = self.git.step(task, f"📥 git fetch origin {branch}", ['git', 'fetch', '--progress', 'origin', branch])
+            if backup_first:
+                # Snapshot chạy song song với fetch (fetch không đụng vào working tree)
+                fetched, state['backup_name'] = await asyncio.gather(
+                    fetch, self.git.call(task, "📦 Snapshot dữ liệu hiện tại", self.backup_current_data)
+                )
+            else:
+                fetched = await fetch
+            if not fetched.success:
+                return fetched
+            return await self.git.step(
+                task, "🔀 git merge FETCH_HEAD", ['git', 'merge', '--no-edit', 'FETCH_HEAD'], cancellable=False
             )
         
-        message = await ctx.reply(embed=embed, mention_author=True)
+        started = await self._run_git_task(
+            ctx, 'sync' if backup_first else 'pull', "🔄 Đang đồng bộ từ GitHub...", pipeline
+        )
+        if started is None:
+            return
+        task, result, message = started
+        backup_name = state['backup_name']
         
-        backup_name = ""
+        if result is None:
+            await self._finish_git_task(ctx, message, self._build_aborted_embed(task, backup_name))
+            return
         
-        try:
-            # Bước 1: Backup nếu cần
-            if backup_first:
-                backup_name = self.backup_current_data()
-                
-                embed.add_field(
-                    name="✅ Backup hoàn tất",
-                    value=f"Đã backup: `{backup_name}`",
-                    inline=False
-                )
-                embed.add_field(
-                    name="📥 Bước 2/3",
-                    value="Đang pull từ GitHub...",
-                    inline=False
-                )
-                
-                try:
-                    await message.edit(embed=embed)
-                except:
-                    pass
-            
-            # Bước 2: Git pull
-            success, output, error = await self.run_git_command("git pull origin main")
+        if result.success:
+            # Thành công
+            embed = discord.Embed(
+                title="✅ Đồng bộ GitHub thành công!",
+                description=f"Hoàn tất trong {task.elapsed:.1f}s",
+                color=discord.Color.green(),
+                timestamp=datetime.now()
+            )
             
-            if success:
-                # Thành công
-                embed = discord.Embed(
-                    title="✅ Đồng bộ GitHub thành công!",
-                    color=discord.Color.green(),
-                    timestamp=datetime.now()
-                )
-                
-                if backup_name:
-                    embed.add_field(
-                        name="📦 Backup",
-                        value=f"Dữ liệu cũ đã được backup: `{backup_name}`",
-                        inline=False
-                    )
-                
-                if output:
-                    # Hiển thị thông tin pull
-                    pull_info = output[:500] + "..." if len(output) > 500 else output
-                    embed.add_field(
-                        name="📥 Kết quả Pull",
-                        value=f"```\n{pull_info}\n```",
-                        inline=False
-                    )
-                
-                embed.add_field(
-                    name="🔄 Bước tiếp theo",
-                    value="Khởi động lại bot để áp dụng thay đổi (nếu cần)",
-                    inline=False
-                )
-                
-            else:
-                # Thất bại
-                embed = discord.Embed(
-                    title="❌ Lỗi khi pull từ GitHub",
-                    color=discord.Color.red(),
-                    timestamp=datetime.now()
-                )
-                
+            if backup_name:
                 embed.add_field(
-                    name="🐛 Chi tiết lỗi",
-                    value=f"```\n{error[:1000]}\n```",
+                    name="📦 Backup",
+                    value=f"Dữ liệu cũ đã được backup: `{backup_name}`",
                     inline=False
                 )
-                
-                if backup_name:
-                    embed.add_field(
-                        name="📦 Backup an toàn",
-                        value=f"Dữ liệu của bạn đã được backup: `{backup_name}`",
-                        inline=False
-                    )
-                
+            
+            if result.output:
+                # Hiển thị thông tin pull
+                pull_info = result.output[:500] + "..." if len(result.output) > 500 else result.output
                 embed.add_field(
-                    name="💡 Gợi ý",
-                    value="• Kiểm tra `git status` để xem conflict\n"
-                          "• Có thể cần resolve conflict thủ công\n"
-                          "• Liên hệ admin nếu cần hỗ trợ",
+                    name="📥 Kết quả Pull",
+                    value=f"```\n{pull_info}\n```",
                     inline=False
                 )
             
-            try:
-                await message.edit(embed=embed)
-            except:
-                await ctx.send(embed=embed)
-            
-        except Exception as e:
-            logger.error(f"Lỗi trong handle_pull: {e}")
-            
+            embed.add_field(
+                name="🔄 Bước tiếp theo",
+                value="Khởi động lại bot để áp dụng thay đổi (nếu cần)",
+                inline=False
+            )
+        
+        else:
+            # Thất bại
             embed = discord.Embed(
-                title="❌ Lỗi hệ thống",
-                description="Có lỗi xảy ra trong quá trình đồng bộ!",
-                color=discord.Color.red()
+                title="❌ Lỗi khi pull từ GitHub",
+                color=discord.Color.red(),
+                timestamp=datetime.now()
             )
             
             embed.add_field(
-                name="🐛 Chi tiết",
-                value=f"```\n{str(e)}\n```",
+                name="🐛 Chi tiết lỗi",
+                value=f"```\n{' '.join(result.args)}: {result.error[:900]}\n```",
                 inline=False
             )
             
             if backup_name:
                 embed.add_field(
                     name="📦 Backup an toàn",
-                    value=f"Dữ liệu đã được backup: `{backup_name}`",
+                    value=f"Dữ liệu của bạn đã được backup: `{backup_name}`",
                     inline=False
                 )
             
-            try:
-                await message.edit(embed=embed)
-            except:
-                await ctx.send(embed=embed)
+            embed.add_field(
+                name="💡 Gợi ý",
+                value="• Kiểm tra `git status` để xem conflict\n"
+                      "• Có thể cần resolve conflict thủ công\n"
+                      "• Liên hệ admin nếu cần hỗ trợ",
+                inline=False
+            )
+        
+        await self._finish_git_task(ctx, message, embed)
+    
+    def _move_conflict_files(self, conflict_files, conflict_backup_dir):
+        """Backup rồi xóa các file hay conflict với repo (chạy trong worker thread)"""
+        backed_up_files = []
+        removed_files = []
+        for file in conflict_files:
+            if os.path.exists(file):
+                try:
+                    os.makedirs(conflict_backup_dir, exist_ok=True)
+                    shutil.copy2(file, conflict_backup_dir)
+                    backed_up_files.append(file)
+                    os.remove(file)
+                    removed_files.append(file)
+                except Exception as e:
+                    logger.error(f"Lỗi backup/xóa {file}: {e}")
+        return backed_up_files, removed_files
     
     async def handle_fix_conflict(self, ctx):
         """Xử lý conflict với GitHub files"""
-        embed = discord.Embed(
-            title="🔧 Đang xử lý Git Conflict...",
-            description="Khắc phục conflict với files từ GitHub",
-            color=discord.Color.orange(),
-            timestamp=datetime.now()
-        )
+        # Kiểm tra Git repository
+        is_git_repo, git_error = await self.check_git_repository()
         
-        embed.add_field(
-            name="🔍 Bước 1/4",
-            value="Đang kiểm tra trạng thái Git...",
-            inline=False
-        )
+        if not is_git_repo:
+            embed = discord.Embed(
+                title="❌ Không phải Git Repository",
+                description="Vui lòng chạy `backup init` trước!",
+                color=discord.Color.red()
+            )
+            await ctx.reply(embed=embed, mention_author=True)
+            return
         
-        message = await ctx.reply(embed=embed, mention_author=True)
+        branch = self.github_config.get('branch', 'main')
+        # Tạo backup folder cho conflict files
+        conflict_backup_dir = f"conflict_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # Kiểm tra files conflict phổ biến
+        conflict_files = ["README.md", ".gitignore", "LICENSE"]
+        state = {'backed_up': [], 'removed': []}
         
-        try:
-            # Kiểm tra Git repository
-            is_git_repo, git_error = await self.check_git_repository()
-            
-            if not is_git_repo:
-                embed = discord.Embed(
-                    title="❌ Không phải Git Repository",
-                    description="Vui lòng chạy `backup init` trước!",
-                    color=discord.Color.red()
-                )
-                await message.edit(embed=embed)
-                return
-            
-            # Bước 1: Backup files hiện tại
-            embed.add_field(
-                name="📦 Bước 2/4",
-                value="Đang backup files conflict...",
-                inline=False
+        async def move_files():
+            state['backed_up'], state['removed'] = await asyncio.to_thread(
+                self._move_conflict_files, conflict_files, conflict_backup_dir
             )
-            
-            try:
-                await message.edit(embed=embed)
-            except:
-                pass
-            
-            # Tạo backup folder cho conflict files
-            conflict_backup_dir = f"conflict_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            
-            # Kiểm tra files conflict phổ biến
-            conflict_files = ["README.md", ".gitignore", "LICENSE"]
-            backed_up_files = []
-            
-            for file in conflict_files:
-                if os.path.exists(file):
-                    if not os.path.exists(conflict_backup_dir):
-                        os.makedirs(conflict_backup_dir)
-                    try:
-                        import shutil
-                        shutil.copy2(file, conflict_backup_dir)
-                        backed_up_files.append(file)
-                    except Exception as e:
-                        logger.error(f"Lỗi backup {file}: {e}")
-            
-            # Bước 2: Xóa conflict files
-            embed.add_field(
-                name="🗑️ Bước 3/4",
-                value="Đang xóa conflict files...",
-                inline=False
+            return True
+        
+        async def pipeline(task):
+            # Dời file conflict song song với fetch (fetch không đụng vào working tree)
+            fetched, _ = await asyncio.gather(
+                self.git.step(task, f"📥 git fetch origin {branch}", ['git', 'fetch', '--progress', 'origin', branch]),
+                self.git.call(task, "📦 Backup + xóa files conflict", move_files)
             )
-            
-            try:
-                await message.edit(embed=embed)
-            except:
-                pass
-            
-            removed_files = []
-            for file in conflict_files:
-                if os.path.exists(file):
-                    try:
-                        os.remove(file)
-                        removed_files.append(file)
-                    except Exception as e:
-                        logger.error(f"Lỗi xóa {file}: {e}")
-            
-            # Bước 3: Pull từ GitHub
-            embed.add_field(
-                name="📥 Bước 4/4",
-                value="Đang pull từ GitHub...",
-                inline=False
+            if not fetched.success:
+                return fetched
+            merged = await self.git.step(
+                task, "🔀 git merge FETCH_HEAD", ['git', 'merge', '--no-edit', 'FETCH_HEAD'], cancellable=False
             )
-            
-            try:
-                await message.edit(embed=embed)
-            except:
-                pass
-            
-            branch = self.github_config.get('branch', 'main')
-            success, output, error = await self.run_git_command(f"git pull origin {branch}")
-            
             # Nếu vẫn lỗi, thử với --allow-unrelated-histories
-            if not success:
-                success, output, error = await self.run_git_command(f"git pull origin {branch} --allow-unrelated-histories")
-            
-            # Tạo embed kết quả
-            if success:
-                embed = discord.Embed(
-                    title="✅ Đã khắc phục Git Conflict!",
-                    description="Conflict đã được giải quyết thành công",
-                    color=discord.Color.green(),
-                    timestamp=datetime.now()
+            if not merged.success:
+                merged = await self.git.step(
+                    task, "🔀 git merge --allow-unrelated-histories",
+                    ['git', 'merge', '--no-edit', '--allow-unrelated-histories', 'FETCH_HEAD'], cancellable=False
                 )
-                
-                if backed_up_files:
-                    embed.add_field(
-                        name="📦 Files đã backup",
-                        value=f"Backup tại: `{conflict_backup_dir}`\n" +
-                              "\n".join([f"• `{file}`" for file in backed_up_files]),
-                        inline=False
-                    )
-                
-                if removed_files:
-                    embed.add_field(
-                        name="🗑️ Files đã xóa",
-                        value="\n".join([f"• `{file}`" for file in removed_files]),
-                        inline=False
-                    )
-                
-                embed.add_field(
-                    name="📥 Pull result",
-                    value=f"```\n{output[:300] if output else 'Pull thành công'}\n```",
-                    inline=False
-                )
-                
-                embed.add_field(
-                    name="🎉 Hoàn tất",
-                    value="Giờ bạn có thể sử dụng:\n"
-                          "• `backup status` - Kiểm tra trạng thái\n"
-                          "• `backup sync` - Đồng bộ từ GitHub",
-                    inline=False
-                )
-                
-            else:
-                embed = discord.Embed(
-                    title="❌ Vẫn còn lỗi Git",
-                    description="Không thể khắc phục conflict tự động",
-                    color=discord.Color.red(),
-                    timestamp=datetime.now()
-                )
-                
+            return merged
+        
+        started = await self._run_git_task(ctx, 'fix', "🔧 Đang xử lý Git Conflict...", pipeline)
+        if started is None:
+            return
+        task, result, message = started
+        backed_up_files, removed_files = state['backed_up'], state['removed']
+        
+        if result is None:
+            embed = self._build_aborted_embed(task, "")
+            if backed_up_files:
+                embed.add_field(name="📦 Files đã backup", value=f"Backup tại: `{conflict_backup_dir}`", inline=False)
+            await self._finish_git_task(ctx, message, embed)
+            return
+        
+        # Tạo embed kết quả
+        if result.success:
+            embed = discord.Embed(
+                title="✅ Đã khắc phục Git Conflict!",
+                description="Conflict đã được giải quyết thành công",
+                color=discord.Color.green(),
+                timestamp=datetime.now()
+            )
+            
+            if backed_up_files:
                 embed.add_field(
-                    name="🐛 Lỗi",
-                    value=f"```\n{error[:500]}\n```",
+                    name="📦 Files đã backup",
+                    value=f"Backup tại: `{conflict_backup_dir}`\n" +
+                          "\n".join([f"• `{file}`" for file in backed_up_files]),
                     inline=False
                 )
-                
+            
+            if removed_files:
                 embed.add_field(
-                    name="💡 Khắc phục thủ công",
-                    value="```bash\n"
-                          "git add .\n"
-                          "git stash\n"
-                          "git pull origin main --allow-unrelated-histories\n"
-                          "```",
+                    name="🗑️ Files đã xóa",
+                    value="\n".join([f"• `{file}`" for file in removed_files]),
                     inline=False
                 )
             
-            try:
-                await message.edit(embed=embed)
-            except:
-                await ctx.send(embed=embed)
-                
-        except Exception as e:
-            logger.error(f"Lỗi trong handle_fix_conflict: {e}")
+            embed.add_field(
+                name="📥 Pull result",
+                value=f"```\n{result.output[:300] if result.output else 'Pull thành công'}\n```",
+                inline=False
+            )
             
+            embed.add_field(
+                name="🎉 Hoàn tất",
+                value="Giờ bạn có thể sử dụng:\n"
+                      "• `backup status` - Kiểm tra trạng thái\n"
+                      "• `backup sync` - Đồng bộ từ GitHub",
+                inline=False
+            )
+        
+        else:
             embed = discord.Embed(
-                title="❌ Lỗi khi xử lý conflict",
-                description="Có lỗi xảy ra trong quá trình khắc phục!",
-                color=discord.Color.red()
+                title="❌ Vẫn còn lỗi Git",
+                description="Không thể khắc phục conflict tự động",
+                color=discord.Color.red(),
+                timestamp=datetime.now()
             )
             
             embed.add_field(
-                name="🐛 Chi tiết",
-                value=f"```\n{str(e)}\n```",
+                name="🐛 Lỗi",
+                value=f"```\n{result.error[:500]}\n```",
                 inline=False
             )
             
-            try:
-                await message.edit(embed=embed)
-            except:
-                await ctx.send(embed=embed)
+            embed.add_field(
+                name="💡 Khắc phục thủ công",
+                value="```bash\n"
+                      "git add .\n"
+                      "git stash\n"
+                      f"git pull origin {branch} --allow-unrelated-histories\n"
+                      "```",
+                inline=False
+            )
+        
+        await self._finish_git_task(ctx, message, embed)
+    
+    async def handle_snapshot(self, ctx):
+        """Tạo snapshot dữ liệu ngay"""
+        snapshot_id = await self.backup_current_data(label='manual')
+        if not snapshot_id:
+            await ctx.reply("❌ Không tạo được snapshot, xem log để biết chi tiết!", mention_author=True)
+            return
+        
+        manifest = self.snapshots.get(snapshot_id)
+        embed = discord.Embed(
+            title="📸 Đã tạo snapshot",
+            description=f"`{snapshot_id}`",
+            color=discord.Color.green(),
+            timestamp=datetime.now()
+        )
+        embed.add_field(name="📁 Files", value=f"{len(manifest['files'])} files ({manifest['total_size'] / 1024:.1f} KB)", inline=True)
+        embed.add_field(
+            name="💾 Dung lượng mới",
+            value=f"{manifest['new_chunks']} chunk ({manifest['stored_bytes'] / 1024:.1f} KB)",
+            inline=True
+        )
+        if manifest['missing']:
+            embed.add_field(name="⚠️ Không tồn tại", value="\n".join(f"• `{path}`" for path in manifest['missing'][:10]), inline=False)
+        embed.set_footer(text="Restore 1 file: ;backup restorefile <file> [snapshot|thời điểm]")
+        await ctx.reply(embed=embed, mention_author=True)
+    
+    async def handle_list_snapshots(self, ctx):
+        """Liệt kê snapshot và dung lượng store"""
+        snapshots = await asyncio.to_thread(self.snapshots.list_snapshots)
+        stats = await asyncio.to_thread(self.snapshots.get_stats)
+        embed = discord.Embed(
+            title="📸 Snapshot dữ liệu",
+            description=(
+                f"**{stats['snapshots']}** snapshot • {stats['chunks']} chunk ({stats['codec']})\n"
+                f"Dữ liệu gốc: {stats['logical_bytes'] / 1024:.1f} KB • Lưu thật: {stats['stored_bytes'] / 1024:.1f} KB"
+            ),
+            color=discord.Color.blue(),
+            timestamp=datetime.now()
+        )
+        if snapshots:
+            lines = [
+                f"`{manifest['id']}` • {len(manifest['files'])} files • +{manifest['stored_bytes'] / 1024:.1f} KB"
+                for manifest in snapshots[:15]
+            ]
+            if len(snapshots) > 15:
+                lines.append(f"... và {len(snapshots) - 15} snapshot khác")
+            embed.add_field(name="🕒 Mới nhất trước", value="\n".join(lines), inline=False)
+        retention = self.snapshot_retention
+        embed.set_footer(
+            text=f"Retention: {retention['keep_last']} mới nhất, {retention['keep_daily']} ngày, {retention['keep_weekly']} tuần"
+        )
+        await ctx.reply(embed=embed, mention_author=True)
+    
+    def is_live_reloadable(self, path: str) -> bool:
+        """File có store load lại được sau khi restore lúc bot đang chạy không"""
+        path = os.path.normpath(path)
+        return path == os.path.normpath(shared_wallet.wallet_file) or path in {
+            os.path.normpath(game_file) for game_file in game_stats.data_files()
+        }
+    
+    def reload_restored_file(self, path: str) -> None:
+        """Load lại store đang giữ file vừa restore để lần save sau không ghi đè dữ liệu cũ lên"""
+        if os.path.normpath(path) == os.path.normpath(shared_wallet.wallet_file):
+            ok, info = shared_wallet.reload_data()
+            if not ok:
+                raise RuntimeError(f"Không load lại được ví: {info}")
+        else:
+            game_stats.reload_file(path)
+    
+    async def handle_restore_file(self, ctx, file_name: Optional[str], ref: str = 'latest'):
+        """Restore 1 file từ snapshot (ID, tiền tố ID, 'latest' hoặc thời điểm)"""
+        if not file_name:
+            await ctx.reply(
+                "❌ Usage: `;backup restorefile <file> [snapshot_id|YYYY-MM-DD HH:MM]`\n"
+                "Ví dụ: `;backup restorefile shared_wallet.json 2024-05-01 20:00`",
+                mention_author=True
+            )
+            return
+        
+        manifest = await asyncio.to_thread(self.snapshots.resolve, ref)
+        if manifest is None:
+            await ctx.reply(f"❌ Không tìm thấy snapshot `{ref}`! Dùng `;backup snapshots` để xem danh sách.", mention_author=True)
+            return
+        
+        # Cho phép gõ tên file không kèm thư mục data/
+        path = file_name if file_name in manifest['files'] else next(
+            (path for path in manifest['files'] if os.path.basename(path) == file_name), None
+        )
+        if path is None:
+            await ctx.reply(f"❌ Snapshot `{manifest['id']}` không có file `{file_name}`!", mention_author=True)
+            return
+        
+        # Store trong RAM sẽ save đè lên file vừa restore - chỉ restore nóng file load lại được
+        if not self.is_live_reloadable(path):
+            await ctx.reply(
+                f"❌ `{path}` đang được bot giữ trong RAM và sẽ bị ghi đè khi bot save, không restore được lúc bot đang chạy!\n"
+                f"Tắt bot rồi chạy: `python restore_data.py --snapshot {manifest['id']} {path}`",
+                mention_author=True
+            )
+            return
+        
+        try:
+            # Snapshot bản hiện tại trước khi ghi đè (file không đổi thì gần như không tốn dung lượng)
+            safety = await self.snapshots.create_snapshot_async([path], 'pre_restore')
+            await self.snapshots.restore_file_async(manifest['id'], path)
+            self.reload_restored_file(path)
+        except Exception as e:
+            logger.error(f"Lỗi restore {path} từ snapshot {manifest['id']}: {e}")
+            await ctx.reply(f"❌ Lỗi khi restore `{path}`: {e}", mention_author=True)
+            return
+        
+        embed = discord.Embed(
+            title="✅ Restore file thành công!",
+            description=f"Đã restore `{path}` từ snapshot `{manifest['id']}`",
+            color=discord.Color.green(),
+            timestamp=datetime.now()
+        )
+        embed.add_field(name="📦 Bản trước khi restore", value=f"`{safety['id']}`", inline=False)
+        embed.add_field(name="🔄 Dữ liệu", value="Đã load lại dữ liệu trong RAM, không cần khởi động lại bot", inline=False)
+        await ctx.reply(embed=embed, mention_author=True)
+        logger.info(f"{ctx.author} restore {path} từ snapshot {manifest['id']}")
     
     def register_commands(self) -> None:
         """
         Đăng ký các commands cho Backup
         """
         @self.bot.command(name='backup')
-        async def backup_command(ctx, action: str = None):
+        async def backup_command(ctx, action: str = None, *args):
             """
             Lệnh quản lý backup và đồng bộ GitHub
             
@@ -1255,6 +1300,10 @@ class BackupCommands:
             - ;backup restore - Khôi phục hoàn toàn từ GitHub (ghi đè local)
             - ;backup status - Kiểm tra trạng thái Git
             - ;backup config - Xem cấu hình GitHub
+            - ;backup snapshot - Tạo snapshot dữ liệu local
+            - ;backup snapshots - Xem danh sách snapshot
+            - ;backup restorefile <file> [snapshot|thời điểm] - Restore 1 file từ snapshot
+            - ;backup cancel - Huỷ thao tác git đang chạy
             """
             try:
                 # Kiểm tra quyền admin
@@ -1283,7 +1332,11 @@ class BackupCommands:
                               "`/backup fix` - Khắc phục Git conflict\n"
                               "`/backup migrate` - Di chuyển dữ liệu vào data/\n"
                               "`/backup status` - Kiểm tra trạng thái Git\n"
-                              "`/backup config` - Xem cấu hình GitHub",
+                              "`/backup config` - Xem cấu hình GitHub\n"
+                              "`/backup snapshot` - Tạo snapshot dữ liệu local\n"
+                              "`/backup snapshots` - Xem danh sách snapshot\n"
+                              "`/backup restorefile <file> [snapshot|thời điểm]` - Restore 1 file\n"
+                              "`/backup cancel` - Huỷ thao tác git đang chạy",
                         inline=False
                     )
                     embed.add_field(
@@ -1315,6 +1368,16 @@ class BackupCommands:
                     await self.handle_fix_conflict(ctx)
                 elif action.lower() == 'migrate':
                     await self.handle_migrate(ctx)
+                elif action.lower() == 'cancel':
+                    await self.handle_cancel(ctx)
+                elif action.lower() == 'snapshot':
+                    await self.handle_snapshot(ctx)
+                elif action.lower() == 'snapshots':
+                    await self.handle_list_snapshots(ctx)
+                elif action.lower() == 'restorefile':
+                    await self.handle_restore_file(
+                        ctx, args[0] if args else None, ' '.join(args[1:]) or 'latest'
+                    )
                 else:
                     embed = discord.Embed(
                         title="❌ Action không hợp lệ",
@@ -1323,11 +1386,12 @@ class BackupCommands:
                     )
                     embed.add_field(
                         name="Actions hợp lệ",
-                        value="`sync`, `pull`, `restore`, `init`, `fix`, `migrate`, `status`, `config`",
+                        value="`sync`, `pull`, `restore`, `init`, `fix`, `migrate`, `status`, `config`, "
+                              "`snapshot`, `snapshots`, `restorefile`, `cancel`",
                         inline=False
                     )
                     await ctx.reply(embed=embed, mention_author=True)
-                
+            
             except Exception as e:
                 logger.error(f"Lỗi trong backup command: {e}")
                 embed = discord.Embed(
@@ -1341,3 +1405,30 @@ class BackupCommands:
         # Các handle methods đã được định nghĩa như methods của class
         
         logger.info("Đã đăng ký backup commands")
+
+
+class GitCancelView(discord.ui.View):
+    """View có nút huỷ git task đang chạy (chỉ admin)"""
+    
+    def __init__(self, backup_commands, task):
+        super().__init__(timeout=None)
+        self.backup_commands = backup_commands
+        self.task = task
+    
+    @discord.ui.button(label='Huỷ', emoji='⛔', style=discord.ButtonStyle.danger)
+    async def cancel_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Button huỷ task"""
+        permissions = getattr(interaction.user, 'guild_permissions', None)
+        if not self.backup_commands.is_admin(interaction.user.id, permissions):
+            await interaction.response.send_message("❌ Chỉ admin mới có thể huỷ!", ephemeral=True)
+            return
+        
+        if self.task.done:
+            await interaction.response.send_message("ℹ️ Thao tác đã kết thúc.", ephemeral=True)
+        elif self.task.cancel():
+            await interaction.response.send_message(f"⛔ Đang huỷ `{self.task.name}`...", ephemeral=True)
+            logger.info(f"{interaction.user} huỷ git task {self.task.name}")
+        else:
+            await interaction.response.send_message(
+                "⏳ Đang ở bước reset/merge (không thể ngắt giữa chừng), thử lại sau giây lát.", ephemeral=True
+            )
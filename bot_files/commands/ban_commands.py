@@ -5,13 +5,15 @@ Chỉ Supreme Admin mới có quyền ban/unban user
 """
 import discord
 from discord.ext import commands
-import json
 import os
 from datetime import datetime
 import logging
+from utils.ban_registry import BanRegistry
 
 logger = logging.getLogger(__name__)
 
+PAGE_SIZE = 10  # Số dòng mỗi trang banlist/banhistory
+
 class BanCommands:
     def __init__(self, bot_instance):
         self.bot_instance = bot_instance
@@ -22,116 +24,108 @@ class BanCommands:
         # Tạo data folder nếu chưa có
         if not os.path.exists(self.data_folder):
             os.makedirs(self.data_folder)
-        self.banned_users = {}  # {user_id: {'reason': str, 'timestamp': str, 'banned_by': int}}
+        self.registry = BanRegistry(self.banned_users_file, os.path.join(self.data_folder, 'ban_history.jsonl'))
+        self.banned_users = self.registry.banned  # {user_id: {'reason', 'timestamp', 'banned_by', 'user_name', 'admin_name'}}
+        self._page_cache = {}  # (loại, trang) -> (version, nội dung đã render)
         self.load_banned_users()
         self.setup_commands()
     
     def load_banned_users(self):
-        """Tải danh sách user bị ban từ file JSON"""
-        try:
-            if os.path.exists(self.banned_users_file):
-                with open(self.banned_users_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Convert string keys back to int
-                    self.banned_users = {int(k): v for k, v in data.get('banned_users', {}).items()}
-                logger.info(f"Đã tải {len(self.banned_users)} user bị ban")
-            else:
-                # Tạo file banned users mặc định
-                default_data = {
-                    "banned_users": {},
-                    "description": "Danh sách users bị cấm sử dụng bot",
-                    "ban_history": []
-                }
-                with open(self.banned_users_file, 'w', encoding='utf-8') as f:
-                    json.dump(default_data, f, indent=4, ensure_ascii=False)
-                logger.info(f"Đã tạo file banned users mới: {self.banned_users_file}")
-        except Exception as e:
-            logger.error(f"Lỗi khi tải banned users: {e}")
+        """Tải danh sách user bị ban và lịch sử ban"""
+        self.registry.load()
+        self.banned_users = self.registry.banned
     
     def save_banned_users(self):
         """Lưu danh sách user bị ban vào file JSON"""
-        try:
-            # Load existing data để giữ lại ban_history
-            existing_data = {}
-            if os.path.exists(self.banned_users_file):
-                with open(self.banned_users_file, 'r', encoding='utf-8') as f:
-                    existing_data = json.load(f)
-            
-            # Convert int keys to string for JSON
-            banned_data = {str(k): v for k, v in self.banned_users.items()}
-            
-            # Update banned_users
-            existing_data['banned_users'] = banned_data
-            existing_data['description'] = "Danh sách users bị cấm sử dụng bot"
-            
-            with open(self.banned_users_file, 'w', encoding='utf-8') as f:
-                json.dump(existing_data, f, indent=4, ensure_ascii=False)
-            logger.info("Đã lưu banned users thành công")
-        except Exception as e:
-            logger.error(f"Lỗi khi lưu banned users: {e}")
+        self.registry.save()
     
-    def add_ban_history(self, user_id: int, action: str, admin_id: int, reason: str = ""):
-        """Thêm lịch sử ban/unban vào file"""
-        try:
-            # Load existing data
-            existing_data = {}
-            if os.path.exists(self.banned_users_file):
-                with open(self.banned_users_file, 'r', encoding='utf-8') as f:
-                    existing_data = json.load(f)
-            
-            # Ensure ban_history exists
-            if 'ban_history' not in existing_data:
-                existing_data['ban_history'] = []
-            
-            # Add new history entry
-            history_entry = {
-                'user_id': user_id,
-                'action': action,  # 'ban' hoặc 'unban'
-                'admin_id': admin_id,
-                'reason': reason,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            existing_data['ban_history'].append(history_entry)
-            
-            # Keep only last 100 entries để tránh file quá lớn
-            if len(existing_data['ban_history']) > 100:
-                existing_data['ban_history'] = existing_data['ban_history'][-100:]
-            
-            # Save back to file
-            with open(self.banned_users_file, 'w', encoding='utf-8') as f:
-                json.dump(existing_data, f, indent=4, ensure_ascii=False)
-                
-        except Exception as e:
-            logger.error(f"Lỗi khi thêm ban history: {e}")
+    def _cached_name(self, user_id: int) -> str:
+        """Tên hiển thị từ cache của bot (không gọi API), '' nếu không có"""
+        user = self.bot.get_user(user_id) if user_id else None
+        return user.display_name if user else ''
+    
+    def _user_label(self, user_id: int, snapshot: str) -> str:
+        """Tên đã lưu lúc ban > cache của bot > mention (Discord tự hiển thị, không tốn REST call)"""
+        return snapshot or self._cached_name(user_id) or f"<@{user_id}>"
     
     def is_user_banned(self, user_id: int) -> bool:
         """Kiểm tra xem user có bị ban không"""
-        return user_id in self.banned_users
+        return self.registry.is_banned(user_id)
     
     def get_ban_info(self, user_id: int) -> dict:
         """Lấy thông tin ban của user"""
-        return self.banned_users.get(user_id, {})
+        return self.registry.get(user_id)
     
-    def ban_user(self, user_id: int, reason: str, admin_id: int):
+    def ban_user(self, user_id: int, reason: str, admin_id: int, user_name: str = '', admin_name: str = ''):
         """Ban user"""
-        self.banned_users[user_id] = {
-            'reason': reason,
-            'timestamp': datetime.now().isoformat(),
-            'banned_by': admin_id
-        }
-        self.save_banned_users()
-        self.add_ban_history(user_id, 'ban', admin_id, reason)
+        self.registry.ban(
+            [user_id], reason, admin_id,
+            {user_id: user_name or self._cached_name(user_id)},
+            admin_name or self._cached_name(admin_id)
+        )
+        
+        self.bot_instance.refresh_auth_index()
     
-    def unban_user(self, user_id: int, admin_id: int, reason: str = ""):
+    def ban_users(self, user_ids: list, reason: str, admin_id: int) -> list:
+        """
+        Ban nhiều user cùng lúc, chỉ lưu file và rebuild index 1 lần
+        
+        Returns:
+            list: Các user ID mới bị ban (bỏ qua user đã bị ban và Supreme Admin)
+        """
+        candidates = [user_id for user_id in user_ids if not self.bot_instance.is_supreme_admin(user_id)]
+        new_ids = self.registry.ban(
+            candidates, reason, admin_id,
+            {user_id: self._cached_name(user_id) for user_id in candidates},
+            self._cached_name(admin_id)
+        )
+        
+        if new_ids:
+            self.bot_instance.refresh_auth_index()
+        return new_ids
+    
+    def unban_user(self, user_id: int, admin_id: int, reason: str = "", admin_name: str = ''):
         """Unban user"""
-        if user_id in self.banned_users:
-            del self.banned_users[user_id]
-            self.save_banned_users()
-            self.add_ban_history(user_id, 'unban', admin_id, reason)
+        if self.registry.unban(user_id, admin_id, reason, admin_name or self._cached_name(admin_id)):
+            self.bot_instance.refresh_auth_index()
             return True
         return False
     
+    def _render_page(self, kind: str, page: int) -> list:
+        """
+        Render 1 trang banlist/banhistory thành các dòng text, cache tới khi registry thay đổi
+        
+        Tên lấy từ snapshot lúc ban nên render không gọi fetch_user - cả trang chỉ tốn 1 lần reply.
+        """
+        key = (kind, page)
+        cached = self._page_cache.get(key)
+        if cached is not None and cached[0] == self.registry.version:
+            return cached[1]
+        
+        offset = (page - 1) * PAGE_SIZE
+        lines = []
+        if kind == 'banlist':
+            for user_id, ban_info in self.registry.bans_page(offset, PAGE_SIZE):
+                reason = ban_info.get('reason', 'Không có lý do')
+                if len(reason) > 50:
+                    reason = reason[:50] + "..."
+                lines.append(f"**{self._user_label(user_id, ban_info.get('user_name', ''))}** (`{user_id}`)\n*Lý do: {reason}*")
+        else:
+            for entry in self.registry.history_page(offset, PAGE_SIZE):
+                action_emoji = "🔨" if entry.action == 'ban' else "✅"
+                action_text = "BAN" if entry.action == 'ban' else "UNBAN"
+                field_value = f"**User:** {self._user_label(entry.user_id, entry.user_name)} (`{entry.user_id}`)\n"
+                field_value += f"**By:** {self._user_label(entry.admin_id, entry.admin_name)}\n"
+                if entry.reason:
+                    field_value += f"**Reason:** {entry.reason}\n"
+                field_value += f"**Time:** {datetime.fromtimestamp(entry.timestamp).strftime('%d/%m/%Y %H:%M') if entry.timestamp else 'Unknown time'}"
+                lines.append((f"{action_emoji} {action_text}", field_value))
+        
+        if len(self._page_cache) > 64:
+            self._page_cache.clear()
+        self._page_cache[key] = (self.registry.version, lines)
+        return lines
+    
     def setup_commands(self):
         """Thiết lập các lệnh ban"""
         
@@ -218,16 +212,18 @@ class BanCommands:
                 await ctx.reply(embed=embed, mention_author=True)
                 return
             
-            # Ban user
-            self.ban_user(target_user_id, reason, ctx.author.id)
-            
-            # Lấy thông tin user nếu có thể
+            # Lấy thông tin user nếu có thể (lưu tên lúc ban để banlist không phải fetch lại)
+            target_name = ''
             try:
-                target_user = await self.bot.fetch_user(target_user_id)
+                target_user = self.bot.get_user(target_user_id) or await self.bot.fetch_user(target_user_id)
+                target_name = target_user.display_name
                 user_info = f"{target_user.display_name} ({target_user.name})"
             except:
                 user_info = f"User ID: {target_user_id}"
             
+            # Ban user
+            self.ban_user(target_user_id, reason, ctx.author.id, target_name, ctx.author.display_name)
+            
             embed = discord.Embed(
                 title="🔨 User đã bị ban",
                 description=f"**{user_info}** đã bị cấm sử dụng bot!",
@@ -319,7 +315,7 @@ class BanCommands:
                 return
             
             # Unban user
-            success = self.unban_user(target_user_id, ctx.author.id, reason)
+            success = self.unban_user(target_user_id, ctx.author.id, reason, ctx.author.display_name)
             
             if success:
                 # Lấy thông tin user nếu có thể
@@ -372,12 +368,12 @@ class BanCommands:
                 await ctx.reply(embed=embed, mention_author=True)
         
         @self.bot.command(name='banlist')
-        async def banlist_command(ctx):
+        async def banlist_command(ctx, page: int = 1):
             """
             Xem danh sách user bị ban
             Admin và Supreme Admin có thể sử dụng
             
-            Usage: ;banlist
+            Usage: ;banlist [trang]
             """
             # Kiểm tra quyền admin
             if not self.bot_instance.has_warn_permission(ctx.author.id, ctx.author.guild_permissions):
@@ -398,6 +394,9 @@ class BanCommands:
                 await ctx.reply(embed=embed, mention_author=True)
                 return
             
+            total_pages = (len(self.banned_users) + PAGE_SIZE - 1) // PAGE_SIZE
+            page = max(1, min(page, total_pages))
+            
             embed = discord.Embed(
                 title="🔨 Danh sách User bị Ban",
                 description=f"Có **{len(self.banned_users)}** user đang bị ban:",
@@ -405,46 +404,22 @@ class BanCommands:
                 timestamp=datetime.now()
             )
             
-            # Hiển thị tối đa 10 user để tránh embed quá dài
-            user_list = list(self.banned_users.items())[:10]
-            user_info_list = []
-            
-            for user_id, ban_info in user_list:
-                try:
-                    user = await self.bot.fetch_user(user_id)
-                    user_info = f"**{user.display_name}** (`{user_id}`)"
-                except:
-                    user_info = f"**Unknown User** (`{user_id}`)"
-                
-                reason = ban_info.get('reason', 'Không có lý do')
-                if len(reason) > 50:
-                    reason = reason[:50] + "..."
-                
-                user_info_list.append(f"{user_info}\n*Lý do: {reason}*")
-            
             embed.add_field(
                 name="👥 Users bị Ban",
-                value="\n\n".join(user_info_list) if user_info_list else "Không có user nào",
+                value="\n\n".join(self._render_page('banlist', page)),
                 inline=False
             )
             
-            if len(self.banned_users) > 10:
-                embed.add_field(
-                    name="⚠️ Lưu ý",
-                    value=f"Chỉ hiển thị 10/{len(self.banned_users)} user đầu tiên",
-                    inline=False
-                )
-            
-            embed.set_footer(text="Sử dụng ;checkban <user_id> để xem chi tiết")
+            embed.set_footer(text=f"Trang {page}/{total_pages} • ;banlist <trang> để xem tiếp • ;checkban <user_id> để xem chi tiết")
             await ctx.reply(embed=embed, mention_author=True)
         
         @self.bot.command(name='banhistory')
-        async def banhistory_command(ctx, limit: int = 10):
+        async def banhistory_command(ctx, page: int = 1):
             """
             Xem lịch sử ban/unban
             Chỉ Supreme Admin mới có quyền sử dụng
             
-            Usage: ;banhistory [số lượng]
+            Usage: ;banhistory [trang]
             """
             # Kiểm tra quyền Supreme Admin
             if not self.bot_instance.is_supreme_admin(ctx.author.id):
@@ -456,86 +431,32 @@ class BanCommands:
                 await ctx.reply(embed=embed, mention_author=True)
                 return
             
-            # Giới hạn limit
-            limit = max(1, min(limit, 20))  # Từ 1 đến 20
-            
-            try:
-                # Load history từ file
-                history_data = []
-                if os.path.exists(self.banned_users_file):
-                    with open(self.banned_users_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        history_data = data.get('ban_history', [])
-                
-                if not history_data:
-                    embed = discord.Embed(
-                        title="📋 Lịch sử Ban",
-                        description="Chưa có lịch sử ban/unban nào!",
-                        color=discord.Color.blue()
-                    )
-                    await ctx.reply(embed=embed, mention_author=True)
-                    return
-                
-                # Hiển thị entries gần nhất
-                recent_history = history_data[-limit:]
-                
-                embed = discord.Embed(
-                    title="📋 Lịch sử Ban/Unban",
-                    description=f"**{len(recent_history)}** hoạt động gần nhất:",
-                    color=discord.Color.blue(),
-                    timestamp=datetime.now()
-                )
-                
-                for entry in reversed(recent_history):  # Hiển thị từ mới nhất
-                    action_emoji = "🔨" if entry['action'] == 'ban' else "✅"
-                    action_text = "BAN" if entry['action'] == 'ban' else "UNBAN"
-                    
-                    # Lấy thông tin user
-                    try:
-                        user = await self.bot.fetch_user(entry['user_id'])
-                        user_info = f"{user.display_name}"
-                    except:
-                        user_info = f"Unknown User"
-                    
-                    # Lấy thông tin admin
-                    try:
-                        admin = await self.bot.fetch_user(entry['admin_id'])
-                        admin_info = f"{admin.display_name}"
-                    except:
-                        admin_info = f"Unknown Admin"
-                    
-                    # Format timestamp
-                    try:
-                        timestamp = datetime.fromisoformat(entry['timestamp'])
-                        time_str = timestamp.strftime("%d/%m/%Y %H:%M")
-                    except:
-                        time_str = "Unknown time"
-                    
-                    field_value = f"**User:** {user_info} (`{entry['user_id']}`)\n"
-                    field_value += f"**By:** {admin_info}\n"
-                    if entry.get('reason'):
-                        field_value += f"**Reason:** {entry['reason']}\n"
-                    field_value += f"**Time:** {time_str}"
-                    
-                    embed.add_field(
-                        name=f"{action_emoji} {action_text}",
-                        value=field_value,
-                        inline=False
-                    )
-                
-                if len(history_data) > limit:
-                    embed.set_footer(text=f"Hiển thị {limit}/{len(history_data)} hoạt động")
-                
-                await ctx.reply(embed=embed, mention_author=True)
-                
-            except Exception as e:
+            history_count = self.registry.history_count()
+            if not history_count:
                 embed = discord.Embed(
-                    title="❌ Lỗi",
-                    description=f"Có lỗi xảy ra khi tải lịch sử: {str(e)}",
-                    color=discord.Color.red()
+                    title="📋 Lịch sử Ban",
+                    description="Chưa có lịch sử ban/unban nào!",
+                    color=discord.Color.blue()
                 )
                 await ctx.reply(embed=embed, mention_author=True)
-                logger.error(f"Lỗi trong banhistory: {e}")
+                return
+            
+            total_pages = (history_count + PAGE_SIZE - 1) // PAGE_SIZE
+            page = max(1, min(page, total_pages))
+            fields = self._render_page('banhistory', page)
+            
+            embed = discord.Embed(
+                title="📋 Lịch sử Ban/Unban",
+                description=f"**{history_count}** hoạt động, mới nhất trước:",
+                color=discord.Color.blue(),
+                timestamp=datetime.now()
+            )
+            
+            for name, value in fields:
+                embed.add_field(name=name, value=value, inline=False)
+            
+            embed.set_footer(text=f"Trang {page}/{total_pages} • ;banhistory <trang> để xem tiếp")
+            await ctx.reply(embed=embed, mention_author=True)
         
         @self.bot.command(name='checkban')
         async def checkban_command(ctx, user_id: str = None):
@@ -613,16 +534,9 @@ class BanCommands:
                     inline=True
                 )
                 
-                # Thông tin admin ban
-                try:
-                    banned_by = ban_info.get('banned_by')
-                    if banned_by:
-                        admin = await self.bot.fetch_user(banned_by)
-                        admin_info = f"{admin.display_name}"
-                    else:
-                        admin_info = "Unknown"
-                except:
-                    admin_info = "Unknown"
+                # Thông tin admin ban (tên lưu lúc ban, không cần fetch)
+                banned_by = ban_info.get('banned_by')
+                admin_info = self._user_label(banned_by, ban_info.get('admin_name', '')) if banned_by else "Unknown"
                 
                 embed.add_field(
                     name="👑 Ban bởi",
@@ -642,7 +556,7 @@ class BanCommands:
                         )
                     except:
                         pass
-                
+            
             else:
                 embed = discord.Embed(
                     title="✅ User không bị Ban",
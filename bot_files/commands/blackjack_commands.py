@@ -2,11 +2,11 @@ import discord
 from discord.ext import commands
 from .base import BaseCommand
 import random
-import json
-import os
 from datetime import datetime
 import logging
 from utils.shared_wallet import shared_wallet
+from utils.game_stats_store import game_stats
+from utils.game_session_manager import game_sessions, REJECT_ACTIVE, REJECT_GLOBAL_LIMIT
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +17,11 @@ class BlackjackCommands(BaseCommand):
         super().__init__(bot_instance)
         self.data_file = "blackjack_data.json"
         self.blackjack_data = self.load_blackjack_data()
-        self.active_games = {}  # Store active games
+        # Phiên game đang chơi (user_id -> state), quản lý bởi session manager
+        self.active_games = game_sessions.configure_game(
+            'blackjack', idle_timeout=300, persistent=True, on_evict=self.on_session_evicted
+        )
+        game_sessions.register_view_factory('blackjack', lambda session: BlackjackView(session.user_id, self))
         
         # Card deck
         self.suits = ["♠️", "♥️", "♦️", "♣️"]
@@ -28,23 +32,12 @@ class BlackjackCommands(BaseCommand):
         }
     
     def load_blackjack_data(self):
-        """Load dữ liệu blackjack từ file"""
-        try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return {}
-        except Exception as e:
-            logger.error(f"Lỗi khi load blackjack data: {e}")
-            return {}
+        """Load dữ liệu blackjack từ game stats store (tự migrate từ file cũ)"""
+        return game_stats.table('blackjack', legacy_file=self.data_file)
     
     def save_blackjack_data(self):
         """Lưu dữ liệu blackjack vào file"""
-        try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.blackjack_data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"Lỗi khi save blackjack data: {e}")
+        self.blackjack_data.save()
     
     def get_user_data(self, user_id):
         """Lấy dữ liệu user, tạo mới nếu chưa có"""
@@ -66,6 +59,43 @@ class BlackjackCommands(BaseCommand):
             }
         return self.blackjack_data[user_id]
     
+    @staticmethod
+    def reject_message(reason):
+        """Thông báo khi không tạo được ván theo lý do từ session manager"""
+        if reason == REJECT_ACTIVE:
+            return "❌ Bạn đang có ván blackjack chưa hoàn thành!"
+        if reason == REJECT_GLOBAL_LIMIT:
+            return "⏳ Bot đang có quá nhiều ván game đang chơi, vui lòng thử lại sau!"
+        return "⏳ Hiện có quá nhiều ván blackjack đang chơi, vui lòng thử lại sau!"
+    
+    async def on_session_evicted(self, session):
+        """Ván bị huỷ do idle: xử thua như bấm Quit (trừ tiền cược) rồi gỡ nút bấm trên tin nhắn ván"""
+        bet_amount = session.state.get('bet_amount', 0)
+        new_balance = shared_wallet.subtract_balance(session.user_id, bet_amount)
+        self.update_user_stats(session.user_id, "lose", bet_amount)
+        logger.info(f"Blackjack của user {session.user_id} bị huỷ do idle, xử thua {bet_amount:,} xu")
+        
+        if not session.channel_id or not session.message_id:
+            return
+        channel = self.bot.get_channel(session.channel_id)
+        if channel is None:
+            return
+        embed = discord.Embed(
+            title="🃏 Blackjack - Hết thời gian",
+            description=f"⌛ Ván đã bị huỷ do không hoạt động quá lâu, xử thua và mất **{bet_amount:,} xu**.",
+            color=discord.Color.dark_grey(),
+            timestamp=datetime.now()
+        )
+        embed.add_field(
+            name="💳 Số dư mới",
+            value=f"**{new_balance:,} xu**",
+            inline=False
+        )
+        try:
+            await channel.get_partial_message(session.message_id).edit(embed=embed, view=None)
+        except discord.HTTPException as e:
+            logger.warning(f"Không sửa được tin nhắn blackjack bị evict ({session.message_id}): {e}")
+    
     def create_deck(self):
         """Tạo bộ bài mới"""
         deck = []
@@ -156,7 +186,6 @@ class BlackjackCommands(BaseCommand):
     
     def register_commands(self):
         """Register blackjack commands"""
-        
         @self.bot.command(name='blackjack', aliases=['bj', 'xidach'])
         async def blackjack_game(ctx, amount=None):
             """
@@ -238,6 +267,15 @@ class BlackjackCommands(BaseCommand):
                     )
                     return
                 
+                # Kiểm tra slot trước khi tạo ván (không tính unluck cho ván không được tạo)
+                reject_reason = self.active_games.check_start(ctx.author.id)
+                if reject_reason is not None:
+                    await ctx.reply(
+                        f"{ctx.author.mention} {self.reject_message(reject_reason)}",
+                        mention_author=True
+                    )
+                    return
+                
                 # Start new game
                 deck = self.create_deck()
                 
@@ -261,13 +299,19 @@ class BlackjackCommands(BaseCommand):
                 dealer_hand = [deck.pop(), deck.pop()]
                 
                 # Store game state
-                self.active_games[ctx.author.id] = {
+                session = self.active_games.start(ctx.author.id, {
                     'deck': deck,
                     'player_hand': player_hand,
                     'dealer_hand': dealer_hand,
                     'bet_amount': bet_amount,
                     'channel_id': ctx.channel.id
-                }
+                }, channel_id=ctx.channel.id)
+                if session is None:
+                    await ctx.reply(
+                        f"{ctx.author.mention} {self.reject_message(self.active_games.check_start(ctx.author.id))}",
+                        mention_author=True
+                    )
+                    return
                 
                 player_value = self.calculate_hand_value(player_hand)
                 dealer_value = self.calculate_hand_value([dealer_hand[0]])  # Only show first card
@@ -353,7 +397,8 @@ class BlackjackCommands(BaseCommand):
                 # Create buttons view
                 view = BlackjackView(ctx.author.id, self)
                 
-                await ctx.reply(embed=embed, view=view, mention_author=True)
+                message = await ctx.reply(embed=embed, view=view, mention_author=True)
+                self.active_games.attach_view(ctx.author.id, view, message.id)
                 
             except Exception as e:
                 logger.error(f"Lỗi trong blackjack command: {e}")
@@ -431,9 +476,11 @@ class BlackjackView(discord.ui.View):
     """View chứa buttons cho blackjack game"""
     
     def __init__(self, user_id, blackjack_commands_instance):
-        super().__init__(timeout=300)  # 5 phút timeout
+        # Không timeout - idle eviction do session manager xử lý, custom_id theo phiên để gắn lại sau restart
+        super().__init__(timeout=None)
         self.user_id = user_id
         self.blackjack_commands = blackjack_commands_instance
+        game_sessions.bind_custom_ids(self, 'blackjack', user_id)
     
     @discord.ui.button(label='🃏 Hit', style=discord.ButtonStyle.primary, custom_id='hit')
     async def hit_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -444,6 +491,7 @@ class BlackjackView(discord.ui.View):
         
         if self.user_id not in self.blackjack_commands.active_games:
             await interaction.response.send_message("❌ Bạn không có ván blackjack nào đang chơi!", ephemeral=True)
+            self.stop()
             return
         
         game = self.blackjack_commands.active_games[self.user_id]
@@ -528,6 +576,7 @@ class BlackjackView(discord.ui.View):
         
         if self.user_id not in self.blackjack_commands.active_games:
             await interaction.response.send_message("❌ Bạn không có ván blackjack nào đang chơi!", ephemeral=True)
+            self.stop()
             return
         
         game = self.blackjack_commands.active_games[self.user_id]
@@ -649,6 +698,7 @@ class BlackjackView(discord.ui.View):
         
         if self.user_id not in self.blackjack_commands.active_games:
             await interaction.response.send_message("❌ Bạn không có ván blackjack nào đang chơi!", ephemeral=True)
+            self.stop()
             return
         
         game = self.blackjack_commands.active_games[self.user_id]
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+Bulk Moderation Commands - warn/mute/ban/auto delete nhiều user trong 1 lệnh
+Dùng khi raid: chọn target theo danh sách hoặc bộ lọc trên member cache
+"""
+import discord
+import re
+import logging
+from datetime import datetime
+from utils.bulk_moderation import BulkModerationEngine, select_members
+
+logger = logging.getLogger(__name__)
+
+BULK_ACTIONS = ('warn', 'mute', 'ban', 'xoa')
+MAX_BULK_TARGETS = 100
+DEFAULT_MUTE_DURATION = '10m'
+RESULT_LINES_SHOWN = 15
+
+_MENTION_PATTERN = re.compile(r'^<@!?(\d+)>$')
+
+
+class BulkModerationCommands:
+    def __init__(self, bot_instance):
+        self.bot_instance = bot_instance
+        self.bot = bot_instance.bot
+        self.engine = BulkModerationEngine(concurrency=5, min_interval=0.25, progress_interval=2.0)
+        self.setup_commands()
+    
+    def snapshot(self) -> dict:
+        """State giữ lại khi ;reload: engine đang giữ các job ban/mute hàng loạt"""
+        return {'engine': self.engine}
+    
+    def restore(self, state: dict) -> None:
+        self.engine = state['engine']
+    
+    def _parse_arguments(self, args: tuple) -> dict:
+        """
+        Tách selector và lý do từ tham số lệnh
+        
+        Selector được đọc từ đầu cho tới token đầu tiên không phải selector:
+        @user / user_id, joined:<thời gian>, name:<regex>, time:<thời gian mute>.
+        Phần còn lại là lý do.
+        """
+        parsed = {'user_ids': [], 'joined_within': None, 'name_pattern': None, 'duration': DEFAULT_MUTE_DURATION, 'reason': None}
+        index = 0
+        for index, token in enumerate(args):
+            mention = _MENTION_PATTERN.match(token)
+            if mention:
+                parsed['user_ids'].append(int(mention.group(1)))
+            elif token.isdigit() and len(token) >= 15:
+                parsed['user_ids'].append(int(token))
+            elif token.lower().startswith('joined:'):
+                parsed['joined_within'] = self.bot_instance.mute_commands._parse_duration(token[7:])
+            elif token.lower().startswith('name:'):
+                parsed['name_pattern'] = token[5:]
+            elif token.lower().startswith('time:'):
+                parsed['duration'] = token[5:]
+            else:
+                parsed['reason'] = ' '.join(args[index:])
+                break
+        return parsed
+    
+    async def _resolve_targets(self, ctx, action: str, parsed: dict) -> list:
+        """Lấy danh sách target từ user ID + bộ lọc, bỏ qua người chạy lệnh, bot và admin"""
+        exclude_ids = {ctx.author.id, self.bot.user.id}
+        if self.bot_instance.supreme_admin_id:
+            exclude_ids.add(self.bot_instance.supreme_admin_id)
+        
+        targets = {}
+        for user_id in parsed['user_ids']:
+            if user_id in exclude_ids:
+                continue
+            member = ctx.guild.get_member(user_id)
+            if member is None and action in ('warn', 'mute'):
+                continue  # warn/mute cần member trong server
+            targets[user_id] = member or discord.Object(id=user_id)
+        
+        if parsed['joined_within'] or parsed['name_pattern']:
+            # Bộ lọc cần đủ member cache
+            if not ctx.guild.chunked:
+                await ctx.guild.chunk(cache=True)
+            for member in select_members(
+                ctx.guild.members,
+                joined_within=parsed['joined_within'],
+                name_pattern=parsed['name_pattern'],
+                exclude_ids=exclude_ids,
+                limit=MAX_BULK_TARGETS + 1
+            ):
+                targets.setdefault(member.id, member)
+        
+        # Không moderation admin
+        return [
+            target for target in targets.values()
+            if not (isinstance(target, discord.Member) and self.bot_instance.has_warn_permission(target.id, target.guild_permissions))
+        ]
+    
+    def _build_progress_embed(self, action: str, done: int, total: int, results: list, finished: bool) -> discord.Embed:
+        """Embed tiến độ + kết quả từng target"""
+        success = sum(1 for result in results if result.ok)
+        failed = len(results) - success
+        embed = discord.Embed(
+            title=f"{'✅' if finished else '⏳'} Bulk {action}: {done}/{total}",
+            description=f"✅ Thành công: **{success}** • ❌ Thất bại: **{failed}**",
+            color=discord.Color.green() if finished else discord.Color.orange(),
+            timestamp=datetime.now()
+        )
+        
+        lines = [
+            f"{'✅' if result.ok else '❌'} {result.label} — {result.message}"
+            for result in results[-RESULT_LINES_SHOWN:]
+        ]
+        if lines:
+            embed.add_field(name="📋 Kết quả", value="\n".join(lines)[:1024], inline=False)
+        if len(results) > RESULT_LINES_SHOWN:
+            embed.set_footer(text=f"Hiển thị {RESULT_LINES_SHOWN} kết quả gần nhất")
+        return embed
+    
+    def _make_action(self, ctx, action: str, parsed: dict, collected_ids: list):
+        """Tạo coroutine xử lý 1 target cho engine"""
+        reason = parsed['reason'] or "Bulk moderation"
+        
+        async def warn_target(member):
+            outcome = self.bot_instance.add_warning(
+                user_id=member.id,
+                reason=reason,
+                warned_by=f"{ctx.author} ({ctx.author.id})",
+                guild_id=ctx.guild.id
+            )
+            if outcome.step is not None:
+                await self.engine.throttle()
+                penalty_status = await self.bot_instance.warn_commands._apply_escalation(ctx, member, reason, outcome.step)
+                return True, f"{outcome.points} điểm, {penalty_status}"
+            return True, f"{outcome.points} điểm"
+        
+        duration = None
+        if action == 'mute':
+            duration = self.bot_instance.mute_commands._parse_duration(parsed['duration'])
+        
+        async def mute_target(member):
+            if member.timed_out_until and member.timed_out_until > datetime.now(member.timed_out_until.tzinfo):
+                return False, "Đã bị mute rồi"
+            if ctx.author != ctx.guild.owner and member.top_role >= ctx.author.top_role:
+                return False, "Role cao hơn hoặc bằng bạn"
+            await self.engine.throttle()
+            await member.timeout(duration, reason=f"Bulk mute by {ctx.author}: {reason}")
+            return True, f"Mute {self.bot_instance.mute_commands._format_duration(duration)}"
+        
+        # ban/xoa chỉ ghi dữ liệu (không gọi API, không cần throttle) - gom ID lại và lưu 1 lần sau khi chạy xong
+        async def ban_target(target):
+            if self.bot_instance.ban_commands.is_user_banned(target.id):
+                return False, "Đã bị ban rồi"
+            collected_ids.append(target.id)
+            return True, "Ban"
+        
+        async def auto_delete_target(target):
+            if self.bot_instance.auto_delete_commands.is_user_auto_deleted(ctx.guild.id, target.id):
+                return False, "Đã bị auto delete rồi"
+            collected_ids.append(target.id)
+            return True, "Auto delete"
+        
+        return {'warn': warn_target, 'mute': mute_target, 'ban': ban_target, 'xoa': auto_delete_target}[action]
+    
+    def setup_commands(self):
+        """Thiết lập lệnh bulk moderation"""
+        
+        @self.bot.command(name='bulk', aliases=['mass'])
+        async def bulk_command(ctx, action: str = None, *args):
+            """
+            Moderation hàng loạt
+            
+            Usage:
+            ;bulk warn @a @b 123... [lý do]
+            ;bulk mute joined:10m time:1h [lý do] - Mute member vào server trong 10 phút qua
+            ;bulk ban name:^spam [lý do] - Ban khỏi bot các member có tên khớp regex
+            ;bulk xoa joined:1h name:free.*nitro - Bật auto delete
+            """
+            if ctx.guild is None:
+                await ctx.reply("❌ Lệnh này chỉ dùng trong server!", mention_author=True)
+                return
+            
+            if not action or action.lower() not in BULK_ACTIONS:
+                embed = discord.Embed(
+                    title="🛡️ Bulk Moderation",
+                    description="Warn/mute/ban/auto delete nhiều user trong 1 lệnh",
+                    color=discord.Color.blue()
+                )
+                embed.add_field(
+                    name="📝 Cách sử dụng",
+                    value=(
+                        "`;bulk warn|mute|ban|xoa <target...> [lý do]`\n"
+                        "**Target:** `@user`, `user_id`, `joined:10m`, `name:<regex>`\n"
+                        "**Mute:** `time:1h` (mặc định 10m)"
+                    ),
+                    inline=False
+                )
+                embed.add_field(
+                    name="⚠️ Lưu ý",
+                    value=f"• Tối đa {MAX_BULK_TARGETS} target/lần\n• Admin, bot và chính bạn luôn được bỏ qua\n• `ban` chỉ dành cho Supreme Admin",
+                    inline=False
+                )
+                await ctx.reply(embed=embed, mention_author=True)
+                return
+            
+            action = action.lower()
+            
+            # Kiểm tra quyền: ban bot chỉ Supreme Admin, còn lại Admin
+            if action == 'ban':
+                allowed = self.bot_instance.is_supreme_admin(ctx.author.id)
+            else:
+                allowed = self.bot_instance.has_warn_permission(ctx.author.id, ctx.author.guild_permissions)
+            if not allowed:
+                await ctx.reply(f"{ctx.author.mention} ❌ Bạn không có quyền sử dụng bulk {action}!", mention_author=True)
+                return
+            
+            try:
+                parsed = self._parse_arguments(args)
+                if action == 'mute':
+                    self.bot_instance.mute_commands._parse_duration(parsed['duration'])
+                targets = await self._resolve_targets(ctx, action, parsed)
+            except (ValueError, re.error) as e:
+                await ctx.reply(f"{ctx.author.mention} ❌ Tham số không hợp lệ: {e}", mention_author=True)
+                return
+            
+            if not targets:
+                await ctx.reply(f"{ctx.author.mention} ℹ️ Không tìm thấy target nào phù hợp!", mention_author=True)
+                return
+            if len(targets) > MAX_BULK_TARGETS:
+                await ctx.reply(
+                    f"{ctx.author.mention} ❌ Bộ lọc khớp hơn {MAX_BULK_TARGETS} user, hãy thu hẹp điều kiện!",
+                    mention_author=True
+                )
+                return
+            
+            progress_message = await ctx.reply(
+                embed=self._build_progress_embed(action, 0, len(targets), [], False),
+                mention_author=True
+            )
+            
+            async def on_progress(done, total, results):
+                await progress_message.edit(embed=self._build_progress_embed(action, done, total, results, False))
+            
+            collected_ids = []
+            results = await self.engine.run(targets, self._make_action(ctx, action, parsed, collected_ids), on_progress)
+            
+            # Lưu 1 lần cho cả lượt
+            reason = parsed['reason'] or "Bulk moderation"
+            if action == 'ban' and collected_ids:
+                self.bot_instance.ban_commands.ban_users(collected_ids, reason, ctx.author.id)
+            elif action == 'xoa' and collected_ids:
+                self.bot_instance.auto_delete_commands.add_auto_delete_users(ctx.guild.id, collected_ids, ctx.author.id, reason)
+            
+            await progress_message.edit(embed=self._build_progress_embed(action, len(results), len(targets), results, True))
+            logger.info(
+                f"Bulk {action} bởi {ctx.author} ({ctx.author.id}): "
+                f"{sum(1 for r in results if r.ok)}/{len(targets)} thành công. Lý do: {reason}"
+            )
+    
+    def register_commands(self):
+        """Đăng ký commands - được gọi từ bot chính"""
+        logger.info("Bulk moderation commands đã được đăng ký")
@@ -38,6 +38,8 @@ class ChannelPermissionCommands(BaseCommand):
             logger.info("Đã lưu channel permissions")
         except Exception as e:
             logger.error(f"Lỗi khi save channel permissions: {e}")
+        
+        self.bot_instance.refresh_auth_index()
     
     def is_channel_allowed(self, guild_id: int, channel_id: int, command_name: str = None) -> bool:
         """Kiểm tra xem channel có được phép chat không"""
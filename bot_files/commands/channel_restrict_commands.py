@@ -24,6 +24,11 @@ class ChannelRestrictCommands:
             os.makedirs(self.data_folder)
             
         self.channel_restrictions = {}  # {guild_id: {user_id: [allowed_channel_ids], 'global_restricted_users': [user_ids]}}
+        
+        # Index đã biên dịch cho check mỗi tin nhắn (cập nhật theo guild khi ;restrict thay đổi)
+        self._restricted_guilds = frozenset()  # Guild có ít nhất 1 giới hạn - guild khác bỏ qua check
+        self._channel_index = {}  # {guild_id: {user_id: frozenset(allowed_channel_ids)}}
+        self._global_index = {}  # {guild_id: frozenset(user_ids)}
         self.load_channel_restrictions()
     
     def load_channel_restrictions(self):
@@ -52,6 +57,41 @@ class ChannelRestrictCommands:
         except Exception as e:
             logger.error(f"Lỗi khi tải channel restrictions: {e}")
             self.channel_restrictions = {}
+        self.rebuild_index()
+    
+    def rebuild_index(self):
+        """Biên dịch lại index của tất cả guild"""
+        self._channel_index = {}
+        self._global_index = {}
+        for guild_id in self.channel_restrictions:
+            self._compile_guild(guild_id)
+        self._restricted_guilds = frozenset(self._channel_index) | frozenset(self._global_index)
+    
+    def _compile_guild(self, guild_id: int):
+        """Biên dịch index của 1 guild từ channel_restrictions"""
+        guild_data = self.channel_restrictions.get(guild_id, {})
+        channel_index = {
+            user_id: frozenset(allowed_channels)
+            for user_id, allowed_channels in guild_data.items() if user_id != 'global_restricted_users'
+        }
+        global_restricted = frozenset(guild_data.get('global_restricted_users', ()))
+        
+        if channel_index:
+            self._channel_index[guild_id] = channel_index
+        else:
+            self._channel_index.pop(guild_id, None)
+        if global_restricted:
+            self._global_index[guild_id] = global_restricted
+        else:
+            self._global_index.pop(guild_id, None)
+    
+    def _update_guild_index(self, guild_id: int):
+        """Cập nhật index sau khi giới hạn của 1 guild thay đổi"""
+        self._compile_guild(guild_id)
+        if guild_id in self._channel_index or guild_id in self._global_index:
+            self._restricted_guilds = self._restricted_guilds | {guild_id}
+        else:
+            self._restricted_guilds = self._restricted_guilds - {guild_id}
     
     def save_channel_restrictions(self):
         """Lưu cấu hình giới hạn channel vào file JSON"""
@@ -76,27 +116,26 @@ class ChannelRestrictCommands:
     def is_user_channel_restricted(self, guild_id: int, user_id: int, channel_id: int) -> bool:
         """Kiểm tra user có bị giới hạn channel không"""
         try:
-            # Supreme Admin không bị giới hạn
-            if user_id == self.bot_instance.supreme_admin_id:
+            # Guild không có giới hạn nào - đường nhanh cho hầu hết tin nhắn
+            if guild_id not in self._restricted_guilds:
                 return False
             
-            # Admin không bị giới hạn
-            if self.bot_instance.is_admin(user_id):
-                return False
-            
-            guild_data = self.channel_restrictions.get(guild_id, {})
-            
             # Kiểm tra user có trong danh sách bị giới hạn không
-            if user_id in guild_data:
-                allowed_channels = guild_data[user_id]
-                return channel_id not in allowed_channels
+            allowed_channels = self._channel_index.get(guild_id, {}).get(user_id)
+            if allowed_channels is not None:
+                restricted = channel_id not in allowed_channels
+            else:
+                # Kiểm tra global restriction - bị cấm chat toàn bộ server
+                restricted = user_id in self._global_index.get(guild_id, ())
+            
+            if not restricted:
+                return False  # Không bị giới hạn
             
-            # Kiểm tra global restriction
-            global_restricted = guild_data.get('global_restricted_users', [])
-            if user_id in global_restricted:
-                return True  # Bị cấm chat toàn bộ server
+            # Supreme Admin và Admin không bị giới hạn (chỉ check khi user có giới hạn)
+            if user_id == self.bot_instance.supreme_admin_id or self.bot_instance.is_admin(user_id):
+                return False
             
-            return False  # Không bị giới hạn
+            return True
             
         except Exception as e:
             logger.error(f"Lỗi kiểm tra channel restriction: {e}")
@@ -108,12 +147,14 @@ class ChannelRestrictCommands:
             self.channel_restrictions[guild_id] = {}
         
         self.channel_restrictions[guild_id][user_id] = allowed_channels
+        self._update_guild_index(guild_id)
         self.save_channel_restrictions()
     
     def remove_channel_restriction(self, guild_id: int, user_id: int):
         """Bỏ giới hạn channel cho user"""
         if guild_id in self.channel_restrictions and user_id in self.channel_restrictions[guild_id]:
             del self.channel_restrictions[guild_id][user_id]
+            self._update_guild_index(guild_id)
             self.save_channel_restrictions()
             return True
         return False
@@ -128,6 +169,7 @@ class ChannelRestrictCommands:
         
         if user_id not in self.channel_restrictions[guild_id]['global_restricted_users']:
             self.channel_restrictions[guild_id]['global_restricted_users'].append(user_id)
+            self._update_guild_index(guild_id)
             self.save_channel_restrictions()
             return True
         return False
@@ -139,6 +181,7 @@ class ChannelRestrictCommands:
             user_id in self.channel_restrictions[guild_id]['global_restricted_users']):
             
             self.channel_restrictions[guild_id]['global_restricted_users'].remove(user_id)
+            self._update_guild_index(guild_id)
             self.save_channel_restrictions()
             return True
         return False
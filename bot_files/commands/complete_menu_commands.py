@@ -182,8 +182,8 @@ class CompleteMenuCommands:
                         "**`;reload [module]`** - Reload bot modules\n"
                         "   🔄 *Ví dụ: `;reload shop` hoặc `;reload` (all)*\n\n"
                         
-                        "**`;banhistory [số]`** - Xem lịch sử ban\n"
-                        "   📚 *Ví dụ: `;banhistory 10` - 10 ban gần nhất*\n\n"
+                        "**`;banhistory [trang]`** - Xem lịch sử ban\n"
+                        "   📚 *Ví dụ: `;banhistory 2` - trang 2 (10 dòng/trang)*\n\n"
                         
                         "**`;backup sync/migrate/restore`** - Quản lý backup\n"
                         "   💾 *Sao lưu và khôi phục dữ liệu bot*"
@@ -23,6 +23,22 @@ class DMManagementCommands(BaseCommand):
         self.cleanup_task = None
         self.cleanup_started = False
     
+    def snapshot(self) -> dict:
+        """State giữ lại khi ;reload: lịch sử DM trong RAM và trạng thái task cleanup"""
+        return {'dm_history': self.dm_history, 'cleanup_started': self.cleanup_started}
+    
+    def unload(self):
+        """Dừng task cleanup của instance cũ (instance mới tự chạy lại trong restore)"""
+        if self.cleanup_task is not None:
+            self.cleanup_task.cancel()
+            self.cleanup_task = None
+        self.cleanup_started = False
+    
+    def restore(self, state: dict) -> None:
+        self.dm_history = state['dm_history']
+        if state['cleanup_started']:
+            asyncio.create_task(self.start_cleanup_task())
+    
     def load_dm_history(self):
         """Load lịch sử DM từ file"""
         try:
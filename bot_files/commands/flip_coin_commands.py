@@ -6,11 +6,11 @@ import discord
 from discord.ext import commands
 from .base import BaseCommand
 import random
-import json
-import os
 from datetime import datetime
 import logging
 from utils.shared_wallet import shared_wallet
+from utils.game_stats_store import game_stats
+from utils.game_session_manager import game_sessions
 
 logger = logging.getLogger(__name__)
 
@@ -23,26 +23,15 @@ class FlipCoinCommands(BaseCommand):
         self.flip_data = self.load_flip_data()
         
         # Tracking game đang chạy
-        self.active_games = set()  # Set chứa user_id của những user đang có game chạy
+        self.active_games = game_sessions.configure_game('flip_coin', idle_timeout=60)  # Phiên game đang chạy theo user_id
     
     def load_flip_data(self):
-        """Load dữ liệu flip coin từ file"""
-        try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return {}
-        except Exception as e:
-            logger.error(f"Lỗi khi load flip coin data: {e}")
-            return {}
+        """Load dữ liệu flip coin từ game stats store (tự migrate từ file cũ)"""
+        return game_stats.table('flip_coin', legacy_file=self.data_file)
     
     def save_flip_data(self):
         """Lưu dữ liệu flip coin vào file"""
-        try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.flip_data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"Lỗi khi save flip coin data: {e}")
+        self.flip_data.save()
     
     def is_user_playing(self, user_id: int) -> bool:
         """Kiểm tra xem user có đang chơi game không"""
@@ -50,16 +39,14 @@ class FlipCoinCommands(BaseCommand):
     
     def start_game_for_user(self, user_id: int) -> bool:
         """Bắt đầu game cho user (thêm vào active games)"""
-        if user_id in self.active_games:
+        if self.active_games.start(user_id) is None:
             return False
-        self.active_games.add(user_id)
         logger.info(f"Started flip coin game for user {user_id}. Active games: {len(self.active_games)}")
         return True
     
     def end_game_for_user(self, user_id: int) -> None:
         """Kết thúc game cho user (xóa khỏi active games)"""
-        if user_id in self.active_games:
-            self.active_games.remove(user_id)
+        if self.active_games.end(user_id) is not None:
             logger.info(f"Ended flip coin game for user {user_id}. Active games: {len(self.active_games)}")
     
     def get_user_data(self, user_id):
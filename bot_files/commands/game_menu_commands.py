@@ -4,14 +4,891 @@ import logging
 from datetime import datetime
 from .base import BaseCommand
 from .all_commands_display import create_all_commands_embed
+from .full_menu_commands import FullMenuView, get_role_values
+from utils.embed_templates import embed_templates
+from utils.game_session_manager import game_sessions
 
 logger = logging.getLogger(__name__)
 
+
+def _build_menu_home_embed() -> discord.Embed:
+    """Build embed Home của ;menu với placeholder {role}, {usage}, {time}"""
+    embed = discord.Embed(
+        title="🏠 Bot Command Center",
+        description="Chào mừng đến với menu lệnh đầy đủ của bot!",
+        color=discord.Color.gold()
+    )
+    
+    embed.add_field(
+        name="📋 Hướng Dẫn Sử Dụng",
+        value=(
+            "🎮 **Games** - Tất cả games và giải trí\n"
+            "🛡️ **Moderation** - Lệnh quản lý và kiểm duyệt\n"
+            "🛒 **Shop** - Hệ thống mua bán EXP Rare\n"
+            "🤖 **AI & Utils** - AI commands và tiện ích\n"
+            "🔄 **Reset** - Hệ thống reset dữ liệu\n"
+            "📋 **All Commands** - Tổng quan tất cả lệnh"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="👤 Quyền Của Bạn",
+        value=(
+            "**Role:** {role}\n"
+            "**Có thể dùng:** {usage}"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="💡 Lưu Ý",
+        value=(
+            "• **Prefix:** Tất cả lệnh bắt đầu bằng `;`\n"
+            "• **Rate Limit:** 1 lệnh/3s (Admin bypass)\n"
+            "• **Interactive:** Sử dụng buttons để điều hướng\n"
+            "• **Help:** Gõ `;help <lệnh>` để xem chi tiết"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="🎯 Quick Access",
+        value=(
+            "`;adminmenu` - Menu admin\n"
+            "`;gamemenu` - Menu games\n"
+            "`;shop` - Shop EXP Rare\n"
+            "`;ai <câu hỏi>` - Chat với AI"
+        ),
+        inline=False
+    )
+    
+    embed.set_footer(text="Bot Command Center • {time} • Click buttons để explore!")
+    return embed
+
+
+def _build_games_embed() -> discord.Embed:
+    """Build embed tĩnh cho nút 🎮 Games"""
+    embed = discord.Embed(
+        title="🎮 Tất cả Games",
+        description="Các trò chơi có sẵn trong bot",
+        color=discord.Color.green()
+    )
+    
+    embed.add_field(
+        name="🎯 Tài Xỉu:",
+        value=(
+            "`;taixiu tai <tiền>` - Cược tài\n"
+            "`;taixiu xiu <tiền>` - Cược xỉu\n"
+            "`;taixiu all` - Cược hết số dư\n"
+            "`;taixiustats` - Thống kê tài xỉu\n"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="✏️ Kéo Búa Bao:",
+        value=(
+            "`;rps <tiền>` - Chơi RPS\n"
+            "`;rpsstats` - Thống kê RPS\n"
+            "`;rpsleaderboard` - Top RPS\n"
+            "`;rpsmoney` - Số dư RPS"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="🎰 Slot Machine:",
+        value=(
+            "`;slot <tiền>` - Chơi slot\n"
+            "`;slotstats` - Thống kê slot\n"
+            "`;slotleaderboard` - Top slot\n"
+            "`;slotmoney` - Số dư slot"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="🃏 Blackjack:",
+        value=(
+            "`;blackjack <tiền>` - Chơi blackjack\n"
+            "`;blackjackstats` - Thống kê blackjack\n"
+            "Tương tác: Buttons (Hit/Stand/Quit)"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="🪙 Flip Coin:",
+        value=(
+            "`;flipheads/tails <tiền>` - Tung xu\n"
+            "`;flipstats` - Thống kê flip coin\n"
+            "`;flipleaderboard` - Top flip coin"
+        ),
+        inline=True
+    )
+    
+    
+    embed.add_field(
+        name="💰 Ví tiền chung:",
+        value=(
+            "`;wallet` - Xem số dư\n"
+            "`;wallet top` - Top giàu nhất\n"
+            "`;daily` - Nhận tiền hàng ngày\n"
+            "`;walletreload` - Nhận role + 100k"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="💡 Lưu ý:",
+        value=(
+            "• Tất cả games dùng chung ví tiền\n"
+            "• Số dư ban đầu: 1,000 xu\n"
+            "• Có thống kê và leaderboard\n"
+            "• Dữ liệu được lưu tự động"
+        ),
+        inline=False
+    )
+    return embed
+
+
+def _build_money_embed() -> discord.Embed:
+    """Build embed tĩnh cho nút 💰 Money Tools"""
+    embed = discord.Embed(
+        title="💰 Money Management Tools",
+        description="Các công cụ quản lý tiền tệ trong hệ thống",
+        color=discord.Color.gold()
+    )
+    
+    embed.add_field(
+        name="💳 Ví tiền chung:",
+        value=(
+            "`;wallet` - Xem số dư ví chung\n"
+            "`;wallet top` - Top người giàu nhất\n"
+            "`;walletstats` - Thống kê tiền tệ\n"
+            "`;resetallmoney` - Reset tất cả tiền (Admin)"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="🎯 Game-specific money:",
+        value=(
+            "`;taixiumoney` - Quản lý tiền tài xỉu (Admin)\n"
+            "`;givemoney @user <amount>` - Give tiền (Admin)\n"
+            "`;give @user <amount>` - Give tiền ví chung (Admin)\n"
+            "`;walletreload` - Reload wallet system (Admin)"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="🎁 Daily & Rewards:",
+        value=(
+            "`;daily` - Nhận tiền hàng ngày\n"
+            "`;dailystats` - Thống kê daily\n"
+            "`;dailytop` - Top daily\n"
+            "`;walletreload` - Nhận role Con Bạc + 100k"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="💡 Lưu ý:",
+        value=(
+            "• Tất cả games dùng chung ví tiền\n"
+            "• Admin có thể give không giới hạn\n"
+            "• Dữ liệu được đồng bộ tự động"
+        ),
+        inline=False
+    )
+    return embed
+
+
+def _build_shop_embed() -> discord.Embed:
+    """Build embed tĩnh cho nút 🛒 Shop"""
+    embed = discord.Embed(
+        title="🛒 Shop - Cửa hàng vật phẩm",
+        description="Mua sắm các vật phẩm đặc biệt với xu của bạn!",
+        color=discord.Color.gold()
+    )
+    
+    embed.add_field(
+        name="⭐ Gói EXP Rare - Cấp Cơ Bản:",
+        value=(
+            "1️⃣ **Gói EXP Rare Cơ Bản** - 100 triệu xu\n"
+            "   • Nhận được: 1,000 EXP Rare\n\n"
+            "2️⃣ **Gói EXP Rare Nâng Cao** - 200 triệu xu\n"
+            "   • Nhận được: 2,000 EXP Rare\n\n"
+            "3️⃣ **Gói EXP Rare Siêu Cấp** - 300 triệu xu\n"
+            "   • Nhận được: 3,000 EXP Rare"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="🌟 Gói EXP Rare - Cấp Cao:",
+        value=(
+            "4️⃣ **Gói EXP Rare Huyền Thoại** - 400 triệu xu\n"
+            "   • Nhận được: 4,000 EXP Rare\n\n"
+            "5️⃣ **Gói EXP Rare Vô Hạn** - 500 triệu xu\n"
+            "   • Nhận được: 5,000 EXP Rare\n\n"
+            "6️⃣ **Gói EXP Rare Thần Thánh** - 600 triệu xu\n"
+            "   • Nhận được: 6,000 EXP Rare"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="💫 Gói EXP Rare - Cấp Tối Thượng:",
+        value=(
+            "7️⃣ **Gói EXP Rare Vũ Trụ** - 700 triệu xu\n"
+            "   • Nhận được: 7,000 EXP Rare\n\n"
+            "8️⃣ **Gói EXP Rare Siêu Sao** - 800 triệu xu\n"
+            "   • Nhận được: 8,000 EXP Rare\n\n"
+            "9️⃣ **Gói EXP Rare Đỉnh Cao** - 900 triệu xu\n"
+            "   • Nhận được: 9,000 EXP Rare\n\n"
+            "🔟 **Gói EXP Rare Tối Thượng** - 1 tỷ xu\n"
+            "   • Nhận được: 10,000 EXP Rare"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="🛍️ Cách mua:",
+        value=(
+            "**Đã có thể sử dụng!** ✅\n"
+            "Hệ thống shop EXP Rare đã hoạt động.\n"
+            "Các lệnh có sẵn:\n"
+            "• ;` - Xem shop EXP Rare\n"
+            "• ; exp <số>` - Mua gói EXP (1-10)\n"
+            "• ;` - Xem số EXP Rare hiện có\n"
+            "• ;` - Hoàn thành đơn hàng (Admin)"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="💡 Lưu ý quan trọng:",
+        value=(
+            "• **Giá tính bằng triệu xu** (100 triệu = 100,000,000 xu)\n"
+            "• **EXP Rare** dùng để nâng cấp nhân vật/kỹ năng\n"
+            "• **Tỷ lệ 1:1** - 1 triệu xu = 10 EXP Rare\n"
+            "• **Gói càng cao** càng có giá trị tốt hơn\n"
+            "• **Không thể hoàn trả** sau khi mua\n"
+            "• Liên hệ admin nếu có vấn đề"
+        ),
+        inline=False
+    )
+    
+    embed.set_footer(
+        text="EXP Rare Shop • 10 gói từ 100 triệu đến 1 tỷ xu • Đã hoạt động!",
+        icon_url="{user_avatar}"
+    )
+    return embed
+
+
+def _build_stats_embed() -> discord.Embed:
+    """Build embed tĩnh cho nút 📊 Thống Kê"""
+    embed = discord.Embed(
+        title="📊 Thống Kê Game",
+        description="Xem thống kê tất cả các trò chơi",
+        color=discord.Color.purple()
+    )
+    
+    
+    embed.add_field(
+        name="✏️ Kéo Búa Bao:",
+        value=(
+            "`;rpsstats` - Thống kê RPS\n"
+            "`;rpsmoney` - Số dư RPS\n"
+            "`;rpsleaderboard` - Top RPS"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="🎰 Slot Machine:",
+        value=(
+            "`;slotstats` - Thống kê slot\n"
+            "`;slotmoney` - Số dư slot\n"
+            "`;slotleaderboard` - Top slot"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="🃏 Blackjack:",
+        value=(
+            "`;blackjackstats` - Xem thống kê blackjack\n"
+            "Tương tác: Buttons (Hit/Stand/Quit)"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="🎯 Tài Xỉu:",
+        value=(
+            "`;taixiustats` - Thống kê tài xỉu\n"
+            "`;taixiumoney` - Số dư tài xỉu"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="🪙 Flip Coin:",
+        value=(
+            "`;flipstats` - Thống kê flip coin\n"
+            "`;flipleaderboard` - Top flip coin"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="💳 Ví tiền:",
+        value=(
+            "`;wallet` - Xem số dư ví chung\n"
+            "`;daily` - Nhận tiền hàng ngày\n"
+            "`;walletreload` - Nhận role + 100k"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="👑 Admin Panel:",
+        value=(
+            "`;backup` - Hướng dẫn backup\n"
+            "`;admin list` - Danh sách admin\n"
+            "`;help` - Hướng dẫn tổng quát\n"
+            "`;status` - Trạng thái bot"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="⚙️ System Tools:",
+        value=(
+            "`;help` - Hướng dẫn\n"
+            "`;status` - Trạng thái bot\n"
+            "`;feedback` - Góp ý"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="💡 Mẹo:",
+        value=(
+            "• Chơi có trách nhiệm\n"
+            "• Đặt cược hợp lý\n"
+            "• Theo dõi thống kê\n"
+            "• Tham gia leaderboard"
+        ),
+        inline=False
+    )
+    return embed
+
+
+def _build_moderation_embed() -> discord.Embed:
+    """Build embed tĩnh cho nút 🛡️ Moderation"""
+    embed = discord.Embed(
+        title="🛡️ Moderation Tools - Công cụ kiểm duyệt",
+        description="Tất cả hệ thống moderation dành cho Admin",
+        color=discord.Color.red()
+    )
+    
+    embed.add_field(
+        name="🔒 Channel Restriction System",
+        value=(
+            "; add @user #channel1 #channel2` - Giới hạn user theo channels\n"
+            "; remove @user` - Bỏ giới hạn channel\n"
+            "; ban @user` - Cấm chat toàn server\n"
+            "; unban @user` - Bỏ cấm chat toàn server\n"
+            "; list` - Xem danh sách bị giới hạn\n"
+            "; check @user` - Kiểm tra trạng thái user"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="🚫 Ban System",
+        value=(
+            "; <user_id> [lý do]` - Cấm user sử dụng bot (Supreme Admin)\n"
+            "; <user_id> [lý do]` - Bỏ cấm user (Supreme Admin)\n"
+            ";` - Xem danh sách user bị cấm\n"
+            "; [số]` - Lịch sử ban/unban (Supreme Admin)\n"
+            "; <user_id>` - Kiểm tra trạng thái ban"
+        ),
+        inline=False
+    )
+    
+    # Fire Delete System đã bị vô hiệu hóa
+    # embed.add_field(
+    #     name="🔥 Fire Delete System",
+    #     value=(
+    #         "; on` - Bật fire delete cho server\n"
+    #         "; off` - Tắt fire delete cho server\n"
+    #         "; status` - Xem trạng thái fire delete\n"
+    #         "; history [số]` - Lịch sử xóa tin nhắn (Supreme Admin)\n"
+    #         "**React emoji 🔥 vào tin nhắn để xóa**"
+    #     ),
+    #     inline=False
+    # )
+    
+    embed.add_field(
+        name="⚡ Auto Delete System",
+        value=(
+            "; on @user [lý do]` - Bật auto delete cho user\n"
+            "; off @user [lý do]` - Tắt auto delete cho user\n"
+            "; list` - Xem danh sách user bị auto delete\n"
+            "; history [số]` - Lịch sử auto delete (Supreme Admin)\n"
+            "**Tự động xóa TẤT CẢ tin nhắn của user**"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="⚠️ Warning System",
+        value=(
+            "; @user <lý do>` - Cảnh báo user\n"
+            "; @user` - Xem cảnh báo của user\n"
+            "; @user` - Xóa cảnh báo\n"
+            ";` - Xem tất cả cảnh báo"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="🔇 Mute System",
+        value=(
+            "; @user <thời gian> [lý do]` - Mute user\n"
+            "; @user` - Unmute user\n"
+            ";` - Xem danh sách bị mute"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="🔧 System Tools",
+        value=(
+            ";` - Kiểm tra quyền bot (QUAN TRỌNG!)\n"
+            ";` - Menu admin text đầy đủ\n"
+            "; sync` - Backup dữ liệu lên GitHub"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="👤 Quyền của bạn",
+        value="{user_role}",
+        inline=False
+    )
+    
+    embed.add_field(
+        name="💡 Lưu ý quan trọng",
+        value=(
+            "• **Supreme Admin**: Không bao giờ bị ảnh hưởng bởi bất kỳ hệ thống nào\n"
+            "• **Admin**: Không bị Auto Delete, Fire Delete, Channel Restriction\n"
+            "• **Bot cần quyền 'Manage Messages'** để xóa tin nhắn"
+        ),
+        inline=False
+    )
+    
+    embed.set_footer(
+        text="Moderation Tools • 6 hệ thống kiểm duyệt • {user_name}",
+        icon_url="{user_avatar}"
+    )
+    return embed
+
+
+def _build_media_embed() -> discord.Embed:
+    """Build embed tĩnh cho nút 🎵 Media"""
+    embed = discord.Embed(
+        title="🎵 Media & Entertainment",
+        description="Các tính năng giải trí và media",
+        color=discord.Color.purple()
+    )
+    
+    embed.add_field(
+        name="🎵 Âm nhạc:",
+        value=(
+            ";` - Spotify tools\n"
+            ";` - Dừng nhạc\n"
+            ";` - Bot join voice channel"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="📺 Video & Media:",
+        value=(
+            ";` - Quản lý video\n"
+            ";` - Danh sách video\n"
+            "; <link>` - Download TikTok\n"
+            ";` - Preview content"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="😀 Emoji & Fun:",
+        value=(
+            ";` - Emoji management\n"
+            ";` - Xem bio user\n"
+            ";` - Tạo nhóm chat"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="💬 Communication:",
+        value=(
+            ";` - Direct message tools\n"
+            ";/cleanupdms` - Quản lý DM\n"
+            ";` - Hệ thống feedback\n"
+            ";` - Thông báo\n"
+            ";` - Chat room"
+        ),
+        inline=False
+    )
+    return embed
+
+
+def _build_ai_info_embed() -> discord.Embed:
+    """Build embed tĩnh cho nút 🤖 AI & Info"""
+    embed = discord.Embed(
+        title="🤖 AI & Information Tools", 
+        description="Trí tuệ nhân tạo và thông tin hệ thống",
+        color=discord.Color.green()
+    )
+    
+    embed.add_field(
+        name="🤖 AI Assistant:",
+        value=(
+            "; <câu hỏi>` - Hỏi AI\n"
+            ";` - Trạng thái AI\n"
+            ";` - Chuyển API AI"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="📊 Bot Information:",
+        value=(
+            ";` - Trạng thái bot\n"
+            ";` - Thông tin bot\n"
+            ";` - Hướng dẫn\n"
+            ";` - Debug info"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="🌐 Network & API:",
+        value=(
+            ";` - Kiểm tra ping\n"
+            ";` - Thống kê mạng\n"
+            ";` - Trạng thái API"
+        ),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="⚙️ System Tools:",
+        value=(
+            ";` - Bảo trì\n"
+            ";` - Cấu hình amen\n"
+            ";` - Cấu hình Git\n"
+            ";` - Test commands"
+        ),
+        inline=False
+    )
+    return embed
+
+
+def _build_system_embed() -> discord.Embed:
+    """Build embed tĩnh cho nút ⚙️ System"""
+    embed = discord.Embed(
+        title="⚙️ System & Channel Tools", 
+        description="Công cụ hệ thống và quản lý kênh",
+        color=discord.Color.dark_grey()
+    )
+    
+    embed.add_field(
+        name="🏠 Channel Management:",
+        value=(
+            ";` - Đóng kênh\n"
+            ";` - Mở kênh\n"
+            ";` - Thiết lập quyền kênh\n"
+            ";` - Xóa quyền kênh\n"
+            ";` - Danh sách kênh\n"
+            ";` - Reset quyền kênh"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="🔧 VIP Management:",
+        value=(
+            ";/viplistChannels` - Danh sách VIP\n"
+            ";/vipsendFile` - VIP send tools\n"
+            ";/vipsetupTemplate` - VIP setup\n"
+            ";/vipdelete/vippurge` - VIP utilities\n"
+            ";` - VIP direct message\n"
+            ";/vipdeleteChannel` - VIP channels\n"
+            ";/vipdeleteCategory` - VIP categories\n"
+            ";/vipgiveRole` - VIP roles"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="💡 Lưu ý:",
+        value=(
+            "• VIP commands chỉ dành cho VIP users\n"
+            "• Channel commands cần quyền admin\n"
+            "• Sử dụng ; <command>` để xem chi tiết"
+        ),
+        inline=False
+    )
+    return embed
+
+
+def _build_play_blackjack_embed() -> discord.Embed:
+    """Build embed tĩnh cho nút 🃏 Blackjack"""
+    embed = discord.Embed(
+        title="🃏 Blackjack",
+        description="Trò chơi bài 21 điểm kinh điển!",
+        color=discord.Color.dark_gold()
+    )
+    
+    embed.add_field(
+        name="📋 Cách chơi:",
+        value=(
+            "**; <số tiền>`** hoặc **; <số tiền>`**\n"
+            "; 100` - Đặt cược 100 xu\n"
+            "; 500` - Đặt cược 500 xu"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="💰 Tỷ lệ thắng:",
+        value=(
+            "🃏 **Blackjack**: x2.5\n"
+            "✅ **Thắng**: x2\n"
+            "🤝 **Hòa**: Hoàn tiền"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="📊 Commands:",
+        value=(
+            ";` - Xem thống kê cá nhân\n"
+            ";` - Bảng xếp hạng"
+        ),
+        inline=False
+    )
+    return embed
+
+
+def _build_admin_menu_embed() -> discord.Embed:
+    """Build embed tĩnh cho nút 👑 Admin Menu"""
+    embed = discord.Embed(
+        title="👑 Admin Menu - Tất cả lệnh Admin",
+        description="Danh sách đầy đủ tất cả lệnh dành cho Admin",
+        color=discord.Color.gold()
+    )
+    
+    embed.add_field(
+        name="🔒 Channel Restriction System",
+        value=(
+            "; add @user #channel1 #channel2` - Giới hạn user theo channels\n"
+            "; remove @user` - Bỏ giới hạn channel\n"
+            "; ban @user` - Cấm chat toàn server\n"
+            "; unban @user` - Bỏ cấm chat toàn server\n"
+            "; list` - Xem danh sách bị giới hạn\n"
+            "; check @user` - Kiểm tra trạng thái user"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="🚫 Ban System",
+        value=(
+            "; <user_id> [lý do]` - Cấm user sử dụng bot (Supreme Admin)\n"
+            "; <user_id> [lý do]` - Bỏ cấm user (Supreme Admin)\n"
+            ";` - Xem danh sách user bị cấm\n"
+            "; [số]` - Lịch sử ban/unban (Supreme Admin)\n"
+            "; <user_id>` - Kiểm tra trạng thái ban"
+        ),
+        inline=False
+    )
+    
+    # Fire Delete System đã bị vô hiệu hóa
+    # embed.add_field(
+    #     name="🔥 Fire Delete System",
+    #     value=(
+    #         "; on` - Bật fire delete cho server\n"
+    #         "; off` - Tắt fire delete cho server\n"
+    #         "; status` - Xem trạng thái fire delete\n"
+    #         "; history [số]` - Lịch sử xóa tin nhắn (Supreme Admin)\n"
+    #         "**React emoji 🔥 vào tin nhắn để xóa**"
+    #     ),
+    #     inline=False
+    # )
+    
+    embed.add_field(
+        name="⚡ Auto Delete System",
+        value=(
+            "; on @user [lý do]` - Bật auto delete cho user\n"
+            "; off @user [lý do]` - Tắt auto delete cho user\n"
+            "; list` - Xem danh sách user bị auto delete\n"
+            "; history [số]` - Lịch sử auto delete (Supreme Admin)\n"
+            "**Tự động xóa TẤT CẢ tin nhắn của user**"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="⚠️ Warning System",
+        value=(
+            "; @user <lý do>` - Cảnh báo user\n"
+            "; @user` - Xem cảnh báo của user\n"
+            "; @user` - Xóa cảnh báo\n"
+            ";` - Xem tất cả cảnh báo"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="🔇 Mute System",
+        value=(
+            "; @user <thời gian> [lý do]` - Mute user\n"
+            "; @user` - Unmute user\n"
+            ";` - Xem danh sách bị mute"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="📦 Backup & Data Management",
+        value=(
+            "; sync` - Đồng bộ với GitHub (backup trước)\n"
+            "; pull` - Tải code mới từ GitHub\n"
+            "; restore` - Khôi phục dữ liệu từ GitHub\n"
+            "; migrate` - Di chuyển dữ liệu vào data/\n"
+            "; status` - Kiểm tra trạng thái Git\n"
+            "; config` - Xem cấu hình GitHub"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="🔧 System & Permissions",
+        value=(
+            ";` - Kiểm tra quyền bot (QUAN TRỌNG!)\n"
+            ";` - Thông tin bot và server\n"
+            ";` - Kiểm tra độ trễ bot\n"
+            ";` - Menu admin đầy đủ (text)"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="🎮 Admin Game Commands",
+        value=(
+            "; add/remove @user <số tiền>` - Quản lý tiền tài xỉu\n"
+            ";` - Cấp role và tiền cho user\n"
+            "; add/remove @user <số tiền>` - Quản lý ví chung"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="👤 Quyền của bạn",
+        value="{user_role}\n{permissions_note}",
+        inline=False
+    )
+    
+    embed.add_field(
+        name="🎯 Lệnh quan trọng nhất",
+        value=(
+            "**;`** - Kiểm tra quyền bot nếu Auto Delete không hoạt động\n"
+            "**;`** - Quản lý chat của users\n"
+            "**;`** - Menu text đầy đủ hơn"
+        ),
+        inline=False
+    )
+    
+    embed.add_field(
+        name="💡 Lưu ý",
+        value=(
+            "• **Supreme Admin**: Không bao giờ bị giới hạn bởi bất kỳ hệ thống nào\n"
+            "• **Admin**: Không bị Auto Delete, Fire Delete, Channel Restriction\n"
+            "• **Bot cần quyền 'Manage Messages'** để các tính năng xóa tin nhắn hoạt động"
+        ),
+        inline=False
+    )
+    
+    embed.set_footer(
+        text=f"Admin Menu • {len([f for f in embed.fields if f.name.endswith('System')])} hệ thống moderation • Requested by {{user_name}}",
+        icon_url="{user_avatar}"
+    )
+    return embed
+
+
+# Build sẵn embed tĩnh của menu 1 lần khi load module
+embed_templates.register('menu.home', _build_menu_home_embed)
+embed_templates.register('gamemenu.games', _build_games_embed, timestamp=False)
+embed_templates.register('gamemenu.money', _build_money_embed, timestamp=False)
+embed_templates.register('gamemenu.shop', _build_shop_embed, timestamp=False)
+embed_templates.register('gamemenu.stats', _build_stats_embed, timestamp=False)
+embed_templates.register('gamemenu.moderation', _build_moderation_embed, timestamp=False)
+embed_templates.register('gamemenu.media', _build_media_embed, timestamp=False)
+embed_templates.register('gamemenu.ai_info', _build_ai_info_embed, timestamp=False)
+embed_templates.register('gamemenu.system', _build_system_embed, timestamp=False)
+embed_templates.register('gamemenu.play_blackjack', _build_play_blackjack_embed, timestamp=False)
+embed_templates.register('gamemenu.admin_menu', _build_admin_menu_embed, timestamp=False)
+
+
 class GameMenuCommands(BaseCommand):
     """Class chứa lệnh game menu với buttons"""
     
     def __init__(self, bot_instance):
         super().__init__(bot_instance)
+        self._menu_view = None  # FullMenuView persistent dùng chung cho mọi tin nhắn menu
+    
+    def get_menu_view(self):
+        """Lấy menu view dùng chung (tạo và đăng ký persistent lần đầu)"""
+        if self._menu_view is None:
+            self._menu_view = FullMenuView(self.bot_instance)
+            self.bot.add_view(self._menu_view)
+        return self._menu_view
+    
+    def snapshot(self) -> dict:
+        """State giữ lại khi ;reload: menu view đang đăng ký (để thay bằng view của class mới)"""
+        return {'menu_view': self._menu_view}
+    
+    def restore(self, state: dict) -> None:
+        old_view = state['menu_view']
+        if old_view is not None and (old_view is not self._menu_view or old_view.is_finished()):
+            old_view.stop()  # Gỡ view cũ khỏi view store trước khi đăng ký view mới cùng custom_id
+            self._menu_view = None
+            self.get_menu_view()
+    
+    def register_persistent_views(self):
+        """
+        Đăng ký persistent views để buttons cũ vẫn hoạt động sau restart:
+        menu dùng chung và các ván game đang chơi dở (blackjack...)
+        """
+        self.get_menu_view()
+        game_sessions.restore_views(self.bot)
+    
+    def stop_sessions(self):
+        """Dừng session manager và lưu các phiên game persistent"""
+        game_sessions.stop()
         
     def register_commands(self):
         """Register game menu commands"""
@@ -20,68 +897,48 @@ class GameMenuCommands(BaseCommand):
         async def menu_command(ctx):
             """Menu đầy đủ với tất cả lệnh của bot - Interactive buttons"""
             try:
-                # Import FullMenuView từ full_menu_commands
-                from commands.full_menu_commands import FullMenuView
-                
-                embed = discord.Embed(
-                    title="🏠 Bot Command Center",
-                    description="Chào mừng đến với menu lệnh đầy đủ của bot!",
-                    color=discord.Color.gold(),
-                    timestamp=datetime.now()
-                )
-                
-                embed.add_field(
-                    name="📋 Hướng Dẫn Sử Dụng",
-                    value=(
-                        "🎮 **Games** - Tất cả games và giải trí\n"
-                        "🛡️ **Moderation** - Lệnh quản lý và kiểm duyệt\n"
-                        "🛒 **Shop** - Hệ thống mua bán EXP Rare\n"
-                        "🤖 **AI & Utils** - AI commands và tiện ích\n"
-                        "🔄 **Reset** - Hệ thống reset dữ liệu\n"
-                        "📋 **All Commands** - Tổng quan tất cả lệnh"
-                    ),
-                    inline=False
+                embed = embed_templates.render(
+                    'menu.home',
+                    time=datetime.now().strftime('%H:%M'),
+                    **get_role_values(self.bot_instance, ctx.author.id)
                 )
                 
-                embed.add_field(
-                    name="👤 Quyền Của Bạn",
-                    value=(
-                        f"**Role:** {'👑 Supreme Admin' if self.bot_instance.is_supreme_admin(ctx.author.id) else '🛡️ Admin' if self.bot_instance.is_admin(ctx.author.id) else '👥 User'}\n"
-                        f"**Có thể dùng:** {'Tất cả lệnh' if self.bot_instance.is_supreme_admin(ctx.author.id) else 'Hầu hết lệnh' if self.bot_instance.is_admin(ctx.author.id) else 'Lệnh cơ bản'}"
-                    ),
-                    inline=True
-                )
+                view = self.get_menu_view()
+                await ctx.reply(embed=embed, view=view, mention_author=True)
                 
+            except Exception as e:
+                logger.error(f"Lỗi trong menu command: {e}")
+                await ctx.reply(f"❌ Có lỗi xảy ra: {str(e)}", mention_author=True)
+        
+        @self.bot.command(name='gamesessions', aliases=['sessions'])
+        async def game_sessions_command(ctx):
+            """Xem số phiên game đang chạy và RAM theo từng game (Admin)"""
+            if not self.bot_instance.is_admin(ctx.author.id):
+                await ctx.reply("❌ Chỉ Admin mới có thể xem game sessions!", mention_author=True)
+                return
+            
+            stats = game_sessions.get_stats()
+            embed = discord.Embed(
+                title="🎮 Game Sessions",
+                description=f"**Đang chạy:** {stats['total_sessions']}/{stats['max_sessions']} phiên",
+                color=discord.Color.blue(),
+                timestamp=datetime.now()
+            )
+            
+            for game, game_stats in stats['games'].items():
                 embed.add_field(
-                    name="💡 Lưu Ý",
+                    name=f"🎲 {game}",
                     value=(
-                        "• **Prefix:** Tất cả lệnh bắt đầu bằng `;`\n"
-                        "• **Rate Limit:** 1 lệnh/3s (Admin bypass)\n"
-                        "• **Interactive:** Sử dụng buttons để điều hướng\n"
-                        "• **Help:** Gõ `;help <lệnh>` để xem chi tiết"
+                        f"Phiên: **{game_stats['sessions']}**\n"
+                        f"RAM: **{game_stats['memory_bytes'] / 1024:.1f} KB**\n"
+                        f"Idle timeout: {game_stats['idle_timeout']}s"
+                        f"{' • persistent' if game_stats['persistent'] else ''}"
                     ),
                     inline=True
                 )
-                
-                embed.add_field(
-                    name="🎯 Quick Access",
-                    value=(
-                        "`;adminmenu` - Menu admin\n"
-                        "`;gamemenu` - Menu games\n"
-                        "`;shop` - Shop EXP Rare\n"
-                        "`;ai <câu hỏi>` - Chat với AI"
-                    ),
-                    inline=False
-                )
-                
-                embed.set_footer(text=f"Bot Command Center • {datetime.now().strftime('%H:%M')} • Click buttons để explore!")
-                
-                view = FullMenuView(self.bot_instance)
-                await ctx.reply(embed=embed, view=view, mention_author=True)
-                
-            except Exception as e:
-                logger.error(f"Lỗi trong menu command: {e}")
-                await ctx.reply(f"❌ Có lỗi xảy ra: {str(e)}", mention_author=True)
+            
+            embed.set_footer(text=f"Evicted: {stats['evicted']} • Bị từ chối (hết slot): {stats['rejected']}")
+            await ctx.reply(embed=embed, mention_author=True)
         
         @self.bot.command(name='gamemenu')
         async def game_menu_command(ctx):
@@ -128,87 +985,7 @@ class GameMenuView(discord.ui.View):
     async def games_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Button cho tất cả Games"""
         try:
-            embed = discord.Embed(
-                title="🎮 Tất cả Games",
-                description="Các trò chơi có sẵn trong bot",
-                color=discord.Color.green()
-            )
-            
-            embed.add_field(
-                name="🎯 Tài Xỉu:",
-                value=(
-                    "`;taixiu tai <tiền>` - Cược tài\n"
-                    "`;taixiu xiu <tiền>` - Cược xỉu\n"
-                    "`;taixiu all` - Cược hết số dư\n"
-                    "`;taixiustats` - Thống kê tài xỉu\n"
-                ),
-                inline=True
-            )
-            
-            embed.add_field(
-                name="✏️ Kéo Búa Bao:",
-                value=(
-                    "`;rps <tiền>` - Chơi RPS\n"
-                    "`;rpsstats` - Thống kê RPS\n"
-                    "`;rpsleaderboard` - Top RPS\n"
-                    "`;rpsmoney` - Số dư RPS"
-                ),
-                inline=True
-            )
-            
-            embed.add_field(
-                name="🎰 Slot Machine:",
-                value=(
-                    "`;slot <tiền>` - Chơi slot\n"
-                    "`;slotstats` - Thống kê slot\n"
-                    "`;slotleaderboard` - Top slot\n"
-                    "`;slotmoney` - Số dư slot"
-                ),
-                inline=True
-            )
-            
-            embed.add_field(
-                name="🃏 Blackjack:",
-                value=(
-                    "`;blackjack <tiền>` - Chơi blackjack\n"
-                    "`;blackjackstats` - Thống kê blackjack\n"
-                    "Tương tác: Buttons (Hit/Stand/Quit)"
-                ),
-                inline=True
-            )
-            
-            embed.add_field(
-                name="🪙 Flip Coin:",
-                value=(
-                    "`;flipheads/tails <tiền>` - Tung xu\n"
-                    "`;flipstats` - Thống kê flip coin\n"
-                    "`;flipleaderboard` - Top flip coin"
-                ),
-                inline=True
-            )
-            
-            
-            embed.add_field(
-                name="💰 Ví tiền chung:",
-                value=(
-                    "`;wallet` - Xem số dư\n"
-                    "`;wallet top` - Top giàu nhất\n"
-                    "`;daily` - Nhận tiền hàng ngày\n"
-                    "`;walletreload` - Nhận role + 100k"
-                ),
-                inline=True
-            )
-            
-            embed.add_field(
-                name="💡 Lưu ý:",
-                value=(
-                    "• Tất cả games dùng chung ví tiền\n"
-                    "• Số dư ban đầu: 1,000 xu\n"
-                    "• Có thống kê và leaderboard\n"
-                    "• Dữ liệu được lưu tự động"
-                ),
-                inline=False
-            )
+            embed = embed_templates.render('gamemenu.games')
             
             # Tạo view với buttons để chơi game
             game_view = GamePlayView(self.bot_instance)
@@ -227,54 +1004,7 @@ class GameMenuView(discord.ui.View):
     async def money_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Button cho Money Management Tools"""
         try:
-            embed = discord.Embed(
-                title="💰 Money Management Tools",
-                description="Các công cụ quản lý tiền tệ trong hệ thống",
-                color=discord.Color.gold()
-            )
-            
-            embed.add_field(
-                name="💳 Ví tiền chung:",
-                value=(
-                    "`;wallet` - Xem số dư ví chung\n"
-                    "`;wallet top` - Top người giàu nhất\n"
-                    "`;walletstats` - Thống kê tiền tệ\n"
-                    "`;resetallmoney` - Reset tất cả tiền (Admin)"
-                ),
-                inline=False
-            )
-            
-            embed.add_field(
-                name="🎯 Game-specific money:",
-                value=(
-                    "`;taixiumoney` - Quản lý tiền tài xỉu (Admin)\n"
-                    "`;givemoney @user <amount>` - Give tiền (Admin)\n"
-                    "`;give @user <amount>` - Give tiền ví chung (Admin)\n"
-                    "`;walletreload` - Reload wallet system (Admin)"
-                ),
-                inline=False
-            )
-            
-            embed.add_field(
-                name="🎁 Daily & Rewards:",
-                value=(
-                    "`;daily` - Nhận tiền hàng ngày\n"
-                    "`;dailystats` - Thống kê daily\n"
-                    "`;dailytop` - Top daily\n"
-                    "`;walletreload` - Nhận role Con Bạc + 100k"
-                ),
-                inline=False
-            )
-            
-            embed.add_field(
-                name="💡 Lưu ý:",
-                value=(
-                    "• Tất cả games dùng chung ví tiền\n"
-                    "• Admin có thể give không giới hạn\n"
-                    "• Dữ liệu được đồng bộ tự động"
-                ),
-                inline=False
-            )
+            embed = embed_templates.render('gamemenu.money')
             
             await interaction.response.send_message(embed=embed, ephemeral=True)
         except Exception as e:
@@ -290,83 +1020,9 @@ class GameMenuView(discord.ui.View):
     async def shop_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Button cho Shop - Cửa hàng vật phẩm"""
         try:
-            embed = discord.Embed(
-                title="🛒 Shop - Cửa hàng vật phẩm",
-                description="Mua sắm các vật phẩm đặc biệt với xu của bạn!",
-                color=discord.Color.gold()
-            )
-            
-            embed.add_field(
-                name="⭐ Gói EXP Rare - Cấp Cơ Bản:",
-                value=(
-                    "1️⃣ **Gói EXP Rare Cơ Bản** - 100 triệu xu\n"
-                    "   • Nhận được: 1,000 EXP Rare\n\n"
-                    "2️⃣ **Gói EXP Rare Nâng Cao** - 200 triệu xu\n"
-                    "   • Nhận được: 2,000 EXP Rare\n\n"
-                    "3️⃣ **Gói EXP Rare Siêu Cấp** - 300 triệu xu\n"
-                    "   • Nhận được: 3,000 EXP Rare"
-                ),
-                inline=True
-            )
-            
-            embed.add_field(
-                name="🌟 Gói EXP Rare - Cấp Cao:",
-                value=(
-                    "4️⃣ **Gói EXP Rare Huyền Thoại** - 400 triệu xu\n"
-                    "   • Nhận được: 4,000 EXP Rare\n\n"
-                    "5️⃣ **Gói EXP Rare Vô Hạn** - 500 triệu xu\n"
-                    "   • Nhận được: 5,000 EXP Rare\n\n"
-                    "6️⃣ **Gói EXP Rare Thần Thánh** - 600 triệu xu\n"
-                    "   • Nhận được: 6,000 EXP Rare"
-                ),
-                inline=True
-            )
-            
-            embed.add_field(
-                name="💫 Gói EXP Rare - Cấp Tối Thượng:",
-                value=(
-                    "7️⃣ **Gói EXP Rare Vũ Trụ** - 700 triệu xu\n"
-                    "   • Nhận được: 7,000 EXP Rare\n\n"
-                    "8️⃣ **Gói EXP Rare Siêu Sao** - 800 triệu xu\n"
-                    "   • Nhận được: 8,000 EXP Rare\n\n"
-                    "9️⃣ **Gói EXP Rare Đỉnh Cao** - 900 triệu xu\n"
-                    "   • Nhận được: 9,000 EXP Rare\n\n"
-                    "🔟 **Gói EXP Rare Tối Thượng** - 1 tỷ xu\n"
-                    "   • Nhận được: 10,000 EXP Rare"
-                ),
-                inline=False
-            )
-            
-            embed.add_field(
-                name="🛍️ Cách mua:",
-                value=(
-                    "**Đã có thể sử dụng!** ✅\n"
-                    "Hệ thống shop EXP Rare đã hoạt động.\n"
-                    "Các lệnh có sẵn:\n"
-                    "• ;` - Xem shop EXP Rare\n"
-                    "• ; exp <số>` - Mua gói EXP (1-10)\n"
-                    "• ;` - Xem số EXP Rare hiện có\n"
-                    "• ;` - Hoàn thành đơn hàng (Admin)"
-                ),
-                inline=False
-            )
-            
-            embed.add_field(
-                name="💡 Lưu ý quan trọng:",
-                value=(
-                    "• **Giá tính bằng triệu xu** (100 triệu = 100,000,000 xu)\n"
-                    "• **EXP Rare** dùng để nâng cấp nhân vật/kỹ năng\n"
-                    "• **Tỷ lệ 1:1** - 1 triệu xu = 10 EXP Rare\n"
-                    "• **Gói càng cao** càng có giá trị tốt hơn\n"
-                    "• **Không thể hoàn trả** sau khi mua\n"
-                    "• Liên hệ admin nếu có vấn đề"
-                ),
-                inline=False
-            )
-            
-            embed.set_footer(
-                text="EXP Rare Shop • 10 gói từ 100 triệu đến 1 tỷ xu • Đã hoạt động!",
-                icon_url=interaction.user.display_avatar.url
+            embed = embed_templates.render(
+                'gamemenu.shop',
+                user_avatar=interaction.user.display_avatar.url
             )
             
             await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -383,101 +1039,7 @@ class GameMenuView(discord.ui.View):
     @discord.ui.button(label='📊 Thống Kê', style=discord.ButtonStyle.danger, custom_id='stats')
     async def stats_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Button cho thống kê tổng hợp"""
-        embed = discord.Embed(
-            title="📊 Thống Kê Game",
-            description="Xem thống kê tất cả các trò chơi",
-            color=discord.Color.purple()
-        )
-        
-        
-        embed.add_field(
-            name="✏️ Kéo Búa Bao:",
-            value=(
-                "`;rpsstats` - Thống kê RPS\n"
-                "`;rpsmoney` - Số dư RPS\n"
-                "`;rpsleaderboard` - Top RPS"
-            ),
-            inline=True
-        )
-        
-        embed.add_field(
-            name="🎰 Slot Machine:",
-            value=(
-                "`;slotstats` - Thống kê slot\n"
-                "`;slotmoney` - Số dư slot\n"
-                "`;slotleaderboard` - Top slot"
-            ),
-            inline=True
-        )
-        
-        embed.add_field(
-            name="🃏 Blackjack:",
-            value=(
-                "`;blackjackstats` - Xem thống kê blackjack\n"
-                "Tương tác: Buttons (Hit/Stand/Quit)"
-            ),
-            inline=True
-        )
-        
-        embed.add_field(
-            name="🎯 Tài Xỉu:",
-            value=(
-                "`;taixiustats` - Thống kê tài xỉu\n"
-                "`;taixiumoney` - Số dư tài xỉu"
-            ),
-            inline=True
-        )
-        
-        embed.add_field(
-            name="🪙 Flip Coin:",
-            value=(
-                "`;flipstats` - Thống kê flip coin\n"
-                "`;flipleaderboard` - Top flip coin"
-            ),
-            inline=True
-        )
-        
-        embed.add_field(
-            name="💳 Ví tiền:",
-            value=(
-                "`;wallet` - Xem số dư ví chung\n"
-                "`;daily` - Nhận tiền hàng ngày\n"
-                "`;walletreload` - Nhận role + 100k"
-            ),
-            inline=True
-        )
-        
-        embed.add_field(
-            name="👑 Admin Panel:",
-            value=(
-                "`;backup` - Hướng dẫn backup\n"
-                "`;admin list` - Danh sách admin\n"
-                "`;help` - Hướng dẫn tổng quát\n"
-                "`;status` - Trạng thái bot"
-            ),
-            inline=True
-        )
-        
-        embed.add_field(
-            name="⚙️ System Tools:",
-            value=(
-                "`;help` - Hướng dẫn\n"
-                "`;status` - Trạng thái bot\n"
-                "`;feedback` - Góp ý"
-            ),
-            inline=True
-        )
-        
-        embed.add_field(
-            name="💡 Mẹo:",
-            value=(
-                "• Chơi có trách nhiệm\n"
-                "• Đặt cược hợp lý\n"
-                "• Theo dõi thống kê\n"
-                "• Tham gia leaderboard"
-            ),
-            inline=False
-        )
+        embed = embed_templates.render('gamemenu.stats')
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
@@ -495,118 +1057,17 @@ class GameMenuView(discord.ui.View):
                 )
                 return
             
-            embed = discord.Embed(
-                title="🛡️ Moderation Tools - Công cụ kiểm duyệt",
-                description="Tất cả hệ thống moderation dành cho Admin",
-                color=discord.Color.red()
-            )
-            
-            embed.add_field(
-                name="🔒 Channel Restriction System",
-                value=(
-                    "; add @user #channel1 #channel2` - Giới hạn user theo channels\n"
-                    "; remove @user` - Bỏ giới hạn channel\n"
-                    "; ban @user` - Cấm chat toàn server\n"
-                    "; unban @user` - Bỏ cấm chat toàn server\n"
-                    "; list` - Xem danh sách bị giới hạn\n"
-                    "; check @user` - Kiểm tra trạng thái user"
-                ),
-                inline=False
-            )
-            
-            embed.add_field(
-                name="🚫 Ban System",
-                value=(
-                    "; <user_id> [lý do]` - Cấm user sử dụng bot (Supreme Admin)\n"
-                    "; <user_id> [lý do]` - Bỏ cấm user (Supreme Admin)\n"
-                    ";` - Xem danh sách user bị cấm\n"
-                    "; [số]` - Lịch sử ban/unban (Supreme Admin)\n"
-                    "; <user_id>` - Kiểm tra trạng thái ban"
-                ),
-                inline=False
-            )
-            
-            # Fire Delete System đã bị vô hiệu hóa
-            # embed.add_field(
-            #     name="🔥 Fire Delete System",
-            #     value=(
-            #         "; on` - Bật fire delete cho server\n"
-            #         "; off` - Tắt fire delete cho server\n"
-            #         "; status` - Xem trạng thái fire delete\n"
-            #         "; history [số]` - Lịch sử xóa tin nhắn (Supreme Admin)\n"
-            #         "**React emoji 🔥 vào tin nhắn để xóa**"
-            #     ),
-            #     inline=False
-            # )
-            
-            embed.add_field(
-                name="⚡ Auto Delete System",
-                value=(
-                    "; on @user [lý do]` - Bật auto delete cho user\n"
-                    "; off @user [lý do]` - Tắt auto delete cho user\n"
-                    "; list` - Xem danh sách user bị auto delete\n"
-                    "; history [số]` - Lịch sử auto delete (Supreme Admin)\n"
-                    "**Tự động xóa TẤT CẢ tin nhắn của user**"
-                ),
-                inline=False
-            )
-            
-            embed.add_field(
-                name="⚠️ Warning System",
-                value=(
-                    "; @user <lý do>` - Cảnh báo user\n"
-                    "; @user` - Xem cảnh báo của user\n"
-                    "; @user` - Xóa cảnh báo\n"
-                    ";` - Xem tất cả cảnh báo"
-                ),
-                inline=False
-            )
-            
-            embed.add_field(
-                name="🔇 Mute System",
-                value=(
-                    "; @user <thời gian> [lý do]` - Mute user\n"
-                    "; @user` - Unmute user\n"
-                    ";` - Xem danh sách bị mute"
-                ),
-                inline=False
-            )
-            
-            embed.add_field(
-                name="🔧 System Tools",
-                value=(
-                    ";` - Kiểm tra quyền bot (QUAN TRỌNG!)\n"
-                    ";` - Menu admin text đầy đủ\n"
-                    "; sync` - Backup dữ liệu lên GitHub"
-                ),
-                inline=False
-            )
-            
             # Hiển thị quyền
             if self.bot_instance.is_supreme_admin(interaction.user.id):
                 user_role = "👑 Supreme Admin - Có thể sử dụng TẤT CẢ lệnh"
             else:
                 user_role = "🛡️ Admin - Có thể sử dụng hầu hết lệnh moderation"
             
-            embed.add_field(
-                name="👤 Quyền của bạn",
-                value=user_role,
-                inline=False
-            )
-            
-            embed.add_field(
-                name="💡 Lưu ý quan trọng",
-                value=(
-                    "• **Supreme Admin**: Không bao giờ bị ảnh hưởng bởi bất kỳ hệ thống nào\n"
-                    "• **Admin**: Không bị Auto Delete, Fire Delete, Channel Restriction\n"
-                    "• **Bot cần quyền 'Manage Messages'** để xóa tin nhắn"
-                ),
-                inline=False
-            )
-            
-            embed.set_footer(
-                text=f"Moderation Tools • 6 hệ thống kiểm duyệt • {interaction.user.display_name}",
-                icon_url=interaction.user.display_avatar.url
+            embed = embed_templates.render(
+                'gamemenu.moderation',
+                user_avatar=interaction.user.display_avatar.url,
+                user_name=interaction.user.display_name,
+                user_role=user_role
             )
             
             await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -624,156 +1085,21 @@ class GameMenuView(discord.ui.View):
     @discord.ui.button(label='🎵 Media', style=discord.ButtonStyle.secondary, custom_id='media')
     async def media_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Button cho Media & Entertainment"""
-        embed = discord.Embed(
-            title="🎵 Media & Entertainment",
-            description="Các tính năng giải trí và media",
-            color=discord.Color.purple()
-        )
-        
-        embed.add_field(
-            name="🎵 Âm nhạc:",
-            value=(
-                ";` - Spotify tools\n"
-                ";` - Dừng nhạc\n"
-                ";` - Bot join voice channel"
-            ),
-            inline=True
-        )
-        
-        embed.add_field(
-            name="📺 Video & Media:",
-            value=(
-                ";` - Quản lý video\n"
-                ";` - Danh sách video\n"
-                "; <link>` - Download TikTok\n"
-                ";` - Preview content"
-            ),
-            inline=True
-        )
-        
-        embed.add_field(
-            name="😀 Emoji & Fun:",
-            value=(
-                ";` - Emoji management\n"
-                ";` - Xem bio user\n"
-                ";` - Tạo nhóm chat"
-            ),
-            inline=True
-        )
-        
-        embed.add_field(
-            name="💬 Communication:",
-            value=(
-                ";` - Direct message tools\n"
-                ";/cleanupdms` - Quản lý DM\n"
-                ";` - Hệ thống feedback\n"
-                ";` - Thông báo\n"
-                ";` - Chat room"
-            ),
-            inline=False
-        )
+        embed = embed_templates.render('gamemenu.media')
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
     @discord.ui.button(label='🤖 AI & Info', style=discord.ButtonStyle.secondary, custom_id='ai_info')
     async def ai_info_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Button cho AI & Information Tools"""
-        embed = discord.Embed(
-            title="🤖 AI & Information Tools", 
-            description="Trí tuệ nhân tạo và thông tin hệ thống",
-            color=discord.Color.green()
-        )
-        
-        embed.add_field(
-            name="🤖 AI Assistant:",
-            value=(
-                "; <câu hỏi>` - Hỏi AI\n"
-                ";` - Trạng thái AI\n"
-                ";` - Chuyển API AI"
-            ),
-            inline=True
-        )
-        
-        embed.add_field(
-            name="📊 Bot Information:",
-            value=(
-                ";` - Trạng thái bot\n"
-                ";` - Thông tin bot\n"
-                ";` - Hướng dẫn\n"
-                ";` - Debug info"
-            ),
-            inline=True
-        )
-        
-        embed.add_field(
-            name="🌐 Network & API:",
-            value=(
-                ";` - Kiểm tra ping\n"
-                ";` - Thống kê mạng\n"
-                ";` - Trạng thái API"
-            ),
-            inline=True
-        )
-        
-        embed.add_field(
-            name="⚙️ System Tools:",
-            value=(
-                ";` - Bảo trì\n"
-                ";` - Cấu hình amen\n"
-                ";` - Cấu hình Git\n"
-                ";` - Test commands"
-            ),
-            inline=False
-        )
+        embed = embed_templates.render('gamemenu.ai_info')
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
     @discord.ui.button(label='⚙️ System', style=discord.ButtonStyle.secondary, custom_id='system')
     async def system_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Button cho System & Channel Tools"""
-        embed = discord.Embed(
-            title="⚙️ System & Channel Tools", 
-            description="Công cụ hệ thống và quản lý kênh",
-            color=discord.Color.dark_grey()
-        )
-        
-        embed.add_field(
-            name="🏠 Channel Management:",
-            value=(
-                ";` - Đóng kênh\n"
-                ";` - Mở kênh\n"
-                ";` - Thiết lập quyền kênh\n"
-                ";` - Xóa quyền kênh\n"
-                ";` - Danh sách kênh\n"
-                ";` - Reset quyền kênh"
-            ),
-            inline=False
-        )
-        
-        embed.add_field(
-            name="🔧 VIP Management:",
-            value=(
-                ";/viplistChannels` - Danh sách VIP\n"
-                ";/vipsendFile` - VIP send tools\n"
-                ";/vipsetupTemplate` - VIP setup\n"
-                ";/vipdelete/vippurge` - VIP utilities\n"
-                ";` - VIP direct message\n"
-                ";/vipdeleteChannel` - VIP channels\n"
-                ";/vipdeleteCategory` - VIP categories\n"
-                ";/vipgiveRole` - VIP roles"
-            ),
-            inline=False
-        )
-        
-        embed.add_field(
-            name="💡 Lưu ý:",
-            value=(
-                "• VIP commands chỉ dành cho VIP users\n"
-                "• Channel commands cần quyền admin\n"
-                "• Sử dụng ; <command>` để xem chi tiết"
-            ),
-            inline=False
-        )
+        embed = embed_templates.render('gamemenu.system')
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
@@ -908,40 +1234,7 @@ class GamePlayView(discord.ui.View):
     @discord.ui.button(label='🃏 Blackjack', style=discord.ButtonStyle.danger, custom_id='play_blackjack')
     async def play_blackjack_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         """Button hiển thị hướng dẫn Blackjack"""
-        embed = discord.Embed(
-            title="🃏 Blackjack",
-            description="Trò chơi bài 21 điểm kinh điển!",
-            color=discord.Color.dark_gold()
-        )
-        
-        embed.add_field(
-            name="📋 Cách chơi:",
-            value=(
-                "**; <số tiền>`** hoặc **; <số tiền>`**\n"
-                "; 100` - Đặt cược 100 xu\n"
-                "; 500` - Đặt cược 500 xu"
-            ),
-            inline=False
-        )
-        
-        embed.add_field(
-            name="💰 Tỷ lệ thắng:",
-            value=(
-                "🃏 **Blackjack**: x2.5\n"
-                "✅ **Thắng**: x2\n"
-                "🤝 **Hòa**: Hoàn tiền"
-            ),
-            inline=False
-        )
-        
-        embed.add_field(
-            name="📊 Commands:",
-            value=(
-                ";` - Xem thống kê cá nhân\n"
-                ";` - Bảng xếp hạng"
-            ),
-            inline=False
-        )
+        embed = embed_templates.render('gamemenu.play_blackjack')
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
@@ -959,117 +1252,6 @@ class GamePlayView(discord.ui.View):
                 )
                 return
             
-            embed = discord.Embed(
-                title="👑 Admin Menu - Tất cả lệnh Admin",
-                description="Danh sách đầy đủ tất cả lệnh dành cho Admin",
-                color=discord.Color.gold()
-            )
-            
-            embed.add_field(
-                name="🔒 Channel Restriction System",
-                value=(
-                    "; add @user #channel1 #channel2` - Giới hạn user theo channels\n"
-                    "; remove @user` - Bỏ giới hạn channel\n"
-                    "; ban @user` - Cấm chat toàn server\n"
-                    "; unban @user` - Bỏ cấm chat toàn server\n"
-                    "; list` - Xem danh sách bị giới hạn\n"
-                    "; check @user` - Kiểm tra trạng thái user"
-                ),
-                inline=False
-            )
-            
-            embed.add_field(
-                name="🚫 Ban System",
-                value=(
-                    "; <user_id> [lý do]` - Cấm user sử dụng bot (Supreme Admin)\n"
-                    "; <user_id> [lý do]` - Bỏ cấm user (Supreme Admin)\n"
-                    ";` - Xem danh sách user bị cấm\n"
-                    "; [số]` - Lịch sử ban/unban (Supreme Admin)\n"
-                    "; <user_id>` - Kiểm tra trạng thái ban"
-                ),
-                inline=False
-            )
-            
-            # Fire Delete System đã bị vô hiệu hóa
-            # embed.add_field(
-            #     name="🔥 Fire Delete System",
-            #     value=(
-            #         "; on` - Bật fire delete cho server\n"
-            #         "; off` - Tắt fire delete cho server\n"
-            #         "; status` - Xem trạng thái fire delete\n"
-            #         "; history [số]` - Lịch sử xóa tin nhắn (Supreme Admin)\n"
-            #         "**React emoji 🔥 vào tin nhắn để xóa**"
-            #     ),
-            #     inline=False
-            # )
-            
-            embed.add_field(
-                name="⚡ Auto Delete System",
-                value=(
-                    "; on @user [lý do]` - Bật auto delete cho user\n"
-                    "; off @user [lý do]` - Tắt auto delete cho user\n"
-                    "; list` - Xem danh sách user bị auto delete\n"
-                    "; history [số]` - Lịch sử auto delete (Supreme Admin)\n"
-                    "**Tự động xóa TẤT CẢ tin nhắn của user**"
-                ),
-                inline=False
-            )
-            
-            embed.add_field(
-                name="⚠️ Warning System",
-                value=(
-                    "; @user <lý do>` - Cảnh báo user\n"
-                    "; @user` - Xem cảnh báo của user\n"
-                    "; @user` - Xóa cảnh báo\n"
-                    ";` - Xem tất cả cảnh báo"
-                ),
-                inline=False
-            )
-            
-            embed.add_field(
-                name="🔇 Mute System",
-                value=(
-                    "; @user <thời gian> [lý do]` - Mute user\n"
-                    "; @user` - Unmute user\n"
-                    ";` - Xem danh sách bị mute"
-                ),
-                inline=False
-            )
-            
-            embed.add_field(
-                name="📦 Backup & Data Management",
-                value=(
-                    "; sync` - Đồng bộ với GitHub (backup trước)\n"
-                    "; pull` - Tải code mới từ GitHub\n"
-                    "; restore` - Khôi phục dữ liệu từ GitHub\n"
-                    "; migrate` - Di chuyển dữ liệu vào data/\n"
-                    "; status` - Kiểm tra trạng thái Git\n"
-                    "; config` - Xem cấu hình GitHub"
-                ),
-                inline=False
-            )
-            
-            embed.add_field(
-                name="🔧 System & Permissions",
-                value=(
-                    ";` - Kiểm tra quyền bot (QUAN TRỌNG!)\n"
-                    ";` - Thông tin bot và server\n"
-                    ";` - Kiểm tra độ trễ bot\n"
-                    ";` - Menu admin đầy đủ (text)"
-                ),
-                inline=False
-            )
-            
-            embed.add_field(
-                name="🎮 Admin Game Commands",
-                value=(
-                    "; add/remove @user <số tiền>` - Quản lý tiền tài xỉu\n"
-                    ";` - Cấp role và tiền cho user\n"
-                    "; add/remove @user <số tiền>` - Quản lý ví chung"
-                ),
-                inline=False
-            )
-            
             # Hiển thị quyền và thống kê
             if self.bot_instance.is_supreme_admin(interaction.user.id):
                 user_role = "👑 Supreme Admin"
@@ -1078,35 +1260,12 @@ class GamePlayView(discord.ui.View):
                 user_role = "🛡️ Admin"
                 permissions_note = "Có thể sử dụng hầu hết lệnh (trừ một số lệnh Supreme Admin)"
             
-            embed.add_field(
-                name="👤 Quyền của bạn",
-                value=f"{user_role}\n{permissions_note}",
-                inline=False
-            )
-            
-            embed.add_field(
-                name="🎯 Lệnh quan trọng nhất",
-                value=(
-                    "**;`** - Kiểm tra quyền bot nếu Auto Delete không hoạt động\n"
-                    "**;`** - Quản lý chat của users\n"
-                    "**;`** - Menu text đầy đủ hơn"
-                ),
-                inline=False
-            )
-            
-            embed.add_field(
-                name="💡 Lưu ý",
-                value=(
-                    "• **Supreme Admin**: Không bao giờ bị giới hạn bởi bất kỳ hệ thống nào\n"
-                    "• **Admin**: Không bị Auto Delete, Fire Delete, Channel Restriction\n"
-                    "• **Bot cần quyền 'Manage Messages'** để các tính năng xóa tin nhắn hoạt động"
-                ),
-                inline=False
-            )
-            
-            embed.set_footer(
-                text=f"Admin Menu • {len([f for f in embed.fields if f.name.endswith('System')])} hệ thống moderation • Requested by {interaction.user.display_name}",
-                icon_url=interaction.user.display_avatar.url
+            embed = embed_templates.render(
+                'gamemenu.admin_menu',
+                user_avatar=interaction.user.display_avatar.url,
+                user_name=interaction.user.display_name,
+                user_role=user_role,
+                permissions_note=permissions_note
             )
             
             await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -12,9 +12,31 @@ import asyncio
 from datetime import datetime
 import logging
 from .base import BaseCommand
+from utils.metrics import metrics
+from utils.github_backup_engine import GitHubBackupEngine, DEFAULT_API_URL
+from utils.game_stats_store import game_stats
 
 logger = logging.getLogger(__name__)
 
+# Danh sách files cần backup (đường dẫn local, lưu lên repo dưới data/<tên file>)
+DATA_FILES = [
+    'shared_wallet.json',
+    'taixiu_data.json',
+    'daily_data.json',
+    'warnings.json',
+    'warnings_log.jsonl',
+    'warning_escalation.json',
+    'banned_users.json',
+    'ban_history.jsonl',
+    'role_members.json',
+    'maintenance_mode.json',
+    'channel_permissions.json',
+    'command_permissions.json',
+    'supreme_admin.json',
+    'admin.json',
+    'priority.json'
+]
+
 class GitHubBackupCommands(BaseCommand):
     def __init__(self, bot_instance):
         """
@@ -30,6 +52,9 @@ class GitHubBackupCommands(BaseCommand):
         self.github_token = None
         self.github_username = None
         self.backup_repo = None
+        self.api_url = DEFAULT_API_URL
+        self.backup_concurrency = 4
+        self._engine = None
         self.load_github_config()
         
         logger.info("GitHub Backup Commands đã được khởi tạo")
@@ -44,6 +69,9 @@ class GitHubBackupCommands(BaseCommand):
                 self.github_token = config.get('github_token')
                 self.github_username = config.get('github_username')
                 self.backup_repo = config.get('github_backup_repo', 'bot-data-backup')
+                self.api_url = config.get('github_api_url', DEFAULT_API_URL).rstrip('/')
+                self.backup_concurrency = config.get('github_backup_concurrency', 4)
+                self._engine = None
                 
                 if self.github_token and self.github_username:
                     logger.info("✅ GitHub config loaded successfully")
@@ -54,6 +82,19 @@ class GitHubBackupCommands(BaseCommand):
         except Exception as e:
             logger.error(f"❌ Lỗi khi load GitHub config: {e}")
     
+    @property
+    def engine(self) -> GitHubBackupEngine:
+        """Engine backup tăng dần (tạo lại khi config đổi)"""
+        if self._engine is None:
+            self._engine = GitHubBackupEngine(
+                self.github_token,
+                self.github_username,
+                self.backup_repo,
+                api_url=self.api_url,
+                concurrency=self.backup_concurrency
+            )
+        return self._engine
+    
     async def create_github_repo(self):
         """Tạo private repository trên GitHub"""
         if not self.github_token:
@@ -73,9 +114,9 @@ class GitHubBackupCommands(BaseCommand):
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[metrics.http_trace_config()]) as session:
                 async with session.post(
-                    'https://api.github.com/user/repos',
+                    f'{self.api_url}/user/repos',
                     headers=headers,
                     json=repo_data
                 ) as response:
@@ -117,10 +158,10 @@ class GitHubBackupCommands(BaseCommand):
         for attempt in range(max_retries):
             try:
                 timeout = aiohttp.ClientTimeout(total=30)  # 30 second timeout
-                async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with aiohttp.ClientSession(timeout=timeout, trace_configs=[metrics.http_trace_config()]) as session:
                     # Get existing file SHA if exists
                     async with session.get(
-                        f'https://api.github.com/repos/{self.github_username}/{self.backup_repo}/contents/{file_path}',
+                        f'{self.api_url}/repos/{self.github_username}/{self.backup_repo}/contents/{file_path}',
                         headers=headers
                     ) as response:
                         if response.status == 200:
@@ -129,7 +170,7 @@ class GitHubBackupCommands(BaseCommand):
                     
                     # Upload/update file
                     async with session.put(
-                        f'https://api.github.com/repos/{self.github_username}/{self.backup_repo}/contents/{file_path}',
+                        f'{self.api_url}/repos/{self.github_username}/{self.backup_repo}/contents/{file_path}',
                         headers=headers,
                         json=file_data
                     ) as response:
@@ -144,7 +185,7 @@ class GitHubBackupCommands(BaseCommand):
                             else:
                                 logger.error(f"❌ Lỗi upload file {file_path}: {response.status} - {error_text}")
                                 return False, f"Lỗi upload: {response.status}"
-                                
+            
             except Exception as e:
                 if attempt < max_retries - 1:
                     logger.warning(f"⚠️ Connection error attempt {attempt + 1} for {file_path}: {str(e)} - Retrying...")
@@ -156,53 +197,38 @@ class GitHubBackupCommands(BaseCommand):
         
         return False, "Tất cả attempts đều thất bại"
     
-    async def backup_data_files(self):
-        """Backup tất cả data files lên GitHub"""
-        # Danh sách files cần backup
-        data_files = [
-            'shared_wallet.json',
-            'taixiu_data.json',
-            'flip_coin_data.json',
-            'rps_data.json',
-            'slot_data.json',
-            'blackjack_data.json',
-            'daily_data.json',
-            'warnings.json',
-            'maintenance_mode.json',
-            'channel_permissions.json',
-            'command_permissions.json',
-            'supreme_admin.json',
-            'admin.json',
-            'priority.json'
-        ]
+    async def backup_data_files(self, full=False):
+        """
+        Backup data files lên GitHub trong 1 commit, bỏ qua file không đổi từ lần trước
         
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        successful_uploads = []
-        failed_uploads = []
+        Args:
+            full: Upload lại tất cả file (bỏ qua cache sha)
         
-        for file_name in data_files:
-            if os.path.exists(file_name):
-                try:
-                    with open(file_name, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    success, message = await self.upload_file_to_github(
-                        f"data/{file_name}",
-                        content,
-                        f"Backup {file_name} - {timestamp}"
-                    )
-                    
-                    if success:
-                        successful_uploads.append(file_name)
-                    else:
-                        failed_uploads.append((file_name, message))
-                        
-                except Exception as e:
-                    failed_uploads.append((file_name, str(e)))
-            else:
-                failed_uploads.append((file_name, "File không tồn tại"))
+        Returns:
+            BackupResult của engine
+        """
+        timestamp = datetime.now()
+        files = {f"data/{file_name}": file_name for file_name in DATA_FILES}
+        # Thống kê game (data/game_stats/<game>.json) thay cho các file *_data.json cũ
+        files.update({path.replace(os.sep, '/'): path for path in game_stats.data_files()})
+        
+        def build_summary(result):
+            backup_summary = {
+                'timestamp': timestamp.isoformat(),
+                'successful_files': [path[len('data/'):] for path in result.uploaded],
+                'unchanged_files': [path[len('data/'):] for path in result.unchanged],
+                'failed_files': [{'file': path[len('data/'):], 'error': error} for path, error in result.failed],
+                'total_files': len(files)
+            }
+            summary_path = f"backup_summary_{timestamp.strftime('%Y%m%d_%H%M%S')}.json"
+            return {summary_path: json.dumps(backup_summary, indent=4, ensure_ascii=False).encode('utf-8')}
         
-        return successful_uploads, failed_uploads
+        return await self.engine.backup(
+            files,
+            f"Backup data - {timestamp.strftime('%Y-%m-%d %H:%M:%S')}",
+            extra_files=build_summary,
+            full=full
+        )
     
     async def download_file_from_github(self, file_path):
         """Download file từ GitHub repository"""
@@ -216,9 +242,9 @@ class GitHubBackupCommands(BaseCommand):
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[metrics.http_trace_config()]) as session:
                 async with session.get(
-                    f'https://api.github.com/repos/{self.github_username}/{self.backup_repo}/contents/{file_path}',
+                    f'{self.api_url}/repos/{self.github_username}/{self.backup_repo}/contents/{file_path}',
                     headers=headers
                 ) as response:
                     if response.status == 200:
@@ -235,11 +261,13 @@ class GitHubBackupCommands(BaseCommand):
         """Đăng ký các commands cho GitHub Backup"""
         
         @self.bot.command(name='gitbackup', aliases=['gbackup'])
-        async def github_backup(ctx):
+        async def github_backup(ctx, mode: str = None):
             """
-            Backup tất cả dữ liệu lên GitHub private repository (Supreme Admin only)
+            Backup dữ liệu lên GitHub private repository (Supreme Admin only)
             
-            Usage: ;gitbackup
+            Usage:
+            ;gitbackup - Chỉ upload file đã đổi từ lần backup trước (1 commit)
+            ;gitbackup full - Upload lại tất cả file
             """
             try:
                 # Kiểm tra quyền Supreme Admin
@@ -288,28 +316,19 @@ class GitHubBackupCommands(BaseCommand):
                     return
                 
                 # Backup data files
-                successful, failed = await self.backup_data_files()
-                
-                # Tạo backup summary
-                backup_summary = {
-                    'timestamp': datetime.now().isoformat(),
-                    'successful_files': successful,
-                    'failed_files': [{'file': f[0], 'error': f[1]} for f in failed],
-                    'total_files': len(successful) + len(failed)
-                }
-                
-                # Upload backup summary
-                await self.upload_file_to_github(
-                    f"backup_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                    json.dumps(backup_summary, indent=4, ensure_ascii=False),
-                    f"Backup Summary - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-                )
+                result = await self.backup_data_files(full=mode == 'full')
+                successful = [path[len('data/'):] for path in result.uploaded]
+                unchanged = [path[len('data/'):] for path in result.unchanged]
+                failed = [(path[len('data/'):], error) for path, error in result.failed]
                 
                 # Tạo result embed
-                if successful:
+                if successful or (unchanged and not failed):
                     embed = discord.Embed(
                         title="✅ Backup thành công!",
-                        description=f"Đã backup {len(successful)} files lên GitHub",
+                        description=(
+                            f"Đã backup {len(successful)} files lên GitHub" if successful
+                            else "Không có file nào thay đổi từ lần backup trước"
+                        ),
                         color=discord.Color.green(),
                         timestamp=datetime.now()
                     )
@@ -320,9 +339,20 @@ class GitHubBackupCommands(BaseCommand):
                         inline=False
                     )
                     
+                    if successful:
+                        embed.add_field(
+                            name="✅ Files thành công",
+                            value=f"```\n{chr(10).join(successful[:10])}{'...' if len(successful) > 10 else ''}```",
+                            inline=False
+                        )
+                    
                     embed.add_field(
-                        name="✅ Files thành công",
-                        value=f"```\n{chr(10).join(successful[:10])}{'...' if len(successful) > 10 else ''}```",
+                        name="📊 Thống kê",
+                        value=(
+                            f"Không đổi (bỏ qua): {len(unchanged)} • Không tồn tại: {len(result.missing)}\n"
+                            f"Dung lượng upload: {result.bytes_uploaded / 1024:.1f} KB • {result.duration_ms:.0f}ms"
+                            + (f"\nCommit: `{result.commit[:7]}`" if result.commit else "")
+                        ),
                         inline=False
                     )
                     
@@ -335,17 +365,23 @@ class GitHubBackupCommands(BaseCommand):
                         )
                     
                     embed.set_footer(text=f"Backup by {ctx.author.display_name}")
-                    
+                
                 else:
                     embed = discord.Embed(
                         title="❌ Backup thất bại",
                         description="Không có file nào được backup thành công",
                         color=discord.Color.red()
                     )
+                    if failed:
+                        embed.add_field(
+                            name="❌ Lỗi",
+                            value=f"```\n{chr(10).join(f'{f[0]}: {f[1]}' for f in failed[:5])[:1000]}```",
+                            inline=False
+                        )
                 
                 await message.edit(embed=embed)
-                logger.info(f"GitHub backup completed by {ctx.author}: {len(successful)} success, {len(failed)} failed")
-                
+                logger.info(f"GitHub backup completed by {ctx.author}: {len(successful)} success, {len(unchanged)} unchanged, {len(failed)} failed")
+            
             except Exception as e:
                 logger.error(f"Lỗi trong gitbackup command: {e}")
                 embed = discord.Embed(
@@ -439,7 +475,7 @@ class GitHubBackupCommands(BaseCommand):
                         inline=True
                     )
                     embed.set_footer(text=f"Restored by {ctx.author.display_name}")
-                    
+                
                 else:
                     embed = discord.Embed(
                         title="❌ Restore thất bại",
@@ -449,7 +485,7 @@ class GitHubBackupCommands(BaseCommand):
                 
                 await message.edit(embed=embed)
                 logger.info(f"GitHub restore {file_name} by {ctx.author}: {'success' if content else 'failed'}")
-                
+            
             except Exception as e:
                 logger.error(f"Lỗi trong gitrestore command: {e}")
                 embed = discord.Embed(
@@ -508,6 +544,18 @@ class GitHubBackupCommands(BaseCommand):
                         inline=False
                     )
                 
+                if self.github_token and self.github_username:
+                    stats = self.engine.get_stats()
+                    embed.add_field(
+                        name="💾 Backup tăng dần",
+                        value=(
+                            f"Đang theo dõi {stats['tracked_files']} files\n"
+                            f"Commit gần nhất: `{(stats['last_commit'] or 'chưa có')[:7]}`"
+                            + (f"\nAPI: {self.api_url}" if self.api_url != DEFAULT_API_URL else "")
+                        ),
+                        inline=False
+                    )
+                
                 embed.add_field(
                     name="📝 Hướng dẫn cấu hình",
                     value="Thêm vào `config.json`:\n```json\n{\n  \"github_token\": \"ghp_xxx\",\n  \"github_username\": \"username\",\n  \"github_backup_repo\": \"bot-data-backup\"\n}```",
@@ -515,7 +563,7 @@ class GitHubBackupCommands(BaseCommand):
                 )
                 
                 await ctx.reply(embed=embed, mention_author=True)
-                
+            
             except Exception as e:
                 logger.error(f"Lỗi trong gitconfig command: {e}")
                 await ctx.reply(f"❌ Có lỗi xảy ra: {e}", mention_author=True)
@@ -8,6 +8,8 @@ import asyncio
 from datetime import datetime
 import logging
 
+from utils.metrics import metrics
+
 logger = logging.getLogger(__name__)
 
 class GitHubDownloadCommands:
@@ -84,7 +86,7 @@ class GitHubDownloadCommands:
         
         params = {'ref': branch} if branch != 'main' else {}
         
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(trace_configs=[metrics.http_trace_config()]) as session:
             async with session.get(api_url, headers=headers, params=params) as response:
                 if response.status == 404:
                     raise Exception(f"File không tồn tại: {path}")
@@ -248,7 +250,7 @@ class GitHubDownloadCommands:
             
             params = {'ref': branch} if branch != 'main' else {}
             
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[metrics.http_trace_config()]) as session:
                 async with session.get(api_url, headers=headers, params=params) as response:
                     if response.status != 200:
                         await ctx.reply(f"❌ Lỗi API: {response.status}")
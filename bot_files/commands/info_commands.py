@@ -167,6 +167,15 @@ class InfoCommands(BaseCommand):
             """
             await self._bot_status_impl(ctx)
         
+        @self.bot.command(name='ready')
+        async def readiness_probe(ctx):
+            """
+            Trạng thái sẵn sàng của bot: giai đoạn khởi động, startup job, reconnect
+            
+            Usage: ;ready
+            """
+            await ctx.reply(embed=self._build_readiness_embed(), mention_author=True)
+        
         @self.bot.command(name='nhom')
         async def server_info(ctx):
             """
@@ -237,6 +246,39 @@ class InfoCommands(BaseCommand):
         
         # Commands ping và optimize đã được chuyển sang NetworkCommands
     
+    def _build_readiness_embed(self) -> discord.Embed:
+        """Embed cho ;ready từ lifecycle.readiness()"""
+        probe = self.bot_instance.lifecycle.readiness()
+        phase_labels = {
+            'starting': "⏳ Đang khởi động",
+            'warming': "🔥 Đang chạy startup job",
+            'ready': "✅ Sẵn sàng",
+            'disconnected': "🔌 Mất kết nối gateway",
+        }
+        embed = discord.Embed(
+            title="🫀 Trạng thái sẵn sàng",
+            description=(
+                f"{phase_labels.get(probe['phase'], probe['phase'])}\n"
+                f"Khởi động lần đầu: {probe['first_ready_ms'] if probe['first_ready_ms'] is not None else '-'}ms • "
+                f"Uptime: {probe['uptime_s']:.0f}s"
+            ),
+            color=discord.Color.green() if probe['ready'] else discord.Color.orange()
+        )
+        state_icons = {'pending': '⏳', 'running': '🔄', 'done': '✅', 'failed': '❌'}
+        for title, jobs in (("📋 Startup job", probe['jobs']), ("🔁 Reconnect job", probe['reconnect_jobs'])):
+            if jobs:
+                embed.add_field(
+                    name=title,
+                    value="\n".join(
+                        f"{state_icons.get(job['state'], '?')} `{name}` {job['ms'] if job['ms'] is not None else '-'}ms"
+                        + (f" - {job['error'][:80]}" if job['error'] else "")
+                        for name, job in jobs.items()
+                    ),
+                    inline=False
+                )
+        embed.set_footer(text=f"on_ready: {probe['ready_count']} lần • Resume: {probe['resumes']} • Mất kết nối: {probe['disconnects']}")
+        return embed
+    
     async def _bot_status_impl(self, ctx):
         """
         Implementation thực tế của status command với system metrics
@@ -372,28 +414,14 @@ class InfoCommands(BaseCommand):
         
         guild = ctx.guild
         
-        # Đếm thành viên theo trạng thái
-        online_members = 0
-        idle_members = 0
-        dnd_members = 0
-        offline_members = 0
-        bot_count = 0
-        human_count = 0
-        
-        for member in guild.members:
-            if member.bot:
-                bot_count += 1
-            else:
-                human_count += 1
-                
-            if member.status == discord.Status.online:
-                online_members += 1
-            elif member.status == discord.Status.idle:
-                idle_members += 1
-            elif member.status == discord.Status.dnd:
-                dnd_members += 1
-            else:
-                offline_members += 1
+        # Đếm thành viên theo trạng thái (số liệu có sẵn từ guild stats tracker)
+        counts = await self.bot_instance.guild_stats.get_member_counts(guild)
+        online_members = counts['online']
+        idle_members = counts['idle']
+        dnd_members = counts['dnd']
+        offline_members = counts['offline']
+        bot_count = counts['bots']
+        human_count = counts['humans']
         
         # Đếm kênh theo loại
         text_channels = len([ch for ch in guild.channels if isinstance(ch, discord.TextChannel)])
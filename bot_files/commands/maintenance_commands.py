@@ -94,6 +94,8 @@ class MaintenanceCommands:
             logger.info(f"🔓 MAINTENANCE MODE DISABLED by {username}")
         
         self.save_maintenance_data()
+        
+        self.bot_instance.refresh_auth_index()
     
     def register_commands(self):
         """Đăng ký các commands cho Maintenance"""
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+Module Commands - Reload nóng command module và xem trạng thái module
+Chỉ Supreme Admin mới có quyền sử dụng
+"""
+import discord
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAX_FIELD_LINES = 20  # Số dòng tối đa mỗi field của ;listmodules
+
+class ModuleCommands:
+    def __init__(self, bot_instance):
+        self.bot_instance = bot_instance
+        self.bot = bot_instance.bot
+        self.setup_commands()
+    
+    @property
+    def registry(self):
+        return self.bot_instance.module_registry
+    
+    def _format_result(self, result: dict) -> str:
+        if not result['ok']:
+            return f"❌ `{result['module']}`: {result['error']}"
+        action = "đã tải lần đầu" if result['action'] == 'load' else "đã reload"
+        extras = []
+        if result['state']:
+            extras.append("giữ state")
+        if result['app_commands']:
+            extras.append(f"{result['app_commands']} slash")
+        suffix = f" ({', '.join(extras)})" if extras else ""
+        return f"✅ `{result['module']}` {action} trong {result['ms']}ms{suffix}"
+    
+    def _build_reload_embed(self, results: list) -> discord.Embed:
+        failed = [result for result in results if not result['ok']]
+        embed = discord.Embed(
+            title="🔄 Reload Module",
+            color=discord.Color.red() if failed else discord.Color.green()
+        )
+        lines = [self._format_result(result) for result in results]
+        if len(lines) > MAX_FIELD_LINES:
+            # Reload tất cả: chỉ liệt kê module lỗi + tổng kết
+            lines = [self._format_result(result) for result in failed[:MAX_FIELD_LINES]]
+        total_ms = round(sum(result['ms'] for result in results), 1)
+        lines.append(f"\n**{len(results) - len(failed)}/{len(results)}** module thành công, tổng {total_ms}ms")
+        embed.description = "\n".join(lines)
+        if any(result['app_commands'] for result in results if result['ok']):
+            embed.set_footer(text="Đổi tên/tham số slash command thì chạy ;slashsync để cập nhật lên Discord")
+        return embed
+    
+    def _build_list_embed(self) -> discord.Embed:
+        registry = self.registry
+        loaded, pending = [], []
+        for name, spec in registry.specs.items():
+            short_name = name[:-len('_commands')] if name.endswith('_commands') else name
+            if registry.is_loaded(name):
+                record = registry.profiler.records.get(name, {})
+                instance = registry.instances[name]
+                marker = " 💾" if hasattr(instance, 'snapshot') else ""
+                reloaded = f" (reload {record['reload_ms']:.0f}ms)" if 'reload_ms' in record else ""
+                loaded.append(
+                    f"`{short_name}` {record.get('phase', '?')} "
+                    f"{record.get('import_ms', 0) + record.get('init_ms', 0):.0f}ms{reloaded}{marker}"
+                )
+            else:
+                pending.append(f"`{short_name}`")
+        
+        stats = registry.get_stats()
+        embed = discord.Embed(
+            title="📦 Danh sách Module",
+            description=(
+                f"Đã tải **{stats['loaded']}/{stats['modules']}** module • "
+                f"Reload: {stats['reloads']} (lỗi {stats['reload_failures']})\n"
+                f"💾 = có snapshot/restore (giữ state khi reload)"
+            ),
+            color=discord.Color.blue()
+        )
+        for index in range(0, len(loaded), MAX_FIELD_LINES):
+            embed.add_field(
+                name="✅ Đã tải" if index == 0 else "✅ Đã tải (tiếp)",
+                value="\n".join(loaded[index:index + MAX_FIELD_LINES]),
+                inline=True
+            )
+        if pending:
+            embed.add_field(name="💤 Lazy chưa dùng", value=", ".join(pending), inline=False)
+        embed.set_footer(text=";reload <module> để reload 1 module • ;reload để reload tất cả module đã tải")
+        return embed
+    
+    def setup_commands(self):
+        """Setup module commands"""
+        
+        @self.bot.command(name='reload')
+        async def reload_command(ctx, module_name: str = None):
+            """
+            Reload nóng command module (Supreme Admin only)
+            
+            Usage:
+            ;reload - Reload tất cả module đã tải
+            ;reload <module> - Reload 1 module (vd: ;reload shop)
+            """
+            if not self.bot_instance.is_supreme_admin(ctx.author.id):
+                await ctx.reply(f"{ctx.author.mention} ❌ Chỉ Supreme Admin mới có thể reload module!", mention_author=True)
+                return
+            
+            if module_name is None:
+                results = await self.registry.reload_all()
+            else:
+                resolved = self.registry.resolve(module_name)
+                if resolved is None:
+                    await ctx.reply(
+                        f"{ctx.author.mention} ❌ Không tìm thấy module `{module_name}`! Dùng `;listmodules` để xem danh sách.",
+                        mention_author=True
+                    )
+                    return
+                results = [await self.registry.reload(resolved)]
+            
+            await ctx.reply(embed=self._build_reload_embed(results), mention_author=True)
+            logger.info(f"{ctx.author} ({ctx.author.id}) reload {module_name or 'tất cả module'}: "
+                        f"{sum(1 for result in results if result['ok'])}/{len(results)} thành công")
+        
+        @self.bot.command(name='listmodules', aliases=['modules'])
+        async def listmodules_command(ctx):
+            """Xem danh sách module và thời gian tải (Supreme Admin only)"""
+            if not self.bot_instance.is_supreme_admin(ctx.author.id):
+                await ctx.reply(f"{ctx.author.mention} ❌ Chỉ Supreme Admin mới có thể xem danh sách module!", mention_author=True)
+                return
+            await ctx.reply(embed=self._build_list_embed(), mention_author=True)
+        
+        @self.bot.command(name='slashsync')
+        async def slashsync_command(ctx, mode: str = None):
+            """
+            Sync slash command lên Discord nếu cây lệnh đã đổi (Supreme Admin only)
+            
+            Usage:
+            ;slashsync - Sync nếu fingerprint khác lần sync trước
+            ;slashsync force - Sync luôn, bỏ qua fingerprint
+            """
+            if not self.bot_instance.is_supreme_admin(ctx.author.id):
+                await ctx.reply(f"{ctx.author.mention} ❌ Chỉ Supreme Admin mới có thể sync slash command!", mention_author=True)
+                return
+            
+            syncer = self.bot_instance.command_sync
+            synced = await self.bot_instance.slash_commands.sync_commands(force=mode == 'force')
+            stats = syncer.get_stats()
+            if synced:
+                message = f"✅ Đã sync **{synced}** slash command (fingerprint `{stats['global_hash']}`)"
+            elif stats['failures']:
+                message = f"⚠️ Không sync (fingerprint `{stats['global_hash']}`), đã có {stats['failures']} lần lỗi - xem log"
+            else:
+                message = f"✅ Cây lệnh không đổi (fingerprint `{stats['global_hash']}`), không cần sync"
+            await ctx.reply(f"{ctx.author.mention} {message}", mention_author=True)
+    
+    def register_commands(self):
+        """Register all commands"""
+        logger.info("Module commands đã được đăng ký")
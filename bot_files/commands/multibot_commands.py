@@ -7,6 +7,8 @@ import aiohttp
 from datetime import datetime
 import logging
 
+from utils.metrics import metrics
+
 logger = logging.getLogger(__name__)
 
 class MultiBotCommands:
@@ -78,7 +80,7 @@ class MultiBotCommands:
                 'content': content
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[metrics.http_trace_config()]) as session:
                 url = f'https://discord.com/api/v10/channels/{channel_id}/messages'
                 async with session.post(url, headers=headers, json=payload) as response:
                     if response.status == 200:
@@ -103,7 +105,7 @@ class MultiBotCommands:
                 'recipient_id': user_id
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[metrics.http_trace_config()]) as session:
                 # Create DM channel
                 dm_url = 'https://discord.com/api/v10/users/@me/channels'
                 async with session.post(dm_url, headers=headers, json=dm_payload) as dm_response:
@@ -142,7 +144,7 @@ class MultiBotCommands:
                 'nick': nickname
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(trace_configs=[metrics.http_trace_config()]) as session:
                 url = f'https://discord.com/api/v10/guilds/{guild_id}/members/@me'
                 async with session.patch(url, headers=headers, json=payload) as response:
                     if response.status == 200:
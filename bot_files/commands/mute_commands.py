@@ -365,27 +365,25 @@ class MuteCommands(BaseCommand):
                 await ctx.reply(embed=embed, mention_author=True)
                 
             else:
-                # Xem tất cả users bị mute trong server
+                # Xem tất cả users bị mute trong server (lấy từ heap timeout của guild stats tracker)
                 muted_members = []
-                current_time = datetime.now()
+                current_time = datetime.now().astimezone()
                 
-                for member in ctx.guild.members:
-                    if member.timed_out_until and member.timed_out_until > current_time.replace(tzinfo=member.timed_out_until.tzinfo):
-                        remaining_time = member.timed_out_until - current_time.replace(tzinfo=member.timed_out_until.tzinfo)
-                        remaining_formatted = self._format_duration(remaining_time)
-                        muted_members.append({
-                            'member': member,
-                            'remaining': remaining_formatted,
-                            'expires_at': member.timed_out_until
-                        })
+                for member_id, expires_at in await self.bot_instance.guild_stats.get_active_timeouts(ctx.guild):
+                    member = ctx.guild.get_member(member_id)
+                    if member is None:
+                        continue
+                    remaining_formatted = self._format_duration(expires_at - current_time)
+                    muted_members.append({
+                        'member': member,
+                        'remaining': remaining_formatted,
+                        'expires_at': expires_at
+                    })
                 
                 if not muted_members:
                     await ctx.reply(f"{ctx.author.mention} ℹ️ Hiện không có user nào bị mute trong server!", mention_author=True)
                     return
                 
-                # Sắp xếp theo thời gian hết hạn
-                muted_members.sort(key=lambda x: x['expires_at'])
-                
                 embed = discord.Embed(
                     title="🔇 Danh sách Users bị Mute",
                     description=f"Có **{len(muted_members)}** user đang bị mute trong server",
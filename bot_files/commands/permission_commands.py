@@ -8,6 +8,7 @@ import logging
 import json
 import os
 from .base import BaseCommand
+from utils.authorization_index import LEVEL_ADMIN, LEVEL_NAMES
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +73,9 @@ class PermissionCommands(BaseCommand):
         
         self.command_permissions[command_name] = permission_level
         self.save_permissions()
+        
+        self.bot_instance.refresh_auth_index()
+        
         return True, f"Đã set permission '{permission_level}' cho lệnh '{command_name}'"
     
     def check_command_permission(self, ctx, command_name):
@@ -79,6 +83,16 @@ class PermissionCommands(BaseCommand):
         required_level = self.get_command_permission(command_name)
         user_id = ctx.author.id
         
+        # Dùng bảng command -> level đã biên dịch nếu có
+        auth_index = getattr(self.bot_instance, 'auth_index', None)
+        if auth_index is not None:
+            user_level = auth_index.get_user_level(user_id)
+            if user_level >= auth_index.get_command_level(command_name):
+                return True, LEVEL_NAMES[user_level]
+            if user_level == LEVEL_ADMIN:
+                return False, "Lệnh này chỉ dành cho Supreme Admin"
+            return False, f"Lệnh này chỉ dành cho {required_level.replace('_', ' ').title()}"
+        
         # Supreme Admin có quyền tất cả
         if hasattr(self.bot_instance, 'supreme_admin_id') and self.bot_instance.supreme_admin_id and user_id == self.bot_instance.supreme_admin_id:
             return True, "supreme_admin"
@@ -57,6 +57,8 @@ class PriorityCommands(BaseCommand):
         self.bot_instance.priority_users.add(user_id)  # Set operation O(1)
         await self._save_priority_users()
         
+        self.bot_instance.refresh_auth_index()
+        
         embed = discord.Embed(
             title="⚡ Đã thêm Priority User",
             description=f"User ID `{user_id}` đã được thêm vào danh sách priority.",
@@ -84,6 +86,8 @@ class PriorityCommands(BaseCommand):
         self.bot_instance.priority_users.discard(user_id)  # Set operation O(1)
         await self._save_priority_users()
         
+        self.bot_instance.refresh_auth_index()
+        
         embed = discord.Embed(
             title="⚡ Đã xóa Priority User",
             description=f"User ID `{user_id}` đã được xóa khỏi danh sách priority.",
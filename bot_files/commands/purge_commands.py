@@ -7,30 +7,97 @@ import discord
 from discord.ext import commands
 import asyncio
 import logging
-from datetime import datetime
+import re
+from datetime import datetime, timedelta, timezone
+from utils.purge_engine import PurgeEngine, PurgeFilter
 
 logger = logging.getLogger(__name__)
 
+PURGE_FILTER_MAX = 1000  # Số tin nhắn khớp tối đa cho ;purge filter
+PURGE_FILTER_SCAN_LIMIT = 5000  # Số tin nhắn quét tối đa cho ;purge filter
+PURGE_ALL_OLD_MAX = 500  # Số tin nhắn quá 14 ngày tối đa cho ;purge all old (xóa từng tin ~1 tin/giây)
+
 class PurgeCommands:
     def __init__(self, bot_instance):
         self.bot_instance = bot_instance
         self.bot = bot_instance.bot
+        self.engine = PurgeEngine()
         self.setup_commands()
     
+    def snapshot(self) -> dict:
+        """State giữ lại khi ;reload: engine đang giữ các lượt purge chạy dở"""
+        return {'engine': self.engine}
+    
+    def restore(self, state: dict) -> None:
+        self.engine = state['engine']
+    
+    def _parse_filter(self, ctx, tokens) -> PurgeFilter:
+        """
+        Parse bộ lọc cho ;purge filter
+        
+        Hỗ trợ: @user / user:<id>, bot, files, regex:<pattern>, after:<thời gian>, before:<thời gian>
+        (after:2h = tin nhắn trong 2 giờ qua, before:1d = tin nhắn cũ hơn 1 ngày)
+        
+        Raises:
+            ValueError: Nếu có tham số không hợp lệ
+            re.error: Nếu regex sai
+        """
+        user_ids = [member.id for member in ctx.message.mentions]
+        options = {'bots_only': False, 'attachments_only': False, 'pattern': None, 'after': None, 'before': None}
+        now = datetime.now(timezone.utc)
+        for token in tokens:
+            lowered = token.lower()
+            if token.startswith('<@'):
+                continue  # Mention đã lấy từ ctx.message.mentions
+            elif lowered.startswith('user:'):
+                user_ids.append(int(token[5:]))
+            elif lowered == 'bot':
+                options['bots_only'] = True
+            elif lowered == 'files':
+                options['attachments_only'] = True
+            elif lowered.startswith('regex:'):
+                options['pattern'] = token[6:]
+            elif lowered.startswith('after:'):
+                options['after'] = now - self._parse_age(token[6:])
+            elif lowered.startswith('before:'):
+                options['before'] = now - self._parse_age(token[7:])
+            else:
+                raise ValueError(f"Bộ lọc không hợp lệ: {token}")
+        return PurgeFilter(user_ids=user_ids, **options)
+    
+    @staticmethod
+    def _parse_age(value: str) -> timedelta:
+        """Parse khoảng thời gian dạng 30m, 2h, 7d"""
+        units = {'m': 'minutes', 'h': 'hours', 'd': 'days'}
+        if len(value) < 2 or value[-1].lower() not in units or not value[:-1].isdigit():
+            raise ValueError(f"Thời gian không hợp lệ: {value} (vd: 30m, 2h, 7d)")
+        return timedelta(**{units[value[-1].lower()]: int(value[:-1])})
+    
+    @staticmethod
+    def _format_throughput(result) -> str:
+        """Dòng thống kê tốc độ xóa"""
+        return (
+            f"Tổng cộng: {result.deleted} tin nhắn ({result.bulk_deleted} bulk, {result.single_deleted} cũ)\n"
+            f"Đã quét: {result.scanned} • {result.elapsed:.1f}s • {result.messages_per_second:.1f} tin/giây"
+        )
+    
     def setup_commands(self):
         """Thiết lập các lệnh purge"""
         
         @self.bot.command(name='purge')
-        async def purge_command(ctx, amount=None, limit=None):
+        async def purge_command(ctx, amount=None, *args):
             """
             Xóa tin nhắn hàng loạt trong kênh
             Chỉ Admin mới có quyền sử dụng
             
             Usage: 
             ;purge <số> - Xóa số tin nhắn cụ thể (1-100)
-            ;purge all - Xóa tất cả tin nhắn trong kênh
+            ;purge all - Xóa tất cả tin nhắn dưới 14 ngày trong kênh
+            ;purge all old - Xóa thêm tối đa 500 tin nhắn quá 14 ngày (xóa từng tin, chậm)
             ;purge bot [số] - Xóa tin nhắn của bot (tối đa 100, mặc định 50)
+            ;purge filter <số> <bộ lọc...> - Xóa tối đa <số> tin nhắn khớp bộ lọc
             """
+            limit = args[0] if args else None
             # Kiểm tra quyền admin
             if not self.bot_instance.has_warn_permission(ctx.author.id, ctx.author.guild_permissions):
                 embed = discord.Embed(
@@ -68,15 +135,17 @@ class PurgeCommands:
                     name="📝 Cách sử dụng",
                     value=(
                         "`;purge <số>` - Xóa số tin nhắn cụ thể (1-100)\n"
-                        "`;purge all` - Xóa tất cả tin nhắn trong kênh\n"
-                        "`;purge bot [số]` - Xóa tin nhắn bot (mặc định 50, tối đa 100)"
+                        "`;purge all` - Xóa tất cả tin nhắn dưới 14 ngày trong kênh\n"
+                        f"`;purge all old` - Xóa thêm tối đa {PURGE_ALL_OLD_MAX} tin nhắn quá 14 ngày\n"
+                        "`;purge bot [số]` - Xóa tin nhắn bot (mặc định 50, tối đa 100)\n"
+                        "`;purge filter <số> <bộ lọc>` - Lọc theo `@user` `user:<id>` `bot` `files` `regex:<mẫu>` `after:2h` `before:7d`"
                     ),
                     inline=False
                 )
                 
                 embed.add_field(
                     name="⚠️ Lưu ý quan trọng",
-                    value="• Tin nhắn đã xóa **KHÔNG THỂ KHÔI PHỤC**\n• Chỉ xóa được tin nhắn dưới 14 ngày\n• Cần quyền Admin để sử dụng",
+                    value="• Tin nhắn đã xóa **KHÔNG THỂ KHÔI PHỤC**\n• Tin nhắn quá 14 ngày phải xóa từng tin (~1 tin/giây)\n• Cần quyền Admin để sử dụng",
                     inline=False
                 )
                 
@@ -92,6 +161,15 @@ class PurgeCommands:
             
             # Xử lý purge all
             if amount.lower() == 'all':
+                # Tin nhắn quá 14 ngày chỉ xóa khi yêu cầu rõ (;purge all old), có giới hạn mỗi lần
+                include_old = bool(limit) and limit.lower() == 'old'
+                max_old = PURGE_ALL_OLD_MAX if include_old else 0
+                old_note = (
+                    f"• Xóa thêm tối đa **{PURGE_ALL_OLD_MAX}** tin nhắn quá 14 ngày, từng tin một (~1 tin/giây)"
+                    if include_old else
+                    "• Chỉ xóa tin nhắn dưới 14 ngày (dùng `;purge all old` để xóa cả tin cũ)"
+                )
+                
                 # Xác nhận trước khi xóa tất cả
                 confirm_embed = discord.Embed(
                     title="⚠️ XÁC NHẬN XÓA TẤT CẢ",
@@ -101,7 +179,7 @@ class PurgeCommands:
                 
                 confirm_embed.add_field(
                     name="🚨 Cảnh báo",
-                    value="• Hành động này **KHÔNG THỂ HOÀN TÁC**\n• Tất cả tin nhắn sẽ bị xóa vĩnh viễn\n• Chỉ xóa được tin nhắn dưới 14 ngày",
+                    value=f"• Hành động này **KHÔNG THỂ HOÀN TÁC**\n• Tất cả tin nhắn sẽ bị xóa vĩnh viễn\n{old_note}",
                     inline=False
                 )
                 
@@ -141,39 +219,21 @@ class PurgeCommands:
                     )
                     progress_msg = await ctx.send(embed=progress_embed)
                     
-                    deleted_count = 0
+                    async def update_progress(result):
+                        progress_embed.description = (
+                            f"Đã xóa {result.deleted} tin nhắn... "
+                            f"({result.messages_per_second:.1f} tin/giây)"
+                        )
+                        await progress_msg.edit(embed=progress_embed)
                     
-                    # Xóa theo batch để tránh rate limit
-                    while True:
-                        messages = []
-                        async for message in ctx.channel.history(limit=100):
-                            if message.id != progress_msg.id:  # Không xóa tin nhắn progress
-                                messages.append(message)
-                        
-                        if not messages:
-                            break
-                        
-                        # Xóa messages
-                        try:
-                            await ctx.channel.delete_messages(messages)
-                            deleted_count += len(messages)
-                            
-                            # Cập nhật progress
-                            if deleted_count % 50 == 0:  # Cập nhật mỗi 50 tin nhắn
-                                progress_embed.description = f"Đã xóa {deleted_count} tin nhắn..."
-                                await progress_msg.edit(embed=progress_embed)
-                        
-                        except discord.HTTPException:
-                            # Nếu bulk delete không được, xóa từng tin nhắn
-                            for message in messages:
-                                try:
-                                    await message.delete()
-                                    deleted_count += 1
-                                except:
-                                    pass
-                        
-                        # Delay để tránh rate limit
-                        await asyncio.sleep(1)
+                    # Quét lịch sử song song với bulk delete, tin nhắn cũ xóa từng tin ở worker riêng
+                    result = await self.engine.purge(
+                        ctx.channel,
+                        max_old=max_old,
+                        skip_ids={progress_msg.id},
+                        on_progress=update_progress
+                    )
+                    deleted_count = result.deleted
                     
                     # Thông báo hoàn thành
                     success_embed = discord.Embed(
@@ -191,10 +251,21 @@ class PurgeCommands:
                     
                     success_embed.add_field(
                         name="📊 Thống kê",
-                        value=f"Tổng cộng: {deleted_count} tin nhắn",
+                        value=self._format_throughput(result),
                         inline=True
                     )
                     
+                    if result.old_limit_reached:
+                        success_embed.add_field(
+                            name="🕰️ Tin nhắn cũ",
+                            value=(
+                                f"Đã xóa tối đa {PURGE_ALL_OLD_MAX} tin nhắn quá 14 ngày, chạy lại `;purge all old` để xóa tiếp"
+                                if include_old else
+                                "Còn tin nhắn quá 14 ngày chưa xóa - dùng `;purge all old` nếu cần xóa"
+                            ),
+                            inline=False
+                        )
+                    
                     await progress_msg.edit(embed=success_embed)
                     logger.info(f"Admin {ctx.author} đã purge all {deleted_count} tin nhắn trong {ctx.channel}")
                 
@@ -263,18 +334,17 @@ class PurgeCommands:
                     )
                     progress_msg = await ctx.send(embed=processing_embed)
                     
-                    # Tìm tin nhắn của bot
-                    bot_messages = []
-                    deleted_count = 0
-                    
-                    # Quét lịch sử kênh để tìm tin nhắn bot (giới hạn theo bot_limit)
-                    async for message in ctx.channel.history(limit=bot_limit * 3):  # Quét nhiều hơn để đảm bảo tìm đủ
-                        if message.author.bot and message.id != progress_msg.id:
-                            bot_messages.append(message)
-                            if len(bot_messages) >= bot_limit:
-                                break
+                    # Quét và xóa tin nhắn bot (dừng khi đủ bot_limit tin, quét tối đa 10 lần số đó)
+                    result = await self.engine.purge(
+                        ctx.channel,
+                        limit=bot_limit * 10,
+                        message_filter=PurgeFilter(bots_only=True),
+                        max_matches=bot_limit,
+                        skip_ids={progress_msg.id}
+                    )
+                    deleted_count = result.deleted
                     
-                    if not bot_messages:
+                    if not result.matched:
                         no_msg_embed = discord.Embed(
                             title="⚠️ Không tìm thấy tin nhắn bot",
                             description="Không có tin nhắn nào của bot để xóa trong kênh này!",
@@ -289,29 +359,6 @@ class PurgeCommands:
                             pass
                         return
                     
-                    # Xóa tin nhắn bot theo batch
-                    batch_size = 100
-                    for i in range(0, len(bot_messages), batch_size):
-                        batch = bot_messages[i:i + batch_size]
-                        try:
-                            await ctx.channel.delete_messages(batch)
-                            deleted_count += len(batch)
-                        except discord.HTTPException:
-                            # Nếu bulk delete không được, xóa từng tin nhắn
-                            for msg in batch:
-                                try:
-                                    await msg.delete()
-                                    deleted_count += 1
-                                    await asyncio.sleep(0.5)
-                                except:
-                                    pass
-                        
-                        # Cập nhật progress nếu có nhiều batch
-                        if len(bot_messages) > batch_size and i + batch_size < len(bot_messages):
-                            processing_embed.description = f"Đã xóa {deleted_count}/{len(bot_messages)} tin nhắn bot..."
-                            await progress_msg.edit(embed=processing_embed)
-                            await asyncio.sleep(1)
-                    
                     # Thông báo kết quả
                     success_embed = discord.Embed(
                         title="🤖 Xóa tin nhắn bot hoàn tất",
@@ -334,7 +381,7 @@ class PurgeCommands:
                     
                     success_embed.add_field(
                         name="📊 Thống kê",
-                        value=f"Tổng cộng: {deleted_count} tin nhắn bot",
+                        value=self._format_throughput(result),
                         inline=False
                     )
                     
@@ -370,6 +417,105 @@ class PurgeCommands:
                 
                 return
             
+            # Xử lý purge theo bộ lọc
+            if amount.lower() == 'filter':
+                try:
+                    max_matches = int(args[0]) if args else 0
+                    if not 1 <= max_matches <= PURGE_FILTER_MAX:
+                        raise ValueError(f"Số tin nhắn phải từ 1 đến {PURGE_FILTER_MAX}")
+                    message_filter = self._parse_filter(ctx, args[1:])
+                    if message_filter.is_empty and not (message_filter.after or message_filter.before):
+                        raise ValueError("Cần ít nhất 1 bộ lọc (dùng `;purge <số>` để xóa không lọc)")
+                except (ValueError, re.error) as e:
+                    embed = discord.Embed(
+                        title="❌ Tham số không hợp lệ",
+                        description=str(e),
+                        color=discord.Color.red()
+                    )
+                    embed.add_field(
+                        name="💡 Ví dụ",
+                        value=(
+                            "`;purge filter 50 @user` - Xóa 50 tin nhắn gần nhất của user\n"
+                            "`;purge filter 200 regex:discord\\.gg after:1h` - Xóa tin có invite link trong 1 giờ qua\n"
+                            "`;purge filter 100 files before:7d` - Xóa tin có file cũ hơn 7 ngày"
+                        ),
+                        inline=False
+                    )
+                    await ctx.reply(embed=embed, mention_author=True)
+                    return
+                
+                try:
+                    await ctx.message.delete()
+                    
+                    progress_embed = discord.Embed(
+                        title="🔍 Đang lọc và xóa tin nhắn...",
+                        description=f"Bộ lọc: {message_filter.describe()}",
+                        color=discord.Color.yellow()
+                    )
+                    progress_msg = await ctx.send(embed=progress_embed)
+                    
+                    async def update_progress(result):
+                        progress_embed.description = (
+                            f"Bộ lọc: {message_filter.describe()}\n"
+                            f"Đã quét {result.scanned} • Đã xóa {result.deleted}/{max_matches} "
+                            f"({result.messages_per_second:.1f} tin/giây)"
+                        )
+                        await progress_msg.edit(embed=progress_embed)
+                    
+                    result = await self.engine.purge(
+                        ctx.channel,
+                        limit=PURGE_FILTER_SCAN_LIMIT,
+                        message_filter=message_filter,
+                        max_matches=max_matches,
+                        skip_ids={progress_msg.id},
+                        on_progress=update_progress
+                    )
+                    
+                    success_embed = discord.Embed(
+                        title="✅ Xóa theo bộ lọc hoàn tất",
+                        description=f"Bộ lọc: {message_filter.describe()}",
+                        color=discord.Color.green(),
+                        timestamp=datetime.now()
+                    )
+                    success_embed.add_field(
+                        name="👤 Thực hiện bởi",
+                        value=ctx.author.mention,
+                        inline=True
+                    )
+                    success_embed.add_field(
+                        name="📊 Thống kê",
+                        value=self._format_throughput(result),
+                        inline=False
+                    )
+                    success_embed.set_footer(text="Tin nhắn này sẽ tự xóa sau 10 giây")
+                    await progress_msg.edit(embed=success_embed)
+                    logger.info(f"Admin {ctx.author} đã purge filter {result.deleted} tin nhắn trong {ctx.channel}: {result.to_dict()}")
+                    
+                    await asyncio.sleep(10)
+                    try:
+                        await progress_msg.delete()
+                    except:
+                        pass
+                
+                except discord.Forbidden:
+                    embed = discord.Embed(
+                        title="❌ Không có quyền",
+                        description="Bot không có quyền xóa tin nhắn trong kênh này!",
+                        color=discord.Color.red()
+                    )
+                    await ctx.send(embed=embed)
+                
+                except Exception as e:
+                    error_embed = discord.Embed(
+                        title="❌ Lỗi khi xóa theo bộ lọc",
+                        description=f"Có lỗi xảy ra: {str(e)}",
+                        color=discord.Color.red()
+                    )
+                    await ctx.send(embed=error_embed)
+                    logger.error(f"Lỗi trong purge filter: {e}")
+                
+                return
+            
             # Xử lý purge số lượng cụ thể
             try:
                 delete_count = int(amount)
@@ -421,12 +567,11 @@ class PurgeCommands:
                 # Xóa tin nhắn command trước
                 await ctx.message.delete()
                 
-                # Lấy tin nhắn cần xóa (không bao gồm tin nhắn command)
-                messages_to_delete = []
-                async for message in ctx.channel.history(limit=delete_count):
-                    messages_to_delete.append(message)
+                # Xóa tin nhắn (không bao gồm tin nhắn command)
+                result = await self.engine.purge(ctx.channel, limit=delete_count)
+                actual_deleted = result.deleted
                 
-                if not messages_to_delete:
+                if not result.scanned:
                     embed = discord.Embed(
                         title="⚠️ Không có tin nhắn",
                         description="Không tìm thấy tin nhắn nào để xóa!",
@@ -435,10 +580,6 @@ class PurgeCommands:
                     await ctx.send(embed=embed)
                     return
                 
-                # Xóa tin nhắn
-                deleted_messages = await ctx.channel.purge(limit=delete_count)
-                actual_deleted = len(deleted_messages)
-                
                 # Thông báo kết quả (tự xóa sau 5 giây)
                 success_embed = discord.Embed(
                     title="✅ Xóa thành công",
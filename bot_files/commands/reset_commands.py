@@ -8,8 +8,10 @@ import json
 import os
 import logging
 import asyncio
+import shutil
 from datetime import datetime
 from pathlib import Path
+from utils.game_stats_store import game_stats, LEGACY_STATS_FILES
 
 logger = logging.getLogger(__name__)
 
@@ -18,14 +20,9 @@ class ResetCommands:
         self.bot_instance = bot_instance
         self.bot = bot_instance.bot
         
-        # Đường dẫn các file dữ liệu
+        # Đường dẫn các file dữ liệu (thống kê game nằm trong game stats store, không ở đây)
         self.data_files = {
             'shared_wallet': 'data/shared_wallet.json',
-            'taixiu_data': 'data/taixiu_data.json',
-            'rps_data': 'data/rps_data.json', 
-            'slot_data': 'data/slot_data.json',
-            'blackjack_data': 'data/blackjack_data.json',
-            'flip_data': 'data/flip_data.json',
             'daily_data': 'data/daily_data.json',
             'shop_data': 'data/shop_data.json',
             'weekly_leaderboard': 'data/weekly_leaderboard.json'
@@ -122,7 +119,7 @@ class ResetCommands:
             
             confirm_embed.add_field(
                 name="🎮 Games có dữ liệu:",
-                value="\n".join([f"• {game}" for game in games_data.keys()]) or "Không có",
+                value="\n".join([f"• {game}" for game, data in games_data.items() if data]) or "Không có",
                 inline=False
             )
             
@@ -167,12 +164,11 @@ class ResetCommands:
                 self.bot_instance.shared_wallet.set_balance(user.id, 0)
                 reset_summary['files_affected'].append('shared_wallet')
             
-            # 2. Reset từng game
+            # 2. Reset thống kê từng game
             for game_name, data in games_data.items():
-                if data:  # Nếu có dữ liệu
-                    self.reset_user_from_file(user_id, self.data_files.get(f'{game_name}_data'))
+                if data and self.reset_user_stats(user_id, game_name):
                     reset_summary['games_reset'].append(game_name)
-                    reset_summary['files_affected'].append(f'{game_name}_data')
+                    reset_summary['files_affected'].append(f'game_stats/{game_name}')
             
             # 3. Reset shop data
             if os.path.exists(self.data_files['shop_data']):
@@ -333,6 +329,18 @@ class ResetCommands:
                     except Exception as e:
                         logger.error(f"Lỗi khi reset file {file_path}: {e}")
             
+            # Reset thống kê games qua store (bảng trong RAM + file compact)
+            for game_name in LEGACY_STATS_FILES:
+                table = game_stats.table(game_name)
+                try:
+                    if os.path.exists(table.data_file):
+                        shutil.copy2(table.data_file, f"{table.data_file}.backup_{int(datetime.now().timestamp())}")
+                    table.clear()
+                    table.save()
+                    files_reset.append(f'game_stats/{game_name}')
+                except Exception as e:
+                    logger.error(f"Lỗi khi reset thống kê {game_name}: {e}")
+            
             # Reload shared wallet
             if hasattr(self.bot_instance, 'shared_wallet'):
                 self.bot_instance.shared_wallet.reload_data()
@@ -392,7 +400,12 @@ class ResetCommands:
             user_id = str(user.id)
             games_reset = []
             
-            # Reset từng game (trừ shared_wallet)
+            # Reset thống kê từng game
+            for game_name in LEGACY_STATS_FILES:
+                if self.reset_user_stats(user_id, game_name):
+                    games_reset.append(game_name)
+            
+            # Reset các file dữ liệu khác (trừ shared_wallet)
             game_files = {k: v for k, v in self.data_files.items() if k != 'shared_wallet'}
             
             for game_name, file_path in game_files.items():
@@ -507,7 +520,10 @@ class ResetCommands:
                 )
             
             # Thống kê files
-            file_stats = []
+            file_stats = [
+                f"• **game_stats/{game_name}**: {len(game_stats.table(game_name))} entries"
+                for game_name in LEGACY_STATS_FILES
+            ]
             for file_name, file_path in self.data_files.items():
                 if os.path.exists(file_path):
                     try:
@@ -548,26 +564,16 @@ class ResetCommands:
             await ctx.reply(f"❌ Có lỗi xảy ra: {str(e)}", mention_author=True)
     
     def get_user_games_data(self, user_id):
-        """Lấy dữ liệu games của user từ tất cả files"""
-        games_data = {}
-        
-        game_files = {k: v for k, v in self.data_files.items() if k != 'shared_wallet'}
-        
-        for game_name, file_path in game_files.items():
-            if os.path.exists(file_path):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        if user_id in data:
-                            games_data[game_name] = data[user_id]
-                        else:
-                            games_data[game_name] = None
-                except:
-                    games_data[game_name] = None
-            else:
-                games_data[game_name] = None
-        
-        return games_data
+        """Lấy thống kê games của user từ game stats store (None nếu chưa chơi)"""
+        return {game_name: game_stats.table(game_name).get(user_id) for game_name in LEGACY_STATS_FILES}
+    
+    def reset_user_stats(self, user_id, game_name):
+        """Xóa thống kê 1 game của user qua game stats store"""
+        table = game_stats.table(game_name)
+        if table.pop(user_id) is None:
+            return False
+        table.save()
+        return True
     
     def reset_user_from_file(self, user_id, file_path):
         """Reset user khỏi 1 file cụ thể"""
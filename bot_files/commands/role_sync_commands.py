@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Role Sync Commands - Đồng bộ/gán role hàng loạt chạy nền
+Chỉ Admin mới có quyền sử dụng
+"""
+import discord
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Nhóm member cho ;rolesync give/take
+MEMBER_GROUPS = {
+    'all': lambda member: True,
+    'humans': lambda member: not member.bot,
+    'bots': lambda member: member.bot,
+}
+
+# Quyền nguy hiểm - không cho give/take hàng loạt role mang các quyền này
+DANGEROUS_PERMISSIONS = ('administrator', 'manage_guild', 'manage_roles', 'ban_members')
+
+class RoleSyncCommands:
+    def __init__(self, bot_instance):
+        self.bot_instance = bot_instance
+        self.bot = bot_instance.bot
+        self.role_sync = bot_instance.role_sync
+        self.setup_commands()
+    
+    async def _ensure_members(self, guild: discord.Guild) -> None:
+        """Bot không chunk member lúc khởi động - tải đủ member trước khi tính chênh lệch"""
+        if not guild.chunked:
+            await guild.chunk()
+    
+    def _check_role_permission(self, ctx, role: discord.Role) -> Optional[str]:
+        """
+        Kiểm tra người chạy lệnh có được give/take role này không (chống leo quyền)
+        
+        Returns:
+            str: Lý do từ chối, None nếu được phép
+        """
+        dangerous = [perm for perm in DANGEROUS_PERMISSIONS if getattr(role.permissions, perm)]
+        if dangerous:
+            return f"Role {role.mention} có quyền nguy hiểm ({', '.join(dangerous)}), không thể give/take hàng loạt!"
+        if not ctx.author.guild_permissions.manage_roles:
+            return "Bạn cần quyền `Manage Roles` để give/take role!"
+        if ctx.author.id == ctx.guild.owner_id or self.bot_instance.is_supreme_admin(ctx.author.id):
+            return None
+        if role >= ctx.author.top_role:
+            return f"Role {role.mention} cao hơn hoặc bằng role cao nhất của bạn!"
+        return None
+    
+    def _build_status_embed(self, guild: discord.Guild) -> discord.Embed:
+        embed = discord.Embed(
+            title="🔄 Role Sync",
+            color=discord.Color.blue()
+        )
+        embed.add_field(
+            name="📏 Rule",
+            value="\n".join(
+                f"`{rule.key}` → **{rule.role_name}** ({'theo danh sách đã nhận' if rule.tracked else 'thêm/gỡ theo trạng thái'})"
+                for rule in self.role_sync.rules.values()
+            ) or "Chưa có rule",
+            inline=False
+        )
+        jobs = self.role_sync.get_jobs(guild.id)[-5:]
+        if jobs:
+            embed.add_field(
+                name="📋 Job gần đây",
+                value="\n".join(
+                    f"#{job.id} `{job.label}`: {job.processed}/{job.total} "
+                    f"(+{job.added} -{job.removed}, bỏ qua {job.skipped}, lỗi {job.failed}) {'✅' if job.done else '⏳'}"
+                    for job in reversed(jobs)
+                ),
+                inline=False
+            )
+        stats = self.role_sync.get_stats()
+        embed.set_footer(text=f"Đang chờ {stats['pending_ops']} thao tác • Cache {stats['cached_roles']} role")
+        return embed
+    
+    def _build_job_embed(self, job, role: discord.Role) -> discord.Embed:
+        if not job.total:
+            return discord.Embed(
+                title="✅ Role Sync",
+                description=f"Role {role.mention} đã đúng với mọi member, không cần thay đổi.",
+                color=discord.Color.green()
+            )
+        embed = discord.Embed(
+            title="🔄 Role Sync",
+            description=f"Đã xếp **{job.total}** thao tác với role {role.mention} vào hàng đợi (job #{job.id}).",
+            color=discord.Color.blue()
+        )
+        embed.set_footer(text="Chạy nền có giới hạn tốc độ • ;rolesync status để xem tiến độ")
+        return embed
+    
+    def setup_commands(self):
+        """Setup role sync commands"""
+        
+        @self.bot.command(name='rolesync')
+        async def rolesync_command(ctx, action: str = None, role: discord.Role = None, target: str = 'humans'):
+            """
+            Đồng bộ/gán role hàng loạt (Admin only)
+            
+            Usage:
+            ;rolesync - Xem rule và tiến độ job
+            ;rolesync <rule> - Đồng bộ role theo rule (muted, conbac)
+            ;rolesync give|take @role [all|humans|bots|@role] - Thêm/gỡ role cho nhóm member
+            """
+            if ctx.guild is None:
+                await ctx.reply("❌ Lệnh này chỉ dùng trong server!", mention_author=True)
+                return
+            if not self.bot_instance.has_warn_permission(ctx.author.id, ctx.author.guild_permissions):
+                await ctx.reply(f"{ctx.author.mention} ❌ Bạn không có quyền sử dụng lệnh này!", mention_author=True)
+                return
+            
+            action = (action or 'status').lower()
+            if action == 'status':
+                await ctx.reply(embed=self._build_status_embed(ctx.guild), mention_author=True)
+                return
+            
+            if action in self.role_sync.rules:
+                await self._ensure_members(ctx.guild)
+                job = await self.role_sync.reconcile(ctx.guild, action)
+                if job is None:
+                    await ctx.reply(f"{ctx.author.mention} ❌ Bot không có quyền tạo role trong server này!", mention_author=True)
+                    return
+                role = await self.role_sync.get_rule_role(ctx.guild, action, create=False)
+                await ctx.reply(embed=self._build_job_embed(job, role), mention_author=True)
+                logger.info(f"{ctx.author} ({ctx.author.id}) chạy role sync '{action}' trong {ctx.guild.name}: {job.total} thao tác")
+                return
+            
+            if action not in ('give', 'take') or role is None:
+                rules = '|'.join(self.role_sync.rules)
+                await ctx.reply(
+                    f"{ctx.author.mention} ❌ Sử dụng: `;rolesync [{rules}]` hoặc `;rolesync give|take @role [all|humans|bots|@role]`",
+                    mention_author=True
+                )
+                return
+            
+            if role >= ctx.guild.me.top_role or role.managed:
+                await ctx.reply(f"{ctx.author.mention} ❌ Bot không thể quản lý role {role.mention}!", mention_author=True)
+                return
+            
+            denied = self._check_role_permission(ctx, role)
+            if denied:
+                await ctx.reply(f"{ctx.author.mention} ❌ {denied}", mention_author=True)
+                return
+            
+            await self._ensure_members(ctx.guild)
+            source_role = None
+            if target.startswith('<@&') and target.endswith('>') and target[3:-1].isdigit():
+                source_role = ctx.guild.get_role(int(target[3:-1]))
+            if source_role is not None:
+                member_ids = [member.id for member in source_role.members]
+            elif target.lower() in MEMBER_GROUPS:
+                group = MEMBER_GROUPS[target.lower()]
+                member_ids = [member.id for member in ctx.guild.members if group(member)]
+            else:
+                await ctx.reply(f"{ctx.author.mention} ❌ Nhóm member không hợp lệ: `{target}`", mention_author=True)
+                return
+            
+            job = self.role_sync.assign(ctx.guild, role, member_ids, add=action == 'give')
+            await ctx.reply(embed=self._build_job_embed(job, role), mention_author=True)
+            logger.info(f"{ctx.author} ({ctx.author.id}) {action} role {role.name} cho {job.total} member trong {ctx.guild.name}")
+    
+    def register_commands(self):
+        """Register all commands"""
+        logger.info("Role sync commands đã được đăng ký")
@@ -8,6 +8,8 @@ from datetime import datetime
 import logging
 import asyncio
 from utils.shared_wallet import shared_wallet
+from utils.game_stats_store import game_stats
+from utils.game_session_manager import game_sessions
 
 logger = logging.getLogger(__name__)
 
@@ -20,30 +22,19 @@ class RPSCommands(BaseCommand):
         self.rps_data = self.load_rps_data()
         
         # Tracking game đang chạy
-        self.active_games = set()  # Set chứa user_id của những user đang có game chạy
+        self.active_games = game_sessions.configure_game('rps', idle_timeout=60)  # Phiên game đang chạy theo user_id
         
         # Player data file riêng cho RPS
         self.player_data_file = 'data/rps_players.json'
         self.player_data = self.load_player_data()
     
     def load_rps_data(self):
-        """Load dữ liệu RPS từ file"""
-        try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return {}
-        except Exception as e:
-            logger.error(f"Lỗi khi load RPS data: {e}")
-            return {}
+        """Load dữ liệu RPS từ game stats store (tự migrate từ file cũ)"""
+        return game_stats.table('rps', legacy_file=self.data_file)
     
     def save_rps_data(self):
         """Lưu dữ liệu RPS vào file"""
-        try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.rps_data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"Lỗi khi save RPS data: {e}")
+        self.rps_data.save()
     
     def load_player_data(self):
         """Load dữ liệu người chơi từ file JSON"""
@@ -71,16 +62,14 @@ class RPSCommands(BaseCommand):
     
     def start_game_for_user(self, user_id: int) -> bool:
         """Bắt đầu game cho user (thêm vào active games)"""
-        if user_id in self.active_games:
+        if self.active_games.start(user_id) is None:
             return False
-        self.active_games.add(user_id)
         logger.info(f"Started RPS game for user {user_id}. Active games: {len(self.active_games)}")
         return True
     
     def end_game_for_user(self, user_id: int) -> None:
         """Kết thúc game cho user (xóa khỏi active games)"""
-        if user_id in self.active_games:
-            self.active_games.remove(user_id)
+        if self.active_games.end(user_id) is not None:
             logger.info(f"Ended RPS game for user {user_id}. Active games: {len(self.active_games)}")
     
     def get_user_data(self, user_id):
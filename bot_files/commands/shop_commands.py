@@ -19,8 +19,6 @@ class ShopCommands:
         self.shop_data = self.load_shop_data()
         self.shop_config = self.load_shop_config()
         self.pending_orders = self.load_pending_orders()
-        self.daily_purchases_file = 'data/daily_purchases.json'
-        self.daily_purchases = self.load_daily_purchases()
         
         # EXP Rare packages removed - only Gmail and TikTok now
         self.exp_packages = {}
@@ -105,26 +103,6 @@ class ShopCommands:
         except Exception as e:
             logger.error(f"Lỗi khi save pending orders: {e}")
     
-    def load_daily_purchases(self):
-        """Load daily purchases from file"""
-        if os.path.exists(self.daily_purchases_file):
-            try:
-                with open(self.daily_purchases_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.error(f"Lỗi khi load daily purchases: {e}")
-                return {}
-        return {}
-    
-    def save_daily_purchases(self):
-        """Save daily purchases to file"""
-        try:
-            os.makedirs(os.path.dirname(self.daily_purchases_file), exist_ok=True)
-            with open(self.daily_purchases_file, 'w', encoding='utf-8') as f:
-                json.dump(self.daily_purchases, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"Lỗi khi save daily purchases: {e}")
-    
     # check_purchase_eligibility removed - no restrictions for Gmail/TikTok
     
     # record_daily_purchase removed - no daily restrictions for Gmail/TikTok
@@ -182,15 +182,29 @@ class SlashCommands(BaseCommand):
     # Giveaway commands được đăng ký trong giveaway_commands.py
     # Chỉ còn lại /dm và /chat ở đây
     
-    async def sync_commands(self):
+    async def sync_commands(self, force: bool = False):
         """
-        Sync slash commands với Discord
+        Sync slash commands với Discord (bỏ qua nếu cây lệnh không đổi so với lần sync trước)
+        
+        Config `dev_guild_ids` (list ID server) bật chế độ dev: chỉ sync vào các server đó
+        (cập nhật ngay) thay vì sync global.
+        
+        Returns:
+            int: Số lệnh đã sync, 0 nếu không cần sync hoặc lỗi
         """
+        syncer = self.bot_instance.command_sync
+        dev_guild_ids = self.bot_instance.config.get('dev_guild_ids') or []
         try:
-            synced = await self.bot.tree.sync()
-            logger.info(f"Synced {len(synced)} slash command(s)")
-            print(f"✅ Successfully synced {len(synced)} slash commands")
-            return len(synced)
+            if dev_guild_ids:
+                results = await syncer.sync_dev_guilds(dev_guild_ids, force=force)
+                synced = sum(count for count in results.values() if count)
+            else:
+                synced = await syncer.sync(force=force) or 0
+            if synced:
+                print(f"✅ Successfully synced {synced} slash commands")
+            else:
+                print(f"✅ Slash commands không đổi, không cần sync ({syncer.fingerprint()[:12]})")
+            return synced
         except Exception as e:
             logger.error(f"Failed to sync slash commands: {e}")
             print(f"❌ Failed to sync slash commands: {e}")
@@ -198,22 +212,8 @@ class SlashCommands(BaseCommand):
     
     async def force_sync_commands(self):
         """
-        Force sync slash commands (clear cache first)
+        Force sync slash commands (bỏ qua so sánh fingerprint)
         """
-        try:
-            # Clear command tree first
-            self.bot.tree.clear_commands()
-            logger.info("Cleared command tree")
-            
-            # Re-register all commands
-            await self.register_commands()
-            
-            # Sync with Discord
-            synced = await self.bot.tree.sync()
-            logger.info(f"Force synced {len(synced)} slash command(s)")
-            print(f"🔄 Force synced {len(synced)} slash commands")
-            return len(synced)
-        except Exception as e:
-            logger.error(f"Failed to force sync slash commands: {e}")
-            print(f"❌ Failed to force sync: {e}")
-            return 0
+        synced = await self.sync_commands(force=True)
+        print(f"🔄 Force synced {synced} slash commands")
+        return synced
@@ -2,11 +2,10 @@ import discord
 from discord.ext import commands
 from .base import BaseCommand
 import random
-import json
-import os
 from datetime import datetime
 import logging
 from utils.shared_wallet import shared_wallet
+from utils.game_stats_store import game_stats
 
 logger = logging.getLogger(__name__)
 
@@ -37,23 +36,19 @@ class SlotCommands(BaseCommand):
             self.weighted_symbols.extend([symbol] * data["weight"])
     
     def load_slot_data(self):
-        """Load dữ liệu slot từ file"""
-        try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return {}
-        except Exception as e:
-            logger.error(f"Lỗi khi load slot data: {e}")
-            return {}
+        """Load dữ liệu slot từ game stats store (tự migrate từ file cũ)"""
+        return game_stats.table('slot', legacy_file=self.data_file)
     
     def save_slot_data(self):
         """Lưu dữ liệu slot vào file"""
-        try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.slot_data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"Lỗi khi save slot data: {e}")
+        self.slot_data.save()
+    
+    def snapshot(self) -> dict:
+        """State giữ lại khi ;reload: user đang quay"""
+        return {'active_games': self.active_games}
+    
+    def restore(self, state: dict) -> None:
+        self.active_games = state['active_games']
     
     def is_user_playing(self, user_id: int) -> bool:
         """Kiểm tra xem user có đang chơi game không"""
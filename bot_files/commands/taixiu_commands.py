@@ -12,9 +12,47 @@ import asyncio
 from datetime import datetime
 from typing import Dict, Optional
 from utils.shared_wallet import shared_wallet
+from utils.game_stats_store import game_stats
+from utils.daily_quota import daily_quota
 
 logger = logging.getLogger(__name__)
 
+GAMBLER_ROLE_NAME = "Con Bạc"
+
+# Emoji mặt xúc xắc 1-6
+DICE_EMOJIS = ("1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣")
+
+# Frame animation quay xúc xắc theo step (None = mặt ngẫu nhiên)
+ROLLING_FRAMES = (
+    ("🎲", "🎲", "🎲"),
+    ("🎯", "🎲", "🎲"),
+    (None, "🎯", "🎲"),
+    (None, None, "🎯"),
+    ("🎲", "🎲", "🎲"),
+    (None, "🎲", "🎲"),
+    ("🎲", "🎲", "🎲"),
+)
+
+# Chế độ animation quay xúc xắc (cấu hình theo từng server)
+#   frames  - 6 frame, mỗi frame 1 lần edit (kiểu cũ, tốn nhiều REST edit nhất)
+#   single  - gửi 1 embed đang quay (kèm GIF nếu server có cấu hình), edit 1 lần ra kết quả
+#   instant - không animation, gửi thẳng kết quả
+ANIMATION_MODES = ('frames', 'single', 'instant')
+DEFAULT_ANIMATION_MODE = 'single'
+DEFAULT_ANIMATION_DELAY = 1.5  # Giây chờ trước khi hiện kết quả ở chế độ single
+DEFAULT_MAX_CONCURRENT_ANIMATIONS = 10
+
+ROLLING_TEXTS = (
+    "🎯 Chuẩn bị quay...",
+    "🎲 Xúc xắc đang bay...",
+    "⚡ Sắp có kết quả...",
+    "🔥 Căng thẳng quá...",
+    "💫 Gần xong rồi...",
+    "🎊 Sắp ra kết quả...",
+    "✨ Hoàn thành!"
+)
+
+
 class TaiXiuCommands:
     def __init__(self, bot_instance):
         """
@@ -28,8 +66,8 @@ class TaiXiuCommands:
         self.player_data_file = 'data/taixiu_players.json'
         self.player_data = self.load_player_data()
         self.shared_wallet = shared_wallet
-        self.daily_give_file = 'data/daily_give_limits.json'
-        self.daily_give_data = self.load_daily_give_data()
+        self.daily_give_file = 'data/daily_give_limits.json'  # File cũ, chỉ dùng để migrate
+        self.daily_give = daily_quota.counter('taixiu_give', legacy_file=self.daily_give_file)
         self.min_bet = 1  # Cược tối thiểu (chỉ > 0)
         self.max_bet = 250000  # Giới hạn max cược 250k
         self.starting_money = 5000  # Tiền khởi tạo cho người chơi mới
@@ -37,41 +75,47 @@ class TaiXiuCommands:
         # Tracking game đang chạy
         self.active_games = set()  # Set chứa user_id của những user đang có game chạy
         
+        # Cấu hình animation theo server + giới hạn số animation chạy cùng lúc
+        self.animation_config_file = 'data/taixiu_animation.json'
+        self.animation_config = self.load_animation_config()
+        # 'in_flight' = số animation đang giữ slot (không tách riêng để ;reload dùng chung 1 dict)
+        self.animation_stats = {'in_flight': 0, 'frames': 0, 'single': 0, 'instant': 0, 'capped': 0, 'edits': 0}
+        
+        # Role Con Bạc: lưu danh sách người đã nhận để ;rolesync conbac khôi phục khi role bị tạo lại
+        bot_instance.role_sync.register_rule(
+            'conbac', GAMBLER_ROLE_NAME,
+            color=discord.Color.gold(),
+            reason="Role cho người chơi tài xỉu"
+        )
+        
         logger.info("TaiXiu Commands đã được khởi tạo")
     
-    def load_player_data(self) -> Dict:
+    def snapshot(self) -> dict:
+        """State giữ lại khi ;reload: ván đang chạy và bộ đếm animation"""
+        return {
+            'active_games': self.active_games,
+            'animation_stats': self.animation_stats,
+        }
+    
+    def restore(self, state: dict) -> None:
+        self.active_games = state['active_games']
+        # Dùng chung dict với instance cũ: animation đang chạy của instance cũ trả slot vào đúng bộ đếm này
+        self.animation_stats = state['animation_stats']
+    
+    def load_player_data(self):
         """
-        Tải dữ liệu người chơi từ file JSON
+        Tải dữ liệu người chơi từ game stats store (tự migrate từ file JSON cũ)
         
         Returns:
-            Dict: Dữ liệu người chơi
+            GameStatsTable: Bảng thống kê tài xỉu
         """
-        try:
-            if os.path.exists(self.player_data_file):
-                with open(self.player_data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                logger.info(f"Đã tải dữ liệu {len(data)} người chơi tài xỉu")
-                return data
-            else:
-                logger.info("Không tìm thấy file dữ liệu tài xỉu, tạo mới")
-                return {}
-        except Exception as e:
-            logger.error(f"Lỗi khi tải dữ liệu tài xỉu: {e}")
-            return {}
+        return game_stats.table('taixiu', legacy_file=self.player_data_file)
     
     def save_player_data(self) -> None:
         """
-        Lưu dữ liệu người chơi vào file JSON
+        Lưu dữ liệu người chơi vào file
         """
-        try:
-            # Tạo thư mục data nếu chưa có
-            os.makedirs(os.path.dirname(self.player_data_file), exist_ok=True)
-            
-            with open(self.player_data_file, 'w', encoding='utf-8') as f:
-                json.dump(self.player_data, f, indent=4, ensure_ascii=False)
-            logger.info("Đã lưu dữ liệu tài xỉu thành công")
-        except Exception as e:
-            logger.error(f"Lỗi khi lưu dữ liệu tài xỉu: {e}")
+        self.player_data.save()
     
     def is_admin(self, user_id: int, guild_permissions) -> bool:
         """
@@ -111,7 +155,6 @@ class TaiXiuCommands:
                 'losses': 0,
                 'total_bet': 0,
                 'total_win': 0,
-                'winrate': 0.0,
                 'games_10m_plus': 0,  # Số game với cược >= 10M
                 'created_at': datetime.now().isoformat(),
                 'last_played': datetime.now().isoformat()
@@ -174,53 +217,21 @@ class TaiXiuCommands:
             self.player_data[user_id_str]['lose_streak'] = current_streak + 1
             logger.info(f"User {user_id} lost taixiu - lose streak: {self.player_data[user_id_str]['lose_streak']}")
         
-        # Cập nhật winrate
-        total_games = self.player_data[user_id_str]['total_games']
-        wins = self.player_data[user_id_str]['wins']
-        self.player_data[user_id_str]['winrate'] = (wins / total_games * 100) if total_games > 0 else 0
+        # Winrate được tính khi đọc từ record, không cần lưu
         
         self.save_player_data()
     
-    def load_daily_give_data(self) -> Dict:
-        """Load daily give limit data"""
-        try:
-            if os.path.exists(self.daily_give_file):
-                with open(self.daily_give_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return {}
-        except Exception as e:
-            logger.error(f"Lỗi khi load daily give data: {e}")
-            return {}
-    
-    def save_daily_give_data(self) -> None:
-        """Save daily give limit data"""
-        try:
-            os.makedirs(os.path.dirname(self.daily_give_file), exist_ok=True)
-            with open(self.daily_give_file, 'w', encoding='utf-8') as f:
-                json.dump(self.daily_give_data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"Lỗi khi save daily give data: {e}")
-    
     def get_daily_give_amount(self, user_id: int) -> int:
         """Lấy số tiền đã give trong ngày hôm nay"""
-        today = datetime.now().strftime('%Y-%m-%d')
-        user_str = str(user_id)
-        
-        if user_str not in self.daily_give_data:
-            self.daily_give_data[user_str] = {}
-        
-        return self.daily_give_data[user_str].get(today, 0)
+        return self.daily_give.get(user_id)
     
     def add_daily_give_amount(self, user_id: int, amount: int) -> None:
-        """Thêm số tiền đã give vào tracking hôm nay"""
-        today = datetime.now().strftime('%Y-%m-%d')
-        user_str = str(user_id)
-        
-        if user_str not in self.daily_give_data:
-            self.daily_give_data[user_str] = {}
-        
-        self.daily_give_data[user_str][today] = self.daily_give_data[user_str].get(today, 0) + amount
-        self.save_daily_give_data()
+        """Thêm số tiền đã give vào tracking hôm nay (lưu file theo lô)"""
+        self.daily_give.add(user_id, amount)
+    
+    def shutdown(self) -> None:
+        """Lưu các thay đổi quota đang chờ ghi khi tắt bot"""
+        daily_quota.stop()
     
     def give_money_to_player(self, user_id: int, amount: int) -> None:
         """
@@ -392,6 +403,109 @@ class TaiXiuCommands:
         
         return dice1, dice2, dice3
     
+    def load_animation_config(self) -> Dict:
+        """Load cấu hình animation theo server"""
+        config = {'max_concurrent': DEFAULT_MAX_CONCURRENT_ANIMATIONS, 'guilds': {}}
+        try:
+            if os.path.exists(self.animation_config_file):
+                with open(self.animation_config_file, 'r', encoding='utf-8') as f:
+                    config.update(json.load(f))
+        except Exception as e:
+            logger.error(f"Lỗi khi load taixiu animation config: {e}")
+        return config
+    
+    def save_animation_config(self) -> None:
+        """Save cấu hình animation theo server"""
+        try:
+            os.makedirs(os.path.dirname(self.animation_config_file), exist_ok=True)
+            with open(self.animation_config_file, 'w', encoding='utf-8') as f:
+                json.dump(self.animation_config, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            logger.error(f"Lỗi khi save taixiu animation config: {e}")
+    
+    def get_guild_animation(self, guild_id: Optional[int]) -> Dict:
+        """
+        Lấy cấu hình animation của server (mặc định nếu chưa cấu hình / DM)
+        
+        Returns:
+            dict: {'mode', 'delay', 'gif_urls'}
+        """
+        guild_config = self.animation_config['guilds'].get(str(guild_id), {}) if guild_id else {}
+        return {
+            'mode': guild_config.get('mode', DEFAULT_ANIMATION_MODE),
+            'delay': guild_config.get('delay', DEFAULT_ANIMATION_DELAY),
+            'gif_urls': guild_config.get('gif_urls', []),
+        }
+    
+    def set_guild_animation(self, guild_id: int, **changes) -> Dict:
+        """Cập nhật cấu hình animation của server và lưu file"""
+        guild_config = self.animation_config['guilds'].setdefault(str(guild_id), {})
+        guild_config.update(changes)
+        self.save_animation_config()
+        return self.get_guild_animation(guild_id)
+    
+    async def play_roll_animation(self, ctx, bet_type: str, bet_amount: int) -> Optional[discord.Message]:
+        """
+        Chạy animation quay xúc xắc theo cấu hình của server
+        
+        Khi số animation đang chạy đạt giới hạn thì bỏ animation (chế độ instant)
+        để giờ cao điểm không đốt hết rate limit edit message.
+        
+        Message trả về vẫn giữ slot animation cho tới khi edit ra kết quả,
+        caller phải gọi release_roll_animation() sau lần edit cuối.
+        
+        Returns:
+            discord.Message: Message cần edit thành kết quả, None nếu phải gửi kết quả mới
+        """
+        settings = self.get_guild_animation(ctx.guild.id if ctx.guild else None)
+        mode = settings['mode']
+        
+        if mode != 'instant' and self.animation_stats['in_flight'] >= self.animation_config['max_concurrent']:
+            mode = 'instant'
+            self.animation_stats['capped'] += 1
+        self.animation_stats[mode] += 1
+        
+        if mode == 'instant':
+            return None
+        
+        self.animation_stats['in_flight'] += 1
+        keep_slot = False
+        try:
+            if mode == 'single':
+                # 1 frame đang quay (GIF nếu có), chờ rồi edit 1 lần ra kết quả
+                rolling_embed = self.create_rolling_embed(ctx.author, bet_type, bet_amount, 1)
+                if settings['gif_urls']:
+                    rolling_embed.set_image(url=random.choice(settings['gif_urls']))
+                message = await ctx.reply(embed=rolling_embed, mention_author=True)
+                await asyncio.sleep(settings['delay'])
+                keep_slot = True
+                return message
+            
+            # Animation 3 giây với 6 frames (mỗi frame 0.5 giây)
+            rolling_embed = self.create_rolling_embed(ctx.author, bet_type, bet_amount, 0)
+            message = await ctx.reply(embed=rolling_embed, mention_author=True)
+            for step in range(1, 7):
+                await asyncio.sleep(0.5)  # Chờ 0.5 giây
+                rolling_embed = self.create_rolling_embed(ctx.author, bet_type, bet_amount, step)
+                try:
+                    await message.edit(embed=rolling_embed)
+                    self.animation_stats['edits'] += 1
+                except discord.NotFound:
+                    # Nếu message bị xóa, thoát khỏi animation và gửi kết quả mới
+                    return None
+                except discord.Forbidden:
+                    # Nếu không có quyền edit, tiếp tục
+                    pass
+            keep_slot = True
+            return message
+        finally:
+            if not keep_slot:
+                self.animation_stats['in_flight'] -= 1
+    
+    def release_roll_animation(self) -> None:
+        """Trả slot animation sau khi đã edit message ra kết quả"""
+        self.animation_stats['in_flight'] -= 1
+    
     def create_rolling_embed(self, user: discord.User, bet_type: str, bet_amount: int, step: int = 0) -> discord.Embed:
         """
         Tạo embed hiển thị animation quay xúc xắc
@@ -406,22 +520,8 @@ class TaiXiuCommands:
             discord.Embed: Embed animation
         """
         # Animation frames cho xúc xắc - tạo hiệu ứng quay thực tế
-        dice_emojis = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣"]
-        
-        if step == 0:
-            dice_frames = ["🎲", "🎲", "🎲"]
-        elif step == 1:
-            dice_frames = ["🎯", "🎲", "🎲"]
-        elif step == 2:
-            dice_frames = [random.choice(dice_emojis), "🎯", "🎲"]
-        elif step == 3:
-            dice_frames = [random.choice(dice_emojis), random.choice(dice_emojis), "🎯"]
-        elif step == 4:
-            dice_frames = ["🎲", "🎲", "🎲"]
-        elif step == 5:
-            dice_frames = [random.choice(dice_emojis), "🎲", "🎲"]
-        else:  # step == 6
-            dice_frames = ["🎲", "🎲", "🎲"]
+        frame = ROLLING_FRAMES[min(step, len(ROLLING_FRAMES) - 1)]
+        dice_frames = [random.choice(DICE_EMOJIS) if slot is None else slot for slot in frame]
         
         embed = discord.Embed(
             title="🎲 TÀIXỈU - Đang quay xúc xắc...",
@@ -435,7 +535,7 @@ class TaiXiuCommands:
         )
         
         # Hiển thị xúc xắc đang quay
-        dice_display = f"{dice_frames[0]} {dice_frames[1]} {dice_frames[2]}"
+        dice_display = " ".join(dice_frames)
         
         embed.add_field(
             name="🎲 Xúc xắc đang quay",
@@ -451,20 +551,9 @@ class TaiXiuCommands:
             inline=True
         )
         
-        # Animation text
-        animation_texts = [
-            "🎯 Chuẩn bị quay...",
-            "🎲 Xúc xắc đang bay...",
-            "⚡ Sắp có kết quả...",
-            "🔥 Căng thẳng quá...",
-            "💫 Gần xong rồi...",
-            "🎊 Sắp ra kết quả...",
-            "✨ Hoàn thành!"
-        ]
-        
         embed.add_field(
             name="⏳ Trạng thái",
-            value=animation_texts[min(step, len(animation_texts) - 1)],
+            value=ROLLING_TEXTS[min(step, len(ROLLING_TEXTS) - 1)],
             inline=True
         )
         
@@ -501,8 +590,7 @@ class TaiXiuCommands:
         )
         
         # Kết quả xúc xắc
-        dice_emojis = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣"]
-        dice_display = f"{dice_emojis[dice1-1]} {dice_emojis[dice2-1]} {dice_emojis[dice3-1]}"
+        dice_display = f"{DICE_EMOJIS[dice1-1]} {DICE_EMOJIS[dice2-1]} {DICE_EMOJIS[dice3-1]}"
         
         embed.add_field(
             name="🎲 Kết quả xúc xắc",
@@ -810,23 +898,10 @@ class TaiXiuCommands:
                     await ctx.reply(embed=embed, mention_author=True)
                     return
                 
-                # Bắt đầu animation quay xúc xắc 3 giây
-                rolling_embed = self.create_rolling_embed(ctx.author, bet_type_normalized, bet_amount_int, 0)
-                message = await ctx.reply(embed=rolling_embed, mention_author=True)
-                
+                message = None
                 try:
-                    # Animation 3 giây với 6 frames (mỗi frame 0.5 giây)
-                    for step in range(1, 7):
-                        await asyncio.sleep(0.5)  # Chờ 0.5 giây
-                        rolling_embed = self.create_rolling_embed(ctx.author, bet_type_normalized, bet_amount_int, step)
-                        try:
-                            await message.edit(embed=rolling_embed)
-                        except discord.NotFound:
-                            # Nếu message bị xóa, thoát khỏi animation nhưng vẫn kết thúc game
-                            break
-                        except discord.Forbidden:
-                            # Nếu không có quyền edit, tiếp tục
-                            pass
+                    # Animation quay xúc xắc theo cấu hình server
+                    message = await self.play_roll_animation(ctx, bet_type_normalized, bet_amount_int)
                     
                     # Thực hiện game với tỷ lệ thắng tùy chỉnh
                     is_admin_player = self.is_admin(ctx.author.id, ctx.author.guild_permissions)
@@ -854,7 +929,11 @@ class TaiXiuCommands:
                     
                     # Cập nhật message với kết quả cuối cùng
                     try:
-                        await message.edit(embed=final_embed)
+                        if message is None:
+                            await ctx.reply(embed=final_embed, mention_author=True)
+                        else:
+                            await message.edit(embed=final_embed)
+                            self.animation_stats['edits'] += 1
                     except discord.NotFound:
                         # Nếu message bị xóa, gửi message mới
                         await ctx.send(embed=final_embed)
@@ -869,6 +948,9 @@ class TaiXiuCommands:
                                f"{'won' if is_win else 'lost'} {abs(money_change)}")
                     
                 finally:
+                    # Trả slot animation sau lần edit kết quả cuối cùng
+                    if message is not None:
+                        self.release_roll_animation()
                     # Luôn kết thúc game cho user (xóa khỏi active games)
                     self.end_game_for_user(ctx.author.id)
                 
@@ -883,6 +965,104 @@ class TaiXiuCommands:
                 )
                 await ctx.reply(embed=embed, mention_author=True)
         
+        @self.bot.command(name='taixiuanim', aliases=['txanim'])
+        async def taixiu_animation_command(ctx, option: str = None, value: str = None):
+            """
+            Cấu hình animation tài xỉu cho server (Admin)
+            
+            Usage:
+            - ;txanim - Xem cấu hình hiện tại
+            - ;txanim frames/single/instant - Đổi chế độ animation
+            - ;txanim delay <giây> - Thời gian chờ ở chế độ single
+            - ;txanim gif <url>/clear - Thêm/xóa GIF quay xúc xắc
+            - ;txanim cap <số> - Giới hạn animation chạy cùng lúc (Bot Admin)
+            """
+            try:
+                if not ctx.guild:
+                    await ctx.reply("❌ Lệnh này chỉ dùng trong server!", mention_author=True)
+                    return
+                
+                is_bot_admin = self.bot_instance.is_admin(ctx.author.id)
+                if not is_bot_admin and not ctx.author.guild_permissions.administrator:
+                    await ctx.reply("❌ Chỉ Admin mới có thể cấu hình animation tài xỉu!", mention_author=True)
+                    return
+                
+                option = option.lower() if option else None
+                
+                if option in ANIMATION_MODES:
+                    self.set_guild_animation(ctx.guild.id, mode=option)
+                elif option == 'delay':
+                    try:
+                        delay = float(value)
+                    except (TypeError, ValueError):
+                        await ctx.reply("❌ Sử dụng: `;txanim delay <giây>` (0.5 - 5)", mention_author=True)
+                        return
+                    if not 0.5 <= delay <= 5:
+                        await ctx.reply("❌ Delay phải từ 0.5 đến 5 giây!", mention_author=True)
+                        return
+                    self.set_guild_animation(ctx.guild.id, delay=delay)
+                elif option == 'gif':
+                    if not value:
+                        await ctx.reply("❌ Sử dụng: `;txanim gif <url>` hoặc `;txanim gif clear`", mention_author=True)
+                        return
+                    if value.lower() == 'clear':
+                        self.set_guild_animation(ctx.guild.id, gif_urls=[])
+                    elif value.startswith(('http://', 'https://')):
+                        gif_urls = self.get_guild_animation(ctx.guild.id)['gif_urls']
+                        if value not in gif_urls:
+                            self.set_guild_animation(ctx.guild.id, gif_urls=gif_urls + [value])
+                    else:
+                        await ctx.reply("❌ URL GIF không hợp lệ!", mention_author=True)
+                        return
+                elif option == 'cap':
+                    if not is_bot_admin:
+                        await ctx.reply("❌ Chỉ Bot Admin mới có thể đổi giới hạn toàn bot!", mention_author=True)
+                        return
+                    if not value or not value.isdigit() or int(value) < 1:
+                        await ctx.reply("❌ Sử dụng: `;txanim cap <số>` (>= 1)", mention_author=True)
+                        return
+                    self.animation_config['max_concurrent'] = int(value)
+                    self.save_animation_config()
+                elif option is not None:
+                    await ctx.reply(
+                        "❌ Tùy chọn không hợp lệ! Dùng: `frames`, `single`, `instant`, `delay`, `gif`, `cap`",
+                        mention_author=True
+                    )
+                    return
+                
+                settings = self.get_guild_animation(ctx.guild.id)
+                embed = discord.Embed(
+                    title="🎲 Animation Tài Xỉu",
+                    description=f"Cấu hình cho server **{ctx.guild.name}**",
+                    color=discord.Color.blue(),
+                    timestamp=datetime.now()
+                )
+                embed.add_field(
+                    name="⚙️ Cấu hình",
+                    value=(
+                        f"Chế độ: **{settings['mode']}**\n"
+                        f"Delay (single): **{settings['delay']}s**\n"
+                        f"GIF: **{len(settings['gif_urls'])}** ảnh"
+                    ),
+                    inline=True
+                )
+                embed.add_field(
+                    name="📊 Toàn bot",
+                    value=(
+                        f"Đang chạy: **{self.animation_stats['in_flight']}/{self.animation_config['max_concurrent']}**\n"
+                        f"frames/single/instant: **{self.animation_stats['frames']}/{self.animation_stats['single']}/{self.animation_stats['instant']}**\n"
+                        f"Bỏ animation do quá tải: **{self.animation_stats['capped']}**\n"
+                        f"Tổng REST edit: **{self.animation_stats['edits']}**"
+                    ),
+                    inline=True
+                )
+                embed.set_footer(text="frames: 7 edit/ván • single: 1 edit/ván • instant: 0 edit/ván")
+                await ctx.reply(embed=embed, mention_author=True)
+                
+            except Exception as e:
+                logger.error(f"Lỗi trong taixiuanim command: {e}")
+                await ctx.reply("❌ Có lỗi xảy ra khi cấu hình animation!", mention_author=True)
+        
         @self.bot.command(name='taixiumoney', aliases=['txmoney'])
         async def taixiu_money_command(ctx, action: str = None, user: discord.Member = None, amount: str = None):
             """
@@ -1287,26 +1467,16 @@ class TaiXiuCommands:
             Usage: ;conbac
             """
             try:
-                # Kiểm tra xem user đã có role "Con Bạc" chưa
-                gambler_role = discord.utils.get(ctx.guild.roles, name="Con Bạc")
-                
-                # Tạo role nếu chưa có
+                # Lấy role "Con Bạc" (cache theo server, tạo nếu chưa có)
+                gambler_role = await self.bot_instance.role_sync.get_rule_role(ctx.guild, 'conbac')
                 if not gambler_role:
-                    try:
-                        gambler_role = await ctx.guild.create_role(
-                            name="Con Bạc",
-                            color=discord.Color.gold(),
-                            reason="Role cho người chơi tài xỉu"
-                        )
-                        logger.info(f"Created 'Con Bạc' role in guild {ctx.guild.name}")
-                    except discord.Forbidden:
-                        embed = discord.Embed(
-                            title="❌ Lỗi quyền",
-                            description="Bot không có quyền tạo role trong server này!",
-                            color=discord.Color.red()
-                        )
-                        await ctx.reply(embed=embed, mention_author=True)
-                        return
+                    embed = discord.Embed(
+                        title="❌ Lỗi quyền",
+                        description="Bot không có quyền tạo role trong server này!",
+                        color=discord.Color.red()
+                    )
+                    await ctx.reply(embed=embed, mention_author=True)
+                    return
                 
                 # Kiểm tra user đã có role chưa
                 if gambler_role in ctx.author.roles:
@@ -1355,6 +1525,7 @@ class TaiXiuCommands:
                 # Cấp role cho user
                 try:
                     await ctx.author.add_roles(gambler_role, reason="Nhận role Con Bạc")
+                    self.bot_instance.role_sync.track('conbac', ctx.guild.id, ctx.author.id)
                 except discord.Forbidden:
                     # Hoàn tiền nếu không thể cấp role
                     shared_wallet.add_balance(supreme_admin_id, reward_amount)
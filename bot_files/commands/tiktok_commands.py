@@ -8,6 +8,7 @@ import aiohttp
 import asyncio
 from datetime import datetime
 from .base import BaseCommand
+from utils.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +49,7 @@ class TikTokCommands(BaseCommand):
                 api_url = f"https://huutri.id.vn/api/info/tiktok?username={username}"
                 
                 timeout = aiohttp.ClientTimeout(total=15)
-                async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with aiohttp.ClientSession(timeout=timeout, trace_configs=[metrics.http_trace_config()]) as session:
                     async with session.get(api_url) as response:
                         if response.status != 200:
                             await ctx.reply(
@@ -12,6 +12,7 @@ from datetime import datetime
 from urllib.parse import urlparse
 import re
 from .base import BaseCommand
+from utils.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -382,7 +383,7 @@ class VideoCommands(BaseCommand):
             # Download video
             async with ctx.typing():
                 timeout = aiohttp.ClientTimeout(total=300)  # 5 minutes timeout
-                async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with aiohttp.ClientSession(timeout=timeout, trace_configs=[metrics.http_trace_config()]) as session:
                     async with session.get(url) as response:
                         if response.status != 200:
                             await status_msg.edit(embed=discord.Embed(
@@ -135,17 +135,20 @@ class WalletReloadCommands(BaseCommand):
                     color=discord.Color.blue()
                 )
                 
-                status = "🟢 **Đang chạy**" if shared_wallet._is_watching else "🔴 **Đã dừng**"
+                status = "🟢 **Đang chạy**" if shared_wallet.is_watching else "🔴 **Đã dừng**"
                 embed.add_field(
                     name="Trạng thái",
                     value=status,
                     inline=False
                 )
                 
-                if shared_wallet._is_watching:
+                if shared_wallet.is_watching:
                     embed.add_field(
                         name="ℹ️ Thông tin",
-                        value="Bot đang tự động theo dõi file `shared_wallet.json` và reload khi có thay đổi",
+                        value=(
+                            f"Bot đang theo dõi file `shared_wallet.json` bằng **{shared_wallet.watch_mode or 'đang khởi động'}** "
+                            "và áp dụng các user thay đổi khi file bị sửa"
+                        ),
                         inline=False
                     )
                 
@@ -162,7 +165,7 @@ class WalletReloadCommands(BaseCommand):
                 await ctx.reply(embed=embed, mention_author=True)
                 
             elif action.lower() == "start":
-                if shared_wallet._is_watching:
+                if shared_wallet.is_watching:
                     await ctx.reply(
                         "⚠️ Auto reload đã đang chạy rồi!",
                         mention_author=True
@@ -175,11 +178,8 @@ class WalletReloadCommands(BaseCommand):
                 elif interval > 300:
                     interval = 300
                 
-                # Start watching
-                import asyncio
-                shared_wallet._file_watch_task = asyncio.create_task(
-                    shared_wallet.start_file_watching(check_interval=interval)
-                )
+                # Start watching (inotify nếu có, interval chỉ dùng khi phải polling)
+                shared_wallet.start_watching(check_interval=interval)
                 
                 embed = discord.Embed(
                     title="✅ Đã bật auto reload wallet!",
@@ -188,7 +188,7 @@ class WalletReloadCommands(BaseCommand):
                 
                 embed.add_field(
                     name="⚙️ Cài đặt",
-                    value=f"**Check interval:** {interval} giây",
+                    value=f"**Check interval:** {interval} giây (chỉ dùng khi không có inotify)",
                     inline=False
                 )
                 
@@ -200,7 +200,7 @@ class WalletReloadCommands(BaseCommand):
                 
                 embed.add_field(
                     name="🔄 Hoạt động",
-                    value="Bot sẽ tự động reload khi phát hiện file thay đổi",
+                    value="Bot sẽ tự động áp dụng thay đổi khi phát hiện file bị sửa",
                     inline=False
                 )
                 
@@ -208,7 +208,7 @@ class WalletReloadCommands(BaseCommand):
                 logger.info(f"Auto wallet reload started by {ctx.author.id} (interval: {interval}s)")
                 
             elif action.lower() == "stop":
-                if not shared_wallet._is_watching:
+                if not shared_wallet.is_watching:
                     await ctx.reply(
                         "⚠️ Auto reload chưa chạy!",
                         mention_author=True
@@ -304,7 +304,7 @@ class WalletReloadCommands(BaseCommand):
                 )
             
             # Auto reload status
-            auto_status = "🟢 Đang bật" if shared_wallet._is_watching else "🔴 Đã tắt"
+            auto_status = "🟢 Đang bật" if shared_wallet.is_watching else "🔴 Đã tắt"
             embed.add_field(
                 name="🔄 Auto Reload",
                 value=auto_status,
@@ -3,11 +3,12 @@ Warn và Warnings commands
 """
 import discord
 from discord.ext import commands
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 import json
 import os
 from .base import BaseCommand
+from utils.warning_engine import EscalationStep
 
 logger = logging.getLogger(__name__)
 
@@ -48,15 +49,15 @@ class WarnCommands(BaseCommand):
                 return
             
             # Lấy lịch sử warnings của user
-            user_warnings = self.bot_instance.get_warnings(member.id)
+            user_warnings = self.bot_instance.get_warnings(member.id, limit=3)
             warning_history = ""
             
             if user_warnings:
                 warning_history = "\n\n**📋 Lịch sử 3 warnings:**\n"
-                for i, warning in enumerate(user_warnings[-3:], 1):  # Lấy 3 warning cuối
+                for i, warning in enumerate(user_warnings, 1):  # 3 warning cuối
                     warning_time = warning.get('timestamp', 'Không rõ thời gian')
                     warning_reason = warning.get('reason', 'Không có lý do')
-                    warning_mod = warning.get('moderator', 'Không rõ mod')
+                    warning_mod = warning.get('warned_by', 'Không rõ mod')
                     
                     # Format timestamp nếu có
                     if isinstance(warning_time, str) and warning_time != 'Không rõ thời gian':
@@ -104,7 +105,7 @@ class WarnCommands(BaseCommand):
             # Gửi DM
             await notification_user.send(full_message)
             logger.info(f"Đã gửi thông báo mute đến {notification_user.name} ({notification_user_id})")
-            
+        
         except discord.Forbidden:
             logger.error(f"Không thể gửi DM đến user {notification_user_id} (DM bị tắt)")
         except Exception as e:
@@ -118,6 +119,9 @@ class WarnCommands(BaseCommand):
             """
             Cảnh báo một user và gửi DM với rate limiting
             
+            Mỗi warning +1 điểm vi phạm trong server, chạm bậc thì tự động
+            timeout/ban theo ;warnladder. Điểm giảm dần khi không vi phạm.
+            
             Usage: ;warn @user <lý do>
             """
             # Sử dụng rate limiting cho command này
@@ -133,6 +137,19 @@ class WarnCommands(BaseCommand):
             # Sử dụng rate limiting cho command này
             await self.execute_with_rate_limit(ctx, self._check_warnings_impl, ctx, member)
         
+        @self.bot.command(name='warnladder', aliases=['warnconfig'])
+        async def warn_ladder_command(ctx, action: str = None, *args):
+            """
+            Xem/cấu hình bậc xử phạt warnings của server (Admin only)
+            
+            Usage:
+            ;warnladder - Xem bậc xử phạt hiện tại
+            ;warnladder set 3:timeout:1m 5:timeout:1h 8:ban - Đặt bậc riêng cho server
+            ;warnladder reset - Dùng lại bậc mặc định
+            ;warnladder decay <số ngày> - Số ngày không vi phạm để giảm 1 điểm (Supreme Admin)
+            """
+            await self._warn_ladder_impl(ctx, action, args)
+        
         @self.bot.command(name='amenconfig')
         async def amen_config_command(ctx, action: str = None, *, value: str = None):
             """
@@ -225,7 +242,7 @@ class WarnCommands(BaseCommand):
                         color=discord.Color.green()
                     )
                     await ctx.reply(embed=embed, mention_author=True)
-                    
+                
                 except ValueError:
                     await ctx.reply("❌ User ID phải là số nguyên.", mention_author=True)
                 except discord.NotFound:
@@ -285,22 +302,26 @@ class WarnCommands(BaseCommand):
             return
         
         try:
-            # Thêm warning vào database
-            warning_count = self.bot_instance.add_warning(
+            # Thêm warning - engine trả về bậc xử phạt cần áp dụng (nếu có)
+            outcome = self.bot_instance.add_warning(
                 user_id=member.id,
                 reason=reason,
-                warned_by=f"{ctx.author} ({ctx.author.id})"
+                warned_by=f"{ctx.author} ({ctx.author.id})",
+                guild_id=ctx.guild.id
             )
+            step = outcome.step
+            next_step = outcome.next_step
+            is_last_warning = next_step is not None and next_step.threshold - outcome.points == 1
             
-            # Tạo embed cho DM - màu sắc và nội dung dựa trên số warnings
-            if warning_count >= 3:
+            # Tạo embed cho DM - màu sắc và nội dung dựa trên bậc xử phạt
+            if step is not None:
                 dm_color = discord.Color.red()
-                dm_title = "🔇 Cảnh báo nghiêm trọng - Đã bị timeout"
-                dm_description = f"Bạn đã nhận được cảnh báo thứ {warning_count} từ server **{ctx.guild.name}** và đã bị timeout."
-            elif warning_count == 2:
+                dm_title = "🔇 Cảnh báo nghiêm trọng - Đã bị timeout" if step.action == 'timeout' else "⛔ Cảnh báo nghiêm trọng - Đã bị ban khỏi server"
+                dm_description = f"Bạn đã nhận được cảnh báo thứ {outcome.total} từ server **{ctx.guild.name}** và bị xử phạt: **{self._describe_step(step)}**."
+            elif is_last_warning:
                 dm_color = discord.Color.orange()
                 dm_title = "⚠️ Cảnh báo nghiêm trọng"
-                dm_description = f"Bạn đã nhận được cảnh báo thứ {warning_count} từ server **{ctx.guild.name}**. Cảnh báo tiếp theo sẽ dẫn đến mute."
+                dm_description = f"Bạn đã nhận được cảnh báo thứ {outcome.total} từ server **{ctx.guild.name}**. Cảnh báo tiếp theo sẽ dẫn đến {self._describe_step(next_step)}."
             else:
                 dm_color = discord.Color.yellow()
                 dm_title = "⚠️ Cảnh báo từ Server"
@@ -314,15 +335,12 @@ class WarnCommands(BaseCommand):
             )
             embed.add_field(name="Lý do", value=reason, inline=False)
             embed.add_field(name="Được cảnh báo bởi", value=ctx.author.mention, inline=True)
-            embed.add_field(name="Tổng số cảnh báo", value=f"{warning_count} lần", inline=True)
+            embed.add_field(name="Tổng số cảnh báo", value=f"{outcome.total} lần", inline=True)
+            embed.add_field(name="Điểm vi phạm", value=f"{outcome.points} điểm", inline=True)
             
-            if warning_count >= 3:
-                embed.add_field(name="⚠️ Thông báo quan trọng", 
-                              value="Bạn đã bị timeout 1 phút do vi phạm nhiều lần. Sẽ tự động hết timeout sau 1 phút.", 
-                              inline=False)
-            elif warning_count == 2:
+            if is_last_warning:
                 embed.add_field(name="⚠️ Cảnh báo cuối", 
-                              value="Đây là cảnh báo cuối cùng. Vi phạm tiếp theo sẽ dẫn đến timeout.", 
+                              value=f"Vi phạm tiếp theo sẽ dẫn đến {self._describe_step(next_step)}. Điểm vi phạm giảm 1 sau mỗi {self._format_days(self.bot_instance.warning_engine.decay_days)} không bị cảnh báo.", 
                               inline=False)
             
             embed.set_footer(text=f"Server: {ctx.guild.name}", icon_url=ctx.guild.icon.url if ctx.guild.icon else None)
@@ -336,16 +354,19 @@ class WarnCommands(BaseCommand):
             except Exception as e:
                 dm_status = f"❌ Lỗi gửi DM: {str(e)[:50]}"
             
-            # Timeout user nếu đạt 3 warnings
-            timeout_status = "⚠️ Chưa đủ 3 warnings để timeout"
-            if warning_count >= 3:
-                timeout_status = await self._handle_auto_mute(ctx, member, reason)
+            # Áp dụng bậc xử phạt nếu vừa chạm ngưỡng
+            if step is not None:
+                penalty_status = await self._apply_escalation(ctx, member, reason, step)
+            elif next_step is not None:
+                penalty_status = f"⚠️ Còn {next_step.threshold - outcome.points} điểm nữa: {self._describe_step(next_step)}"
+            else:
+                penalty_status = "⚠️ Chưa có bậc xử phạt"
             
-            # Phản hồi trong channel với reply - màu sắc dựa trên số warnings
-            if warning_count >= 3:
-                embed_color = discord.Color.red()  # Đỏ - nghiêm trọng (đã timeout)
-                title = "🔇 Đã cảnh báo và timeout"
-            elif warning_count == 2:
+            # Phản hồi trong channel với reply - màu sắc dựa trên bậc xử phạt
+            if step is not None:
+                embed_color = discord.Color.red()  # Đỏ - nghiêm trọng (đã xử phạt)
+                title = "🔇 Đã cảnh báo và xử phạt"
+            elif is_last_warning:
                 embed_color = discord.Color.orange()  # Cam - cảnh báo
                 title = "⚠️ Cảnh báo nghiêm trọng"
             else:
@@ -358,57 +379,87 @@ class WarnCommands(BaseCommand):
                 color=embed_color
             )
             response_embed.add_field(name="Lý do", value=reason, inline=False)
-            response_embed.add_field(name="Tổng cảnh báo", value=f"{warning_count} lần", inline=True)
+            response_embed.add_field(name="Tổng cảnh báo", value=f"{outcome.total} lần ({outcome.points} điểm)", inline=True)
             response_embed.add_field(name="Trạng thái DM", value=dm_status, inline=True)
-            response_embed.add_field(name="Trạng thái Timeout", value=timeout_status, inline=True)
+            response_embed.add_field(name="Xử phạt", value=penalty_status, inline=True)
             
             await ctx.reply(embed=response_embed, mention_author=True)
             
             # Log
             logger.info(
                 f"User {member} ({member.id}) đã được warn bởi {ctx.author} ({ctx.author.id}). "
-                f"Lý do: {reason}. Tổng warnings: {warning_count}"
+                f"Lý do: {reason}. Tổng warnings: {outcome.total}, điểm: {outcome.points}"
             )
-            
+        
         except Exception as e:
             await ctx.send(f"❌ Có lỗi xảy ra: {str(e)}")
             logger.error(f"Lỗi khi warn user {member}: {e}")
     
-    async def _handle_auto_mute(self, ctx, member: discord.Member, reason: str):
+    @staticmethod
+    def _format_days(days: float) -> str:
+        return f"{days:g} ngày"
+    
+    def _describe_step(self, step: EscalationStep) -> str:
+        """Mô tả ngắn 1 bậc xử phạt"""
+        if step.action == 'timeout':
+            return f"timeout {self.bot_instance.mute_commands._format_duration(timedelta(seconds=step.duration))}"
+        return "ban khỏi server"
+    
+    async def _apply_escalation(self, ctx, member: discord.Member, reason: str, step: EscalationStep) -> str:
         """
-        Xử lý auto-mute khi user đạt 3 warnings sử dụng Discord timeout
+        Thực hiện bậc xử phạt engine trả về
+        
+        Returns:
+            str: Status message
+        """
+        if step.action == 'timeout':
+            return await self._handle_auto_mute(ctx, member, reason, timedelta(seconds=step.duration))
+        
+        # ban = ban khỏi server đang warn (không phải cấm dùng bot toàn cục của ;ban)
+        if not self._can_ban(ctx):
+            return "❌ Người warn không có quyền Ban Members"
+        try:
+            await member.ban(reason=f"Tự động ban do tích lũy warnings. Warning cuối bởi {ctx.author}: {reason}")
+        except discord.Forbidden:
+            return "❌ Bot không có quyền ban user"
+        except discord.HTTPException as e:
+            return f"❌ Lỗi HTTP ban: {str(e)[:30]}"
+        logger.info(f"Đã tự động ban user {member} ({member.id}) khỏi {ctx.guild.name} do tích lũy warnings")
+        return "⛔ Đã ban user khỏi server"
+    
+    def _can_ban(self, ctx) -> bool:
+        """Người chạy lệnh được ban trong server này không (bậc ban chạy theo quyền người warn)"""
+        return ctx.author.guild_permissions.ban_members or self.bot_instance.is_supreme_admin(ctx.author.id)
+    
+    async def _handle_auto_mute(self, ctx, member: discord.Member, reason: str, duration: timedelta = timedelta(minutes=1)):
+        """
+        Timeout user khi chạm bậc xử phạt sử dụng Discord timeout
         
         Args:
             ctx: Discord context
             member: Member cần mute
             reason: Lý do warn
-            
+            duration: Thời gian timeout
+        
         Returns:
             str: Status message
         """
         try:
-            from datetime import timedelta
-            
             # Kiểm tra xem user đã bị timeout chưa
             if member.timed_out_until and member.timed_out_until > datetime.now(member.timed_out_until.tzinfo):
                 return "ℹ️ User đã bị timeout từ trước"
             
-            # Timeout user trong 1 phút sử dụng Discord timeout
-            timeout_duration = timedelta(minutes=1)
+            duration_text = self.bot_instance.mute_commands._format_duration(duration)
             await member.timeout(
-                timeout_duration, 
-                reason=f"Auto-timeout after 3 warnings. Last warning by {ctx.author}: {reason}"
+                duration, 
+                reason=f"Auto-timeout do tích lũy warnings. Last warning by {ctx.author}: {reason}"
             )
             
             # Gửi thông báo DM đến user được cấu hình trong amen.json
-            await self.send_mute_notification(ctx, member, reason, "1 phút")
+            await self.send_mute_notification(ctx, member, reason, duration_text)
             
-            # Xóa tất cả warnings sau khi timeout (reset về 0)
-            self.bot_instance.clear_user_warnings(member.id)
-            logger.info(f"Đã xóa tất cả warnings của user {member} ({member.id}) sau khi timeout")
-            
-            return "🔇 Đã timeout user (1 phút) và reset warnings"
-                
+            return f"🔇 Đã timeout user ({duration_text})"
+        
         except discord.Forbidden:
             return "❌ Không có quyền timeout user"
         except discord.HTTPException as e:
@@ -416,6 +467,88 @@ class WarnCommands(BaseCommand):
         except Exception as e:
             return f"❌ Lỗi timeout: {str(e)[:30]}"
     
+    def _parse_ladder(self, tokens) -> list:
+        """
+        Parse bậc xử phạt dạng <điểm>:timeout:<thời gian> hoặc <điểm>:ban
+        
+        Raises:
+            ValueError: Nếu có bậc không hợp lệ
+        """
+        steps = []
+        for token in tokens:
+            parts = token.lower().split(':')
+            if len(parts) < 2 or not parts[0].isdigit():
+                raise ValueError(f"`{token}` không đúng dạng <điểm>:timeout:<thời gian> hoặc <điểm>:ban")
+            if parts[1] == 'timeout':
+                if len(parts) != 3:
+                    raise ValueError(f"`{token}` thiếu thời gian timeout")
+                duration = int(self.bot_instance.mute_commands._parse_duration(parts[2]).total_seconds())
+                steps.append(EscalationStep(int(parts[0]), 'timeout', duration))
+            else:
+                steps.append(EscalationStep(int(parts[0]), parts[1]))
+        if not steps:
+            raise ValueError("Cần ít nhất 1 bậc")
+        return steps
+    
+    async def _warn_ladder_impl(self, ctx, action: str, args: tuple):
+        """
+        Implementation thực tế của warnladder command
+        """
+        if ctx.guild is None:
+            await ctx.reply("❌ Lệnh này chỉ dùng trong server!", mention_author=True)
+            return
+        
+        # Cấu hình xử phạt luôn cần quyền Admin (mặc định của permission system là user)
+        if not self.has_warn_permission(ctx.author.id, ctx.author.guild_permissions):
+            await ctx.reply(f"{ctx.author.mention} ❌ Bạn không có quyền sử dụng lệnh này!", mention_author=True)
+            return
+        
+        engine = self.bot_instance.warning_engine
+        action = (action or 'show').lower()
+        
+        try:
+            if action == 'set':
+                steps = self._parse_ladder(args)
+                if any(step.action == 'ban' for step in steps) and not self._can_ban(ctx):
+                    await ctx.reply(f"{ctx.author.mention} ❌ Cần quyền `Ban Members` để đặt bậc ban!", mention_author=True)
+                    return
+                engine.set_guild_ladder(ctx.guild.id, steps)
+                logger.info(f"{ctx.author} ({ctx.author.id}) đặt bậc xử phạt warnings cho {ctx.guild.name}: {' '.join(args)}")
+            elif action == 'reset':
+                if not engine.reset_guild_ladder(ctx.guild.id):
+                    await ctx.reply(f"{ctx.author.mention} ℹ️ Server đang dùng bậc mặc định rồi!", mention_author=True)
+                    return
+            elif action == 'decay':
+                if not self.bot_instance.is_supreme_admin(ctx.author.id):
+                    await ctx.reply(f"{ctx.author.mention} ❌ Chỉ Supreme Admin được đổi thời gian giảm điểm!", mention_author=True)
+                    return
+                if not args:
+                    raise ValueError("Thiếu số ngày")
+                engine.set_decay_days(float(args[0]))
+            elif action != 'show':
+                await ctx.reply(f"{ctx.author.mention} ❌ Sử dụng: `;warnladder [set|reset|decay]`", mention_author=True)
+                return
+        except ValueError as e:
+            await ctx.reply(f"{ctx.author.mention} ❌ Tham số không hợp lệ: {e}", mention_author=True)
+            return
+        
+        ladder = engine.get_ladder(ctx.guild.id)
+        embed = discord.Embed(
+            title="⚖️ Bậc xử phạt warnings",
+            description=(
+                f"Mỗi warning +1 điểm (tính riêng từng server), giảm 1 điểm sau mỗi **{self._format_days(engine.decay_days)}** không vi phạm.\n"
+                f"Vượt bậc cao nhất thì mỗi warning tiếp theo áp dụng lại bậc cao nhất."
+            ),
+            color=discord.Color.green() if action != 'show' else discord.Color.blue()
+        )
+        embed.add_field(
+            name="📶 Các bậc" + (" (riêng server)" if engine.has_guild_ladder(ctx.guild.id) else " (mặc định)"),
+            value="\n".join(f"**{step.threshold}** điểm → {self._describe_step(step)}" for step in ladder.steps),
+            inline=False
+        )
+        embed.set_footer(text="Ví dụ: ;warnladder set 3:timeout:1m 5:timeout:1h 8:ban")
+        await ctx.reply(embed=embed, mention_author=True)
+    
     async def _check_warnings_impl(self, ctx, member: discord.Member = None):
         """
         Implementation thực tế của warnings command
@@ -440,30 +573,36 @@ class WarnCommands(BaseCommand):
                     await ctx.reply(f"{ctx.author.mention} ❌ Bạn không có quyền xem warnings của user khác!", mention_author=True)
                     return
         
-        warnings_list = self.bot_instance.get_warnings(member.id)
+        engine = self.bot_instance.warning_engine
+        total = engine.get_total(member.id)
         
-        if not warnings_list:
+        if not total:
             embed = discord.Embed(
                 title="📋 Lịch sử cảnh báo",
                 description=f"{member.mention} chưa có cảnh báo nào.",
                 color=discord.Color.green()
             )
         else:
+            points = engine.get_points(member.id, ctx.guild.id if ctx.guild else None)
+            next_step = engine.get_ladder(ctx.guild.id if ctx.guild else None).next_step(points)
+            description = f"{member.mention} có **{total}** cảnh báo • Điểm vi phạm trong server: **{points}**"
+            if next_step is not None:
+                description += f"\nBậc tiếp theo: {self._describe_step(next_step)} ở **{next_step.threshold}** điểm"
             embed = discord.Embed(
                 title="📋 Lịch sử cảnh báo",
-                description=f"{member.mention} có **{len(warnings_list)}** cảnh báo:",
-                color=discord.Color.red()
+                description=description,
+                color=discord.Color.red() if points else discord.Color.orange()
             )
             
-            for i, warning in enumerate(warnings_list[-5:], 1):  # Chỉ hiển thị 5 warnings gần nhất
+            warnings_list = self.bot_instance.get_warnings(member.id, limit=5)  # Chỉ hiển thị 5 warnings gần nhất
+            for i, warning in enumerate(warnings_list, 1):
                 timestamp = datetime.fromisoformat(warning['timestamp']).strftime('%d/%m/%Y %H:%M')
                 embed.add_field(
-                    name=f"Cảnh báo #{len(warnings_list) - 5 + i}",
+                    name=f"Cảnh báo #{total - len(warnings_list) + i}",
                     value=f"**Lý do:** {warning['reason']}\n**Bởi:** {warning['warned_by']}\n**Thời gian:** {timestamp}",
                     inline=False
                 )
             
-            if len(warnings_list) > 5:
-                embed.set_footer(text=f"Hiển thị 5/{len(warnings_list)} cảnh báo gần nhất")
+            embed.set_footer(text=f"Hiển thị {len(warnings_list)}/{total} cảnh báo gần nhất • Điểm giảm 1 sau mỗi {self._format_days(engine.decay_days)} không vi phạm")
         
         await ctx.reply(embed=embed, mention_author=True)
@@ -1,6 +1,9 @@
 """
 Script restore dữ liệu game và user từ backup
 Chạy sau khi update code: python restore_data.py <backup_file.zip>
+Restore từ snapshot (;backup snapshot):
+    python restore_data.py --snapshots                                   - Liệt kê snapshot
+    python restore_data.py --snapshot <id|latest|"YYYY-MM-DD HH:MM"> [file ...] - Restore tất cả/từng file
 """
 import os
 import shutil
@@ -9,6 +12,8 @@ import zipfile
 import sys
 from datetime import datetime
 
+SNAPSHOT_ROOT = os.path.join('data_backups', 'snapshots')
+
 def list_backups():
     """Liệt kê các backup có sẵn"""
     backup_dir = 'data_backups'
@@ -71,26 +76,82 @@ def restore_backup(backup_file):
         shutil.rmtree(temp_dir)
         
         print("=" * 60)
-        print(f"\n📊 Thống kê:")
+        print("\n📊 Thống kê:")
         print(f"  ✅ Restored: {len(restored_files)} files")
         print(f"  ❌ Failed:   {len(failed_files)} files")
         
         if failed_files:
-            print(f"\n❌ Các file thất bại:")
+            print("\n❌ Các file thất bại:")
             for file, error in failed_files:
                 print(f"  - {file}: {error}")
         
-        print(f"\n🎉 Restore hoàn tất!")
-        print(f"\n💡 Khởi động lại bot để áp dụng dữ liệu mới")
+        print("\n🎉 Restore hoàn tất!")
+        print("\n💡 Khởi động lại bot để áp dụng dữ liệu mới")
         
         return True
-        
+    
     except Exception as e:
         print(f"\n❌ Lỗi khi restore: {e}")
         if os.path.exists(temp_dir):
             shutil.rmtree(temp_dir)
         return False
 
+def list_snapshots():
+    """Liệt kê snapshot trong data_backups/snapshots"""
+    from utils.snapshot_store import SnapshotStore
+    
+    store = SnapshotStore(SNAPSHOT_ROOT)
+    snapshots = store.list_snapshots()
+    if not snapshots:
+        print("❌ Chưa có snapshot nào!")
+        return
+    
+    for manifest in snapshots:
+        created = datetime.fromtimestamp(manifest['created_at']).strftime('%d/%m/%Y %H:%M:%S')
+        print(f"📸 {manifest['id']}")
+        print(f"   📅 {created} • {len(manifest['files'])} files • {manifest['total_size']:,} bytes")
+    
+    stats = store.get_stats()
+    print(f"\n💾 Dữ liệu gốc {stats['logical_bytes']:,} bytes, lưu thật {stats['stored_bytes']:,} bytes ({stats['codec']})")
+
+def restore_snapshot(ref, files=None):
+    """Restore tất cả (hoặc 1 số) file từ snapshot theo ID, 'latest' hoặc thời điểm"""
+    from utils.snapshot_store import SnapshotStore
+    
+    store = SnapshotStore(SNAPSHOT_ROOT)
+    manifest = store.resolve(ref)
+    if manifest is None:
+        print(f"❌ Không tìm thấy snapshot: {ref}")
+        return False
+    
+    print(f"\n📸 Đang restore từ snapshot: {manifest['id']}")
+    print("=" * 60)
+    
+    targets = []
+    for file in files or manifest['files']:
+        # Cho phép gõ tên file không kèm thư mục data/
+        path = file if file in manifest['files'] else next(
+            (path for path in manifest['files'] if os.path.basename(path) == file), None
+        )
+        if path is None:
+            print(f"❌ {file:30s} - Không có trong snapshot")
+        else:
+            targets.append(path)
+    
+    restored_files = []
+    for path in targets:
+        try:
+            store.restore_file(manifest['id'], path)
+            restored_files.append(path)
+            print(f"✅ {path:30s} ({manifest['files'][path]['size']:,} bytes)")
+        except Exception as e:
+            print(f"❌ {path:30s} - Lỗi: {e}")
+    
+    print("=" * 60)
+    print(f"\n📊 Restored: {len(restored_files)}/{len(targets)} files")
+    print("\n💡 Khởi động lại bot để áp dụng dữ liệu mới")
+    return len(restored_files) == len(targets)
+
 def interactive_restore():
     """Restore tương tác - chọn backup từ danh sách"""
     backups = list_backups()
@@ -133,7 +194,7 @@ def interactive_restore():
                 print("❌ Đã hủy restore")
         else:
             print("❌ Lựa chọn không hợp lệ!")
-            
+    
     except ValueError:
         print("❌ Vui lòng nhập số!")
     except KeyboardInterrupt:
@@ -144,7 +205,11 @@ if __name__ == '__main__':
     print("🔄 RESTORE SYSTEM - Discord Bot Data")
     print("=" * 60)
     
-    if len(sys.argv) > 1:
+    if len(sys.argv) > 1 and sys.argv[1] == '--snapshots':
+        list_snapshots()
+    elif len(sys.argv) > 2 and sys.argv[1] == '--snapshot':
+        restore_snapshot(sys.argv[2], sys.argv[3:])
+    elif len(sys.argv) > 1:
         # Restore từ file cụ thể
         backup_file = sys.argv[1]
         
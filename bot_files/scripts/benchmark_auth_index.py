@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark global command check: chuỗi check cũ (dict key string + list) vs authorization index
+Chạy từ thư mục bot_files: python scripts/benchmark_auth_index.py [số lần]
+"""
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.getcwd())
+
+from utils.authorization_index import AuthorizationIndex, MAINTENANCE_ALLOWED_COMMANDS
+
+GUILDS = 50
+CHANNELS_PER_GUILD = 40
+BANNED_USERS = 2000
+ADMINS = 50
+COMMANDS = ['taixiu', 'slot', 'bal', 'daily', 'warn', 'mute', 'menu', 'help', 'shop', 'give']
+
+
+def build_fake_bot():
+    """Tạo dữ liệu giả lập giống cấu trúc các command class"""
+    rng = random.Random(42)
+    permissions_data = {}
+    for guild_id in range(1, GUILDS + 1):
+        permissions_data[str(guild_id)] = {
+            'allowed_channels': [guild_id * 1000 + c for c in range(CHANNELS_PER_GUILD)],
+            'bypass_commands': rng.sample(COMMANDS, 3),
+        }
+    return SimpleNamespace(
+        ban_commands=SimpleNamespace(banned_users={10_000 + i: {} for i in range(BANNED_USERS)}),
+        maintenance_manager=SimpleNamespace(maintenance_data={'is_maintenance': False}),
+        channel_permission_manager=SimpleNamespace(permissions_data=permissions_data),
+        permission_manager=SimpleNamespace(command_permissions={'warn': 'admin', 'mute': 'admin'}),
+        admin_ids={20_000 + i for i in range(ADMINS)},
+        priority_users={30_000, 30_001},
+        supreme_admin_id=1,
+    )
+
+
+def legacy_check(bot, user_id, guild_id, channel_id, command_name, is_dm):
+    """Chuỗi check cũ của global_rate_limit_check (không gồm gửi tin nhắn)"""
+    if user_id in bot.ban_commands.banned_users:
+        return False
+    if bot.maintenance_manager.maintenance_data.get('is_maintenance', False):
+        if user_id != bot.supreme_admin_id and command_name not in list(MAINTENANCE_ALLOWED_COMMANDS):
+            return False
+    if is_dm:
+        return user_id in bot.admin_ids or user_id == bot.supreme_admin_id
+    guild_key = str(guild_id)
+    permissions_data = bot.channel_permission_manager.permissions_data
+    if guild_key in permissions_data:
+        if command_name not in permissions_data[guild_key].get('bypass_commands', []):
+            allowed_channels = permissions_data[guild_key].get('allowed_channels', [])
+            if allowed_channels and channel_id not in allowed_channels:
+                return False
+    return True
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    bot = build_fake_bot()
+    index = AuthorizationIndex(bot)
+    index.rebuild()
+
+    rng = random.Random(7)
+    requests = []
+    for _ in range(1000):
+        guild_id = rng.randint(1, GUILDS + 10)
+        channel_id = guild_id * 1000 + rng.randint(0, CHANNELS_PER_GUILD * 2)
+        user_id = rng.choice([rng.randint(100_000, 999_999), 10_000 + rng.randint(0, BANNED_USERS), 20_000, 30_000])
+        requests.append((user_id, guild_id, channel_id, rng.choice(COMMANDS), rng.random() < 0.05))
+    loops = max(1, number // len(requests))
+
+    print(f"=== Benchmark authorization check ({loops * len(requests):,} checks) ===")
+    results = {}
+    for name, check in (
+        ('Chuỗi check cũ', lambda r: legacy_check(bot, *r)),
+        ('Authorization index', lambda r: index.check(*r)),
+    ):
+        start = time.perf_counter()
+        for _ in range(loops):
+            for request in requests:
+                check(request)
+        elapsed = time.perf_counter() - start
+        results[name] = loops * len(requests) / elapsed
+        print(f"  {name:<22}{results[name]:>14,.0f} checks/s")
+
+    print(f"  Nhanh hơn: {results['Authorization index'] / results['Chuỗi check cũ']:.1f}x")
+
+    start = time.perf_counter()
+    for _ in range(100):
+        index.rebuild()
+    print(f"  Rebuild index: {(time.perf_counter() - start) / 100 * 1000:.3f} ms/lần")
+    print(f"  Stats: {index.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
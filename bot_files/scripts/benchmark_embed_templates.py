@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark thời gian tạo embed: build lại từ đầu (add_field) vs render từ template
+Chạy từ thư mục bot_files: python scripts/benchmark_embed_templates.py [số lần]
+"""
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.getcwd())
+
+from utils.embed_templates import embed_templates
+from commands import all_commands_display, full_menu_commands, game_menu_commands
+
+# Giá trị placeholder giả lập cho các template có phần động
+SAMPLE_VALUES = {
+    'user_name': 'Benchmark User',
+    'user_avatar': 'https://cdn.discordapp.com/embed/avatars/0.png',
+    'user_role': '👑 Supreme Admin',
+    'permissions_note': 'Có thể sử dụng TẤT CẢ lệnh trên',
+    'role': '👑 Supreme Admin',
+    'usage': 'Tất cả lệnh',
+    'time': '12:00',
+}
+
+# Các menu nặng nhất (nhiều field nhất): template -> hàm build từ đầu
+HEAVY_EMBEDS = {
+    'all_commands': all_commands_display._build_all_commands_embed,
+    'fullmenu.admin_supreme': lambda: full_menu_commands._build_admin_panel_embed(True),
+    'fullmenu.all_commands': full_menu_commands._build_all_commands_embed,
+    'gamemenu.admin_menu': game_menu_commands._build_admin_menu_embed,
+    'gamemenu.moderation': game_menu_commands._build_moderation_embed,
+}
+
+
+def _with_timestamp(builder):
+    """Build từ đầu như code cũ: dựng embed rồi gắn timestamp=datetime.now()"""
+    def build():
+        embed = builder()
+        embed.timestamp = datetime.now()
+        return embed
+    return build
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"=== Benchmark embed templates ({number:,} lần/embed) ===")
+    print(f"  {'Embed':<26}{'Fields':>7}{'Build (µs)':>13}{'Render (µs)':>13}{'Nhanh hơn':>11}")
+
+    for name, builder in HEAVY_EMBEDS.items():
+        template = embed_templates.get(name)
+        fields = len(template.to_dict()['embed'].get('fields', []))
+        build = _with_timestamp(builder) if template.timestamp else builder
+        build_time = timeit.timeit(build, number=number) / number * 1_000_000
+        render_time = timeit.timeit(lambda: template.render(**SAMPLE_VALUES), number=number) / number * 1_000_000
+        print(f"  {name:<26}{fields:>7}{build_time:>13.1f}{render_time:>13.1f}{build_time / render_time:>10.1f}x")
+
+    stats = embed_templates.get_stats()
+    print(f"\n  Tổng {stats['templates']} templates, build lúc khởi động: {stats['build_time_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark RAM: dict JSON cũ vs game stats store (PlayerStats __slots__)
+Chạy từ thư mục bot_files: python scripts/benchmark_game_stats.py [số người chơi]
+"""
+import os
+import sys
+import gc
+import json
+import random
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.getcwd())
+
+from utils.game_stats_store import GameStatsTable
+
+
+def make_legacy_data(players: int) -> str:
+    """Tạo JSON giả lập giống taixiu_players.json với N người chơi"""
+    now = datetime.now()
+    data = {}
+    for i in range(players):
+        total_games = random.randint(1, 500)
+        wins = random.randint(0, total_games)
+        data[str(10**17 + i)] = {
+            'money': 5000,
+            'total_games': total_games,
+            'wins': wins,
+            'losses': total_games - wins,
+            'total_bet': random.randint(1000, 10**12),
+            'total_win': random.randint(0, 10**12),
+            'winrate': wins / total_games * 100,
+            'games_10m_plus': random.randint(0, 20),
+            'lose_streak': random.randint(0, 5),
+            'created_at': (now - timedelta(days=random.randint(0, 90))).isoformat(),
+            'last_played': (now - timedelta(minutes=random.randint(0, 10000))).isoformat(),
+        }
+    return json.dumps(data)
+
+
+def measure(loader) -> tuple:
+    """Đo RAM (bytes) của object tạo ra bởi loader"""
+    gc.collect()
+    tracemalloc.start()
+    obj = loader()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current, peak
+
+
+def load_into_table(raw: str) -> GameStatsTable:
+    table = GameStatsTable('benchmark', os.path.join('data', 'game_stats', '__benchmark_not_saved__.json'))
+    table.import_legacy(json.loads(raw))
+    return table
+
+
+def main():
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"=== Benchmark game stats RAM ({players:,} người chơi) ===")
+    raw = make_legacy_data(players)
+
+    legacy, legacy_mem, legacy_peak = measure(lambda: json.loads(raw))
+    del legacy
+    table, table_mem, table_peak = measure(lambda: load_into_table(raw))
+
+    print(f"  dict JSON cũ : {legacy_mem / 1024 / 1024:8.1f} MB (peak {legacy_peak / 1024 / 1024:.1f} MB)")
+    print(f"  game stats   : {table_mem / 1024 / 1024:8.1f} MB (peak {table_peak / 1024 / 1024:.1f} MB)")
+    print(f"  Tiết kiệm    : {(1 - table_mem / legacy_mem) * 100:8.1f}%")
+    print(f"  Bytes/người  : {legacy_mem / players:.0f} -> {table_mem / players:.0f}")
+    assert len(table) == players
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark resource: bot_resource.json cũ vs bundle .bres (resource_bundle.py)
+Chạy từ thư mục gốc repo: python bot_files/scripts/benchmark_resource_bundle.py [thư mục nguồn]
+"""
+import os
+import io
+import sys
+import time
+import shutil
+import tempfile
+import tracemalloc
+import contextlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from create_bot_resource import BotResourceManager
+from resource_bundle import ResourceBundle, create_bundle, update_bundle
+
+
+def timed(func, *args, **kwargs):
+    """(kết quả, giây, peak RAM bytes) - in ra của func bị ẩn"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args, **kwargs)
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def row(name, seconds, peak=None, size=None):
+    extra = f"{peak / 1024 / 1024:>8.1f} MB" if peak is not None else " " * 11
+    extra += f"{size:>14,} bytes" if size is not None else ""
+    print(f"  {name:<34}{seconds * 1000:>9.1f} ms {extra}")
+
+
+def main():
+    source = os.path.abspath(sys.argv[1] if len(sys.argv) > 1 else os.path.join(ROOT, 'bot_files'))
+    workdir = tempfile.mkdtemp(prefix='bundle_bench_')
+    try:
+        src = os.path.join(workdir, 'src')
+        shutil.copytree(source, src, ignore=shutil.ignore_patterns('__pycache__'))
+        files = sum(len(names) for _, _, names in os.walk(src))
+        raw = sum(os.path.getsize(os.path.join(d, n)) for d, _, names in os.walk(src) for n in names)
+        print(f"Nguồn: {source} ({files} files, {raw:,} bytes)\n")
+        print(f"  {'Thao tác':<34}{'Thời gian':>12}{'Peak RAM':>12}{'Kích thước':>20}")
+        
+        # JSON cũ
+        manager = BotResourceManager()
+        manager.bot_files_folder = src
+        manager.resource_file = os.path.join(workdir, 'bot_resource.json')
+        manager.bundle_file = os.path.join(workdir, 'none.bres')
+        _, seconds, peak = timed(manager.create_json_resource_file)
+        row("JSON: tạo", seconds, peak, os.path.getsize(manager.resource_file))
+        manager.bot_files_folder = os.path.join(workdir, 'out_json')
+        _, seconds, peak = timed(manager.extract_resource_file, force=True)
+        row("JSON: extract", seconds, peak)
+        manager.bot_files_folder = src
+        _, seconds, peak = timed(manager.create_json_resource_file)
+        row("JSON: update (tạo lại toàn bộ)", seconds, peak)
+        
+        # Bundle
+        bundle_path = os.path.join(workdir, 'bot_resource.bres')
+        _, seconds, peak = timed(create_bundle, src, bundle_path)
+        row("Bundle: tạo", seconds, peak, os.path.getsize(bundle_path))
+        bundle = ResourceBundle(bundle_path)
+        _, seconds, peak = timed(bundle.extract, os.path.join(workdir, 'out_bundle'))
+        row("Bundle: extract song song", seconds, peak)
+        _, seconds, peak = timed(bundle.extract, os.path.join(workdir, 'out_bundle_1'), workers=1)
+        row("Bundle: extract 1 thread", seconds, peak)
+        for name in bundle.files:
+            with open(os.path.join(src, *name.split('/')), 'rb') as f, \
+                    open(os.path.join(workdir, 'out_bundle', *name.split('/')), 'rb') as out:
+                assert f.read() == out.read(), name
+        largest = max(bundle.files, key=lambda name: bundle.files[name]['size'])
+        _, seconds, peak = timed(lambda: ResourceBundle(bundle_path).read(largest))
+        row("Bundle: đọc 1 file (lớn nhất)", seconds, peak)
+        _, seconds, peak = timed(update_bundle, src, bundle_path)
+        row("Bundle: update (không đổi)", seconds, peak)
+        target = os.path.join(src, *largest.split('/'))
+        with open(target, 'ab') as f:
+            f.write(b'\n')
+        stats, seconds, peak = timed(update_bundle, src, bundle_path)
+        row(f"Bundle: update ({stats['changed']} file đổi)", seconds, peak, stats['bundle_bytes'])
+        print("\n✅ Nội dung extract khớp nguồn")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark spam detector: replay luồng tin nhắn giả lập (chat thường + flood + spam lặp + raid)
+Chạy từ thư mục bot_files: python scripts/benchmark_spam_detector.py [số tin nhắn]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.getcwd())
+
+from utils.spam_detector import SpamDetector
+
+GUILDS = 50
+CHANNELS_PER_GUILD = 10
+USERS = 20_000
+MESSAGES_PER_SECOND = 200  # Tốc độ chat nền của toàn bộ server
+WORDS = (
+    "hello moi nguoi hom nay choi game gi vay ae oi cho minh hoi cai nay sao lam "
+    "taixiu slot daily bal ok luon an com chua di ngu thoi mai gap lai nha vui qua"
+).split()
+
+
+def build_stream(total: int):
+    """
+    Tạo luồng (thời điểm, guild, channel, user, nội dung, nhãn)
+    
+    Nhãn: None = chat thường, 'flood' / 'duplicate' / 'raid' = user vi phạm được cài vào
+    """
+    rng = random.Random(42)
+    stream = []
+    now = 1_700_000_000.0
+    attacks = {index: rng.choice(('flood', 'duplicate', 'raid')) for index in rng.sample(range(total), total // 5000)}
+    
+    index = 0
+    while len(stream) < total:
+        now += rng.expovariate(MESSAGES_PER_SECOND)
+        guild_id = rng.randint(1, GUILDS)
+        channel_id = guild_id * 100 + rng.randint(0, CHANNELS_PER_GUILD - 1)
+        content = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 12)))
+        stream.append((now, guild_id, channel_id, rng.randint(1, USERS), content, None))
+        
+        attack = attacks.get(index)
+        index += 1
+        if attack == 'flood':
+            user_id = rng.randint(USERS + 1, USERS * 2)
+            for burst in range(10):
+                stream.append((now + burst * 0.3, guild_id, channel_id, user_id, f"spam {rng.random()}", 'flood'))
+        elif attack == 'duplicate':
+            user_id = rng.randint(USERS + 1, USERS * 2)
+            for burst in range(6):
+                stream.append((now + burst * 3, guild_id, channel_id, user_id,
+                               f"free nitro discord gift tai day nhanh len {'!' * burst}", 'duplicate'))
+        elif attack == 'raid':
+            for burst in range(15):
+                stream.append((now + burst * 0.8, guild_id, guild_id * 100 + burst % CHANNELS_PER_GUILD,
+                               rng.randint(USERS + 1, USERS * 2), "join server abc xyz nhan qua free https://raid.example/x", 'raid'))
+    
+    stream.sort(key=lambda item: item[0])
+    return stream[:total]
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    stream = build_stream(total)
+    detector = SpamDetector()
+    
+    offenders = {(guild_id, user_id): label for _, guild_id, _, user_id, _, label in stream if label}
+    detected = set()
+    false_positives = set()
+    latencies = []
+    
+    print(f"=== Benchmark spam detector ({len(stream):,} tin nhắn, {len(offenders)} user vi phạm) ===")
+    start = time.perf_counter()
+    for now, guild_id, channel_id, user_id, content, label in stream:
+        began = time.perf_counter()
+        verdict = detector.observe(guild_id, channel_id, user_id, content, now=now)
+        latencies.append(time.perf_counter() - began)
+        if verdict is not None:
+            (detected if (guild_id, user_id) in offenders else false_positives).add((guild_id, user_id))
+    elapsed = time.perf_counter() - start
+    
+    latencies.sort()
+    print(f"  Tốc độ:        {len(stream) / elapsed:>12,.0f} tin nhắn/s")
+    print(f"  Latency p50:   {latencies[len(latencies) // 2] * 1e6:>12.1f} µs")
+    print(f"  Latency p99:   {latencies[int(len(latencies) * 0.99)] * 1e6:>12.1f} µs")
+    for label in ('flood', 'duplicate', 'raid'):
+        users = [key for key, value in offenders.items() if value == label]
+        print(f"  Phát hiện {label:<10}{sum(1 for key in users if key in detected):>5}/{len(users)} user")
+    print(f"  Báo nhầm:      {len(false_positives)} user")
+    print(f"  Bộ nhớ sketch: {detector.memory_bytes // 1024} KB (cố định)")
+    print("  (raid: các tài khoản gửi trước khi chạm ngưỡng raid_messages không bị tính)")
+    print(f"  Stats: {detector.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cập nhật danh sách lệnh (tên + alias) trong commands/manifest.json từ mã nguồn các command module
+Chạy từ thư mục bot_files: python scripts/build_command_manifest.py
+
+Chỉ đọc AST, không import module. Các trường module/class/attr/lazy giữ nguyên như trong
+manifest (thêm module mới bằng tay rồi chạy script để điền lệnh).
+"""
+import ast
+import json
+import os
+import sys
+
+MANIFEST_FILE = os.path.join('commands', 'manifest.json')
+
+
+def _literal(node, default=None):
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError):
+        return default
+
+
+def collect_commands(module_name: str) -> dict:
+    """{tên lệnh: [alias]} của các hàm có decorator *.bot.command / *.bot.group"""
+    with open(os.path.join('commands', f"{module_name}.py"), 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+
+    found = {}
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for decorator in node.decorator_list:
+            if not isinstance(decorator, ast.Call):
+                continue
+            target = ast.unparse(decorator.func)
+            if not (target.endswith('bot.command') or target.endswith('bot.group')):
+                continue
+            keywords = {keyword.arg: keyword.value for keyword in decorator.keywords}
+            name = _literal(keywords['name']) if 'name' in keywords else node.name
+            aliases = _literal(keywords['aliases'], []) if 'aliases' in keywords else []
+            found[name] = list(aliases)
+    return found
+
+
+def main():
+    with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    changed = 0
+    for entry in manifest['modules']:
+        found = collect_commands(entry['module'])
+        if found != entry.get('commands'):
+            changed += 1
+            print(f"  {entry['module']}: {sorted(entry.get('commands', {}))} -> {sorted(found)}")
+        entry['commands'] = found
+
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    lazy = sum(1 for entry in manifest['modules'] if entry.get('lazy'))
+    print(f"Đã cập nhật {changed}/{len(manifest['modules'])} module ({lazy} lazy) trong {MANIFEST_FILE}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
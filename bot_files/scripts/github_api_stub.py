@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Stub GitHub API (git data API + contents API tối thiểu) chạy local để test backup không cần mạng
+Chạy từ thư mục bot_files:
+    python scripts/github_api_stub.py [port]          - chạy stub, đặt "github_api_url": "http://127.0.0.1:<port>" trong config.json
+    python scripts/github_api_stub.py --selftest      - chạy GitHubBackupEngine với stub và kiểm tra backup tăng dần
+"""
+import os
+import sys
+import json
+import base64
+import asyncio
+import hashlib
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.getcwd())
+
+
+class GitStore:
+    """Object store trong RAM: blob sha giống git, tree lưu phẳng {path: blob sha}"""
+    
+    def __init__(self, branch: str = 'main'):
+        self.branch = branch
+        self.blobs = {}
+        self.trees = {}
+        self.commits = {}
+        self.requests = []  # (method, path) theo thứ tự
+        self.lock = threading.Lock()
+        tree_sha = self.put_tree({})
+        self.head = self.put_commit('Initial commit', tree_sha, [])
+    
+    @staticmethod
+    def _sha(data: bytes) -> str:
+        return hashlib.sha1(data).hexdigest()
+    
+    def put_blob(self, content: bytes) -> str:
+        sha = self._sha(f"blob {len(content)}\0".encode('utf-8') + content)
+        self.blobs[sha] = content
+        return sha
+    
+    def put_tree(self, entries: dict) -> str:
+        sha = self._sha(json.dumps(entries, sort_keys=True).encode('utf-8'))
+        self.trees[sha] = dict(entries)
+        return sha
+    
+    def put_commit(self, message: str, tree: str, parents: list) -> str:
+        sha = self._sha(json.dumps([message, tree, parents, len(self.commits)]).encode('utf-8'))
+        self.commits[sha] = {'sha': sha, 'message': message, 'tree': {'sha': tree}, 'parents': [{'sha': p} for p in parents]}
+        return sha
+    
+    def file(self, path: str):
+        return self.trees[self.commits[self.head]['tree']['sha']].get(path)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    store: GitStore = None
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _body(self) -> dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+    
+    def _route(self, method: str) -> None:
+        store = self.store
+        if not self.headers.get('Authorization', '').startswith('token '):
+            self._reply(401, {'message': 'Bad credentials'})
+            return
+        parts = self.path.split('?')[0].strip('/').split('/')
+        with store.lock:
+            store.requests.append((method, self.path))
+            if parts[:2] == ['user', 'repos'] and method == 'POST':
+                self._reply(422, {'message': 'name already exists on this account'})
+                return
+            if parts[0] != 'repos' or len(parts) < 3:
+                self._reply(404, {'message': 'Not Found'})
+                return
+            rest = parts[3:]
+            if not rest and method == 'GET':
+                self._reply(200, {'name': parts[2], 'private': True, 'default_branch': store.branch})
+            elif rest[:3] == ['git', 'ref', 'heads'] and method == 'GET':
+                self._reply(200, {'ref': f"refs/heads/{store.branch}", 'object': {'sha': store.head, 'type': 'commit'}})
+            elif rest[:2] == ['git', 'commits'] and method == 'GET':
+                commit = store.commits.get(rest[2])
+                self._reply(200, commit) if commit else self._reply(404, {'message': 'Not Found'})
+            elif rest == ['git', 'blobs'] and method == 'POST':
+                self._reply(201, {'sha': store.put_blob(base64.b64decode(self._body()['content']))})
+            elif rest == ['git', 'trees'] and method == 'POST':
+                body = self._body()
+                entries = dict(store.trees.get(body.get('base_tree'), {}))
+                for entry in body['tree']:
+                    if 'content' in entry:
+                        entries[entry['path']] = store.put_blob(entry['content'].encode('utf-8'))
+                    elif entry.get('sha') is None:
+                        entries.pop(entry['path'], None)
+                    else:
+                        entries[entry['path']] = entry['sha']
+                self._reply(201, {'sha': store.put_tree(entries)})
+            elif rest == ['git', 'commits'] and method == 'POST':
+                body = self._body()
+                self._reply(201, {'sha': store.put_commit(body['message'], body['tree'], body['parents'])})
+            elif rest[:3] == ['git', 'refs', 'heads'] and method == 'PATCH':
+                sha = self._body()['sha']
+                parents = [p['sha'] for p in store.commits[sha]['parents']]
+                if store.head not in parents:
+                    self._reply(422, {'message': 'Update is not a fast forward'})
+                    return
+                store.head = sha
+                self._reply(200, {'object': {'sha': sha}})
+            elif rest[:1] == ['contents'] and method == 'GET':
+                blob_sha = store.file('/'.join(rest[1:]))
+                if blob_sha is None:
+                    self._reply(404, {'message': 'Not Found'})
+                else:
+                    self._reply(200, {'sha': blob_sha, 'content': base64.b64encode(store.blobs[blob_sha]).decode('ascii')})
+            else:
+                self._reply(404, {'message': 'Not Found'})
+    
+    def do_GET(self):
+        self._route('GET')
+    
+    def do_POST(self):
+        self._route('POST')
+    
+    def do_PATCH(self):
+        self._route('PATCH')
+
+
+def start_stub(port: int = 0):
+    """Chạy stub trong thread nền, trả về (server, store, api_url)"""
+    store = GitStore()
+    handler = type('Handler', (StubHandler,), {'store': store})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, store, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+async def selftest() -> None:
+    from utils.github_backup_engine import GitHubBackupEngine
+    
+    server, store, api_url = start_stub()
+    with tempfile.TemporaryDirectory() as workdir:
+        local = {f"data/file_{i}.json": os.path.join(workdir, f"file_{i}.json") for i in range(5)}
+        for i, path in enumerate(local.values()):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'index': i}, f)
+        local['data/missing.json'] = os.path.join(workdir, 'missing.json')
+        engine = GitHubBackupEngine('test-token', 'owner', 'repo', state_file=os.path.join(workdir, 'state.json'), api_url=api_url)
+        
+        def summary(result):
+            return {'backup_summary.json': json.dumps(result.to_dict()).encode('utf-8')}
+        
+        first = await engine.backup(local, 'first', extra_files=summary)
+        assert len(first.uploaded) == 5 and first.missing == ['data/missing.json'] and first.commit == store.head
+        assert store.file('backup_summary.json') is not None
+        print(f"Lần 1: upload {len(first.uploaded)} file, {len(store.requests)} request, commit {first.commit[:7]}")
+        
+        store.requests.clear()
+        second = await engine.backup(local, 'second', extra_files=summary)
+        assert not second.uploaded and len(second.unchanged) == 5 and second.commit is None and not store.requests
+        print("Lần 2: không đổi -> 0 request")
+        
+        with open(local['data/file_3.json'], 'w', encoding='utf-8') as f:
+            json.dump({'index': 3, 'changed': True}, f)
+        reloaded = GitHubBackupEngine('test-token', 'owner', 'repo', state_file=engine.state_file, api_url=api_url)
+        third = await reloaded.backup(local, 'third')
+        blob_posts = [r for r in store.requests if r == ('POST', '/repos/owner/repo/git/blobs')]
+        assert third.uploaded == ['data/file_3.json'] and len(blob_posts) == 1
+        assert store.blobs[store.file('data/file_3.json')] == open(local['data/file_3.json'], 'rb').read()
+        assert store.file('data/file_0.json') is not None  # File cũ vẫn còn trong tree
+        print(f"Lần 3: đổi 1 file (cache đọc từ đĩa) -> upload 1 file, {len(store.requests)} request")
+        
+        full = await reloaded.backup(local, 'full', full=True)
+        assert len(full.uploaded) == 5
+        print(f"Full: upload lại {len(full.uploaded)} file")
+    server.shutdown()
+    print("✅ Selftest OK")
+
+
+if __name__ == '__main__':
+    if '--selftest' in sys.argv:
+        asyncio.run(selftest())
+    else:
+        port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+        server, _, api_url = start_stub(port)
+        print(f"GitHub API stub đang chạy tại {api_url} (Ctrl+C để dừng)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
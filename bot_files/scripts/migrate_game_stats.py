@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script migrate thống kê games từ 5 file JSON cũ sang game stats store
+Chạy từ thư mục bot_files: python scripts/migrate_game_stats.py
+"""
+import os
+import sys
+import logging
+
+sys.path.insert(0, os.getcwd())
+
+from utils.game_stats_store import game_stats, LEGACY_STATS_FILES
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    print("=== Migrate game stats ===")
+    results = game_stats.migrate_legacy_files()
+    for game, count in results.items():
+        print(f"  • {game}: {count} records ({LEGACY_STATS_FILES[game]})")
+    print(f"✅ Đã lưu vào {game_stats.data_dir}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Admin notifier - gửi cảnh báo moderation (bot thiếu quyền...) cho admin qua DM:
+roster admin cache theo guild, chống lặp theo (guild, lý do) và 1 hàng đợi gửi có backoff
+"""
+import asyncio
+import time
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COOLDOWN = 3600.0  # Cùng 1 cảnh báo của 1 guild chỉ gửi 1 lần/giờ
+ROSTER_TTL = 600.0  # Giây trước khi quét lại danh sách admin của guild
+QUEUE_MAXSIZE = 100
+MAX_BACKOFF = 60.0
+MAX_ATTEMPTS = 3
+
+
+class AdminNotifier:
+    """
+    Class gửi thông báo cho admin của guild
+    
+    notify() chỉ tra dict cooldown rồi đưa vào hàng đợi (O(1)), nên gọi được
+    từ đường xử lý mỗi tin nhắn. Task gửi duy nhất lấy roster admin đã cache
+    (quét guild.members tối đa 1 lần/ROSTER_TTL), DM lần lượt tới khi có 1
+    admin nhận được, gặp lỗi HTTP thì lùi thời gian chờ theo cấp số nhân.
+    """
+    
+    def __init__(self, bot_instance, cooldown: float = DEFAULT_COOLDOWN, roster_ttl: float = ROSTER_TTL):
+        self.bot_instance = bot_instance
+        self.cooldown = cooldown
+        self.roster_ttl = roster_ttl
+        self._last_sent: Dict[Tuple[int, str], float] = {}
+        self._rosters: Dict[int, Tuple[float, List[int]]] = {}  # guild_id -> (thời điểm quét, [admin_id])
+        self._dm_closed: Dict[int, float] = {}  # admin_id -> thời điểm DM bị chặn (bỏ qua trong roster_ttl)
+        self._queue: Optional[asyncio.Queue] = None
+        self._sender_task: Optional[asyncio.Task] = None
+        self._backoff = 0.0
+        self._queued = 0
+        self._sent = 0
+        self._suppressed = 0
+        self._dropped = 0
+        self._failed = 0
+    
+    # ---------- Gửi ----------
+    
+    def notify(self, guild, reason_key: str, embed: discord.Embed) -> bool:
+        """
+        Đưa cảnh báo vào hàng đợi gửi cho admin của guild
+        
+        Args:
+            guild: discord.Guild
+            reason_key: Khóa chống lặp (vd: 'auto_delete_forbidden')
+            embed: Nội dung cảnh báo
+        
+        Returns:
+            bool: False nếu bị bỏ qua do cooldown hoặc hàng đợi đầy
+        """
+        now = time.monotonic()
+        key = (guild.id, reason_key)
+        last_sent = self._last_sent.get(key)
+        if last_sent is not None and now - last_sent < self.cooldown:
+            self._suppressed += 1
+            return False
+        
+        self._ensure_sender()
+        try:
+            self._queue.put_nowait((guild, reason_key, embed, 1))
+        except asyncio.QueueFull:
+            self._dropped += 1
+            return False
+        self._last_sent[key] = now
+        self._queued += 1
+        if len(self._last_sent) > 1000:
+            self._prune(now)
+        return True
+    
+    def _ensure_sender(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+        if self._sender_task is None or self._sender_task.done():
+            self._sender_task = asyncio.get_running_loop().create_task(self._sender_loop())
+    
+    async def _sender_loop(self) -> None:
+        while True:
+            guild, reason_key, embed, attempt = await self._queue.get()
+            if self._backoff:
+                await asyncio.sleep(self._backoff)
+            try:
+                delivered = await self._deliver(guild, embed)
+                self._backoff = 0.0
+                if delivered:
+                    self._sent += 1
+                else:
+                    self._failed += 1
+                    logger.warning(f"Không gửi được cảnh báo '{reason_key}' cho admin nào của {guild.name}")
+            except discord.HTTPException as e:
+                self._backoff = min(MAX_BACKOFF, max(1.0, self._backoff * 2))
+                logger.warning(f"Lỗi HTTP khi gửi cảnh báo admin ({e}), chờ {self._backoff:.0f}s trước lần gửi tiếp")
+                if attempt < MAX_ATTEMPTS and not self._queue.full():
+                    self._queue.put_nowait((guild, reason_key, embed, attempt + 1))
+                else:
+                    self._failed += 1
+            except Exception as e:
+                self._failed += 1
+                logger.error(f"Lỗi khi gửi cảnh báo admin: {e}")
+    
+    async def _deliver(self, guild, embed: discord.Embed) -> bool:
+        """DM lần lượt admin trong roster tới khi 1 người nhận được"""
+        now = time.monotonic()
+        for admin_id in self.get_roster(guild):
+            closed_at = self._dm_closed.get(admin_id)
+            if closed_at is not None and now - closed_at < self.roster_ttl:
+                continue
+            member = guild.get_member(admin_id)
+            if member is None:
+                continue
+            try:
+                await member.send(embed=embed)
+                return True
+            except discord.Forbidden:
+                self._dm_closed[admin_id] = now  # Admin tắt DM - bỏ qua 1 thời gian
+        return False
+    
+    # ---------- Roster ----------
+    
+    def get_roster(self, guild) -> List[int]:
+        """
+        Danh sách admin của guild (Supreme Admin, chủ server, admin bot, member có quyền warn)
+        
+        Cache trong roster_ttl giây, chỉ task gửi gọi nên không nằm trên đường xử lý tin nhắn.
+        """
+        now = time.monotonic()
+        cached = self._rosters.get(guild.id)
+        if cached is not None and now - cached[0] < self.roster_ttl:
+            return cached[1]
+        
+        roster = []
+        supreme_admin_id = self.bot_instance.supreme_admin_id
+        if supreme_admin_id and guild.get_member(supreme_admin_id):
+            roster.append(supreme_admin_id)
+        if guild.owner_id and guild.owner_id not in roster:
+            roster.append(guild.owner_id)
+        for member in guild.members:
+            if member.bot or member.id in roster:
+                continue
+            if self.bot_instance.has_warn_permission(member.id, member.guild_permissions):
+                roster.append(member.id)
+        self._rosters[guild.id] = (now, roster)
+        return roster
+    
+    def forget_guild(self, guild_id: int) -> None:
+        """Bỏ cache khi bot rời guild"""
+        self._rosters.pop(guild_id, None)
+        for key in [key for key in self._last_sent if key[0] == guild_id]:
+            del self._last_sent[key]
+    
+    def _prune(self, now: float) -> None:
+        """Dọn các mục cooldown/DM đã hết hạn"""
+        self._last_sent = {key: sent_at for key, sent_at in self._last_sent.items() if now - sent_at < self.cooldown}
+        self._dm_closed = {admin_id: closed_at for admin_id, closed_at in self._dm_closed.items() if now - closed_at < self.roster_ttl}
+    
+    def get_stats(self) -> dict:
+        """Thống kê notifier"""
+        return {
+            'queued': self._queued,
+            'sent': self._sent,
+            'suppressed': self._suppressed,
+            'dropped': self._dropped,
+            'failed': self._failed,
+            'pending': self._queue.qsize() if self._queue else 0,
+            'cached_rosters': len(self._rosters),
+            'backoff': self._backoff,
+        }
@@ -0,0 +1,199 @@
+"""
+Authorization index - biên dịch ban list, maintenance, channel permissions, quyền lệnh
+và danh sách admin/priority thành 1 snapshot bất biến để global check chỉ tra cứu O(1)
+"""
+import time
+import logging
+from typing import Dict, FrozenSet, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Cờ quyền của user (bitmask)
+FLAG_BANNED = 1
+FLAG_ADMIN = 2
+FLAG_SUPREME = 4
+FLAG_PRIORITY = 8
+
+# Level quyền lệnh (command_permissions.json lưu dạng string)
+LEVEL_USER = 0
+LEVEL_ADMIN = 1
+LEVEL_SUPREME = 2
+LEVEL_BY_NAME = {'user': LEVEL_USER, 'admin': LEVEL_ADMIN, 'supreme_admin': LEVEL_SUPREME}
+LEVEL_NAMES = {level: name for name, level in LEVEL_BY_NAME.items()}
+
+# Kết quả check
+ALLOW = 0  # Cho phép, vẫn áp dụng rate limit
+ALLOW_NO_LIMIT = 1  # Cho phép, bỏ qua rate limit (Supreme Admin, priority, admin qua DM)
+DENY_BANNED = 2
+DENY_MAINTENANCE = 3
+DENY_DM = 4
+DENY_CHANNEL = 5
+
+VERDICT_NAMES = {
+    ALLOW: 'allow',
+    ALLOW_NO_LIMIT: 'allow_no_limit',
+    DENY_BANNED: 'deny_banned',
+    DENY_MAINTENANCE: 'deny_maintenance',
+    DENY_DM: 'deny_dm',
+    DENY_CHANNEL: 'deny_channel',
+}
+
+# Lệnh vẫn dùng được khi bảo trì
+MAINTENANCE_ALLOWED_COMMANDS = frozenset({
+    'close', 'open', 'maintenancestatus', 'maintenance', 'lock', 'unlock', 'unmaintenance', 'mstatus'
+})
+
+
+class _PolicySnapshot:
+    """Snapshot quyền đã biên dịch - không sửa sau khi tạo, rebuild sẽ thay cả object"""
+
+    __slots__ = ('user_flags', 'guild_policies', 'command_levels', 'maintenance', 'maintenance_info', 'built_at')
+
+    def __init__(self, user_flags: Dict[int, int],
+                 guild_policies: Dict[int, Tuple[FrozenSet[int], FrozenSet[str]]],
+                 command_levels: Dict[str, int], maintenance: bool, maintenance_info: dict):
+        self.user_flags = user_flags
+        self.guild_policies = guild_policies  # guild_id -> (allowed_channels, bypass_commands)
+        self.command_levels = command_levels
+        self.maintenance = maintenance
+        self.maintenance_info = maintenance_info
+        self.built_at = time.time()
+
+
+class AuthorizationIndex:
+    """
+    Class biên dịch các luật quyền thành index tra cứu nhanh cho global command check
+
+    Nguồn dữ liệu vẫn là các command class (ban_commands, maintenance_manager,
+    channel_permission_manager, permission_manager) và admin_ids/priority_users
+    của bot. Khi admin đổi luật, command gọi rebuild(): snapshot mới được build
+    xong rồi mới gán thay snapshot cũ nên check() không bao giờ thấy trạng thái dở dang.
+    """
+
+    def __init__(self, bot_instance=None):
+        self.bot_instance = bot_instance
+        self._snapshot = _PolicySnapshot({}, {}, {}, False, {})
+        self._rebuild_count = 0
+        self._last_build_time = 0.0
+
+    def rebuild(self) -> None:
+        """Build lại snapshot từ dữ liệu hiện tại của bot và thay thế snapshot cũ"""
+        start = time.perf_counter()
+        bot = self.bot_instance
+
+        user_flags: Dict[int, int] = {}
+
+        def add_flag(user_id, flag):
+            try:
+                user_id = int(user_id)
+            except (TypeError, ValueError):
+                return
+            user_flags[user_id] = user_flags.get(user_id, 0) | flag
+
+        ban_commands = getattr(bot, 'ban_commands', None)
+        if ban_commands is not None:
+            for user_id in ban_commands.banned_users:
+                add_flag(user_id, FLAG_BANNED)
+        for user_id in getattr(bot, 'admin_ids', ()):
+            add_flag(user_id, FLAG_ADMIN)
+        for user_id in getattr(bot, 'priority_users', ()):
+            add_flag(user_id, FLAG_PRIORITY)
+        supreme_admin_id = getattr(bot, 'supreme_admin_id', None)
+        if supreme_admin_id is not None:
+            add_flag(supreme_admin_id, FLAG_SUPREME | FLAG_ADMIN)
+
+        # Server không có kênh nào trong allowed_channels = cho phép tất cả, không cần lưu
+        guild_policies = {}
+        channel_manager = getattr(bot, 'channel_permission_manager', None)
+        if channel_manager is not None:
+            for guild_key, guild_data in channel_manager.permissions_data.items():
+                allowed_channels = frozenset(int(c) for c in guild_data.get('allowed_channels', []))
+                if not allowed_channels:
+                    continue
+                bypass_commands = frozenset(guild_data.get('bypass_commands', []))
+                guild_policies[int(guild_key)] = (allowed_channels, bypass_commands)
+
+        command_levels = {}
+        permission_manager = getattr(bot, 'permission_manager', None)
+        if permission_manager is not None:
+            for command_name, level_name in permission_manager.command_permissions.items():
+                command_levels[command_name] = LEVEL_BY_NAME.get(level_name, LEVEL_USER)
+
+        maintenance = False
+        maintenance_info = {}
+        maintenance_manager = getattr(bot, 'maintenance_manager', None)
+        if maintenance_manager is not None:
+            maintenance = bool(maintenance_manager.maintenance_data.get('is_maintenance', False))
+            if maintenance:
+                maintenance_info = {
+                    'reason': maintenance_manager.maintenance_data.get('reason', 'Đang bảo trì hệ thống'),
+                    'closed_by': dict(maintenance_manager.maintenance_data.get('closed_by', {})),
+                }
+
+        # Gán 1 lần - check() đang chạy vẫn dùng snapshot cũ trọn vẹn
+        self._snapshot = _PolicySnapshot(user_flags, guild_policies, command_levels, maintenance, maintenance_info)
+        self._rebuild_count += 1
+        self._last_build_time = time.perf_counter() - start
+        logger.debug(
+            f"Authorization index rebuilt: {len(user_flags)} users, {len(guild_policies)} guilds, "
+            f"{len(command_levels)} commands ({self._last_build_time * 1000:.2f} ms)"
+        )
+
+    def check(self, user_id: int, guild_id: Optional[int], channel_id: int,
+              command_name: Optional[str], is_dm: bool = False) -> int:
+        """
+        Quyết định 1 lệnh có được chạy không
+
+        Returns:
+            int: ALLOW, ALLOW_NO_LIMIT, DENY_BANNED, DENY_MAINTENANCE, DENY_DM hoặc DENY_CHANNEL
+        """
+        snapshot = self._snapshot
+        flags = snapshot.user_flags.get(user_id, 0)
+
+        if flags & FLAG_BANNED:
+            return DENY_BANNED
+        if snapshot.maintenance and not flags & FLAG_SUPREME and command_name not in MAINTENANCE_ALLOWED_COMMANDS:
+            return DENY_MAINTENANCE
+        if is_dm:
+            return ALLOW_NO_LIMIT if flags & FLAG_ADMIN else DENY_DM
+
+        policy = snapshot.guild_policies.get(guild_id)
+        if policy is not None and channel_id not in policy[0] and command_name not in policy[1]:
+            return DENY_CHANNEL
+
+        return ALLOW_NO_LIMIT if flags & (FLAG_SUPREME | FLAG_PRIORITY) else ALLOW
+
+    def is_admin(self, user_id: int) -> bool:
+        """User là Admin hoặc Supreme Admin"""
+        return bool(self._snapshot.user_flags.get(user_id, 0) & FLAG_ADMIN)
+
+    def get_command_level(self, command_name: str) -> int:
+        """Level quyền yêu cầu của lệnh (mặc định LEVEL_USER)"""
+        return self._snapshot.command_levels.get(command_name, LEVEL_USER)
+
+    def get_user_level(self, user_id: int) -> int:
+        """Level quyền của user"""
+        flags = self._snapshot.user_flags.get(user_id, 0)
+        if flags & FLAG_SUPREME:
+            return LEVEL_SUPREME
+        if flags & FLAG_ADMIN:
+            return LEVEL_ADMIN
+        return LEVEL_USER
+
+    @property
+    def maintenance_info(self) -> dict:
+        """Lý do + người bật bảo trì (rỗng nếu không bảo trì)"""
+        return self._snapshot.maintenance_info
+
+    def get_stats(self) -> dict:
+        """Thống kê index"""
+        snapshot = self._snapshot
+        return {
+            'users': len(snapshot.user_flags),
+            'banned': sum(1 for flags in snapshot.user_flags.values() if flags & FLAG_BANNED),
+            'restricted_guilds': len(snapshot.guild_policies),
+            'command_levels': len(snapshot.command_levels),
+            'maintenance': snapshot.maintenance,
+            'rebuilds': self._rebuild_count,
+            'last_build_ms': round(self._last_build_time * 1000, 3),
+        }
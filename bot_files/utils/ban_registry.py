@@ -0,0 +1,236 @@
+"""
+Ban registry - danh sách user bị ban + lịch sử ban/unban dạng log append-only,
+truy vấn theo trang (mới nhất trước) và lưu sẵn tên hiển thị tại thời điểm ban
+"""
+import bisect
+import json
+import os
+import time
+import logging
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .metrics import PERSISTENCE_FLUSH
+
+logger = logging.getLogger(__name__)
+
+
+class BanHistoryEntry(NamedTuple):
+    """1 dòng lịch sử ban/unban"""
+    timestamp: float
+    action: str  # 'ban' hoặc 'unban'
+    user_id: int
+    admin_id: int
+    reason: str
+    user_name: str  # Tên hiển thị lúc ban/unban ('' nếu không có trong cache)
+    admin_name: str
+
+
+class BanRegistry:
+    """
+    Class quản lý user bị ban của bot
+    
+    - banned: {user_id: {'reason', 'timestamp', 'banned_by', 'user_name', 'admin_name'}},
+      thứ tự dict = thứ tự ban, lưu atomic vào state_file
+    - Lịch sử: mỗi thao tác ghi thêm 1 dòng JSON vào history_file (không ghi lại cả file),
+      trong RAM giữ list theo thời gian nên phân trang/tra theo mốc thời gian bằng bisect
+    - version tăng sau mỗi thay đổi để bên hiển thị biết khi nào cache trang hết hạn
+    """
+    
+    def __init__(self, state_file: str = 'data/banned_users.json', history_file: str = 'data/ban_history.jsonl'):
+        self.state_file = state_file
+        self.history_file = history_file
+        self.banned: Dict[int, dict] = {}
+        self._history: List[BanHistoryEntry] = []
+        self._history_times: List[float] = []
+        self._newest_first: Optional[List[int]] = None
+        self.version = 0
+    
+    # ---------- Load / lưu ----------
+    
+    def load(self) -> None:
+        """Tải danh sách ban và lịch sử (chuyển ban_history cũ trong state_file sang log)"""
+        legacy_history = []
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.banned = {int(user_id): info for user_id, info in data.get('banned_users', {}).items()}
+                legacy_history = data.get('ban_history', [])
+            else:
+                self.save()
+                logger.info(f"Đã tạo file banned users mới: {self.state_file}")
+        except Exception as e:
+            logger.error(f"Lỗi khi tải banned users: {e}")
+        
+        try:
+            if os.path.exists(self.history_file):
+                with open(self.history_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            self._remember(self._entry_from_dict(json.loads(line)))
+            if legacy_history:
+                self._import_legacy(legacy_history)
+        except Exception as e:
+            logger.error(f"Lỗi khi tải lịch sử ban: {e}")
+        
+        self.version += 1
+        logger.info(f"Đã tải {len(self.banned)} user bị ban, {len(self._history)} dòng lịch sử")
+    
+    def _import_legacy(self, legacy_history: list) -> None:
+        """Ghi ban_history cũ vào log rồi bỏ khỏi state_file (chỉ chạy 1 lần)"""
+        entries = []
+        for item in legacy_history:
+            try:
+                timestamp = datetime.fromisoformat(item['timestamp']).timestamp()
+            except (KeyError, TypeError, ValueError):
+                timestamp = 0.0
+            entries.append(BanHistoryEntry(
+                timestamp, item.get('action', 'ban'), int(item.get('user_id', 0)),
+                int(item.get('admin_id', 0)), item.get('reason', ''), '', ''
+            ))
+        entries.sort(key=lambda entry: entry.timestamp)
+        self._append(entries)
+        self.save()
+        logger.info(f"Đã chuyển {len(entries)} dòng ban_history sang {self.history_file}")
+    
+    @PERSISTENCE_FLUSH.time(store='ban_registry')
+    def save(self) -> None:
+        """Lưu danh sách ban hiện tại (ghi atomic)"""
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+            data = {
+                'banned_users': {str(user_id): info for user_id, info in self.banned.items()},
+                'description': "Danh sách users bị cấm sử dụng bot",
+            }
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            logger.error(f"Lỗi khi lưu banned users: {e}")
+    
+    @staticmethod
+    def _entry_from_dict(data: dict) -> BanHistoryEntry:
+        return BanHistoryEntry(
+            data['t'], data['a'], int(data['u']), int(data.get('b', 0)),
+            data.get('r', ''), data.get('un', ''), data.get('bn', '')
+        )
+    
+    def _remember(self, entry: BanHistoryEntry) -> None:
+        # Log ghi theo thời gian nên luôn append cuối; bisect chỉ để chịu được đồng hồ lùi
+        if self._history_times and entry.timestamp < self._history_times[-1]:
+            index = bisect.bisect_right(self._history_times, entry.timestamp)
+            self._history.insert(index, entry)
+            self._history_times.insert(index, entry.timestamp)
+        else:
+            self._history.append(entry)
+            self._history_times.append(entry.timestamp)
+    
+    def _append(self, entries: List[BanHistoryEntry]) -> None:
+        """Ghi thêm các dòng lịch sử vào cuối log"""
+        try:
+            os.makedirs(os.path.dirname(self.history_file) or '.', exist_ok=True)
+            with open(self.history_file, 'a', encoding='utf-8') as f:
+                for entry in entries:
+                    line = {'t': entry.timestamp, 'a': entry.action, 'u': entry.user_id, 'b': entry.admin_id, 'r': entry.reason}
+                    if entry.user_name:
+                        line['un'] = entry.user_name
+                    if entry.admin_name:
+                        line['bn'] = entry.admin_name
+                    f.write(json.dumps(line, ensure_ascii=False, separators=(',', ':')) + '\n')
+        except Exception as e:
+            logger.error(f"Lỗi khi ghi lịch sử ban: {e}")
+        for entry in entries:
+            self._remember(entry)
+    
+    def _changed(self) -> None:
+        self._newest_first = None
+        self.version += 1
+    
+    # ---------- Ban / unban ----------
+    
+    def is_banned(self, user_id: int) -> bool:
+        return user_id in self.banned
+    
+    def get(self, user_id: int) -> dict:
+        return self.banned.get(user_id, {})
+    
+    def ban(self, user_ids: List[int], reason: str, admin_id: int,
+            names: Optional[Dict[int, str]] = None, admin_name: str = '') -> List[int]:
+        """
+        Ban nhiều user, lưu state 1 lần và ghi 1 dòng log cho mỗi user
+        
+        Args:
+            names: {user_id: tên hiển thị} lấy lúc ban (không bắt buộc)
+        
+        Returns:
+            list: Các user ID mới bị ban (bỏ qua user đã bị ban)
+        """
+        names = names or {}
+        new_ids = [user_id for user_id in dict.fromkeys(user_ids) if user_id not in self.banned]
+        if not new_ids:
+            return []
+        
+        now = time.time()
+        timestamp = datetime.fromtimestamp(now).isoformat()
+        for user_id in new_ids:
+            self.banned[user_id] = {
+                'reason': reason,
+                'timestamp': timestamp,
+                'banned_by': admin_id,
+                'user_name': names.get(user_id, ''),
+                'admin_name': admin_name,
+            }
+        self.save()
+        self._append([
+            BanHistoryEntry(now, 'ban', user_id, admin_id, reason, names.get(user_id, ''), admin_name)
+            for user_id in new_ids
+        ])
+        self._changed()
+        return new_ids
+    
+    def unban(self, user_id: int, admin_id: int, reason: str = '', admin_name: str = '') -> bool:
+        """Bỏ ban user, False nếu user không bị ban"""
+        info = self.banned.pop(user_id, None)
+        if info is None:
+            return False
+        self.save()
+        self._append([BanHistoryEntry(time.time(), 'unban', user_id, admin_id, reason, info.get('user_name', ''), admin_name)])
+        self._changed()
+        return True
+    
+    # ---------- Truy vấn theo trang ----------
+    
+    def bans_page(self, offset: int, limit: int) -> List[Tuple[int, dict]]:
+        """User đang bị ban, ban gần nhất trước"""
+        if self._newest_first is None:
+            self._newest_first = list(reversed(self.banned))
+        return [(user_id, self.banned[user_id]) for user_id in self._newest_first[offset:offset + limit]]
+    
+    def history_page(self, offset: int, limit: int, before: Optional[float] = None) -> List[BanHistoryEntry]:
+        """
+        Lịch sử ban/unban, mới nhất trước
+        
+        Args:
+            offset: Bỏ qua bao nhiêu dòng (tính từ mốc `before`)
+            before: Chỉ lấy các dòng trước mốc epoch này (None = tới hiện tại)
+        """
+        end = len(self._history) if before is None else bisect.bisect_left(self._history_times, before)
+        end -= offset
+        if end <= 0:
+            return []
+        return self._history[max(0, end - limit):end][::-1]
+    
+    def history_count(self, before: Optional[float] = None) -> int:
+        if before is None:
+            return len(self._history)
+        return bisect.bisect_left(self._history_times, before)
+    
+    def get_stats(self) -> dict:
+        """Thống kê registry"""
+        return {
+            'banned': len(self.banned),
+            'history': len(self._history),
+            'version': self.version,
+        }
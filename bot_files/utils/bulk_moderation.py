@@ -0,0 +1,176 @@
+"""
+Bulk moderation - chạy 1 hành động moderation (warn/mute/ban/auto-delete) cho nhiều
+target cùng lúc với semaphore giới hạn, giãn cách request và báo tiến độ định kỳ
+"""
+import asyncio
+import re
+import time
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Hành động trên 1 target: trả về (thành công, thông báo ngắn)
+BulkAction = Callable[[object], Awaitable[Tuple[bool, str]]]
+ProgressCallback = Callable[[int, int, List['BulkResult']], Awaitable[None]]
+
+
+class BulkResult:
+    """Kết quả hành động trên 1 target"""
+    
+    __slots__ = ('target_id', 'label', 'ok', 'message')
+    
+    def __init__(self, target_id: int, label: str, ok: bool, message: str):
+        self.target_id = target_id
+        self.label = label
+        self.ok = ok
+        self.message = message
+    
+    def __repr__(self) -> str:
+        return f"BulkResult(target_id={self.target_id}, ok={self.ok}, message={self.message!r})"
+
+
+def select_members(members: Iterable, joined_within: Optional[timedelta] = None,
+                   name_pattern: Optional[str] = None, include_bots: bool = False,
+                   exclude_ids: Iterable[int] = (), limit: Optional[int] = None) -> list:
+    """
+    Lọc member từ member cache theo điều kiện
+    
+    Args:
+        members: guild.members
+        joined_within: Chỉ lấy member vào server trong khoảng thời gian này
+        name_pattern: Regex (không phân biệt hoa thường) khớp name/display_name
+        include_bots: Có lấy bot không
+        exclude_ids: ID bỏ qua (người chạy lệnh, admin...)
+        limit: Số member tối đa
+    
+    Raises:
+        re.error: Nếu name_pattern không hợp lệ
+    """
+    regex = re.compile(name_pattern, re.IGNORECASE) if name_pattern else None
+    cutoff = datetime.now(timezone.utc) - joined_within if joined_within else None
+    exclude_ids = set(exclude_ids)
+    
+    selected = []
+    for member in members:
+        if member.id in exclude_ids or (member.bot and not include_bots):
+            continue
+        if cutoff is not None and (member.joined_at is None or member.joined_at < cutoff):
+            continue
+        if regex is not None and not (regex.search(member.name) or regex.search(member.display_name)):
+            continue
+        selected.append(member)
+        if limit and len(selected) >= limit:
+            break
+    return selected
+
+
+class BulkModerationEngine:
+    """
+    Class chạy hành động moderation hàng loạt
+    
+    Tối đa `concurrency` hành động chạy đồng thời. Action gọi throttle() ngay
+    trước mỗi request API để các lần gọi được giãn cách ít nhất `min_interval`
+    giây, hành động chỉ ghi dữ liệu local thì không phải chờ. Callback tiến độ
+    được gọi mỗi `progress_interval` giây, kết quả cuối do caller tự hiển thị.
+    """
+    
+    def __init__(self, concurrency: int = 5, min_interval: float = 0.25, progress_interval: float = 2.0):
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self.progress_interval = progress_interval
+        self._pace_lock: Optional[asyncio.Lock] = None
+        self._next_slot = 0.0
+        self._runs = 0
+        self._targets_processed = 0
+        self._failures = 0
+        self._rate_limited = 0
+    
+    async def throttle(self) -> None:
+        """Chờ tới lượt gọi API (action gọi ngay trước request Discord)"""
+        if self._pace_lock is None:
+            self._pace_lock = asyncio.Lock()
+        async with self._pace_lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_slot = max(now, self._next_slot) + self.min_interval
+    
+    async def run(self, targets: List, action: BulkAction,
+                  on_progress: Optional[ProgressCallback] = None) -> List[BulkResult]:
+        """
+        Chạy action cho tất cả targets
+        
+        Args:
+            targets: Danh sách discord.Member/User hoặc object có .id
+            action: Coroutine nhận 1 target, trả về (thành công, thông báo)
+            on_progress: Coroutine nhận (đã xong, tổng, results) để cập nhật embed tiến độ,
+                chỉ gọi định kỳ trong lúc chạy
+        
+        Returns:
+            list: BulkResult theo đúng thứ tự targets
+        """
+        self._runs += 1
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results: List[Optional[BulkResult]] = [None] * len(targets)
+        done = 0
+        
+        async def worker(index, target):
+            nonlocal done
+            label = str(getattr(target, 'display_name', None) or getattr(target, 'id', target))
+            target_id = getattr(target, 'id', 0)
+            async with semaphore:
+                try:
+                    ok, message = await action(target)
+                except discord.Forbidden:
+                    ok, message = False, "Không có quyền"
+                except discord.HTTPException as e:
+                    if e.status == 429:
+                        self._rate_limited += 1
+                    ok, message = False, f"Lỗi HTTP {e.status}"
+                except Exception as e:
+                    logger.error(f"Bulk moderation lỗi với target {target_id}: {e}")
+                    ok, message = False, f"Lỗi: {str(e)[:40]}"
+            results[index] = BulkResult(target_id, label, ok, message)
+            done += 1
+            self._targets_processed += 1
+            if not ok:
+                self._failures += 1
+        
+        async def report_progress():
+            while True:
+                await asyncio.sleep(self.progress_interval)
+                await self._safe_progress(on_progress, done, len(targets), results)
+        
+        reporter = asyncio.create_task(report_progress()) if on_progress else None
+        try:
+            await asyncio.gather(*(worker(i, target) for i, target in enumerate(targets)))
+        finally:
+            if reporter:
+                reporter.cancel()
+        
+        return [result for result in results if result is not None]
+    
+    @staticmethod
+    async def _safe_progress(on_progress: Optional[ProgressCallback], done: int, total: int, results: list) -> None:
+        """Gọi callback tiến độ, lỗi cập nhật embed không làm dừng cả lượt"""
+        if on_progress is None:
+            return
+        try:
+            await on_progress(done, total, [result for result in results if result is not None])
+        except Exception as e:
+            logger.warning(f"Không cập nhật được tiến độ bulk moderation: {e}")
+    
+    def get_stats(self) -> dict:
+        """Thống kê engine"""
+        return {
+            'runs': self._runs,
+            'targets_processed': self._targets_processed,
+            'failures': self._failures,
+            'rate_limited': self._rate_limited,
+            'concurrency': self.concurrency,
+        }
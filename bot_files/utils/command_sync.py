@@ -0,0 +1,140 @@
+"""
+Command tree sync - chỉ sync slash command với Discord khi cây lệnh thật sự thay đổi
+(so fingerprint của cây lệnh đã serialize với hash lần sync trước, lưu trên đĩa)
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+import logging
+from typing import Dict, Iterable, List, Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = 'global'
+
+
+class CommandTreeSyncer:
+    """
+    Class quản lý việc sync cây slash command
+    
+    - fingerprint = sha256 của payload các lệnh (giống payload gửi lên Discord), sắp theo
+      loại + tên nên không phụ thuộc thứ tự đăng ký
+    - state_file lưu hash đã sync theo "<application_id>:<scope>" (scope = 'global' hoặc guild ID)
+      để đổi token sang app khác vẫn sync lại
+    - on_ready chạy lại sau mỗi lần reconnect: hash không đổi thì bỏ qua, lock đảm bảo
+      nhiều on_ready dồn dập chỉ gọi endpoint 1 lần
+    - dev guild: copy lệnh global sang guild rồi sync riêng guild đó (cập nhật ngay, không
+      chờ cache global của Discord)
+    """
+    
+    def __init__(self, bot, state_file: str = 'data/command_tree_sync.json'):
+        self.bot = bot
+        self.tree = bot.tree
+        self.state_file = state_file
+        self.synced: Dict[str, dict] = {}  # scope key -> {'hash', 'count', 'synced_at'}
+        self._lock = asyncio.Lock()
+        self._syncs = 0
+        self._skipped = 0
+        self._failures = 0
+        self.load()
+    
+    def load(self) -> None:
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    self.synced = json.load(f).get('synced', {})
+        except Exception as e:
+            logger.error(f"Lỗi khi tải trạng thái sync slash command: {e}")
+    
+    def save(self) -> None:
+        """Lưu hash đã sync (ghi atomic)"""
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'synced': self.synced}, f, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            logger.error(f"Lỗi khi lưu trạng thái sync slash command: {e}")
+    
+    # ---------- Fingerprint ----------
+    
+    def _payload(self, command) -> dict:
+        try:
+            return command.to_dict(self.tree)
+        except TypeError:
+            return command.to_dict()  # discord.py < 2.4: to_dict() không nhận tree
+    
+    def serialize(self, guild: Optional[discord.abc.Snowflake] = None) -> List[dict]:
+        """Payload các lệnh trong scope (global hoặc guild), sắp xếp ổn định"""
+        payloads = [self._payload(command) for command in self.tree.get_commands(guild=guild)]
+        payloads.sort(key=lambda payload: (payload.get('type', 1), payload['name']))
+        return payloads
+    
+    def fingerprint(self, guild: Optional[discord.abc.Snowflake] = None) -> str:
+        data = json.dumps(self.serialize(guild), sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+    
+    def _scope_key(self, guild: Optional[discord.abc.Snowflake]) -> str:
+        scope = GLOBAL_SCOPE if guild is None else str(guild.id)
+        return f"{self.bot.application_id}:{scope}"
+    
+    def is_synced(self, guild: Optional[discord.abc.Snowflake] = None) -> bool:
+        entry = self.synced.get(self._scope_key(guild))
+        return entry is not None and entry['hash'] == self.fingerprint(guild)
+    
+    # ---------- Sync ----------
+    
+    async def sync(self, guild: Optional[discord.abc.Snowflake] = None, force: bool = False) -> Optional[int]:
+        """
+        Sync 1 scope nếu cây lệnh khác lần sync trước
+        
+        Args:
+            guild: None = lệnh global, ngược lại sync lệnh của guild đó
+            force: Bỏ qua so sánh hash
+        
+        Returns:
+            Số lệnh đã sync, None nếu bỏ qua (không đổi) hoặc lỗi
+        """
+        async with self._lock:
+            key = self._scope_key(guild)
+            digest = self.fingerprint(guild)
+            entry = self.synced.get(key)
+            if not force and entry is not None and entry['hash'] == digest:
+                self._skipped += 1
+                logger.info(f"Slash command {key} không đổi ({digest[:12]}), bỏ qua sync")
+                return None
+            try:
+                synced = await self.tree.sync(guild=guild)
+            except discord.HTTPException as e:
+                self._failures += 1
+                logger.error(f"Lỗi khi sync slash command {key}: {e}")
+                return None
+            self.synced[key] = {'hash': digest, 'count': len(synced), 'synced_at': time.time()}
+            self.save()
+            self._syncs += 1
+            logger.info(f"Đã sync {len(synced)} slash command {key} ({digest[:12]})")
+            return len(synced)
+    
+    async def sync_dev_guilds(self, guild_ids: Iterable[int], force: bool = False) -> Dict[int, Optional[int]]:
+        """Copy lệnh global sang từng dev guild rồi sync riêng guild đó"""
+        results = {}
+        for guild_id in guild_ids:
+            guild = discord.Object(id=int(guild_id))
+            self.tree.copy_global_to(guild=guild)
+            results[guild.id] = await self.sync(guild, force=force)
+        return results
+    
+    def get_stats(self) -> dict:
+        """Thống kê sync"""
+        return {
+            'syncs': self._syncs,
+            'skipped': self._skipped,
+            'failures': self._failures,
+            'scopes': len(self.synced),
+            'global_hash': self.fingerprint()[:12],
+        }
@@ -0,0 +1,271 @@
+"""
+Daily quota - đếm hạn mức theo ngày (give tiền...) với bucket theo ngày,
+tự bỏ ngày cũ khi qua nửa đêm và lưu file theo lô
+"""
+import asyncio
+import json
+import os
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from .metrics import PERSISTENCE_FLUSH
+
+logger = logging.getLogger(__name__)
+
+
+def _today() -> str:
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+def _seconds_until_midnight() -> float:
+    now = datetime.now()
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (midnight - now).total_seconds()
+
+
+class QuotaCounter:
+    """Bộ đếm của 1 loại quota (namespace), dùng như handle gọn cho từng command class"""
+
+    def __init__(self, quota: 'DailyQuota', namespace: str):
+        self.quota = quota
+        self.namespace = namespace
+
+    def get(self, user_id: int) -> int:
+        """Số đã dùng hôm nay"""
+        return self.quota.get(self.namespace, user_id)
+
+    def add(self, user_id: int, amount: int = 1) -> int:
+        """Cộng thêm vào hôm nay, trả về tổng mới"""
+        return self.quota.add(self.namespace, user_id, amount)
+
+    def remaining(self, user_id: int, limit: int) -> int:
+        """Số còn lại trong hạn mức hôm nay"""
+        return max(0, limit - self.get(user_id))
+
+    def try_consume(self, user_id: int, amount: int, limit: int) -> bool:
+        """Cộng nếu không vượt hạn mức, trả về False nếu vượt"""
+        return self.quota.try_consume(self.namespace, user_id, amount, limit)
+
+    def get_window(self, user_id: int, days: int) -> int:
+        """Tổng đã dùng trong N ngày gần nhất (tính cả hôm nay)"""
+        return self.quota.get_window(self.namespace, user_id, days)
+
+
+class DailyQuota:
+    """
+    Class quản lý hạn mức theo ngày dùng chung
+
+    Dữ liệu trong RAM: ngày -> namespace -> user_id -> số lượng. Chỉ giữ
+    retention_days ngày gần nhất nên file không phình theo thời gian; tra cứu
+    hôm nay là O(1). Thay đổi được đánh dấu dirty và lưu theo lô mỗi
+    flush_interval giây thay vì ghi file mỗi lần cộng.
+    """
+
+    def __init__(self, data_file: str = 'data/daily_quotas.json',
+                 retention_days: int = 7, flush_interval: float = 10.0):
+        self.data_file = data_file
+        self.retention_days = retention_days
+        self.flush_interval = flush_interval
+        self._days: Dict[str, Dict[str, Dict[int, int]]] = {}
+        self._migrated = set()  # Namespace đã import từ file cũ
+        self._current_day = _today()
+        self._dirty = False
+        self._save_count = 0
+        self._pruned_days = 0
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._load()
+
+    # ---------- Đếm ----------
+
+    def counter(self, namespace: str, legacy_file: Optional[str] = None) -> QuotaCounter:
+        """
+        Lấy bộ đếm của namespace (import dữ liệu file JSON cũ lần đầu nếu có)
+
+        Args:
+            namespace: Tên quota (vd: 'taixiu_give')
+            legacy_file: File cũ dạng {user_id: {ngày: số}} hoặc {user_id: [ngày, ...]}
+        """
+        if legacy_file and namespace not in self._migrated:
+            self.import_legacy(namespace, legacy_file)
+        return QuotaCounter(self, namespace)
+
+    def get(self, namespace: str, user_id: int) -> int:
+        self._check_rollover()
+        return self._days.get(self._current_day, {}).get(namespace, {}).get(int(user_id), 0)
+
+    def add(self, namespace: str, user_id: int, amount: int = 1) -> int:
+        self._check_rollover()
+        bucket = self._days.setdefault(self._current_day, {}).setdefault(namespace, {})
+        user_id = int(user_id)
+        bucket[user_id] = bucket.get(user_id, 0) + amount
+        self._mark_dirty()
+        return bucket[user_id]
+
+    def try_consume(self, namespace: str, user_id: int, amount: int, limit: int) -> bool:
+        if self.get(namespace, user_id) + amount > limit:
+            return False
+        self.add(namespace, user_id, amount)
+        return True
+
+    def get_window(self, namespace: str, user_id: int, days: int) -> int:
+        self._check_rollover()
+        user_id = int(user_id)
+        start = (datetime.now() - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+        return sum(
+            namespaces.get(namespace, {}).get(user_id, 0)
+            for day, namespaces in self._days.items() if day >= start
+        )
+
+    # ---------- Rollover ----------
+
+    def _check_rollover(self) -> None:
+        """Qua ngày mới thì bỏ các bucket hết hạn (gọi ở mỗi lần tra cứu, O(1) khi chưa đổi ngày)"""
+        today = _today()
+        if today != self._current_day:
+            self._current_day = today
+            self.prune()
+
+    def prune(self) -> int:
+        """
+        Xóa bucket các ngày ngoài retention
+
+        Returns:
+            int: Số ngày đã xóa
+        """
+        cutoff = (datetime.now() - timedelta(days=self.retention_days - 1)).strftime('%Y-%m-%d')
+        expired = [day for day in self._days if day < cutoff]
+        for day in expired:
+            del self._days[day]
+        if expired:
+            self._pruned_days += len(expired)
+            self._mark_dirty()
+            logger.info(f"Daily quota: đã xóa {len(expired)} ngày cũ")
+        return len(expired)
+
+    # ---------- Lưu / load ----------
+
+    def _load(self) -> None:
+        try:
+            if os.path.exists(self.data_file):
+                with open(self.data_file, 'r', encoding='utf-8') as f:
+                    payload = json.load(f)
+                self._days = {
+                    day: {
+                        namespace: {int(user_id): amount for user_id, amount in users.items()}
+                        for namespace, users in namespaces.items()
+                    }
+                    for day, namespaces in payload.get('days', {}).items()
+                }
+                self._migrated = set(payload.get('migrated', []))
+                self.prune()
+        except Exception as e:
+            logger.error(f"Lỗi khi load daily quota: {e}")
+
+    def import_legacy(self, namespace: str, legacy_file: str) -> int:
+        """
+        Import file JSON cũ (chỉ lấy các ngày còn trong retention)
+
+        Returns:
+            int: Số bản ghi (user, ngày) đã import
+        """
+        count = 0
+        try:
+            if os.path.exists(legacy_file):
+                with open(legacy_file, 'r', encoding='utf-8') as f:
+                    legacy_data = json.load(f)
+                cutoff = (datetime.now() - timedelta(days=self.retention_days - 1)).strftime('%Y-%m-%d')
+                for user_id, days in legacy_data.items():
+                    # {ngày: số} (give limits) hoặc [ngày, ...] (daily purchases)
+                    items = days.items() if isinstance(days, dict) else ((day, 1) for day in days)
+                    for day, amount in items:
+                        if day < cutoff:
+                            continue
+                        bucket = self._days.setdefault(day, {}).setdefault(namespace, {})
+                        bucket[int(user_id)] = bucket.get(int(user_id), 0) + amount
+                        count += 1
+                logger.info(f"Daily quota: đã import {count} bản ghi {namespace} từ {legacy_file}")
+        except Exception as e:
+            logger.error(f"Lỗi khi import {legacy_file} vào daily quota: {e}")
+        self._migrated.add(namespace)
+        self._mark_dirty()
+        return count
+
+    @PERSISTENCE_FLUSH.time(store='daily_quota')
+    def save(self) -> None:
+        """Lưu xuống file (ghi atomic)"""
+        try:
+            os.makedirs(os.path.dirname(self.data_file) or '.', exist_ok=True)
+            payload = {
+                'version': 1,
+                'migrated': sorted(self._migrated),
+                'days': {
+                    day: {
+                        namespace: {str(user_id): amount for user_id, amount in users.items()}
+                        for namespace, users in namespaces.items()
+                    }
+                    for day, namespaces in self._days.items()
+                }
+            }
+            tmp_file = f"{self.data_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_file, self.data_file)
+            self._dirty = False
+            self._save_count += 1
+        except Exception as e:
+            logger.error(f"Lỗi khi save daily quota: {e}")
+
+    def _mark_dirty(self) -> None:
+        self._dirty = True
+        if not self._ensure_maintenance():
+            # Không có event loop (script/khởi động) - lưu ngay
+            self.save()
+
+    # ---------- Task bảo trì ----------
+
+    def _ensure_maintenance(self) -> bool:
+        """Start task lưu theo lô + rollover nếu chưa chạy, False nếu chưa có event loop"""
+        if self._maintenance_task is not None and not self._maintenance_task.done():
+            return True
+        try:
+            self._maintenance_task = asyncio.get_running_loop().create_task(self._maintenance_loop())
+            return True
+        except RuntimeError:
+            return False
+
+    async def _maintenance_loop(self) -> None:
+        """Task định kỳ: lưu thay đổi theo lô và rollover đúng nửa đêm"""
+        while True:
+            try:
+                await asyncio.sleep(min(self.flush_interval, _seconds_until_midnight() + 1))
+                self._check_rollover()
+                if self._dirty:
+                    self.save()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in daily quota maintenance: {e}")
+
+    def stop(self) -> None:
+        """Dừng task bảo trì và lưu lần cuối"""
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            self._maintenance_task = None
+        if self._dirty:
+            self.save()
+
+    def get_stats(self) -> dict:
+        """Thống kê quota"""
+        return {
+            'days': sorted(self._days.keys()),
+            'namespaces': sorted({ns for namespaces in self._days.values() for ns in namespaces}),
+            'today_entries': sum(len(users) for users in self._days.get(self._current_day, {}).values()),
+            'saves': self._save_count,
+            'pruned_days': self._pruned_days,
+            'dirty': self._dirty,
+        }
+
+
+# Global instance
+daily_quota = DailyQuota()
@@ -0,0 +1,231 @@
+"""
+Embed templates - build phần tĩnh của embed 1 lần, mỗi lần hiển thị chỉ điền phần động
+
+Phần động dùng placeholder kiểu str.format ({user_name}, {balance:,}...) trong
+title, description, tên/giá trị field, footer, author. Chuỗi tĩnh có dấu ngoặc
+nhọn thật phải escape thành {{ }}.
+"""
+import copy
+import string
+import time
+import logging
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+_FORMATTER = string.Formatter()
+
+# Các key dạng text có thể chứa placeholder
+_TEXT_KEYS = ('title', 'description', 'url')
+_NESTED_TEXT_KEYS = {
+    'author': ('name', 'url', 'icon_url'),
+    'footer': ('text', 'icon_url'),
+    'thumbnail': ('url',),
+    'image': ('url',),
+}
+
+
+def _is_slot(value) -> bool:
+    """Chuỗi có placeholder (hoặc ngoặc nhọn escape) cần format khi render"""
+    return isinstance(value, str) and ('{' in value or '}' in value)
+
+
+def _find_slots(data: dict) -> List[Tuple[tuple, str]]:
+    """Tìm tất cả chuỗi có placeholder trong embed dict, trả về [(path, format_string)]"""
+    slots = []
+    for key in _TEXT_KEYS:
+        value = data.get(key)
+        if _is_slot(value):
+            slots.append(((key,), value))
+    for section, keys in _NESTED_TEXT_KEYS.items():
+        nested = data.get(section)
+        if not nested:
+            continue
+        for key in keys:
+            value = nested.get(key)
+            if _is_slot(value):
+                slots.append(((section, key), value))
+    for index, field in enumerate(data.get('fields', [])):
+        for key in ('name', 'value'):
+            value = field.get(key)
+            if _is_slot(value):
+                slots.append((('fields', index, key), value))
+    return slots
+
+
+class EmbedTemplate:
+    """
+    Template của 1 embed: build sẵn discord.Embed tĩnh 1 lần, render ra bản sao
+
+    Mỗi lần render chỉ gán lại thuộc tính của embed tĩnh, copy list fields và
+    format các chuỗi có placeholder - không qua to_dict/from_dict, không gọi
+    lại hàng chục add_field.
+    """
+
+    __slots__ = ('name', 'timestamp', '_data', '_slots', '_attrs', '_fields', '_sections')
+
+    def __init__(self, name: str, data: dict, timestamp: bool = True):
+        self.name = name
+        self.timestamp = timestamp
+        self._data = copy.deepcopy(data)
+        self._data.pop('timestamp', None)
+        self._slots = _find_slots(self._data)
+
+        # Embed tĩnh build 1 lần; fields được copy riêng mỗi lần render vì
+        # add_field/set_field_at/remove_field sửa trực tiếp list và dict field
+        base = discord.Embed.from_dict(copy.deepcopy(self._data))
+        self._fields = getattr(base, '_fields', None)
+        self._attrs = tuple(
+            (attr, getattr(base, attr)) for attr in discord.Embed.__slots__
+            if attr != '_fields' and hasattr(base, attr)
+        )
+        # author/footer/... chỉ copy khi có placeholder (set_author/set_footer luôn tạo dict mới)
+        self._sections = tuple({'_' + path[0] for path, _ in self._slots if path[0] in _NESTED_TEXT_KEYS})
+
+    @classmethod
+    def from_embed(cls, name: str, embed: discord.Embed, timestamp: bool = True) -> 'EmbedTemplate':
+        """Tạo template từ discord.Embed đã build"""
+        return cls(name, embed.to_dict(), timestamp)
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> 'EmbedTemplate':
+        """Tạo template từ dict đã serialize bằng to_dict()"""
+        return cls(payload['name'], payload['embed'], payload.get('timestamp', True))
+
+    def to_dict(self) -> dict:
+        """Serialize template sang dict (JSON được) để lưu/tái sử dụng"""
+        return {
+            'name': self.name,
+            'timestamp': self.timestamp,
+            'embed': copy.deepcopy(self._data),
+        }
+
+    @property
+    def slot_names(self) -> List[str]:
+        """Danh sách tên placeholder cần truyền khi render"""
+        names = []
+        for _, fmt in self._slots:
+            for _, field_name, _, _ in _FORMATTER.parse(fmt):
+                name = field_name.split('.')[0].split('[')[0] if field_name else None
+                if name and name not in names:
+                    names.append(name)
+        return names
+
+    def render(self, color: Optional[discord.Color] = None, **values) -> discord.Embed:
+        """
+        Render embed mới từ template
+
+        Args:
+            color: Màu embed (None = dùng màu của template)
+            **values: Giá trị cho các placeholder
+
+        Returns:
+            discord.Embed: Embed mới, có thể add_field/set_footer thêm mà không ảnh hưởng template
+        """
+        embed = discord.Embed.__new__(discord.Embed)
+        for attr, value in self._attrs:
+            setattr(embed, attr, value)
+        if self._fields is not None:
+            embed._fields = [field.copy() for field in self._fields]
+        for attr in self._sections:
+            setattr(embed, attr, getattr(embed, attr).copy())
+
+        for path, fmt in self._slots:
+            text = fmt.format_map(values)
+            if len(path) == 1:
+                setattr(embed, path[0], text)
+            elif path[0] == 'fields':
+                embed._fields[path[1]][path[2]] = text
+            else:
+                getattr(embed, '_' + path[0])[path[1]] = text
+
+        if color is not None:
+            embed.colour = color
+        if self.timestamp:
+            # Gán thẳng datetime có tz (UTC) - setter timestamp gọi astimezone() rất tốn
+            embed._timestamp = datetime.now(timezone.utc)
+        return embed
+
+    def __repr__(self) -> str:
+        return f"EmbedTemplate(name={self.name!r}, fields={len(self._data.get('fields', []))}, slots={len(self._slots)})"
+
+
+class EmbedTemplateRegistry:
+    """Class quản lý các embed template dùng chung (build 1 lần lúc khởi động)"""
+
+    def __init__(self):
+        self._templates: Dict[str, EmbedTemplate] = {}
+        self._builders: Dict[str, Tuple[Callable[[], discord.Embed], bool]] = {}
+        self._renders = 0
+        self._build_time = 0.0
+
+    def register(self, name: str, builder: Callable[[], discord.Embed], timestamp: bool = True) -> EmbedTemplate:
+        """
+        Build template từ hàm builder và lưu lại (đăng ký lại cùng tên sẽ build lại)
+
+        Args:
+            name: Tên template (vd: 'fullmenu.games')
+            builder: Hàm không tham số trả về discord.Embed với phần tĩnh + placeholder
+            timestamp: Có gắn timestamp hiện tại khi render không
+        """
+        start = time.perf_counter()
+        template = EmbedTemplate.from_embed(name, builder(), timestamp)
+        self._build_time += time.perf_counter() - start
+        self._templates[name] = template
+        self._builders[name] = (builder, timestamp)
+        return template
+
+    def get(self, name: str) -> EmbedTemplate:
+        """Lấy template đã đăng ký"""
+        return self._templates[name]
+
+    def render(self, name: str, color: Optional[discord.Color] = None, **values) -> discord.Embed:
+        """Render embed từ template đã đăng ký"""
+        self._renders += 1
+        return self._templates[name].render(color=color, **values)
+
+    def rebuild(self, name: Optional[str] = None) -> int:
+        """
+        Build lại template từ builder (khi nội dung tĩnh thay đổi)
+
+        Returns:
+            int: Số template đã build lại
+        """
+        names = [name] if name else list(self._builders.keys())
+        for template_name in names:
+            builder, timestamp = self._builders[template_name]
+            self.register(template_name, builder, timestamp)
+        return len(names)
+
+    def to_dict(self) -> dict:
+        """Serialize tất cả template sang dict"""
+        return {name: template.to_dict() for name, template in self._templates.items()}
+
+    def load_dict(self, payload: dict) -> int:
+        """
+        Load template từ dict đã serialize (ghi đè template cùng tên)
+
+        Returns:
+            int: Số template đã load
+        """
+        for name, template_data in payload.items():
+            self._templates[name] = EmbedTemplate.from_dict(template_data)
+        return len(payload)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._templates
+
+    def get_stats(self) -> dict:
+        """Thống kê template"""
+        return {
+            'templates': len(self._templates),
+            'renders': self._renders,
+            'build_time_ms': round(self._build_time * 1000, 2),
+        }
+
+
+# Global instance
+embed_templates = EmbedTemplateRegistry()
@@ -0,0 +1,163 @@
+"""
+File watcher - báo khi 1 file bị ghi từ bên ngoài: dùng inotify (Linux, gọi libc qua ctypes)
+nếu có, không thì poll os.stat định kỳ
+"""
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import logging
+from typing import Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+DEBOUNCE_SECONDS = 0.2  # Gom các event liên tiếp của 1 lần ghi
+
+
+def _load_libc():
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_libc = _load_libc()
+INOTIFY_AVAILABLE = _libc is not None
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    """(inode, mtime_ns, size) của file, None nếu không tồn tại"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class FileWatcher:
+    """
+    Class theo dõi 1 file và gọi on_change() khi file có thể đã đổi
+    
+    inotify theo dõi thư mục chứa file (ghi atomic bằng os.replace đổi inode nên không
+    watch thẳng file được). Bên nhận tự so sánh nội dung/chữ ký để bỏ qua lần ghi của chính mình.
+    """
+    
+    def __init__(self, path: str, on_change: Callable[[], None], interval: float = 5.0, use_inotify: bool = True):
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self.use_inotify = use_inotify and INOTIFY_AVAILABLE
+        self.mode: Optional[str] = None  # 'inotify' | 'polling' khi đang chạy
+        self.events = 0
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+    
+    def stop(self) -> None:
+        if self.running:
+            self._task.cancel()
+        self._task = None
+        self.mode = None
+    
+    async def _run(self) -> None:
+        try:
+            if self.use_inotify:
+                try:
+                    await self._watch_inotify()
+                    return
+                except OSError as e:
+                    logger.warning(f"Không dùng được inotify cho {self.path} ({e}), chuyển sang polling")
+            await self._poll()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.mode = None
+    
+    def _notify(self) -> None:
+        self.events += 1
+        try:
+            self.on_change()
+        except Exception as e:
+            logger.error(f"Lỗi khi xử lý thay đổi file {self.path}: {e}")
+    
+    async def _watch_inotify(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        filename = os.fsencode(os.path.basename(self.path))
+        fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        loop = asyncio.get_running_loop()
+        readable = asyncio.Event()
+        try:
+            if _libc.inotify_add_watch(fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE) < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch {directory}")
+            loop.add_reader(fd, readable.set)
+            self.mode = 'inotify'
+            logger.info(f"Theo dõi {self.path} bằng inotify")
+            while True:
+                await readable.wait()
+                readable.clear()
+                if not self._drain(fd, filename):
+                    continue
+                await asyncio.sleep(DEBOUNCE_SECONDS)
+                self._drain(fd, filename)
+                self._notify()
+        finally:
+            loop.remove_reader(fd)
+            os.close(fd)
+    
+    @staticmethod
+    def _drain(fd: int, filename: bytes) -> bool:
+        """Đọc hết event đang chờ, True nếu có event của file cần theo dõi"""
+        matched = False
+        while True:
+            try:
+                buffer = os.read(fd, 4096)
+            except BlockingIOError:
+                return matched
+            if not buffer:
+                return matched
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buffer):
+                _, _, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if name == filename:
+                    matched = True
+    
+    async def _poll(self) -> None:
+        self.mode = 'polling'
+        logger.info(f"Theo dõi {self.path} bằng polling mỗi {self.interval}s")
+        last_signature = file_signature(self.path)
+        while True:
+            await asyncio.sleep(self.interval)
+            signature = file_signature(self.path)
+            if signature != last_signature:
+                last_signature = signature
+                self._notify()
+    
+    def get_stats(self) -> dict:
+        """Thống kê watcher"""
+        return {
+            'mode': self.mode,
+            'events': self.events,
+            'inotify_available': INOTIFY_AVAILABLE,
+        }
@@ -0,0 +1,457 @@
+"""
+Game session manager - quản lý tập trung các phiên game tương tác
+(blackjack, rps, flip coin...) với giới hạn số phiên, idle eviction
+và custom_id cố định để gắn lại view sau khi restart
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+import logging
+from typing import Callable, Dict, Optional
+
+from .metrics import PERSISTENCE_FLUSH
+
+logger = logging.getLogger(__name__)
+
+CUSTOM_ID_PREFIX = 'gs'
+
+# Lý do không tạo được phiên (check_start)
+REJECT_ACTIVE = 'active'
+REJECT_GLOBAL_LIMIT = 'global_limit'
+REJECT_GAME_LIMIT = 'game_limit'
+
+
+def _deep_sizeof(obj, seen=None) -> int:
+    """Ước lượng RAM (bytes) của object và các phần tử bên trong"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+class GameSession:
+    """Record compact của 1 phiên game"""
+    __slots__ = ('game', 'user_id', 'state', 'channel_id', 'message_id',
+                 'created_at', 'last_active', 'view')
+
+    def __init__(self, game: str, user_id: int, state: Optional[dict] = None,
+                 channel_id: Optional[int] = None):
+        now = time.time()
+        self.game = game
+        self.user_id = user_id
+        self.state = state if state is not None else {}
+        self.channel_id = channel_id
+        self.message_id = None
+        self.created_at = now
+        self.last_active = now
+        self.view = None  # View đang gắn (chỉ tồn tại trong RAM, không lưu file)
+
+    def to_dict(self) -> dict:
+        return {
+            'game': self.game,
+            'user_id': self.user_id,
+            'state': self.state,
+            'channel_id': self.channel_id,
+            'message_id': self.message_id,
+            'created_at': self.created_at,
+            'last_active': self.last_active,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'GameSession':
+        session = cls(data['game'], int(data['user_id']), data.get('state') or {}, data.get('channel_id'))
+        session.message_id = data.get('message_id')
+        session.created_at = data.get('created_at', session.created_at)
+        session.last_active = data.get('last_active', session.last_active)
+        return session
+
+
+class SessionBucket:
+    """
+    Các phiên của 1 game, giao diện giống dict user_id -> state
+
+    Thay thế trực tiếp self.active_games cũ của từng game.
+    """
+
+    def __init__(self, manager: 'GameSessionManager', game: str):
+        self.manager = manager
+        self.game = game
+
+    def check_start(self, user_id: int) -> Optional[str]:
+        """Lý do không tạo được phiên mới (REJECT_*), None nếu tạo được"""
+        return self.manager.check_start(self.game, user_id)
+
+    def start(self, user_id: int, state: Optional[dict] = None,
+              channel_id: Optional[int] = None) -> Optional[GameSession]:
+        """Bắt đầu phiên mới, trả về None nếu user đã có phiên hoặc hết slot"""
+        return self.manager.start(self.game, user_id, state, channel_id)
+
+    def end(self, user_id: int) -> Optional[GameSession]:
+        return self.manager.end(self.game, user_id)
+
+    def session(self, user_id: int) -> Optional[GameSession]:
+        return self.manager.get(self.game, user_id)
+
+    def attach_view(self, user_id: int, view, message_id: Optional[int] = None) -> None:
+        self.manager.attach_view(self.game, user_id, view, message_id)
+
+    def __contains__(self, user_id) -> bool:
+        return self.manager.get(self.game, user_id) is not None
+
+    def __getitem__(self, user_id) -> dict:
+        session = self.manager.get(self.game, user_id)
+        if session is None:
+            raise KeyError(user_id)
+        self.manager.touch(session)
+        return session.state
+
+    def __delitem__(self, user_id) -> None:
+        if self.manager.end(self.game, user_id) is None:
+            raise KeyError(user_id)
+
+    def __len__(self) -> int:
+        return self.manager.count(self.game)
+
+
+class GameSessionManager:
+    """Class quản lý tất cả phiên game tương tác"""
+
+    def __init__(self, data_file: str = 'data/game_sessions.json', max_sessions: int = 500,
+                 default_idle_timeout: int = 300, maintenance_interval: int = 15):
+        """
+        Khởi tạo session manager
+
+        Args:
+            data_file: File lưu các phiên persistent (để gắn lại view sau restart)
+            max_sessions: Tổng số phiên tối đa đồng thời (mọi game)
+            default_idle_timeout: Thời gian idle (giây) trước khi phiên bị evict
+            maintenance_interval: Chu kỳ (giây) evict phiên idle và lưu file
+        """
+        self.data_file = data_file
+        self.max_sessions = max_sessions
+        self.default_idle_timeout = default_idle_timeout
+        self.maintenance_interval = maintenance_interval
+
+        self._sessions: Dict[str, Dict[int, GameSession]] = {}
+        self._game_config: Dict[str, dict] = {}
+        self._view_factories: Dict[str, Callable] = {}
+        self._views_bot = None  # Bot đã gắn lại view lúc khởi động (None = chưa tới lượt)
+        self._buckets: Dict[str, SessionBucket] = {}
+        self._evicted_count = 0
+        self._rejected_count = 0
+        self._dirty = False
+        self._maintenance_task = None
+
+        self._load_persistent_sessions()
+
+    # ---------- Cấu hình ----------
+
+    def configure_game(self, game: str, idle_timeout: Optional[int] = None,
+                       max_sessions: Optional[int] = None, persistent: bool = False,
+                       on_evict: Optional[Callable] = None) -> SessionBucket:
+        """
+        Cấu hình 1 game và trả về bucket của game đó
+
+        Args:
+            game: Tên game
+            idle_timeout: Idle timeout riêng (giây)
+            max_sessions: Số phiên tối đa riêng cho game
+            persistent: Lưu phiên xuống file để gắn lại view sau restart
+            on_evict: Callback(session) khi phiên bị evict do idle (có thể là coroutine)
+        """
+        self._game_config[game] = {
+            'idle_timeout': idle_timeout or self.default_idle_timeout,
+            'max_sessions': max_sessions,
+            'persistent': persistent,
+            'on_evict': on_evict,
+        }
+        return self.bucket(game)
+
+    def bucket(self, game: str) -> SessionBucket:
+        if game not in self._buckets:
+            self._buckets[game] = SessionBucket(self, game)
+        return self._buckets[game]
+
+    def _config(self, game: str) -> dict:
+        return self._game_config.get(game) or {
+            'idle_timeout': self.default_idle_timeout,
+            'max_sessions': None,
+            'persistent': False,
+            'on_evict': None,
+        }
+
+    # ---------- Vòng đời phiên ----------
+
+    def check_start(self, game: str, user_id: int) -> Optional[str]:
+        """
+        Lý do không tạo được phiên mới cho user, None nếu tạo được
+
+        Returns:
+            REJECT_ACTIVE (user đang có phiên), REJECT_GLOBAL_LIMIT (hết slot toàn bot),
+            REJECT_GAME_LIMIT (hết slot của game) hoặc None
+        """
+        sessions = self._sessions.get(game, {})
+        if user_id in sessions:
+            return REJECT_ACTIVE
+        if self.count() >= self.max_sessions:
+            return REJECT_GLOBAL_LIMIT
+        max_sessions = self._config(game)['max_sessions']
+        if max_sessions and len(sessions) >= max_sessions:
+            return REJECT_GAME_LIMIT
+        return None
+
+    def start(self, game: str, user_id: int, state: Optional[dict] = None,
+              channel_id: Optional[int] = None) -> Optional[GameSession]:
+        """Tạo phiên mới, trả về None nếu user đã có phiên hoặc hết slot (lý do: check_start)"""
+        reason = self.check_start(game, user_id)
+        if reason is not None:
+            if reason != REJECT_ACTIVE:
+                self._rejected_count += 1
+                logger.warning(f"Game session limit reached ({game}): {self.count(game)} / total {self.count()}")
+            return None
+
+        sessions = self._sessions.setdefault(game, {})
+        session = GameSession(game, user_id, state, channel_id)
+        sessions[user_id] = session
+        self._mark_dirty(game)
+        self._ensure_maintenance()
+        logger.debug(f"Started {game} session for user {user_id}. Active: {len(sessions)}")
+        return session
+
+    def get(self, game: str, user_id: int) -> Optional[GameSession]:
+        return self._sessions.get(game, {}).get(user_id)
+
+    def touch(self, session: GameSession) -> None:
+        """Cập nhật thời gian hoạt động (state có thể đã thay đổi)"""
+        session.last_active = time.time()
+        self._mark_dirty(session.game)
+
+    def end(self, game: str, user_id: int) -> Optional[GameSession]:
+        """Kết thúc phiên và dừng view đang gắn"""
+        session = self._sessions.get(game, {}).pop(user_id, None)
+        if session is None:
+            return None
+        if session.view is not None and not session.view.is_finished():
+            session.view.stop()
+        session.view = None
+        self._mark_dirty(game)
+        logger.debug(f"Ended {game} session for user {user_id}")
+        return session
+
+    def attach_view(self, game: str, user_id: int, view, message_id: Optional[int] = None) -> None:
+        """Gắn view (và message chứa view) vào phiên"""
+        session = self.get(game, user_id)
+        if session is None:
+            return
+        session.view = view
+        if message_id:
+            session.message_id = message_id
+        self.touch(session)
+
+    def count(self, game: Optional[str] = None) -> int:
+        if game is not None:
+            return len(self._sessions.get(game, {}))
+        return sum(len(sessions) for sessions in self._sessions.values())
+
+    # ---------- Custom ID & gắn lại view ----------
+
+    @staticmethod
+    def custom_id(game: str, user_id: int, action: str) -> str:
+        """Custom ID cố định cho button của phiên: gs:<game>:<user_id>:<action>"""
+        return f"{CUSTOM_ID_PREFIX}:{game}:{user_id}:{action}"
+
+    @staticmethod
+    def parse_custom_id(custom_id: str) -> Optional[tuple]:
+        """Tách custom ID thành (game, user_id, action), None nếu không phải của session manager"""
+        parts = custom_id.split(':', 3)
+        if len(parts) != 4 or parts[0] != CUSTOM_ID_PREFIX:
+            return None
+        try:
+            return parts[1], int(parts[2]), parts[3]
+        except ValueError:
+            return None
+
+    def bind_custom_ids(self, view, game: str, user_id: int) -> None:
+        """Đổi custom_id tĩnh của các item trong view thành custom ID của phiên"""
+        for item in view.children:
+            action = getattr(item, 'custom_id', None)
+            if action and self.parse_custom_id(action) is None:
+                item.custom_id = self.custom_id(game, user_id, action)
+
+    def register_view_factory(self, game: str, factory: Callable) -> None:
+        """
+        Đăng ký hàm factory(session) -> View để gắn lại view sau restart
+
+        Module lazy đăng ký sau khi đã gắn lại view lúc khởi động thì gắn lại
+        ngay cho game đó, để ván đang chơi dở không mất nút bấm.
+        """
+        self._view_factories[game] = factory
+        if self._views_bot is not None:
+            self.restore_views(self._views_bot, game)
+
+    def restore_views(self, bot, game: Optional[str] = None) -> int:
+        """
+        Gắn lại view cho các phiên persistent đã load từ file
+
+        Returns:
+            int: Số view đã gắn lại
+        """
+        if game is None:
+            self._views_bot = bot
+        restored = 0
+        games = [game] if game else list(self._sessions.keys())
+        for game_name in games:
+            factory = self._view_factories.get(game_name)
+            if not factory:
+                continue
+            for session in list(self._sessions.get(game_name, {}).values()):
+                if session.view is not None or not session.message_id:
+                    continue
+                try:
+                    view = factory(session)
+                    bot.add_view(view, message_id=session.message_id)
+                    session.view = view
+                    restored += 1
+                except Exception as e:
+                    logger.error(f"Không thể gắn lại view {game_name} cho user {session.user_id}: {e}")
+        if restored:
+            logger.info(f"Restored {restored} game session views")
+        return restored
+
+    # ---------- Idle eviction & persistence ----------
+
+    def evict_idle(self) -> list:
+        """Evict các phiên idle quá timeout, trả về danh sách phiên đã evict"""
+        now = time.time()
+        evicted = []
+        for game, sessions in self._sessions.items():
+            idle_timeout = self._config(game)['idle_timeout']
+            for user_id in [uid for uid, s in sessions.items() if now - s.last_active > idle_timeout]:
+                evicted.append(self.end(game, user_id))
+        if evicted:
+            self._evicted_count += len(evicted)
+            logger.info(f"Evicted {len(evicted)} idle game sessions")
+        return evicted
+
+    async def _run_evict_callbacks(self, evicted: list) -> None:
+        for session in evicted:
+            callback = self._config(session.game)['on_evict']
+            if not callback:
+                continue
+            try:
+                result = callback(session)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Lỗi trong on_evict của {session.game}: {e}")
+
+    def _mark_dirty(self, game: str) -> None:
+        if self._config(game)['persistent']:
+            self._dirty = True
+
+    def _load_persistent_sessions(self) -> None:
+        """Load các phiên persistent còn hạn từ file"""
+        try:
+            if not os.path.exists(self.data_file):
+                return
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            now = time.time()
+            loaded = 0
+            for item in data.get('sessions', []):
+                session = GameSession.from_dict(item)
+                if now - session.last_active > self.default_idle_timeout:
+                    continue
+                self._sessions.setdefault(session.game, {})[session.user_id] = session
+                loaded += 1
+            if loaded:
+                logger.info(f"Đã tải {loaded} game sessions từ {self.data_file}")
+        except Exception as e:
+            logger.error(f"Lỗi khi load game sessions: {e}")
+
+    @PERSISTENCE_FLUSH.time(store='game_sessions')
+    def save(self) -> None:
+        """Lưu các phiên persistent xuống file"""
+        try:
+            sessions = [
+                session.to_dict()
+                for game, game_sessions in self._sessions.items()
+                if self._config(game)['persistent']
+                for session in game_sessions.values()
+            ]
+            os.makedirs(os.path.dirname(self.data_file) or '.', exist_ok=True)
+            tmp_file = f"{self.data_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'sessions': sessions}, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_file, self.data_file)
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"Lỗi khi save game sessions: {e}")
+
+    def _ensure_maintenance(self) -> None:
+        """Start task bảo trì nếu chưa chạy (chỉ khi đã có event loop)"""
+        if self._maintenance_task is not None and not self._maintenance_task.done():
+            return
+        try:
+            self._maintenance_task = asyncio.get_running_loop().create_task(self._maintenance_loop())
+        except RuntimeError:
+            pass  # Chưa có event loop, sẽ start ở lần gọi sau
+
+    async def _maintenance_loop(self) -> None:
+        """Task định kỳ: evict phiên idle và lưu phiên persistent"""
+        while True:
+            try:
+                await asyncio.sleep(self.maintenance_interval)
+                evicted = self.evict_idle()
+                await self._run_evict_callbacks(evicted)
+                if self._dirty:
+                    self.save()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in game session maintenance: {e}")
+
+    def stop(self) -> None:
+        """Dừng task bảo trì và lưu lần cuối"""
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            self._maintenance_task = None
+        if self._dirty:
+            self.save()
+
+    # ---------- Thống kê ----------
+
+    def get_stats(self) -> dict:
+        """Số phiên và RAM ước lượng theo từng game"""
+        games = {}
+        for game, sessions in self._sessions.items():
+            memory = sum(
+                sys.getsizeof(session) + _deep_sizeof(session.state)
+                for session in sessions.values()
+            )
+            games[game] = {
+                'sessions': len(sessions),
+                'memory_bytes': memory,
+                'idle_timeout': self._config(game)['idle_timeout'],
+                'persistent': self._config(game)['persistent'],
+            }
+        return {
+            'total_sessions': self.count(),
+            'max_sessions': self.max_sessions,
+            'evicted': self._evicted_count,
+            'rejected': self._rejected_count,
+            'games': games,
+        }
+
+
+# Global instance
+game_sessions = GameSessionManager()
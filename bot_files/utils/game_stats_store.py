@@ -0,0 +1,362 @@
+"""
+Game stats store - lưu thống kê người chơi dạng compact cho tất cả games
+(taixiu, slot, rps, blackjack, flip coin)
+"""
+import json
+import os
+import logging
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .metrics import PERSISTENCE_FLUSH
+
+logger = logging.getLogger(__name__)
+
+# Các field số nguyên dùng chung cho mọi game (field không dùng giữ giá trị 0)
+INT_FIELDS = (
+    'total_games', 'wins', 'losses', 'draws',
+    'total_bet', 'total_won', 'total_lost', 'biggest_win',
+    'jackpots', 'blackjacks', 'games_10m_plus',
+    'lose_streak', 'auto_wins_left',
+)
+
+# Field thời gian - lưu epoch (float), trả về ISO string khi đọc theo key
+TIME_FIELDS = ('created_at', 'last_played')
+
+FIELDS = INT_FIELDS + TIME_FIELDS
+
+# Tên field cũ -> field mới (taixiu dùng 'total_win' thay vì 'total_won')
+FIELD_ALIASES = {'total_win': 'total_won'}
+
+# Field tính toán khi đọc, không lưu xuống file
+DERIVED_FIELDS = ('winrate',)
+
+# Field số dư cũ - số dư thật nằm trong shared wallet nên không lưu lại (đọc trả về 0)
+WALLET_MIRROR_FIELDS = ('money', 'balance')
+
+# File JSON cũ của từng game (dùng cho migration)
+LEGACY_STATS_FILES = {
+    'taixiu': 'data/taixiu_players.json',
+    'slot': 'data/slot_data.json',
+    'rps': 'data/rps_data.json',
+    'blackjack': 'blackjack_data.json',
+    'flip_coin': 'flip_coin_data.json',
+}
+
+
+def _to_epoch(value) -> float:
+    """Chuyển ISO string / số sang epoch float"""
+    if not value:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class PlayerStats:
+    """
+    Record thống kê compact của 1 người chơi
+
+    Dùng __slots__ thay vì dict để giảm RAM. Hỗ trợ truy cập kiểu dict
+    (record['wins'] += 1, record.get('lose_streak', 0)) để tương thích code cũ.
+    """
+    __slots__ = FIELDS + ('_extra',)
+
+    def __init__(self):
+        for name in INT_FIELDS:
+            setattr(self, name, 0)
+        self.created_at = 0.0
+        self.last_played = 0.0
+        self._extra = None  # Dict cho field chưa khai báo ở trên, None nếu không có
+
+    @property
+    def winrate(self) -> float:
+        """Tỷ lệ thắng (%) - tính khi đọc"""
+        return (self.wins / self.total_games * 100) if self.total_games > 0 else 0.0
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'PlayerStats':
+        """Tạo record từ dict kiểu cũ"""
+        record = cls()
+        for key, value in data.items():
+            record[key] = value
+        return record
+
+    def to_dict(self) -> dict:
+        """Chuyển record về dict kiểu cũ (chỉ dùng khi cần hiển thị/export)"""
+        data = {name: getattr(self, name) for name in INT_FIELDS}
+        for name in TIME_FIELDS:
+            data[name] = self[name]
+        data['winrate'] = self.winrate
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def to_row(self) -> list:
+        """Chuyển record thành row compact để lưu file"""
+        row = [getattr(self, name) for name in FIELDS]
+        if self._extra:
+            row.append(self._extra)
+        return row
+
+    @classmethod
+    def from_row(cls, row: list) -> 'PlayerStats':
+        """Tạo record từ row compact"""
+        record = cls()
+        for name, value in zip(FIELDS, row):
+            setattr(record, name, value)
+        if len(row) > len(FIELDS) and row[len(FIELDS)]:
+            record._extra = dict(row[len(FIELDS)])
+        return record
+
+    # Truy cập kiểu dict để tương thích code cũ
+    def __getitem__(self, key):
+        key = FIELD_ALIASES.get(key, key)
+        if key in TIME_FIELDS:
+            value = getattr(self, key)
+            return datetime.fromtimestamp(value).isoformat() if value else None
+        if key in INT_FIELDS or key in DERIVED_FIELDS:
+            return getattr(self, key)
+        if key in WALLET_MIRROR_FIELDS:
+            return 0
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        key = FIELD_ALIASES.get(key, key)
+        if key in TIME_FIELDS:
+            setattr(self, key, _to_epoch(value))
+        elif key in INT_FIELDS:
+            setattr(self, key, value)
+        elif key in DERIVED_FIELDS or key in WALLET_MIRROR_FIELDS:
+            return  # Không lưu - tính khi đọc / lấy từ shared wallet
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __contains__(self, key) -> bool:
+        key = FIELD_ALIASES.get(key, key)
+        if key in FIELDS or key in DERIVED_FIELDS or key in WALLET_MIRROR_FIELDS:
+            return True
+        return bool(self._extra) and key in self._extra
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self) -> str:
+        return f"PlayerStats(total_games={self.total_games}, wins={self.wins}, losses={self.losses})"
+
+
+class GameStatsTable:
+    """
+    Bảng thống kê của 1 game: user_id (int) -> PlayerStats
+
+    Giao diện giống dict với key là string user_id để thay thế trực tiếp
+    các dict cũ (self.slot_data, self.player_data, ...).
+    """
+
+    def __init__(self, game: str, data_file: str, legacy_file: Optional[str] = None):
+        self.game = game
+        self.data_file = data_file
+        self.legacy_file = legacy_file
+        self._records: Dict[int, PlayerStats] = {}
+        self.load()
+
+    def load(self) -> None:
+        """Load bảng từ file compact, tự động migrate từ file cũ nếu chưa có"""
+        try:
+            if os.path.exists(self.data_file):
+                with open(self.data_file, 'r', encoding='utf-8') as f:
+                    payload = json.load(f)
+                fields = payload.get('fields', list(FIELDS))
+                if tuple(fields) == FIELDS:
+                    self._records = {
+                        int(user_id): PlayerStats.from_row(row)
+                        for user_id, row in payload.get('records', {}).items()
+                    }
+                else:
+                    # Layout field khác phiên bản hiện tại - map theo tên
+                    self._records = {}
+                    for user_id, row in payload.get('records', {}).items():
+                        data = dict(zip(fields, row))
+                        if len(row) > len(fields) and row[len(fields)]:
+                            data.update(row[len(fields)])
+                        self._records[int(user_id)] = PlayerStats.from_dict(data)
+                logger.info(f"Đã tải {len(self._records)} records thống kê {self.game}")
+            elif self.legacy_file and os.path.exists(self.legacy_file):
+                with open(self.legacy_file, 'r', encoding='utf-8') as f:
+                    legacy_data = json.load(f)
+                self.import_legacy(legacy_data)
+                self.save()
+                logger.info(f"Đã migrate {len(self._records)} records {self.game} từ {self.legacy_file}")
+        except Exception as e:
+            logger.error(f"Lỗi khi load game stats {self.game}: {e}")
+
+    def import_legacy(self, legacy_data: dict) -> int:
+        """
+        Import dữ liệu từ dict JSON cũ (user_id_str -> dict stats)
+
+        Returns:
+            int: Số records đã import
+        """
+        count = 0
+        for user_id, data in legacy_data.items():
+            try:
+                self._records[int(user_id)] = PlayerStats.from_dict(data)
+                count += 1
+            except (TypeError, ValueError):
+                logger.warning(f"Bỏ qua record {self.game} không hợp lệ: {user_id}")
+        return count
+
+    @PERSISTENCE_FLUSH.time(store='game_stats')
+    def save(self) -> None:
+        """Lưu bảng xuống file (compact, ghi atomic)"""
+        try:
+            os.makedirs(os.path.dirname(self.data_file) or '.', exist_ok=True)
+            payload = {
+                'version': 1,
+                'game': self.game,
+                'fields': list(FIELDS),
+                'records': {str(user_id): record.to_row() for user_id, record in self._records.items()}
+            }
+            tmp_file = f"{self.data_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_file, self.data_file)
+        except Exception as e:
+            logger.error(f"Lỗi khi save game stats {self.game}: {e}")
+
+    def to_legacy_dict(self) -> dict:
+        """Export về dạng dict JSON cũ"""
+        return {str(user_id): record.to_dict() for user_id, record in self._records.items()}
+
+    # Giao diện dict (key có thể là int hoặc str)
+    def __contains__(self, user_id) -> bool:
+        try:
+            return int(user_id) in self._records
+        except (TypeError, ValueError):
+            return False
+
+    def __getitem__(self, user_id) -> PlayerStats:
+        return self._records[int(user_id)]
+
+    def __setitem__(self, user_id, value) -> None:
+        if not isinstance(value, PlayerStats):
+            value = PlayerStats.from_dict(value)
+        self._records[int(user_id)] = value
+
+    def __delitem__(self, user_id) -> None:
+        del self._records[int(user_id)]
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __bool__(self) -> bool:
+        return bool(self._records)
+
+    def __iter__(self) -> Iterator[str]:
+        return (str(user_id) for user_id in self._records)
+
+    def get(self, user_id, default=None):
+        try:
+            return self._records.get(int(user_id), default)
+        except (TypeError, ValueError):
+            return default
+
+    def pop(self, user_id, default=None):
+        return self._records.pop(int(user_id), default)
+
+    def keys(self) -> Iterator[str]:
+        return iter(self)
+
+    def values(self) -> Iterator[PlayerStats]:
+        return iter(self._records.values())
+
+    def items(self) -> Iterator[Tuple[str, PlayerStats]]:
+        return ((str(user_id), record) for user_id, record in self._records.items())
+
+    def clear(self) -> None:
+        self._records.clear()
+
+
+class GameStatsStore:
+    """Store thống nhất quản lý bảng thống kê của tất cả games"""
+
+    def __init__(self, data_dir: str = 'data/game_stats'):
+        self.data_dir = data_dir
+        self._tables: Dict[str, GameStatsTable] = {}
+
+    def table(self, game: str, legacy_file: Optional[str] = None) -> GameStatsTable:
+        """
+        Lấy bảng thống kê của game (load lần đầu, lần sau dùng lại)
+
+        Args:
+            game: Tên game (taixiu, slot, rps, blackjack, flip_coin)
+            legacy_file: File JSON cũ để migrate nếu chưa có file compact
+        """
+        if game not in self._tables:
+            data_file = os.path.join(self.data_dir, f"{game}.json")
+            self._tables[game] = GameStatsTable(
+                game, data_file, legacy_file or LEGACY_STATS_FILES.get(game)
+            )
+        return self._tables[game]
+
+    def data_files(self) -> List[str]:
+        """Đường dẫn file compact của tất cả games (cho backup/restore)"""
+        return [os.path.join(self.data_dir, f"{game}.json") for game in LEGACY_STATS_FILES]
+
+    def migrate_legacy_files(self, legacy_files: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+        """
+        Migrate toàn bộ file JSON cũ sang store (ghi đè bảng compact hiện có)
+
+        Returns:
+            dict: game -> số records đã migrate
+        """
+        results = {}
+        for game, legacy_file in (legacy_files or LEGACY_STATS_FILES).items():
+            if not os.path.exists(legacy_file):
+                results[game] = 0
+                continue
+            try:
+                with open(legacy_file, 'r', encoding='utf-8') as f:
+                    legacy_data = json.load(f)
+                table = self.table(game, legacy_file)
+                table.clear()
+                results[game] = table.import_legacy(legacy_data)
+                table.save()
+                logger.info(f"Migrated {results[game]} records {game} từ {legacy_file}")
+            except Exception as e:
+                logger.error(f"Lỗi khi migrate {legacy_file}: {e}")
+                results[game] = 0
+        return results
+
+    def reload_file(self, path: str) -> bool:
+        """
+        Load lại bảng đang dùng file này (sau khi file bị ghi đè, vd. restore từ snapshot)
+
+        Returns:
+            bool: True nếu file thuộc store (bảng chưa load thì lần dùng sau tự đọc file mới)
+        """
+        path = os.path.normpath(path)
+        for game in LEGACY_STATS_FILES:
+            if os.path.normpath(os.path.join(self.data_dir, f"{game}.json")) == path:
+                if game in self._tables:
+                    self._tables[game].load()
+                return True
+        return False
+
+    def get_stats(self) -> dict:
+        """Thống kê số records mỗi game"""
+        return {game: len(table) for game, table in self._tables.items()}
+
+
+# Global instance
+game_stats = GameStatsStore()
@@ -0,0 +1,274 @@
+"""
+Git task runner - chạy lệnh git không chặn event loop: có timeout, đọc output từng dòng
+(kể cả dòng progress kết thúc bằng \\r), gom nhiều lệnh thành 1 task huỷ được
+"""
+import asyncio
+import os
+import time
+import logging
+from collections import deque
+from typing import Awaitable, Callable, Deque, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 120.0  # Giây cho mỗi lệnh git
+PROGRESS_LINES = 6  # Số dòng output gần nhất giữ lại để hiển thị
+
+
+class GitResult:
+    """Kết quả 1 lệnh git"""
+    
+    __slots__ = ('args', 'returncode', 'output', 'error', 'duration_ms', 'timed_out')
+    
+    def __init__(self, args: List[str], returncode: Optional[int], output: str, error: str,
+                 duration_ms: float, timed_out: bool = False):
+        self.args = args
+        self.returncode = returncode
+        self.output = output
+        self.error = error
+        self.duration_ms = duration_ms
+        self.timed_out = timed_out
+    
+    @property
+    def success(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+
+
+class GitTask:
+    """1 chuỗi thao tác git đang chạy (vd: snapshot + fetch + merge), huỷ được bằng cancel()"""
+    
+    def __init__(self, name: str, user_id: Optional[int] = None):
+        self.name = name
+        self.user_id = user_id
+        self.started_at = time.perf_counter()
+        self.finished_at: Optional[float] = None
+        self.state = 'running'  # running -> done | failed | cancelled
+        self.steps: List[dict] = []  # {'name', 'state', 'ms'} theo thứ tự bắt đầu
+        self.lines: Deque[str] = deque(maxlen=PROGRESS_LINES)
+        self.version = 0  # Tăng mỗi khi có thay đổi cần hiển thị
+        self.cancel_requested = False
+        self.cancellable = True  # False trong bước không được ngắt giữa chừng (reset, merge)
+        self._inner: Optional[asyncio.Task] = None
+        self._outer: Optional[asyncio.Task] = None
+    
+    @property
+    def done(self) -> bool:
+        return self.state != 'running'
+    
+    @property
+    def elapsed(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at
+    
+    def begin(self, step: str) -> dict:
+        entry = {'name': step, 'state': 'running', 'started': time.perf_counter(), 'ms': None}
+        self.steps.append(entry)
+        self.version += 1
+        return entry
+    
+    def finish(self, entry: dict, ok: bool) -> None:
+        entry['state'] = 'done' if ok else 'failed'
+        entry['ms'] = round((time.perf_counter() - entry['started']) * 1000)
+        self.version += 1
+    
+    def add_line(self, line: str) -> None:
+        # Dòng progress (vd: "Receiving objects: 45%") ghi đè dòng progress trước của cùng loại
+        prefix = line.split(':', 1)[0]
+        if self.lines and self.lines[-1].split(':', 1)[0] == prefix and '%' in line:
+            self.lines[-1] = line
+        else:
+            self.lines.append(line)
+        self.version += 1
+    
+    def cancel(self) -> bool:
+        if self.done or self._inner is None or not self.cancellable:
+            return False
+        self.cancel_requested = True
+        self._inner.cancel()
+        return True
+    
+    async def wait(self):
+        """Chờ task xong, trả về kết quả của pipeline (None nếu bị huỷ)"""
+        return await self._outer
+
+
+class GitTaskRunner:
+    """
+    Class chạy lệnh git bằng create_subprocess_exec (không qua shell)
+    
+    - mỗi lệnh có timeout, quá hạn thì kill process và trả về GitResult.timed_out
+    - stdout/stderr đọc song song theo dòng, dòng tách bởi \\n hoặc \\r (progress của git),
+      dòng progress chỉ báo qua on_line chứ không lưu vào output
+    - GIT_TERMINAL_PROMPT=0 để git báo lỗi thay vì treo chờ nhập mật khẩu
+    - start() chạy 1 pipeline thành GitTask; mỗi lúc chỉ 1 task (git lock của repo cũng chỉ cho 1)
+    """
+    
+    def __init__(self, cwd: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT):
+        self.cwd = cwd
+        self.timeout = timeout
+        self.active: Optional[GitTask] = None
+        self._commands = 0
+        self._timeouts = 0
+        self._tasks = 0
+        self._cancelled = 0
+    
+    # ---------- Lệnh đơn ----------
+    
+    @staticmethod
+    async def _pump(stream: asyncio.StreamReader, sink: List[str], on_line: Optional[Callable[[str], None]]) -> None:
+        buffer = b''
+        while True:
+            chunk = await stream.read(4096)
+            buffer += chunk
+            while True:
+                cut = min((i for i in (buffer.find(b'\n'), buffer.find(b'\r')) if i >= 0), default=-1)
+                if cut < 0 or (buffer[cut:cut + 1] == b'\r' and cut == len(buffer) - 1 and chunk):
+                    break  # Chưa đủ dòng (hoặc \r cuối buffer có thể là nửa đầu của \r\n)
+                newline = buffer[cut:cut + 1] == b'\n' or buffer[cut + 1:cut + 2] == b'\n'
+                line = buffer[:cut].decode('utf-8', errors='ignore').strip()
+                buffer = buffer[cut + (2 if buffer[cut:cut + 2] == b'\r\n' else 1):]
+                if line:
+                    if newline:
+                        sink.append(line)
+                    if on_line:
+                        on_line(line)
+            if not chunk:
+                break
+        line = buffer.decode('utf-8', errors='ignore').strip()
+        if line:
+            sink.append(line)
+            if on_line:
+                on_line(line)
+    
+    @staticmethod
+    def _kill(process: asyncio.subprocess.Process) -> None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+    
+    async def run(self, args: List[str], timeout: Optional[float] = None, cwd: Optional[str] = None,
+                  on_line: Optional[Callable[[str], None]] = None) -> GitResult:
+        """Chạy 1 lệnh, không raise khi lệnh lỗi/timeout (xem GitResult)"""
+        timeout = timeout or self.timeout
+        started = time.perf_counter()
+        self._commands += 1
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                cwd=cwd or self.cwd or os.getcwd(),
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env={**os.environ, 'GIT_TERMINAL_PROMPT': '0'}
+            )
+        except OSError as e:
+            logger.error(f"Lỗi khi chạy '{' '.join(args)}': {e}")
+            return GitResult(args, None, '', str(e), 0.0)
+        
+        stdout: List[str] = []
+        stderr: List[str] = []
+        timed_out = False
+        io = asyncio.gather(
+            self._pump(process.stdout, stdout, on_line),
+            self._pump(process.stderr, stderr, on_line),
+            process.wait()
+        )
+        # Khi bị huỷ/timeout, gather kết thúc bằng CancelledError mà không ai đọc -> đọc để khỏi log cảnh báo
+        io.add_done_callback(lambda future: future.cancelled() or future.exception())
+        try:
+            await asyncio.wait_for(io, timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            self._timeouts += 1
+            self._kill(process)
+            await process.wait()
+            stderr.append(f"Timeout sau {timeout:g}s, đã dừng lệnh")
+            logger.warning(f"Lệnh '{' '.join(args)}' quá {timeout:g}s, đã kill")
+        except asyncio.CancelledError:
+            self._kill(process)
+            await asyncio.shield(process.wait())
+            raise
+        
+        duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        return GitResult(args, process.returncode, '\n'.join(stdout), '\n'.join(stderr), duration_ms, timed_out)
+    
+    # ---------- Task ----------
+    
+    async def step(self, task: GitTask, name: str, args: List[str], timeout: Optional[float] = None,
+                   cancellable: bool = True) -> GitResult:
+        """
+        Chạy 1 lệnh như 1 bước của task (output đẩy vào task.lines)
+        
+        cancellable=False cho lệnh sửa working tree (reset, merge): kill giữa chừng có thể để lại
+        index.lock hoặc merge dở, nên task không nhận huỷ trong lúc chạy bước này
+        """
+        entry = task.begin(name)
+        task.cancellable = cancellable
+        try:
+            result = await self.run(args, timeout=timeout, on_line=task.add_line)
+        finally:
+            task.cancellable = True
+        task.finish(entry, result.success)
+        return result
+    
+    async def call(self, task: GitTask, name: str, func: Callable[[], Awaitable]):
+        """Chạy 1 bước không phải lệnh git (vd: snapshot) để hiện trong tiến trình task"""
+        entry = task.begin(name)
+        try:
+            result = await func()
+        except Exception:
+            task.finish(entry, False)
+            raise
+        task.finish(entry, bool(result))
+        return result
+    
+    def start(self, name: str, pipeline: Callable[[GitTask], Awaitable], user_id: Optional[int] = None) -> GitTask:
+        """
+        Chạy pipeline(task) trong nền
+        
+        Raises:
+            RuntimeError: Đang có task khác chạy
+        """
+        if self.active is not None and not self.active.done:
+            raise RuntimeError(f"Đang chạy '{self.active.name}'")
+        task = self.active = GitTask(name, user_id)
+        self._tasks += 1
+        task._inner = asyncio.ensure_future(pipeline(task))
+        task._outer = asyncio.ensure_future(self._supervise(task))
+        return task
+    
+    async def _supervise(self, task: GitTask):
+        try:
+            result = await task._inner
+            task.state = 'done' if getattr(result, 'success', bool(result)) else 'failed'
+            return result
+        except asyncio.CancelledError:
+            if not task.cancel_requested:
+                raise
+            task.state = 'cancelled'
+            self._cancelled += 1
+            logger.info(f"Git task '{task.name}' đã bị huỷ")
+            return None
+        except Exception as e:
+            task.state = 'failed'
+            task.add_line(f"Lỗi: {e}")
+            logger.error(f"Git task '{task.name}' lỗi: {e}")
+            return None
+        finally:
+            task.finished_at = time.perf_counter()
+            task.version += 1
+    
+    def cancel(self) -> bool:
+        """Huỷ task đang chạy (True nếu có task để huỷ)"""
+        return self.active is not None and self.active.cancel()
+    
+    def get_stats(self) -> dict:
+        """Thống kê runner"""
+        return {
+            'commands': self._commands,
+            'timeouts': self._timeouts,
+            'tasks': self._tasks,
+            'cancelled': self._cancelled,
+            'active': self.active.name if self.active is not None and not self.active.done else None,
+        }
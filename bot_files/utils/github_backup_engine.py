@@ -0,0 +1,307 @@
+"""
+GitHub backup engine - backup tăng dần: hash file tại chỗ theo kiểu git blob, chỉ upload file
+đã đổi (song song) rồi gộp tất cả vào 1 commit qua git data API (blobs/trees/commits/refs)
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import time
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_URL = 'https://api.github.com'
+RETRY_STATUSES = {500, 502, 503, 504}
+
+
+def git_blob_sha(content: bytes) -> str:
+    """SHA-1 của git blob (giống `git hash-object`) - trùng với sha GitHub trả về cho blob"""
+    header = f"blob {len(content)}\0".encode('utf-8')
+    return hashlib.sha1(header + content).hexdigest()
+
+
+class GitHubAPIError(Exception):
+    """Lỗi HTTP từ GitHub API"""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+class BackupResult:
+    """Kết quả 1 lần backup"""
+    
+    __slots__ = ('uploaded', 'unchanged', 'missing', 'failed', 'commit', 'bytes_uploaded', 'duration_ms')
+    
+    def __init__(self):
+        self.uploaded: List[str] = []
+        self.unchanged: List[str] = []
+        self.missing: List[str] = []
+        self.failed: List[Tuple[str, str]] = []
+        self.commit: Optional[str] = None
+        self.bytes_uploaded = 0
+        self.duration_ms = 0.0
+    
+    def to_dict(self) -> dict:
+        return {
+            'uploaded': self.uploaded,
+            'unchanged': self.unchanged,
+            'missing': self.missing,
+            'failed': [{'file': path, 'error': error} for path, error in self.failed],
+            'commit': self.commit,
+            'bytes_uploaded': self.bytes_uploaded,
+            'duration_ms': self.duration_ms,
+        }
+
+
+class GitHubBackupEngine:
+    """
+    Class backup file lên 1 GitHub repo theo kiểu tăng dần
+    
+    - state_file lưu blob sha đã upload theo "<owner>/<repo>" -> {remote_path: sha}; file có
+      sha trùng được bỏ qua mà không gọi API nào (không đổi gì thì không có request nào)
+    - file đổi được tạo blob song song (giới hạn bởi concurrency) trên 1 session dùng chung
+    - sau đó tạo 1 tree (base_tree = tree của commit hiện tại), 1 commit và cập nhật ref:
+      N file = N + 5 request thay vì 2N request và N commit như contents API
+    - cập nhật ref bị từ chối (có người push cùng lúc) thì dựng lại tree trên HEAD mới 1 lần
+    - api_url đổi được để chạy với stub local (scripts/github_api_stub.py)
+    """
+    
+    def __init__(self, token: str, owner: str, repo: str, state_file: str = 'data/github_backup_state.json',
+                 api_url: str = DEFAULT_API_URL, concurrency: int = 4, max_retries: int = 3, timeout: float = 30):
+        self.token = token
+        self.owner = owner
+        self.repo = repo
+        self.state_file = state_file
+        self.api_url = api_url.rstrip('/')
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.state: Dict[str, dict] = {}  # "<owner>/<repo>" -> {'files': {path: sha}, 'commit', 'backed_up_at'}
+        self._lock = asyncio.Lock()
+        self._runs = 0
+        self._requests = 0
+        self._skipped_files = 0
+        self._uploaded_files = 0
+        self.load()
+    
+    # ---------- State ----------
+    
+    @property
+    def repo_key(self) -> str:
+        return f"{self.owner}/{self.repo}"
+    
+    @property
+    def remote_files(self) -> Dict[str, str]:
+        """remote_path -> blob sha của lần backup gần nhất lên repo hiện tại"""
+        return self.state.setdefault(self.repo_key, {}).setdefault('files', {})
+    
+    def load(self) -> None:
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    self.state = json.load(f).get('repos', {})
+        except Exception as e:
+            logger.error(f"Lỗi khi tải trạng thái GitHub backup: {e}")
+    
+    def save(self) -> None:
+        """Lưu blob sha đã upload (ghi atomic)"""
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'repos': self.state}, f, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            logger.error(f"Lỗi khi lưu trạng thái GitHub backup: {e}")
+    
+    def forget(self) -> None:
+        """Xóa cache sha của repo hiện tại (lần backup sau upload lại tất cả)"""
+        self.state.pop(self.repo_key, None)
+        self.save()
+    
+    # ---------- HTTP ----------
+    
+    def _session(self) -> aiohttp.ClientSession:
+        return aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            trace_configs=[metrics.http_trace_config()],
+            headers={
+                'Authorization': f'token {self.token}',
+                'Accept': 'application/vnd.github.v3+json',
+                'User-Agent': 'Discord-Bot-Backup'
+            }
+        )
+    
+    async def _request(self, session: aiohttp.ClientSession, method: str, path: str, payload: dict = None) -> dict:
+        """Gọi API với retry + exponential backoff cho lỗi mạng/5xx, lỗi 4xx raise ngay"""
+        url = f"{self.api_url}/repos/{self.owner}/{self.repo}{path}"
+        for attempt in range(self.max_retries):
+            self._requests += 1
+            try:
+                async with session.request(method, url, json=payload) as response:
+                    if response.status < 400:
+                        return await response.json()
+                    error_text = await response.text()
+                    if response.status not in RETRY_STATUSES or attempt == self.max_retries - 1:
+                        raise GitHubAPIError(response.status, error_text[:200])
+                    logger.warning(f"⚠️ {method} {path} lỗi {response.status}, thử lại lần {attempt + 2}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.max_retries - 1:
+                    raise
+                logger.warning(f"⚠️ {method} {path} lỗi kết nối ({e}), thử lại lần {attempt + 2}")
+            await asyncio.sleep(2 ** attempt)
+        raise GitHubAPIError(0, "Tất cả attempts đều thất bại")
+    
+    async def _head(self, session: aiohttp.ClientSession) -> Tuple[str, str, str]:
+        """(branch, sha commit HEAD, sha tree HEAD) của nhánh mặc định"""
+        repo_info = await self._request(session, 'GET', '')
+        branch = repo_info.get('default_branch', 'main')
+        ref = await self._request(session, 'GET', f'/git/ref/heads/{branch}')
+        head_sha = ref['object']['sha']
+        commit = await self._request(session, 'GET', f'/git/commits/{head_sha}')
+        return branch, head_sha, commit['tree']['sha']
+    
+    async def _create_blob(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                           path: str, content: bytes, local_sha: str) -> str:
+        async with semaphore:
+            blob = await self._request(session, 'POST', '/git/blobs', {
+                'content': base64.b64encode(content).decode('ascii'),
+                'encoding': 'base64'
+            })
+        if blob['sha'] != local_sha:
+            logger.warning(f"⚠️ Blob sha của {path} khác sha tính tại chỗ ({blob['sha'][:12]} != {local_sha[:12]})")
+        return blob['sha']
+    
+    async def _commit(self, session: aiohttp.ClientSession, tree_entries: List[dict], message: str) -> str:
+        """Tạo tree + commit trên HEAD và cập nhật ref, thử lại 1 lần nếu HEAD đổi giữa chừng"""
+        for attempt in range(2):
+            branch, head_sha, base_tree = await self._head(session)
+            tree = await self._request(session, 'POST', '/git/trees', {'base_tree': base_tree, 'tree': tree_entries})
+            if tree['sha'] == base_tree:
+                return head_sha  # Nội dung trên repo đã giống hệt, không cần commit rỗng
+            commit = await self._request(session, 'POST', '/git/commits', {
+                'message': message,
+                'tree': tree['sha'],
+                'parents': [head_sha]
+            })
+            try:
+                await self._request(session, 'PATCH', f'/git/refs/heads/{branch}', {'sha': commit['sha'], 'force': False})
+                return commit['sha']
+            except GitHubAPIError as e:
+                if e.status != 422 or attempt == 1:
+                    raise
+                logger.warning(f"⚠️ Nhánh {branch} vừa đổi, dựng lại commit trên HEAD mới")
+        raise GitHubAPIError(422, "Không cập nhật được ref")
+    
+    # ---------- Backup ----------
+    
+    @staticmethod
+    def _read_files(files: Dict[str, str]) -> Dict[str, Optional[bytes]]:
+        contents = {}
+        for remote_path, local_path in files.items():
+            try:
+                with open(local_path, 'rb') as f:
+                    contents[remote_path] = f.read()
+            except FileNotFoundError:
+                contents[remote_path] = None
+        return contents
+    
+    async def backup(self, files: Dict[str, str], message: str, extra_files: Dict[str, bytes] = None,
+                     full: bool = False) -> BackupResult:
+        """
+        Backup các file đã đổi từ lần trước trong 1 commit
+        
+        Args:
+            files: remote_path -> local_path
+            message: Commit message
+            extra_files: remote_path -> nội dung, chỉ commit kèm khi có file đổi (vd: backup summary),
+                         có thể là callable(result) -> dict để tạo nội dung sau khi biết kết quả
+            full: Bỏ qua cache sha, upload lại tất cả
+        """
+        async with self._lock:
+            started = time.perf_counter()
+            result = BackupResult()
+            self._runs += 1
+            contents = await asyncio.to_thread(self._read_files, files)
+            
+            known = {} if full else self.remote_files
+            changed: Dict[str, Tuple[bytes, str]] = {}
+            for remote_path, content in contents.items():
+                if content is None:
+                    result.missing.append(remote_path)
+                    continue
+                sha = git_blob_sha(content)
+                if known.get(remote_path) == sha:
+                    result.unchanged.append(remote_path)
+                else:
+                    changed[remote_path] = (content, sha)
+            self._skipped_files += len(result.unchanged)
+            
+            if changed:
+                async with self._session() as session:
+                    semaphore = asyncio.Semaphore(self.concurrency)
+                    paths = list(changed)
+                    blobs = await asyncio.gather(
+                        *(self._create_blob(session, semaphore, path, *changed[path]) for path in paths),
+                        return_exceptions=True
+                    )
+                    tree_entries = []
+                    uploaded: Dict[str, str] = {}
+                    for path, blob in zip(paths, blobs):
+                        if isinstance(blob, Exception):
+                            result.failed.append((path, str(blob) or type(blob).__name__))
+                            continue
+                        uploaded[path] = blob
+                        tree_entries.append({'path': path, 'mode': '100644', 'type': 'blob', 'sha': blob})
+                    
+                    if uploaded:
+                        result.uploaded = list(uploaded)
+                        result.bytes_uploaded = sum(len(changed[path][0]) for path in uploaded)
+                        extras = extra_files(result) if callable(extra_files) else (extra_files or {})
+                        for path, content in extras.items():
+                            tree_entries.append({'path': path, 'mode': '100644', 'type': 'blob',
+                                                 'content': content.decode('utf-8')})
+                        try:
+                            result.commit = await self._commit(session, tree_entries, message)
+                        except Exception as e:
+                            # Commit hỏng thì không file nào coi như đã backup
+                            result.failed.extend((path, f"Commit lỗi: {e}") for path in uploaded)
+                            result.uploaded = []
+                            result.bytes_uploaded = 0
+                            logger.error(f"❌ Lỗi khi tạo commit backup: {e}")
+                
+                if result.commit:
+                    self.remote_files.update(uploaded)
+                    entry = self.state[self.repo_key]
+                    entry['commit'] = result.commit
+                    entry['backed_up_at'] = time.time()
+                    self.save()
+                    self._uploaded_files += len(result.uploaded)
+            
+            result.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+            logger.info(
+                f"GitHub backup {self.repo_key}: {len(result.uploaded)} upload, {len(result.unchanged)} không đổi, "
+                f"{len(result.failed)} lỗi, {len(result.missing)} thiếu trong {result.duration_ms}ms"
+            )
+            return result
+    
+    def get_stats(self) -> dict:
+        """Thống kê backup"""
+        entry = self.state.get(self.repo_key, {})
+        return {
+            'runs': self._runs,
+            'requests': self._requests,
+            'uploaded_files': self._uploaded_files,
+            'skipped_files': self._skipped_files,
+            'tracked_files': len(entry.get('files', {})),
+            'last_commit': entry.get('commit'),
+            'last_backup_at': entry.get('backed_up_at'),
+        }
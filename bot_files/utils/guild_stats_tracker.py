@@ -0,0 +1,212 @@
+"""
+Guild stats tracker - đếm sẵn thành viên theo trạng thái, bot/người và heap timeout
+của từng server, cập nhật dần từ gateway events thay vì duyệt guild.members mỗi lệnh
+"""
+import asyncio
+import heapq
+import time
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATUS_KEYS = ('online', 'idle', 'dnd', 'offline')
+_STATUS_INDEX = {key: index for index, key in enumerate(STATUS_KEYS)}
+_BOT_BIT = 4  # Code của member = index trạng thái | _BOT_BIT nếu là bot
+
+# Số member xử lý trước khi nhường event loop khi seed server lớn
+SEED_BATCH_SIZE = 5000
+
+
+def _status_code(member) -> int:
+    """Mã hóa trạng thái + bot của member thành 1 số nhỏ"""
+    status = getattr(member.status, 'value', str(member.status))
+    code = _STATUS_INDEX.get(status, _STATUS_INDEX['offline'])  # invisible/unknown -> offline
+    return code | _BOT_BIT if member.bot else code
+
+
+def _timeout_expiry(member) -> Optional[float]:
+    """Thời điểm hết timeout (epoch) hoặc None nếu không bị timeout"""
+    timed_out_until = getattr(member, 'timed_out_until', None)
+    return timed_out_until.timestamp() if timed_out_until else None
+
+
+class GuildCounters:
+    """Bộ đếm của 1 server"""
+
+    __slots__ = ('status_counts', 'bots', 'humans', 'members', 'timeouts', 'timeout_heap', 'seeded_at')
+
+    def __init__(self):
+        self.status_counts = [0, 0, 0, 0]
+        self.bots = 0
+        self.humans = 0
+        self.members: Dict[int, int] = {}  # member_id -> status code
+        self.timeouts: Dict[int, float] = {}  # member_id -> epoch hết hạn
+        self.timeout_heap: List[Tuple[float, int]] = []  # (epoch hết hạn, member_id), xóa lười
+        self.seeded_at = 0.0
+
+    def set_member(self, member_id: int, code: Optional[int]) -> None:
+        """Cập nhật code của member (None = rời server), điều chỉnh bộ đếm theo chênh lệch"""
+        old = self.members.pop(member_id, None) if code is None else self.members.get(member_id)
+        if old == code:
+            return
+        if old is not None:
+            self.status_counts[old & 3] -= 1
+            if old & _BOT_BIT:
+                self.bots -= 1
+            else:
+                self.humans -= 1
+        if code is not None:
+            self.members[member_id] = code
+            self.status_counts[code & 3] += 1
+            if code & _BOT_BIT:
+                self.bots += 1
+            else:
+                self.humans += 1
+
+    def set_timeout(self, member_id: int, expires_at: Optional[float]) -> None:
+        """Cập nhật thời điểm hết timeout (None = đã gỡ timeout)"""
+        if expires_at is None or expires_at <= time.time():
+            self.timeouts.pop(member_id, None)
+            return
+        if self.timeouts.get(member_id) == expires_at:
+            return
+        self.timeouts[member_id] = expires_at
+        heapq.heappush(self.timeout_heap, (expires_at, member_id))
+
+    def expire_timeouts(self, now: float) -> int:
+        """Bỏ các timeout đã hết hạn ở đầu heap (và entry cũ bị thay thế)"""
+        expired = 0
+        heap = self.timeout_heap
+        while heap and (heap[0][0] <= now or self.timeouts.get(heap[0][1]) != heap[0][0]):
+            expires_at, member_id = heapq.heappop(heap)
+            if self.timeouts.get(member_id) == expires_at:
+                del self.timeouts[member_id]
+                expired += 1
+        return expired
+
+
+class GuildStatsTracker:
+    """
+    Class duy trì thống kê thành viên của các server
+
+    Lần đầu cần số liệu của 1 server sẽ seed bằng 1 lượt duyệt member cache
+    (nhường event loop mỗi SEED_BATCH_SIZE member). Sau đó chỉ cập nhật từ
+    on_presence_update / on_member_update / on_member_join / on_member_remove
+    nên ;nhom và ;muteinfo đọc số liệu có sẵn thay vì O(members).
+    """
+
+    def __init__(self):
+        self._guilds: Dict[int, GuildCounters] = {}
+        self._seed_locks: Dict[int, asyncio.Lock] = {}
+        self._events = 0
+        self._seeds = 0
+
+    # ---------- Seed ----------
+
+    async def seed_guild(self, guild) -> GuildCounters:
+        """Seed bộ đếm của server từ member cache (không chặn event loop quá lâu)"""
+        counters = GuildCounters()
+        for index, member in enumerate(guild.members):
+            counters.set_member(member.id, _status_code(member))
+            counters.set_timeout(member.id, _timeout_expiry(member))
+            if index and index % SEED_BATCH_SIZE == 0:
+                await asyncio.sleep(0)
+        counters.seeded_at = time.time()
+        self._guilds[guild.id] = counters
+        self._seeds += 1
+        logger.info(f"Guild stats: đã seed {len(counters.members)} members của {guild.name}")
+        return counters
+
+    async def seed_all(self, guilds) -> int:
+        """Seed tất cả server (gọi khi on_ready)"""
+        for guild in guilds:
+            async with self._seed_locks.setdefault(guild.id, asyncio.Lock()):
+                await self.seed_guild(guild)
+        return len(self._guilds)
+
+    async def get_counters(self, guild) -> GuildCounters:
+        """Lấy bộ đếm của server, seed nếu chưa có (gọi đồng thời vẫn chỉ seed 1 lần)"""
+        counters = self._guilds.get(guild.id)
+        if counters is not None:
+            return counters
+        async with self._seed_locks.setdefault(guild.id, asyncio.Lock()):
+            counters = self._guilds.get(guild.id)
+            if counters is None:
+                counters = await self.seed_guild(guild)
+        return counters
+
+    def forget_guild(self, guild_id: int) -> None:
+        """Bỏ bộ đếm khi bot rời server"""
+        self._guilds.pop(guild_id, None)
+        self._seed_locks.pop(guild_id, None)
+
+    # ---------- Gateway events ----------
+
+    def on_member_join(self, member) -> None:
+        counters = self._guilds.get(member.guild.id)
+        if counters is None:
+            return  # Chưa seed - lần seed sau sẽ thấy member này
+        self._events += 1
+        counters.set_member(member.id, _status_code(member))
+        counters.set_timeout(member.id, _timeout_expiry(member))
+
+    def on_member_remove(self, member) -> None:
+        counters = self._guilds.get(member.guild.id)
+        if counters is None:
+            return
+        self._events += 1
+        counters.set_member(member.id, None)
+        counters.timeouts.pop(member.id, None)
+
+    def on_presence_update(self, before, after) -> None:
+        counters = self._guilds.get(after.guild.id)
+        if counters is None:
+            return
+        self._events += 1
+        counters.set_member(after.id, _status_code(after))
+
+    def on_member_update(self, before, after) -> None:
+        counters = self._guilds.get(after.guild.id)
+        if counters is None:
+            return
+        self._events += 1
+        if after.id not in counters.members:
+            counters.set_member(after.id, _status_code(after))
+        if getattr(before, 'timed_out_until', None) != getattr(after, 'timed_out_until', None):
+            counters.set_timeout(after.id, _timeout_expiry(after))
+
+    # ---------- Đọc số liệu ----------
+
+    async def get_member_counts(self, guild) -> dict:
+        """Số member theo trạng thái và bot/người"""
+        counters = await self.get_counters(guild)
+        counts = dict(zip(STATUS_KEYS, counters.status_counts))
+        counts['bots'] = counters.bots
+        counts['humans'] = counters.humans
+        return counts
+
+    async def get_active_timeouts(self, guild) -> List[Tuple[int, datetime]]:
+        """
+        Danh sách member đang bị timeout, sắp xếp theo thời điểm hết hạn
+
+        Returns:
+            list: [(member_id, thời điểm hết hạn)]
+        """
+        counters = await self.get_counters(guild)
+        counters.expire_timeouts(time.time())
+        return [
+            (member_id, datetime.fromtimestamp(expires_at).astimezone())
+            for member_id, expires_at in sorted(counters.timeouts.items(), key=lambda item: item[1])
+        ]
+
+    def get_stats(self) -> dict:
+        """Thống kê tracker"""
+        return {
+            'guilds': len(self._guilds),
+            'members': sum(len(counters.members) for counters in self._guilds.values()),
+            'active_timeouts': sum(len(counters.timeouts) for counters in self._guilds.values()),
+            'events': self._events,
+            'seeds': self._seeds,
+        }
@@ -0,0 +1,181 @@
+"""
+Lifecycle manager - tách việc khởi động 1 lần (lần on_ready đầu tiên) khỏi các lần
+on_ready sau reconnect, chạy startup job trong nền có đo thời gian và trả trạng thái sẵn sàng
+"""
+import asyncio
+import inspect
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StartupJob:
+    """1 job chạy nền sau on_ready (lưu trạng thái + thời gian chạy)"""
+    
+    __slots__ = ('name', 'func', 'state', 'started_at', 'finished_at', 'error', 'task')
+    
+    def __init__(self, name: str, func: Callable):
+        self.name = name
+        self.func = func
+        self.state = 'pending'  # pending -> running -> done | failed
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+    
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return round((end - self.started_at) * 1000, 1)
+    
+    def to_dict(self) -> dict:
+        return {'state': self.state, 'ms': self.duration_ms, 'error': self.error}
+
+
+class LifecycleManager:
+    """
+    Class quản lý vòng đời kết nối của bot
+    
+    on_ready chạy lại sau mỗi lần gateway reconnect (không phải resume), nên:
+    - first_ready hook: chạy đúng 1 lần, tuần tự, phải nhanh (start utility, đăng ký view...)
+    - startup job: chạy 1 lần trong nền sau first_ready hook (sync slash, seed thống kê, in banner...),
+      không chặn xử lý event
+    - reconnect hook: chạy nền mỗi lần on_ready sau lần đầu
+    Trạng thái sẵn sàng (readiness) = đã qua first_ready và đang kết nối gateway.
+    """
+    
+    def __init__(self):
+        self.created_at = time.perf_counter()
+        self._first_ready_hooks: List[Tuple[str, Callable]] = []
+        self._reconnect_hooks: List[Tuple[str, Callable]] = []
+        self.jobs: Dict[str, StartupJob] = {}
+        self.reconnect_jobs: Dict[str, StartupJob] = {}  # Lần chạy gần nhất của mỗi reconnect hook
+        self.first_ready_at: Optional[float] = None
+        self.first_ready_ms: Optional[float] = None  # Thời gian chạy các first_ready hook
+        self.connected = False
+        self.ready_count = 0
+        self.resume_count = 0
+        self.disconnect_count = 0
+        self.last_disconnect_at: Optional[float] = None
+        self._ready_lock = asyncio.Lock()
+    
+    # ---------- Đăng ký ----------
+    
+    def on_first_ready(self, name: str, func: Callable) -> None:
+        """Hook chạy 1 lần ở lần on_ready đầu tiên (sync hoặc async)"""
+        self._first_ready_hooks.append((name, func))
+    
+    def on_reconnect(self, name: str, func: Callable) -> None:
+        """Hook chạy nền ở mỗi lần on_ready sau lần đầu"""
+        self._reconnect_hooks.append((name, func))
+    
+    def add_startup_job(self, name: str, func: Callable) -> StartupJob:
+        """Job chạy nền 1 lần sau first_ready (sync hoặc async, hàm sync nên ngắn vì chạy trong event loop)"""
+        job = self.jobs[name] = StartupJob(name, func)
+        return job
+    
+    # ---------- Gateway events ----------
+    
+    async def handle_ready(self) -> None:
+        """Gọi từ on_ready"""
+        async with self._ready_lock:
+            self.connected = True
+            self.ready_count += 1
+            if self.first_ready_at is not None:
+                logger.info(f"Reconnect lần {self.ready_count - 1}: bỏ qua khởi động, chạy {len(self._reconnect_hooks)} reconnect hook")
+                for name, func in self._reconnect_hooks:
+                    job = self.reconnect_jobs[name] = StartupJob(f"reconnect:{name}", func)
+                    self._spawn(job)
+                return
+            
+            started = time.perf_counter()
+            for name, func in self._first_ready_hooks:
+                hook_started = time.perf_counter()
+                try:
+                    result = func()
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    logger.error(f"Lỗi first_ready hook {name}: {e}")
+                logger.debug(f"first_ready hook {name}: {(time.perf_counter() - hook_started) * 1000:.1f}ms")
+            self.first_ready_at = time.perf_counter()
+            self.first_ready_ms = round((self.first_ready_at - started) * 1000, 1)
+            logger.info(f"Khởi động lần đầu xong trong {self.first_ready_ms}ms, chạy nền {len(self.jobs)} startup job")
+            for job in self.jobs.values():
+                self._spawn(job)
+    
+    def handle_resumed(self) -> None:
+        """Gọi từ on_resumed - session được giữ nên không cần chạy lại gì"""
+        self.connected = True
+        self.resume_count += 1
+    
+    def handle_disconnect(self) -> None:
+        """Gọi từ on_disconnect"""
+        if self.connected:
+            self.disconnect_count += 1
+            self.last_disconnect_at = time.time()
+        self.connected = False
+    
+    # ---------- Job ----------
+    
+    def _spawn(self, job: StartupJob) -> None:
+        job.task = asyncio.create_task(self._run_job(job))
+    
+    async def _run_job(self, job: StartupJob) -> None:
+        job.state = 'running'
+        job.started_at = time.perf_counter()
+        try:
+            result = job.func()
+            if inspect.isawaitable(result):
+                await result
+            job.state = 'done'
+        except Exception as e:
+            job.state = 'failed'
+            job.error = str(e)
+            logger.error(f"Startup job {job.name} lỗi: {e}")
+        finally:
+            job.finished_at = time.perf_counter()
+        logger.info(f"Startup job {job.name}: {job.state} sau {job.duration_ms}ms")
+    
+    # ---------- Readiness ----------
+    
+    def is_ready(self) -> bool:
+        return self.connected and self.first_ready_at is not None
+    
+    @property
+    def phase(self) -> str:
+        if self.first_ready_at is None:
+            return 'starting'
+        if not self.connected:
+            return 'disconnected'
+        if any(job.state in ('pending', 'running') for job in self.jobs.values()):
+            return 'warming'
+        return 'ready'
+    
+    def readiness(self) -> dict:
+        """Probe trạng thái sẵn sàng (dùng cho ;ready và endpoint giám sát)"""
+        return {
+            'ready': self.is_ready(),
+            'phase': self.phase,
+            'uptime_s': round(time.perf_counter() - self.created_at, 1),
+            'first_ready_ms': self.first_ready_ms,
+            'ready_count': self.ready_count,
+            'resumes': self.resume_count,
+            'disconnects': self.disconnect_count,
+            'jobs': {name: job.to_dict() for name, job in self.jobs.items()},
+            'reconnect_jobs': {name: job.to_dict() for name, job in self.reconnect_jobs.items()},
+        }
+    
+    def get_stats(self) -> dict:
+        """Thống kê lifecycle"""
+        return {
+            'phase': self.phase,
+            'ready_count': self.ready_count,
+            'resumes': self.resume_count,
+            'disconnects': self.disconnect_count,
+            'jobs_failed': sum(1 for job in self.jobs.values() if job.state == 'failed'),
+        }
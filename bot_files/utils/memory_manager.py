@@ -8,6 +8,8 @@ from discord.ext import tasks
 from collections import defaultdict, deque
 import logging
 
+from .metrics import PERSISTENCE_FLUSH
+
 logger = logging.getLogger(__name__)
 
 class MemoryManager:
@@ -62,11 +64,6 @@ class MemoryManager:
         for user_id in completed_tasks:
             del self.bot_instance.mute_tasks[user_id]
         
-        # Clear role cache nếu quá lớn
-        if len(self.bot_instance._role_cache) > 50:
-            self.bot_instance._role_cache.clear()
-            logger.info("Cleared role cache due to size limit")
-        
         if expired_cooldowns or expired_users or completed_tasks:
             logger.info(f"Memory cleanup: {len(expired_cooldowns)} cooldowns, {len(expired_users)} user histories, {len(completed_tasks)} tasks")
     
@@ -76,19 +73,15 @@ class MemoryManager:
         if self._pending_saves:
             await self._batch_save_data()
             self._pending_saves = False
+        else:
+            self.bot_instance.warning_engine.maybe_compact()
     
+    @PERSISTENCE_FLUSH.time(store='batch_save')
     async def _batch_save_data(self):
         """Batch save để giảm I/O operations"""
         try:
-            # Convert deque warnings to list for JSON serialization
-            warnings_data = {}
-            for user_id, warnings_deque in self.bot_instance.warnings.items():
-                warnings_data[str(user_id)] = list(warnings_deque)
-            
-            # Save warnings
-            warnings_file = self.bot_instance.config.get('warnings_file', 'warnings.json')
-            with open(warnings_file, 'w', encoding='utf-8') as f:
-                json.dump(warnings_data, f, indent=2, ensure_ascii=False)
+            # Warnings đã ghi log ngay khi warn - chỉ compact khi log quá dài
+            self.bot_instance.warning_engine.maybe_compact()
             
             # Save admin IDs
             admin_data = {
@@ -108,7 +101,7 @@ class MemoryManager:
             with open(priority_file, 'w', encoding='utf-8') as f:
                 json.dump(priority_data, f, indent=2, ensure_ascii=False)
             
-            logger.debug("Batch saved warnings, admin and priority data")
+            logger.debug("Batch saved admin and priority data")
             
         except Exception as e:
             logger.error(f"Error in batch save: {e}")
@@ -128,8 +121,8 @@ class MemoryManager:
             'cooldowns': len(self.bot_instance.cooldowns),
             'user_command_history': len(self.bot_instance.user_command_history),
             'mute_tasks': len(self.bot_instance.mute_tasks),
-            'role_cache': len(self.bot_instance._role_cache),
-            'warnings_users': len(self.bot_instance.warnings),
+            'role_cache': len(self.bot_instance.role_sync),  # LRU, tự giới hạn kích thước
+            'warnings_users': len(self.bot_instance.warning_engine),
             'admin_ids': len(self.bot_instance.admin_ids),
             'priority_users': len(self.bot_instance.priority_users),
             'supreme_admin': 1 if self.bot_instance.supreme_admin_id else 0,
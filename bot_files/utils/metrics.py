@@ -0,0 +1,381 @@
+"""
+Metrics registry - counter/gauge/histogram trong process, export dạng text Prometheus
+qua endpoint HTTP local (/metrics) để vẽ biểu đồ bot khi chạy thật
+"""
+import sys
+import time
+import inspect
+import logging
+import functools
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import aiohttp
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+# Bucket (giây) đủ rộng cho cả event handler vài ms lẫn request AI vài chục giây
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+INF_LABEL = 'le="+Inf"'
+
+# Sample từ collector: (tên, type, help, labels, giá trị)
+Sample = Tuple[str, str, str, Dict[str, str], float]
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    """Gốc chung: 1 metric có tên, help và bộ label cố định, giá trị lưu theo tuple label"""
+    
+    type = 'untyped'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()  # save() có thể chạy trong thread (to_thread)
+    
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} cần label {self.labelnames}, nhận {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Giá trị chỉ tăng"""
+    
+    type = 'counter'
+    
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    """Giá trị tăng/giảm tuỳ ý"""
+    
+    type = 'gauge'
+    
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+    
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+    
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+
+class _Timer:
+    """Đo thời gian 1 khối code (with) hoặc 1 hàm (decorator, sync hoặc async) vào histogram"""
+    
+    __slots__ = ('histogram', 'labels', 'started')
+    
+    def __init__(self, histogram: 'Histogram', labels: Dict[str, object]):
+        self.histogram = histogram
+        self.labels = labels
+        self.started = 0.0
+    
+    def __enter__(self) -> '_Timer':
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+    
+    def __call__(self, func: Callable) -> Callable:
+        histogram, labels = self.histogram, self.labels
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with _Timer(histogram, labels):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Timer(histogram, labels):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+class Histogram(_Metric):
+    """Phân bố giá trị (thời gian tính bằng giây) theo bucket cố định"""
+    
+    type = 'histogram'
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [số đếm riêng từng bucket..., tổng, số lần]
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+    
+    def time(self, **labels) -> _Timer:
+        """with histogram.time(stage='x'): ... hoặc @histogram.time(store='y')"""
+        return _Timer(self, labels)
+    
+    def summary(self, **labels) -> Optional[dict]:
+        """Số lần + thời gian trung bình (ms) của 1 bộ label, None nếu chưa có dữ liệu"""
+        state = self._values.get(self._key(labels))
+        if not state or not state[-1]:
+            return None
+        return {'count': state[-1], 'avg_ms': round(state[-2] / state[-1] * 1000, 1)}
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, INF_LABEL)} {state[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {state[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Class giữ toàn bộ metric của process
+    
+    - counter()/gauge()/histogram() trả về metric có sẵn nếu trùng tên (module nào khai báo trước cũng được)
+    - collector: hàm gọi lúc export, trả về Sample lấy từ get_stats() có sẵn của các utility
+      (không phải cập nhật metric ở mỗi thao tác)
+    """
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Tuple[str, Callable[[], Iterable[Sample]]]] = []
+        self._trace_config: Optional[aiohttp.TraceConfig] = None
+        self._renders = 0
+        self._collector_errors = 0
+    
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs) -> _Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+        # So theo tên class: 2 đường import tạo 2 bản class khác nhau nhưng dùng chung registry
+        elif type(metric).__name__ != cls.__name__ or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric {name} đã được khai báo với kiểu/label khác")
+        return metric
+    
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+    
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+    
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+    
+    def add_collector(self, name: str, func: Callable[[], Iterable[Sample]]) -> None:
+        """Đăng ký (hoặc thay) collector theo tên"""
+        self._collectors = [(key, collector) for key, collector in self._collectors if key != name]
+        self._collectors.append((name, func))
+    
+    def _collect(self) -> List[str]:
+        families: Dict[str, Tuple[str, str, List[str]]] = {}
+        for name, func in self._collectors:
+            try:
+                samples = list(func())
+            except Exception as e:
+                self._collector_errors += 1
+                logger.error(f"Lỗi metrics collector {name}: {e}")
+                continue
+            for metric_name, metric_type, documentation, labels, value in samples:
+                if value is None:
+                    continue
+                family = families.setdefault(metric_name, (metric_type, documentation, []))
+                label_text = _format_labels(list(labels), list(labels.values()))
+                family[2].append(f"{metric_name}{label_text} {_format_value(value)}")
+        lines = []
+        for metric_name, (metric_type, documentation, samples) in families.items():
+            lines.append(f"# HELP {metric_name} {documentation}")
+            lines.append(f"# TYPE {metric_name} {metric_type}")
+            lines.extend(samples)
+        return lines
+    
+    def render(self) -> str:
+        """Text format Prometheus 0.0.4 của toàn bộ metric + collector"""
+        self._renders += 1
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        lines.extend(self._collect())
+        return '\n'.join(lines) + '\n'
+    
+    def http_trace_config(self) -> aiohttp.TraceConfig:
+        """
+        TraceConfig aiohttp ghi thời gian request theo host (dùng chung cho mọi ClientSession:
+        ClientSession(trace_configs=[metrics.http_trace_config()]) và discord.py qua http_trace)
+        """
+        if self._trace_config is not None:
+            return self._trace_config
+        histogram = self.histogram(
+            'bot_http_request_duration_seconds', 'Thời gian HTTP request theo host',
+            ('host', 'method', 'status')
+        )
+        
+        async def on_request_start(session, context, params):
+            context.started = time.perf_counter()
+        
+        async def on_request_end(session, context, params):
+            histogram.observe(time.perf_counter() - context.started,
+                              host=params.url.host, method=params.method, status=params.response.status)
+        
+        async def on_request_exception(session, context, params):
+            histogram.observe(time.perf_counter() - context.started,
+                              host=params.url.host, method=params.method, status='error')
+        
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        self._trace_config = trace_config
+        return trace_config
+    
+    def get_stats(self) -> dict:
+        """Thống kê registry"""
+        return {
+            'metrics': len(self._metrics),
+            'collectors': len(self._collectors),
+            'renders': self._renders,
+            'collector_errors': self._collector_errors,
+        }
+
+
+class MetricsServer:
+    """
+    HTTP server nhỏ (aiohttp.web) chạy trong event loop của bot
+    
+    - /metrics: text Prometheus
+    - /ready: readiness probe (200 khi sẵn sàng, 503 khi chưa), nếu có readiness callback
+    Mặc định chỉ bind 127.0.0.1 - không public ra ngoài
+    """
+    
+    def __init__(self, registry: 'MetricsRegistry', host: str = '127.0.0.1', port: int = 9108,
+                 readiness: Optional[Callable[[], dict]] = None):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.readiness = readiness
+        self._runner: Optional[web.AppRunner] = None
+        self._scrapes = 0
+    
+    @property
+    def running(self) -> bool:
+        return self._runner is not None
+    
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        self._scrapes += 1
+        return web.Response(body=self.registry.render().encode('utf-8'), headers={'Content-Type': CONTENT_TYPE})
+    
+    async def _handle_ready(self, request: web.Request) -> web.Response:
+        probe = self.readiness()
+        return web.json_response(probe, status=200 if probe.get('ready') else 503)
+    
+    async def start(self) -> None:
+        if self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get('/metrics', self._handle_metrics)
+        if self.readiness is not None:
+            app.router.add_get('/ready', self._handle_ready)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, self.host, self.port).start()
+        except OSError:
+            await runner.cleanup()
+            raise
+        self._runner = runner
+        logger.info(f"Metrics endpoint: http://{self.host}:{self.port}/metrics")
+    
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+    
+    def get_stats(self) -> dict:
+        """Thống kê server"""
+        return {
+            'running': self.running,
+            'address': f"{self.host}:{self.port}",
+            'scrapes': self._scrapes,
+        }
+
+
+def _shared_instance() -> MetricsRegistry:
+    """Dùng chung 1 registry cho cả 2 đường import (bot_files.utils.metrics / utils.metrics)"""
+    for module_name in ('bot_files.utils.metrics', 'utils.metrics'):
+        module = sys.modules.get(module_name)
+        if module is not None and module.__dict__.get('metrics') is not None:
+            return module.metrics
+    return MetricsRegistry()
+
+
+# Global instance
+metrics = _shared_instance()
+
+# Metric dùng chung giữa nhiều module
+PERSISTENCE_FLUSH = metrics.histogram(
+    'bot_persistence_flush_seconds', 'Thời gian ghi dữ liệu xuống file', ('store',)
+)
+AI_REQUEST = metrics.histogram(
+    'bot_ai_request_duration_seconds', 'Thời gian gọi AI theo provider', ('provider',)
+)
+AI_ERRORS = metrics.counter('bot_ai_errors_total', 'Số lần gọi AI lỗi theo provider', ('provider',))
@@ -0,0 +1,430 @@
+"""
+Module registry - tải command module theo manifest: module eager khởi tạo lúc start,
+module lazy chỉ đăng ký lệnh stub và được import/khởi tạo khi dùng lần đầu hoặc khi warm-up nền,
+reload nóng module đã tải (;reload) mà không cần khởi động lại bot
+"""
+import asyncio
+import importlib
+import json
+import os
+import sys
+import time
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import discord
+from discord.ext import commands
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'commands', 'manifest.json')
+MODULE_PACKAGE = 'bot_files.commands'
+WARMUP_DELAY = 5.0  # Giây sau on_ready mới bắt đầu warm-up (nhường gateway/slash sync)
+WARMUP_GAP = 0.05  # Nghỉ giữa 2 module khi warm-up
+
+
+class ModuleSpec:
+    """1 dòng manifest: module, class, tên thuộc tính trên bot, lazy, {lệnh: [alias]}"""
+    
+    __slots__ = ('name', 'class_name', 'attr', 'lazy', 'commands')
+    
+    def __init__(self, name: str, class_name: str, attr: Optional[str] = None, lazy: bool = False,
+                 commands: Optional[Dict[str, List[str]]] = None):
+        self.name = name
+        self.class_name = class_name
+        self.attr = attr or name
+        self.lazy = lazy
+        self.commands = commands or {}
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ModuleSpec':
+        return cls(data['module'], data['class'], data.get('attr'), data.get('lazy', False), data.get('commands', {}))
+
+
+class StartupProfiler:
+    """Ghi thời gian import/khởi tạo của từng module"""
+    
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.ready_at: Optional[float] = None
+        self.records: Dict[str, dict] = {}  # module -> {'phase', 'import_ms', 'init_ms', 'commands'[, 'reload_ms']}
+    
+    def record(self, module: str, phase: str, import_seconds: float, init_seconds: float, command_count: int) -> None:
+        if phase == 'reload' and module in self.records:
+            # Giữ số liệu lúc khởi động (eager_ms không bị mất sau ;reload), chỉ ghi thêm lần reload gần nhất
+            self.records[module] = dict(
+                self.records[module],
+                reload_ms=round((import_seconds + init_seconds) * 1000, 1),
+                commands=command_count
+            )
+            return
+        self.records[module] = {
+            'phase': phase,
+            'import_ms': round(import_seconds * 1000, 1),
+            'init_ms': round(init_seconds * 1000, 1),
+            'commands': command_count,
+        }
+    
+    def mark_ready(self) -> None:
+        if self.ready_at is None:
+            self.ready_at = time.perf_counter()
+    
+    @property
+    def startup_ms(self) -> float:
+        end = self.ready_at if self.ready_at is not None else time.perf_counter()
+        return round((end - self.started_at) * 1000, 1)
+    
+    def total_ms(self, phase: Optional[str] = None) -> float:
+        return round(sum(
+            record['import_ms'] + record['init_ms'] for record in self.records.values()
+            if phase is None or record['phase'] == phase
+        ), 1)
+    
+    def report(self, limit: int = 10) -> List[str]:
+        """Các module tốn thời gian nhất (import + khởi tạo)"""
+        slowest = sorted(self.records.items(), key=lambda item: item[1]['import_ms'] + item[1]['init_ms'], reverse=True)
+        return [
+            f"{module:<30} {record['phase']:<7} import {record['import_ms']:>8.1f}ms  init {record['init_ms']:>8.1f}ms  ({record['commands']} lệnh)"
+            for module, record in slowest[:limit]
+        ]
+
+
+class Registrations:
+    """Những gì 1 module đã đăng ký lên bot: lệnh prefix, slash command, listener, persistent view"""
+    
+    __slots__ = ('commands', 'app_commands', 'listeners', 'views')
+    
+    def __init__(self, commands=(), app_commands=(), listeners=(), views=()):
+        self.commands = list(commands)
+        self.app_commands = list(app_commands)
+        self.listeners: List[Tuple[str, object]] = list(listeners)  # (tên event, hàm)
+        self.views = list(views)
+    
+    def __len__(self) -> int:
+        return len(self.commands) + len(self.app_commands) + len(self.listeners) + len(self.views)
+
+
+class ModuleRegistry:
+    """
+    Class quản lý command module theo manifest
+    
+    Module lazy chỉ có lệnh stub trên bot. Khi stub được gọi: import module trong thread
+    (không chặn event loop), khởi tạo class, gỡ stub rồi chạy lại lệnh thật bằng
+    ctx.reinvoke() - global check đã chạy cho stub nên không tính rate limit 2 lần.
+    
+    Reload nóng: gỡ mọi thứ module đã đăng ký (ghi lại lúc _load), importlib.reload rồi khởi tạo
+    lại. State trong RAM chuyển sang instance mới qua hợp đồng tùy chọn của command class:
+    - snapshot() -> dict: lấy state cần giữ (ván game đang chạy, job nền...) từ instance cũ
+    - unload(): dừng task nền của instance cũ (gọi sau snapshot)
+    - restore(state): nhận state ở instance mới (gọi sau register_commands)
+    Dữ liệu trên đĩa không bị đụng tới. Reload lỗi thì đăng ký lại instance cũ.
+    """
+    
+    def __init__(self, bot_instance, manifest_file: str = MANIFEST_FILE):
+        self.bot_instance = bot_instance
+        self.bot = bot_instance.bot
+        self.manifest_file = manifest_file
+        self.specs: Dict[str, ModuleSpec] = {}
+        self.instances: Dict[str, object] = {}
+        self.profiler = StartupProfiler()
+        self._stubs: Dict[str, List[str]] = {}  # module -> tên lệnh stub đã đăng ký
+        self._owned: Dict[str, Registrations] = {}  # module đã tải -> những gì nó đăng ký
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._warmup_task: Optional[asyncio.Task] = None
+        self._lazy_loads = 0
+        self._reloads = 0
+        self._reload_failures = 0
+        self.load_manifest()
+    
+    def load_manifest(self) -> None:
+        with open(self.manifest_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.specs = {}
+        for item in data['modules']:
+            spec = ModuleSpec.from_dict(item)
+            self.specs[spec.name] = spec
+    
+    # ---------- Khởi động ----------
+    
+    def setup(self) -> None:
+        """Khởi tạo module eager và đăng ký stub cho module lazy (theo thứ tự manifest)"""
+        for spec in self.specs.values():
+            if spec.lazy:
+                self._install_stubs(spec)
+            else:
+                import_started = time.perf_counter()
+                module = importlib.import_module(f"{MODULE_PACKAGE}.{spec.name}")
+                self._load(spec, 'eager', module, import_started)
+        
+        eager = sum(1 for spec in self.specs.values() if not spec.lazy)
+        logger.info(
+            f"Đã khởi tạo {eager} module eager trong {self.profiler.total_ms('eager')}ms, "
+            f"{len(self.specs) - eager} module lazy chờ dùng lần đầu"
+        )
+        for line in self.profiler.report(5):
+            logger.info(f"  {line}")
+    
+    def _load(self, spec: ModuleSpec, phase: str, module, import_started: float, state: Optional[dict] = None):
+        """Khởi tạo class của module đã import và gắn instance lên bot (state: dữ liệu restore khi reload)"""
+        import_seconds = time.perf_counter() - import_started
+        init_started = time.perf_counter()
+        before = set(self.bot.all_commands)
+        registrations = self._capture()
+        try:
+            instance = getattr(module, spec.class_name)(self.bot_instance)
+            instance.register_commands()
+            if state is not None and hasattr(instance, 'restore'):
+                instance.restore(state)
+        except Exception:
+            # Gỡ phần đã kịp đăng ký để lần thử sau (hoặc rollback reload) không bị trùng lệnh
+            self._unregister(self._diff(registrations))
+            raise
+        setattr(self.bot_instance, spec.attr, instance)
+        self.instances[spec.name] = instance
+        self._owned[spec.name] = self._diff(registrations)
+        registered = {name for name in self.bot.all_commands if name not in before}
+        self.profiler.record(spec.name, phase, import_seconds, time.perf_counter() - init_started, len(registered))
+        
+        declared = set(spec.commands) | {alias for aliases in spec.commands.values() for alias in aliases}
+        if registered != declared:
+            logger.warning(
+                f"Manifest của {spec.name} không khớp lệnh thực tế (thiếu {sorted(registered - declared)}, "
+                f"thừa {sorted(declared - registered)}) - chạy scripts/build_command_manifest.py"
+            )
+        return instance
+    
+    # ---------- Theo dõi đăng ký ----------
+    
+    def _capture(self) -> Registrations:
+        """Chụp lại các đăng ký hiện có trên bot (để diff sau khi khởi tạo module)"""
+        return Registrations(
+            {id(command) for command in self.bot.commands},
+            {id(command) for command in self.bot.tree.get_commands()},
+            {id(listener) for listeners in self.bot.extra_events.values() for listener in listeners},
+            {id(view) for view in self.bot.persistent_views},
+        )
+    
+    def _diff(self, before: Registrations) -> Registrations:
+        """Những đăng ký mới xuất hiện so với lần chụp before"""
+        commands_before, app_before = set(before.commands), set(before.app_commands)
+        listeners_before, views_before = set(before.listeners), set(before.views)
+        return Registrations(
+            [command for command in self.bot.commands if id(command) not in commands_before],
+            [command for command in self.bot.tree.get_commands() if id(command) not in app_before],
+            [
+                (event, listener) for event, listeners in self.bot.extra_events.items()
+                for listener in listeners if id(listener) not in listeners_before
+            ],
+            [view for view in self.bot.persistent_views if id(view) not in views_before],
+        )
+    
+    def _unregister(self, registrations: Registrations) -> None:
+        for command in registrations.commands:
+            if self.bot.all_commands.get(command.name) is command:
+                self.bot.remove_command(command.name)
+        for command in registrations.app_commands:
+            self.bot.tree.remove_command(command.name, type=getattr(command, 'type', discord.AppCommandType.chat_input))
+        for event, listener in registrations.listeners:
+            self.bot.remove_listener(listener, event)
+        for view in registrations.views:
+            view.stop()  # View đã stop tự gỡ khỏi view store
+    
+    def _reregister(self, registrations: Registrations) -> None:
+        """Đăng ký lại đúng các object cũ (rollback khi reload lỗi)"""
+        for command in registrations.commands:
+            self.bot.add_command(command)
+        for command in registrations.app_commands:
+            self.bot.tree.add_command(command, override=True)
+        for event, listener in registrations.listeners:
+            self.bot.add_listener(listener, event)
+        for view in registrations.views:
+            # View đã stop không dispatch được nữa nên chỉ ghi cảnh báo
+            logger.warning(f"Persistent view {type(view).__name__} không khôi phục được khi rollback")
+    
+    # ---------- Lazy ----------
+    
+    def _install_stubs(self, spec: ModuleSpec) -> None:
+        names = []
+        for name, aliases in spec.commands.items():
+            if self.bot.get_command(name) is not None:
+                logger.warning(f"Lệnh {name} của {spec.name} trùng với lệnh đã có, bỏ qua stub")
+                continue
+            self.bot.add_command(commands.Command(
+                self._make_stub(spec.name),
+                name=name,
+                aliases=list(aliases),
+                help=f"(Module {spec.name} sẽ được tải khi dùng lần đầu)"
+            ))
+            names.append(name)
+        self._stubs[spec.name] = names
+    
+    def _remove_stubs(self, module_name: str) -> None:
+        for name in self._stubs.pop(module_name, []):
+            self.bot.remove_command(name)
+    
+    def _make_stub(self, module_name: str):
+        async def lazy_command_stub(ctx):
+            instance = await self.ensure_loaded(module_name)
+            command = self.bot.get_command(ctx.invoked_with) if instance is not None else None
+            if command is None or command.callback is lazy_command_stub:
+                await ctx.reply("❌ Lệnh tạm thời không khả dụng, vui lòng thử lại sau!", mention_author=True)
+                return
+            ctx.command = command
+            try:
+                await ctx.reinvoke(restart=True)
+            except commands.CommandError as e:
+                self.bot.dispatch('command_error', ctx, e)
+        return lazy_command_stub
+    
+    def is_loaded(self, module_name: str) -> bool:
+        return module_name in self.instances
+    
+    async def ensure_loaded(self, module_name: str, phase: str = 'lazy'):
+        """
+        Import + khởi tạo module nếu chưa có (phase: 'lazy' = dùng lần đầu, 'warmup' = nạp nền)
+        
+        Returns:
+            Instance của module, None nếu tải lỗi (stub được giữ lại để lần sau thử lại)
+        """
+        instance = self.instances.get(module_name)
+        if instance is not None:
+            return instance
+        
+        lock = self._locks.setdefault(module_name, asyncio.Lock())
+        async with lock:
+            if module_name in self.instances:
+                return self.instances[module_name]
+            spec = self.specs[module_name]
+            import_started = time.perf_counter()
+            try:
+                module = await asyncio.to_thread(importlib.import_module, f"{MODULE_PACKAGE}.{spec.name}")
+                self._remove_stubs(spec.name)
+                instance = self._load(spec, phase, module, import_started)
+            except Exception as e:
+                logger.error(f"Lỗi khi tải module {module_name}: {e}")
+                if spec.name not in self._stubs:
+                    self._install_stubs(spec)
+                return None
+            self._lazy_loads += 1
+            logger.info(f"Đã tải module lazy {module_name} ({self.profiler.records[module_name]})")
+            return instance
+    
+    # ---------- Reload ----------
+    
+    def resolve(self, name: str) -> Optional[str]:
+        """Tên module trong manifest từ tên người dùng nhập ('shop' hoặc 'shop_commands')"""
+        name = name.lower().strip()
+        for candidate in (name, f"{name}_commands"):
+            if candidate in self.specs:
+                return candidate
+        return None
+    
+    async def reload(self, module_name: str) -> dict:
+        """
+        Reload nóng 1 module
+        
+        Module lazy chưa tải thì chỉ tải lần đầu (không có gì để reload).
+        
+        Returns:
+            dict: {'module', 'ms', 'action' ('reload'|'load'), 'ok', 'error', 'state', 'app_commands'}
+        """
+        spec = self.specs[module_name]
+        if module_name not in self.instances:
+            started = time.perf_counter()
+            instance = await self.ensure_loaded(module_name)
+            return {
+                'module': module_name, 'action': 'load', 'ok': instance is not None,
+                'ms': round((time.perf_counter() - started) * 1000, 1),
+                'error': None if instance is not None else 'import lỗi (xem log)',
+                'state': False, 'app_commands': 0,
+            }
+        
+        lock = self._locks.setdefault(module_name, asyncio.Lock())
+        async with lock:
+            started = time.perf_counter()
+            old_instance = self.instances[module_name]
+            old_record = self.profiler.records.get(module_name)
+            
+            # snapshot() chạy trước khi gỡ gì: lỗi ở đây thì bỏ reload, module cũ vẫn nguyên
+            try:
+                state = old_instance.snapshot() if hasattr(old_instance, 'snapshot') else None
+            except Exception as e:
+                self._reload_failures += 1
+                logger.error(f"Lỗi snapshot module {module_name}, hủy reload: {e}")
+                return {'module': module_name, 'action': 'reload', 'ok': False, 'ms': 0.0,
+                        'error': f"snapshot: {e}", 'state': False, 'app_commands': 0}
+            
+            owned = self._owned.pop(module_name, Registrations())
+            self._unregister(owned)
+            if hasattr(old_instance, 'unload'):
+                try:
+                    old_instance.unload()
+                except Exception as e:
+                    logger.error(f"Lỗi unload module {module_name}: {e}")
+            
+            import_started = time.perf_counter()
+            try:
+                module = importlib.reload(sys.modules[f"{MODULE_PACKAGE}.{spec.name}"])
+                self._load(spec, 'reload', module, import_started, state)
+            except Exception as e:
+                self._reregister(owned)
+                self._owned[module_name] = owned
+                self.instances[module_name] = old_instance
+                setattr(self.bot_instance, spec.attr, old_instance)
+                if old_record is not None:
+                    self.profiler.records[module_name] = old_record
+                if state is not None and hasattr(old_instance, 'restore'):
+                    old_instance.restore(state)  # Trả lại task nền đã dừng ở unload()
+                self._reload_failures += 1
+                logger.error(f"Reload module {module_name} lỗi, giữ bản cũ: {e}")
+                return {'module': module_name, 'action': 'reload', 'ok': False,
+                        'ms': round((time.perf_counter() - started) * 1000, 1),
+                        'error': str(e), 'state': state is not None, 'app_commands': 0}
+            
+            self.bot_instance.refresh_auth_index()
+            self._reloads += 1
+            elapsed = round((time.perf_counter() - started) * 1000, 1)
+            logger.info(f"Đã reload module {module_name} trong {elapsed}ms (state: {state is not None})")
+            return {
+                'module': module_name, 'action': 'reload', 'ok': True, 'ms': elapsed, 'error': None,
+                'state': state is not None, 'app_commands': len(self._owned[module_name].app_commands),
+            }
+    
+    async def reload_all(self) -> List[dict]:
+        """Reload mọi module đã tải theo thứ tự manifest (module lazy chưa dùng giữ nguyên stub)"""
+        results = []
+        for module_name in list(self.specs):
+            if module_name in self.instances:
+                results.append(await self.reload(module_name))
+        return results
+    
+    def owned(self, module_name: str) -> Registrations:
+        return self._owned.get(module_name, Registrations())
+    
+    def start_warmup(self, delay: float = WARMUP_DELAY) -> None:
+        """Tải dần các module lazy còn lại trong nền (gọi từ on_ready)"""
+        self.profiler.mark_ready()
+        if self._warmup_task is None or self._warmup_task.done():
+            self._warmup_task = asyncio.create_task(self._warmup(delay))
+    
+    async def _warmup(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        started = time.perf_counter()
+        pending = [name for name, spec in self.specs.items() if spec.lazy and name not in self.instances]
+        for module_name in pending:
+            await self.ensure_loaded(module_name, 'warmup')
+            await asyncio.sleep(WARMUP_GAP)
+        logger.info(f"Warm-up xong {len(pending)} module lazy trong {(time.perf_counter() - started) * 1000:.0f}ms")
+    
+    def get_stats(self) -> dict:
+        """Thống kê module"""
+        return {
+            'modules': len(self.specs),
+            'loaded': len(self.instances),
+            'pending_lazy': sum(1 for name, spec in self.specs.items() if spec.lazy and name not in self.instances),
+            'lazy_loads': self._lazy_loads,
+            'reloads': self._reloads,
+            'reload_failures': self._reload_failures,
+            'eager_ms': self.profiler.total_ms('eager'),
+            'startup_ms': self.profiler.startup_ms,
+        }
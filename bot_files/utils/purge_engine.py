@@ -0,0 +1,258 @@
+"""
+Purge engine - xóa tin nhắn hàng loạt: quét lịch sử song song với bulk delete
+(tối đa 100 tin/lần), tin nhắn quá 14 ngày chuyển sang worker xóa từng tin có giãn cách
+"""
+import asyncio
+import re
+import time
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Iterable, Optional
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+BULK_DELETE_MAX = 100  # Giới hạn của Discord cho 1 lần bulk delete
+BULK_DELETE_MAX_AGE = timedelta(days=14) - timedelta(minutes=5)  # Chừa biên an toàn
+SINGLE_DELETE_INTERVAL = 1.0  # Giây giữa 2 lần xóa từng tin nhắn cũ
+
+ProgressCallback = Callable[['PurgeResult'], Awaitable[None]]
+
+
+class PurgeFilter:
+    """
+    Bộ lọc tin nhắn áp dụng ngay trong lúc quét lịch sử
+    
+    Khoảng thời gian (after/before) được truyền thẳng vào channel.history nên
+    không tốn request cho tin nhắn ngoài khoảng.
+    """
+    
+    __slots__ = ('user_ids', 'bots_only', 'pattern', 'attachments_only', 'after', 'before')
+    
+    def __init__(self, user_ids: Iterable[int] = (), bots_only: bool = False, pattern: Optional[str] = None,
+                 attachments_only: bool = False, after: Optional[datetime] = None, before: Optional[datetime] = None):
+        self.user_ids = frozenset(user_ids)
+        self.bots_only = bots_only
+        self.pattern = re.compile(pattern, re.IGNORECASE) if pattern else None  # re.error nếu regex sai
+        self.attachments_only = attachments_only
+        self.after = after
+        self.before = before
+    
+    @property
+    def is_empty(self) -> bool:
+        return not (self.user_ids or self.bots_only or self.pattern or self.attachments_only)
+    
+    def matches(self, message) -> bool:
+        if self.user_ids and message.author.id not in self.user_ids:
+            return False
+        if self.bots_only and not message.author.bot:
+            return False
+        if self.attachments_only and not message.attachments:
+            return False
+        if self.pattern is not None and not self.pattern.search(message.content or ''):
+            return False
+        return True
+    
+    def describe(self) -> str:
+        """Mô tả bộ lọc để hiển thị trong embed"""
+        parts = []
+        if self.user_ids:
+            parts.append(', '.join(f"<@{user_id}>" for user_id in self.user_ids))
+        if self.bots_only:
+            parts.append("chỉ bot")
+        if self.pattern is not None:
+            parts.append(f"regex `{self.pattern.pattern}`")
+        if self.attachments_only:
+            parts.append("có file đính kèm")
+        if self.after:
+            parts.append(f"sau <t:{int(self.after.timestamp())}:R>")
+        if self.before:
+            parts.append(f"trước <t:{int(self.before.timestamp())}:R>")
+        return ' • '.join(parts) or "Tất cả tin nhắn"
+
+
+class PurgeResult:
+    """Kết quả (và tiến độ) 1 lượt purge"""
+    
+    __slots__ = ('scanned', 'matched', 'bulk_deleted', 'single_deleted', 'failed', 'old_limit_reached',
+                 'started_at', 'finished_at')
+    
+    def __init__(self):
+        self.scanned = 0
+        self.matched = 0
+        self.bulk_deleted = 0
+        self.single_deleted = 0
+        self.failed = 0
+        self.old_limit_reached = False  # Dừng quét vì đã đủ số tin nhắn cũ được phép xóa
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+    
+    @property
+    def deleted(self) -> int:
+        return self.bulk_deleted + self.single_deleted
+    
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+    
+    @property
+    def messages_per_second(self) -> float:
+        return self.deleted / self.elapsed if self.elapsed > 0 else 0.0
+    
+    def to_dict(self) -> dict:
+        return {
+            'scanned': self.scanned,
+            'matched': self.matched,
+            'bulk_deleted': self.bulk_deleted,
+            'single_deleted': self.single_deleted,
+            'failed': self.failed,
+            'old_limit_reached': self.old_limit_reached,
+            'elapsed': round(self.elapsed, 2),
+            'messages_per_second': round(self.messages_per_second, 1),
+        }
+
+
+class PurgeEngine:
+    """
+    Class xóa tin nhắn hàng loạt theo pipeline
+    
+    - Scanner: duyệt channel.history (Discord phân trang 100 tin/request), lọc,
+      gom tin nhắn dưới 14 ngày thành batch 100 và đẩy vào hàng đợi bulk.
+    - Bulk worker: gọi delete_messages cho từng batch trong khi scanner quét tiếp.
+    - Old worker: tin nhắn quá 14 ngày (hoặc batch bị từ chối) xóa từng tin,
+      giãn cách SINGLE_DELETE_INTERVAL giây để không dính rate limit.
+    """
+    
+    def __init__(self, single_delete_interval: float = SINGLE_DELETE_INTERVAL, progress_interval: float = 3.0):
+        self.single_delete_interval = single_delete_interval
+        self.progress_interval = progress_interval
+        self._runs = 0
+        self._total_deleted = 0
+        self._total_elapsed = 0.0
+    
+    async def purge(self, channel, limit: Optional[int] = None, message_filter: Optional[PurgeFilter] = None,
+                    max_matches: Optional[int] = None, max_old: Optional[int] = None,
+                    skip_ids: Iterable[int] = (), on_progress: Optional[ProgressCallback] = None) -> PurgeResult:
+        """
+        Xóa tin nhắn trong kênh
+        
+        Args:
+            channel: Kênh cần xóa
+            limit: Số tin nhắn quét tối đa (None = toàn bộ lịch sử)
+            message_filter: Bộ lọc (None = xóa tất cả)
+            max_matches: Dừng khi đã khớp đủ số tin nhắn này
+            max_old: Số tin nhắn quá 14 ngày tối đa được xóa từng tin (None = không giới hạn,
+                0 = không xóa tin cũ). Đạt giới hạn thì dừng quét vì phần còn lại đều cũ hơn
+            skip_ids: ID tin nhắn không xóa (vd: tin nhắn tiến độ)
+            on_progress: Coroutine nhận PurgeResult, gọi định kỳ
+        
+        Returns:
+            PurgeResult: Thống kê, gồm tốc độ xóa (tin nhắn/giây)
+        """
+        self._runs += 1
+        result = PurgeResult()
+        message_filter = message_filter or PurgeFilter()
+        skip_ids = set(skip_ids)
+        bulk_queue: asyncio.Queue = asyncio.Queue(maxsize=2)  # Scanner chỉ đi trước tối đa 2 batch
+        old_queue: asyncio.Queue = asyncio.Queue()
+        
+        async def scanner():
+            cutoff = datetime.now(timezone.utc) - BULK_DELETE_MAX_AGE
+            batch = []
+            old_count = 0
+            try:
+                async for message in channel.history(limit=limit, after=message_filter.after,
+                                                     before=message_filter.before, oldest_first=False):
+                    result.scanned += 1
+                    if message.id in skip_ids or not message_filter.matches(message):
+                        continue
+                    if message.created_at < cutoff and max_old is not None and old_count >= max_old:
+                        # Lịch sử duyệt từ mới đến cũ nên các tin còn lại đều quá 14 ngày
+                        result.old_limit_reached = True
+                        break
+                    result.matched += 1
+                    if message.created_at < cutoff:
+                        old_count += 1
+                        await old_queue.put(message)
+                    else:
+                        batch.append(message)
+                        if len(batch) >= BULK_DELETE_MAX:
+                            await bulk_queue.put(batch)
+                            batch = []
+                    if max_matches and result.matched >= max_matches:
+                        break
+                if batch:
+                    await bulk_queue.put(batch)
+            finally:
+                await bulk_queue.put(None)
+        
+        async def bulk_worker():
+            while True:
+                batch = await bulk_queue.get()
+                if batch is None:
+                    break
+                try:
+                    if len(batch) == 1:
+                        await batch[0].delete()
+                    else:
+                        await channel.delete_messages(batch)
+                    result.bulk_deleted += len(batch)
+                except discord.NotFound:
+                    # 1 tin trong batch đã bị xóa - chuyển cả batch sang xóa từng tin
+                    for message in batch:
+                        await old_queue.put(message)
+                except Exception as e:
+                    # Lỗi gì cũng phải tiếp tục lấy batch, nếu không scanner kẹt ở bulk_queue.put
+                    logger.warning(f"Bulk delete thất bại ({e}), chuyển {len(batch)} tin nhắn sang xóa từng tin")
+                    for message in batch:
+                        await old_queue.put(message)
+            await old_queue.put(None)
+        
+        async def old_worker():
+            while True:
+                message = await old_queue.get()
+                if message is None:
+                    break
+                try:
+                    await message.delete()
+                    result.single_deleted += 1
+                except discord.NotFound:
+                    pass  # Đã bị xóa
+                except Exception as e:
+                    result.failed += 1
+                    logger.warning(f"Không xóa được tin nhắn {message.id}: {e}")
+                await asyncio.sleep(self.single_delete_interval)
+        
+        async def report_progress():
+            while True:
+                await asyncio.sleep(self.progress_interval)
+                try:
+                    await on_progress(result)
+                except Exception as e:
+                    logger.warning(f"Không cập nhật được tiến độ purge: {e}")
+        
+        reporter = asyncio.create_task(report_progress()) if on_progress else None
+        tasks = [asyncio.create_task(coro) for coro in (scanner(), bulk_worker(), old_worker())]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # 1 task lỗi (vd: không có quyền đọc lịch sử) thì dừng luôn các task còn lại
+            for task in tasks:
+                task.cancel()
+            if reporter:
+                reporter.cancel()
+            result.finished_at = time.monotonic()
+            self._total_deleted += result.deleted
+            self._total_elapsed += result.elapsed
+        
+        logger.info(f"Purge {getattr(channel, 'name', channel)}: {result.to_dict()}")
+        return result
+    
+    def get_stats(self) -> dict:
+        """Thống kê engine"""
+        return {
+            'runs': self._runs,
+            'total_deleted': self._total_deleted,
+            'avg_messages_per_second': round(self._total_deleted / self._total_elapsed, 1) if self._total_elapsed else 0.0,
+        }
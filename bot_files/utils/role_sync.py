@@ -0,0 +1,358 @@
+"""
+Role sync - đồng bộ role của member theo rule: tính role mong muốn, so với trạng thái
+guild đang cache rồi thêm/bớt role theo lô có giới hạn tốc độ trong 1 task nền
+"""
+import asyncio
+import itertools
+import json
+import os
+import time
+import logging
+from collections import OrderedDict, deque
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+ROLE_CACHE_SIZE = 256  # Số (guild, tên role) giữ trong LRU cache
+OPS_PER_SECOND = 5.0  # Tốc độ add/remove role tối đa (Discord giới hạn theo route member)
+BATCH_SIZE = 10
+MAX_ATTEMPTS = 3
+JOB_HISTORY = 20  # Số job gần nhất giữ lại để xem tiến độ
+
+
+class RoleRule:
+    """
+    Rule đồng bộ 1 role
+    
+    desired(member) -> bool quyết định member có nên giữ role không. Rule không có
+    desired thì dùng danh sách member đã đăng ký (track) và chỉ thêm, không gỡ.
+    """
+    
+    __slots__ = ('key', 'role_name', 'desired', 'remove', 'color', 'reason', 'on_create')
+    
+    def __init__(self, key: str, role_name: str, desired: Optional[Callable] = None, remove: bool = True,
+                 color: Optional[discord.Color] = None, reason: str = '', on_create: Optional[Callable] = None):
+        self.key = key
+        self.role_name = role_name
+        self.desired = desired
+        self.remove = remove and desired is not None
+        self.color = color
+        self.reason = reason or f"Role sync: {key}"
+        self.on_create = on_create  # async (guild, role) - thiết lập quyền sau khi tạo role
+    
+    @property
+    def tracked(self) -> bool:
+        return self.desired is None
+
+
+class SyncJob:
+    """Tiến độ 1 lần đồng bộ/gán role hàng loạt"""
+    
+    __slots__ = ('id', 'guild_id', 'label', 'total', 'added', 'removed', 'skipped', 'failed', 'created_at', 'finished_at')
+    
+    def __init__(self, job_id: int, guild_id: int, label: str, total: int):
+        self.id = job_id
+        self.guild_id = guild_id
+        self.label = label
+        self.total = total
+        self.added = 0
+        self.removed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None if total else self.created_at
+    
+    @property
+    def processed(self) -> int:
+        return self.added + self.removed + self.skipped + self.failed
+    
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+    
+    def _record(self, result: str) -> None:
+        setattr(self, result, getattr(self, result) + 1)
+        if self.processed >= self.total:
+            self.finished_at = time.time()
+    
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'guild_id': self.guild_id,
+            'label': self.label,
+            'total': self.total,
+            'added': self.added,
+            'removed': self.removed,
+            'skipped': self.skipped,
+            'failed': self.failed,
+            'done': self.done,
+        }
+
+
+class RoleSyncService:
+    """
+    Class đồng bộ role cho member
+    
+    - Role tra theo (guild_id, tên) qua LRU cache lưu role ID, resolve lại bằng
+      guild.get_role() nên không giữ object Role cũ
+    - reconcile()/assign() chỉ tính chênh lệch từ member.roles đã cache (không gọi API)
+      rồi xếp thao tác vào hàng đợi; 1 task nền thực hiện theo lô BATCH_SIZE, tối đa
+      OPS_PER_SECOND thao tác/giây, lỗi HTTP thì thử lại với backoff
+    - Rule dạng track lưu danh sách member đã nhận role vào members_file để khôi phục
+      khi role bị xóa/tạo lại
+    """
+    
+    def __init__(self, bot_instance, members_file: str = 'data/role_members.json',
+                 cache_size: int = ROLE_CACHE_SIZE, ops_per_second: float = OPS_PER_SECOND):
+        self.bot_instance = bot_instance
+        self.members_file = members_file
+        self.cache_size = cache_size
+        self.ops_per_second = ops_per_second
+        self.rules: Dict[str, RoleRule] = {}
+        self._roles: 'OrderedDict[Tuple[int, str], int]' = OrderedDict()
+        self._tracked: Dict[str, Dict[int, Set[int]]] = {}  # rule -> guild_id -> {member_id}
+        self._queue: deque = deque()  # (job, guild, role_id, member_id, add, attempt)
+        self._jobs: 'OrderedDict[int, SyncJob]' = OrderedDict()
+        self._job_ids = itertools.count(1)
+        self._worker_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._applied = 0
+        self._failed = 0
+        self.load_members()
+    
+    # ---------- Rule / member đã đăng ký ----------
+    
+    def register_rule(self, key: str, role_name: str, desired: Optional[Callable] = None, **options) -> RoleRule:
+        """Đăng ký rule (xem RoleRule)"""
+        rule = self.rules[key] = RoleRule(key, role_name, desired, **options)
+        return rule
+    
+    def load_members(self) -> None:
+        try:
+            if os.path.exists(self.members_file):
+                with open(self.members_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self._tracked = {
+                    rule_key: {int(guild_id): set(member_ids) for guild_id, member_ids in guilds.items()}
+                    for rule_key, guilds in data.items()
+                }
+        except Exception as e:
+            logger.error(f"Lỗi khi tải danh sách member role sync: {e}")
+    
+    def save_members(self) -> None:
+        """Lưu danh sách member đã đăng ký (ghi atomic)"""
+        try:
+            os.makedirs(os.path.dirname(self.members_file) or '.', exist_ok=True)
+            data = {
+                rule_key: {str(guild_id): sorted(member_ids) for guild_id, member_ids in guilds.items() if member_ids}
+                for rule_key, guilds in self._tracked.items()
+            }
+            tmp_file = f"{self.members_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_file, self.members_file)
+        except Exception as e:
+            logger.error(f"Lỗi khi lưu danh sách member role sync: {e}")
+    
+    def track(self, rule_key: str, guild_id: int, member_id: int) -> None:
+        """Ghi nhận member đã nhận role của rule dạng track"""
+        members = self._tracked.setdefault(rule_key, {}).setdefault(guild_id, set())
+        if member_id not in members:
+            members.add(member_id)
+            self.save_members()
+    
+    # ---------- Role cache ----------
+    
+    async def get_role(self, guild: discord.Guild, role_name: str, create: bool = False,
+                       color: Optional[discord.Color] = None, reason: Optional[str] = None,
+                       on_create: Optional[Callable] = None) -> Optional[discord.Role]:
+        """
+        Lấy role theo tên qua LRU cache, tạo mới nếu create=True và server chưa có
+        
+        Returns:
+            Optional[discord.Role]: None nếu không có role và không tạo được
+        """
+        key = (guild.id, role_name)
+        role_id = self._roles.get(key)
+        if role_id is not None:
+            role = guild.get_role(role_id)
+            if role is not None and role.name == role_name:
+                self._roles.move_to_end(key)
+                self._cache_hits += 1
+                return role
+            del self._roles[key]  # Role đã bị xóa/đổi tên
+        
+        self._cache_misses += 1
+        role = discord.utils.get(guild.roles, name=role_name)
+        if role is None and create:
+            try:
+                role = await guild.create_role(
+                    name=role_name,
+                    color=color or discord.Color.default(),
+                    reason=reason or f"Auto-created role {role_name}"
+                )
+                logger.info(f"Đã tạo role '{role_name}' trong {guild.name}")
+                if on_create is not None:
+                    await on_create(guild, role)
+            except discord.Forbidden:
+                logger.warning(f"Không có quyền tạo role '{role_name}' trong {guild.name}")
+                return None
+        if role is None:
+            return None
+        
+        self._roles[key] = role.id
+        if len(self._roles) > self.cache_size:
+            self._roles.popitem(last=False)
+        return role
+    
+    async def get_rule_role(self, guild: discord.Guild, rule_key: str, create: bool = True) -> Optional[discord.Role]:
+        rule = self.rules[rule_key]
+        return await self.get_role(guild, rule.role_name, create, rule.color, rule.reason, rule.on_create)
+    
+    def invalidate(self, guild_id: int, role_name: Optional[str] = None) -> None:
+        if role_name is not None:
+            self._roles.pop((guild_id, role_name), None)
+            return
+        for key in [key for key in self._roles if key[0] == guild_id]:
+            del self._roles[key]
+    
+    def forget_guild(self, guild_id: int) -> None:
+        """Bỏ cache và thao tác đang chờ khi bot rời guild"""
+        self.invalidate(guild_id)
+        self._queue = deque(op for op in self._queue if op[1].id != guild_id)
+    
+    # ---------- Đồng bộ ----------
+    
+    async def reconcile(self, guild: discord.Guild, rule_key: str) -> Optional[SyncJob]:
+        """
+        So role mong muốn của rule với role hiện tại của mọi member và xếp chênh lệch vào hàng đợi
+        
+        Returns:
+            Optional[SyncJob]: None nếu không lấy/tạo được role
+        """
+        rule = self.rules[rule_key]
+        role = await self.get_rule_role(guild, rule_key, create=True)
+        if role is None:
+            return None
+        
+        to_add: List[int] = []
+        to_remove: List[int] = []
+        if rule.tracked:
+            tracked = self._tracked.setdefault(rule_key, {}).setdefault(guild.id, set())
+            holders = {member.id for member in role.members}
+            if not holders <= tracked:
+                tracked |= holders  # Ghi nhận người đang giữ role để khôi phục được về sau
+                self.save_members()
+            to_add = [member_id for member_id in tracked - holders if guild.get_member(member_id) is not None]
+        else:
+            for member in guild.members:
+                has_role = member.get_role(role.id) is not None
+                if rule.desired(member):
+                    if not has_role:
+                        to_add.append(member.id)
+                elif has_role and rule.remove:
+                    to_remove.append(member.id)
+        
+        return self._enqueue(guild, role, to_add, to_remove, rule.key)
+    
+    def assign(self, guild: discord.Guild, role: discord.Role, member_ids: List[int], add: bool = True) -> SyncJob:
+        """Thêm (hoặc gỡ) 1 role cho nhiều member dưới dạng job nền"""
+        changes = [
+            member_id for member_id in dict.fromkeys(member_ids)
+            if (member := guild.get_member(member_id)) is not None and (member.get_role(role.id) is None) == add
+        ]
+        return self._enqueue(guild, role, changes if add else [], [] if add else changes, role.name)
+    
+    def _enqueue(self, guild: discord.Guild, role: discord.Role, to_add: List[int], to_remove: List[int], label: str) -> SyncJob:
+        job = SyncJob(next(self._job_ids), guild.id, label, len(to_add) + len(to_remove))
+        self._jobs[job.id] = job
+        while len(self._jobs) > JOB_HISTORY:
+            self._jobs.popitem(last=False)
+        
+        for member_id in to_add:
+            self._queue.append((job, guild, role.id, member_id, True, 1))
+        for member_id in to_remove:
+            self._queue.append((job, guild, role.id, member_id, False, 1))
+        if job.total:
+            self._ensure_worker()
+            logger.info(f"Role sync '{label}' trong {guild.name}: +{len(to_add)} / -{len(to_remove)} member")
+        return job
+    
+    def _ensure_worker(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._worker_task is None or self._worker_task.done():
+            self._worker_task = asyncio.get_running_loop().create_task(self._worker_loop())
+    
+    async def _worker_loop(self) -> None:
+        while True:
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            
+            started = time.monotonic()
+            batch = [self._queue.popleft() for _ in range(min(BATCH_SIZE, len(self._queue)))]
+            backoff = 0.0
+            for op in batch:
+                try:
+                    await self._apply(*op)
+                except discord.HTTPException as e:
+                    job, guild, role_id, member_id, add, attempt = op
+                    if attempt < MAX_ATTEMPTS:
+                        self._queue.append((job, guild, role_id, member_id, add, attempt + 1))
+                        backoff = max(backoff, 2.0 ** attempt)
+                    else:
+                        self._failed += 1
+                        job._record('failed')
+                    logger.warning(f"Role sync: lỗi HTTP với member {member_id} (lần {attempt}): {e}")
+            
+            # Giữ tốc độ tối đa ops_per_second
+            await asyncio.sleep(max(backoff, len(batch) / self.ops_per_second - (time.monotonic() - started)))
+    
+    async def _apply(self, job: SyncJob, guild: discord.Guild, role_id: int, member_id: int, add: bool, attempt: int) -> None:
+        """Thêm/gỡ role cho 1 member, kiểm tra lại trạng thái ngay trước khi gọi API"""
+        member = guild.get_member(member_id)
+        role = guild.get_role(role_id)
+        if member is None or role is None or (member.get_role(role_id) is not None) == add:
+            job._record('skipped')
+            return
+        try:
+            if add:
+                await member.add_roles(role, reason=f"Role sync: {job.label}")
+            else:
+                await member.remove_roles(role, reason=f"Role sync: {job.label}")
+        except (discord.Forbidden, discord.NotFound):
+            self._failed += 1
+            job._record('failed')
+            return
+        self._applied += 1
+        job._record('added' if add else 'removed')
+    
+    # ---------- Thống kê ----------
+    
+    def get_job(self, job_id: int) -> Optional[SyncJob]:
+        return self._jobs.get(job_id)
+    
+    def get_jobs(self, guild_id: Optional[int] = None) -> List[SyncJob]:
+        return [job for job in self._jobs.values() if guild_id is None or job.guild_id == guild_id]
+    
+    def __len__(self) -> int:
+        return len(self._roles)
+    
+    def get_stats(self) -> dict:
+        """Thống kê role sync"""
+        return {
+            'cached_roles': len(self._roles),
+            'cache_hits': self._cache_hits,
+            'cache_misses': self._cache_misses,
+            'pending_ops': len(self._queue),
+            'applied': self._applied,
+            'failed': self._failed,
+            'jobs': len(self._jobs),
+        }
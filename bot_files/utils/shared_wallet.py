@@ -1,40 +1,89 @@
 import json
 import os
+import sys
 import logging
 from datetime import datetime
-import asyncio
-from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional
+
+from .file_watcher import FileWatcher, file_signature
+from .metrics import PERSISTENCE_FLUSH
 
 logger = logging.getLogger(__name__)
 
+
+class BalanceChange(NamedTuple):
+    """1 thay đổi số dư gửi cho subscriber"""
+    user_id: int
+    old: int
+    new: int
+    source: str  # 'update' | 'create' | 'reset' | 'external'
+
+
 class SharedWallet:
-    """Hệ thống ví tiền chung cho tất cả games"""
+    """
+    Hệ thống ví tiền chung cho tất cả games
+    
+    - Cả process chỉ dùng 1 instance (biến shared_wallet cuối file)
+    - subscribe(callback): nhận BalanceChange mỗi khi số dư đổi (bảng xếp hạng, thống kê...)
+    - File bị sửa từ bên ngoài (inotify, không có thì polling) được áp dụng theo từng user
+      thay đổi thay vì thay cả ví; lần ghi của chính ví được nhận ra qua chữ ký file
+    """
     
     def __init__(self):
         self.wallet_file = "data/shared_wallet.json"
         self.starting_balance = 1000  # Số dư ban đầu
+        self._subscribers: List[Callable[[BalanceChange], None]] = []
+        self._file_signature = None  # Chữ ký file lúc ví đọc/ghi lần cuối
         self.data = self.load_wallet_data()
-        self._file_watch_task = None
-        self._last_modified = None
-        self._is_watching = False
+        self._watcher: Optional[FileWatcher] = None
+        self.stats = WalletStats(self)
+    
+    # ---------- Pub/sub ----------
+    
+    def subscribe(self, callback: Callable[[BalanceChange], None]) -> Callable[[], None]:
+        """Đăng ký nhận thay đổi số dư, trả về hàm hủy đăng ký"""
+        self._subscribers.append(callback)
+        
+        def unsubscribe():
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+        return unsubscribe
+    
+    def _publish(self, changes: List[BalanceChange]) -> None:
+        for change in changes:
+            for callback in list(self._subscribers):
+                try:
+                    callback(change)
+                except Exception as e:
+                    logger.error(f"Lỗi ở subscriber của wallet: {e}")
+    
+    # ---------- Load / lưu ----------
     
     def load_wallet_data(self):
         """Load dữ liệu ví từ file"""
         try:
             if os.path.exists(self.wallet_file):
+                signature = file_signature(self.wallet_file)
                 with open(self.wallet_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    data = json.load(f)
+                self._file_signature = signature
+                return data
             else:
                 return {}
         except Exception as e:
             logger.error(f"Lỗi khi load wallet data: {e}")
             return {}
     
+    @PERSISTENCE_FLUSH.time(store='wallet')
     def save_wallet_data(self):
-        """Lưu dữ liệu ví vào file"""
+        """Lưu dữ liệu ví vào file (ghi atomic)"""
         try:
-            with open(self.wallet_file, 'w', encoding='utf-8') as f:
+            os.makedirs(os.path.dirname(self.wallet_file) or '.', exist_ok=True)
+            tmp_file = f"{self.wallet_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
                 json.dump(self.data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.wallet_file)
+            self._file_signature = file_signature(self.wallet_file)
         except Exception as e:
             logger.error(f"Lỗi khi save wallet data: {e}")
     
@@ -49,6 +98,7 @@ class SharedWallet:
                 'last_updated': datetime.now().isoformat()
             }
             self.save_wallet_data()
+            self._publish([BalanceChange(int(user_id), 0, self.starting_balance, 'create')])
         
         return self.data[user_id_str]['balance']
     
@@ -56,16 +106,20 @@ class SharedWallet:
         """Set số dư cho user"""
         user_id_str = str(user_id)
         if user_id_str not in self.data:
+            old_balance = 0
             self.data[user_id_str] = {
                 'balance': amount,
                 'created_at': datetime.now().isoformat(),
                 'last_updated': datetime.now().isoformat()
             }
         else:
+            old_balance = self.data[user_id_str]['balance']
             self.data[user_id_str]['balance'] = amount
             self.data[user_id_str]['last_updated'] = datetime.now().isoformat()
         
         self.save_wallet_data()
+        if amount != old_balance:
+            self._publish([BalanceChange(int(user_id), old_balance, amount, 'update')])
     
     def add_balance(self, user_id, amount):
         """Thêm tiền vào ví"""
@@ -98,7 +152,7 @@ class SharedWallet:
         Args:
             user_id: ID người dùng
             amount_str: Chuỗi số tiền ("100", "all", "999999")
-            
+        
         Returns:
             tuple: (bet_amount, is_adjusted, message)
                 - bet_amount: Số tiền sau khi parse
@@ -127,7 +181,7 @@ class SharedWallet:
                 return balance, True, f"⚠️ Đã điều chỉnh từ {bet_amount:,} xuống {balance:,} xu (số dư hiện tại)"
             
             return bet_amount, False, None
-            
+        
         except ValueError:
             return 0, False, "❌ Số tiền không hợp lệ! Sử dụng số hoặc 'all'"
     
@@ -142,49 +196,39 @@ class SharedWallet:
     
     def reset_all_balances(self):
         """Reset tất cả số dư về 0 (dành cho admin)"""
-        reset_count = 0
+        changes = []
         for user_id in self.data:
             old_balance = self.data[user_id]['balance']
             if old_balance != 0:
                 self.data[user_id]['balance'] = 0
                 self.data[user_id]['last_updated'] = datetime.now().isoformat()
-                reset_count += 1
+                changes.append(BalanceChange(int(user_id), old_balance, 0, 'reset'))
         
         self.save_wallet_data()
-        return reset_count
+        self._publish(changes)
+        return len(changes)
     
     def get_all_users_with_money(self):
-        """Lấy danh sách tất cả user có tiền"""
-        users_with_money = []
-        for user_id, data in self.data.items():
-            if data['balance'] > 0:
-                users_with_money.append({
-                    'user_id': int(user_id),
-                    'balance': data['balance']
-                })
-        
-        # Sort theo số dư giảm dần
-        users_with_money.sort(key=lambda x: x['balance'], reverse=True)
-        return users_with_money
+        """Lấy danh sách tất cả user có tiền (số dư giảm dần)"""
+        return [dict(entry) for entry in self.stats.ranking()]
     
     def get_total_money_in_system(self):
-        """Tính tổng số tiền trong hệ thống"""
-        total = 0
-        for user_data in self.data.values():
-            total += user_data['balance']
-        return total
+        """Tổng số tiền trong hệ thống"""
+        return self.stats.total
     
     def get_user_count(self):
         """Đếm số user trong hệ thống"""
         return len(self.data)
     
     def reload_data(self):
-        """Reload dữ liệu từ file (manual refresh)"""
+        """Reload dữ liệu từ file (manual refresh) - áp dụng phần khác biệt như khi file đổi từ bên ngoài"""
         try:
             old_count = len(self.data)
             old_total = self.get_total_money_in_system()
             
-            self.data = self.load_wallet_data()
+            changed = self.apply_external_changes(force=True)
+            if changed is None:
+                return False, "File ví không đọc được (đang ghi dở hoặc sai JSON)"
             
             new_count = len(self.data)
             new_total = self.get_total_money_in_system()
@@ -194,65 +238,121 @@ class SharedWallet:
                 'old_count': old_count,
                 'new_count': new_count,
                 'old_total': old_total,
-                'new_total': new_total
+                'new_total': new_total,
+                'changed': changed
             }
         except Exception as e:
             logger.error(f"Error reloading wallet data: {e}")
             return False, str(e)
     
-    def get_file_modified_time(self):
-        """Lấy thời gian file được sửa đổi lần cuối"""
+    def apply_external_changes(self, force: bool = False) -> Optional[int]:
+        """
+        Đọc lại file và chỉ áp dụng các user có dữ liệu khác trong RAM
+        
+        Args:
+            force: Đọc lại cả khi chữ ký file trùng lần đọc/ghi cuối của ví
+        
+        Returns:
+            Số user có số dư thay đổi, None nếu file không đọc được
+        """
+        signature = file_signature(self.wallet_file)
+        if signature is None:
+            return 0
+        if not force and signature == self._file_signature:
+            return 0  # Lần ghi của chính ví
         try:
-            if os.path.exists(self.wallet_file):
-                return os.path.getmtime(self.wallet_file)
-            return None
-        except Exception as e:
-            logger.error(f"Error getting file modified time: {e}")
+            with open(self.wallet_file, 'r', encoding='utf-8') as f:
+                file_data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Không đọc được {self.wallet_file}, giữ dữ liệu trong RAM: {e}")
             return None
+        
+        changes = []
+        for user_id_str, entry in file_data.items():
+            current = self.data.get(user_id_str)
+            if current == entry:
+                continue
+            self.data[user_id_str] = entry
+            old_balance = current['balance'] if current else 0
+            if entry.get('balance', 0) != old_balance:
+                changes.append(BalanceChange(int(user_id_str), old_balance, entry.get('balance', 0), 'external'))
+        for user_id_str in [user_id_str for user_id_str in self.data if user_id_str not in file_data]:
+            removed = self.data.pop(user_id_str)
+            if removed['balance']:
+                changes.append(BalanceChange(int(user_id_str), removed['balance'], 0, 'external'))
+        
+        self._file_signature = signature
+        self._publish(changes)
+        if changes:
+            logger.info(f"Áp dụng thay đổi từ bên ngoài cho {len(changes)} user trong {self.wallet_file}")
+        return len(changes)
     
-    async def start_file_watching(self, check_interval=5):
-        """Bắt đầu theo dõi file thay đổi"""
-        if self._is_watching:
+    # ---------- Theo dõi file ----------
+    
+    @property
+    def is_watching(self) -> bool:
+        return self._watcher is not None and self._watcher.running
+    
+    @property
+    def watch_mode(self) -> Optional[str]:
+        return self._watcher.mode if self.is_watching else None
+    
+    def start_watching(self, check_interval: float = 5):
+        """Bắt đầu theo dõi file ví (inotify nếu có, không thì poll mỗi check_interval giây)"""
+        if self.is_watching:
             logger.warning("File watching already started")
             return
-        
-        self._is_watching = True
-        self._last_modified = self.get_file_modified_time()
-        
-        logger.info(f"Started watching {self.wallet_file} for changes (check every {check_interval}s)")
-        
-        while self._is_watching:
-            try:
-                await asyncio.sleep(check_interval)
-                
-                current_modified = self.get_file_modified_time()
-                
-                if current_modified and self._last_modified and current_modified != self._last_modified:
-                    logger.info(f"Detected change in {self.wallet_file}, reloading...")
-                    success, result = self.reload_data()
-                    
-                    if success:
-                        logger.info(f"Auto-reloaded: {result['new_count']} users, {result['new_total']} total coins")
-                    else:
-                        logger.error(f"Failed to auto-reload: {result}")
-                    
-                    self._last_modified = current_modified
-                
-            except asyncio.CancelledError:
-                logger.info("File watching task cancelled")
-                break
-            except Exception as e:
-                logger.error(f"Error in file watching loop: {e}")
-                await asyncio.sleep(check_interval)
-        
-        self._is_watching = False
+        self._watcher = FileWatcher(self.wallet_file, self.apply_external_changes, interval=check_interval)
+        self._watcher.start()
     
     def stop_file_watching(self):
         """Dừng theo dõi file"""
-        if self._file_watch_task and not self._file_watch_task.done():
-            self._file_watch_task.cancel()
-            self._is_watching = False
+        if self.is_watching:
+            self._watcher.stop()
             logger.info("Stopped file watching")
+        self._watcher = None
+
+
+class WalletStats:
+    """
+    Subscriber của ví: giữ tổng tiền theo từng thay đổi và cache bảng xếp hạng
+    (chỉ sắp xếp lại khi có thay đổi kể từ lần xem trước)
+    """
+    
+    def __init__(self, wallet: SharedWallet):
+        self.wallet = wallet
+        self.total = sum(entry['balance'] for entry in wallet.data.values())
+        self._ranking: Optional[List[dict]] = None
+        wallet.subscribe(self.on_change)
+    
+    def on_change(self, change: BalanceChange) -> None:
+        self.total += change.new - change.old
+        self._ranking = None
+    
+    def ranking(self) -> List[dict]:
+        """User có tiền, số dư giảm dần"""
+        if self._ranking is None:
+            self._ranking = sorted(
+                ({'user_id': int(user_id), 'balance': entry['balance']}
+                 for user_id, entry in self.wallet.data.items() if entry['balance'] > 0),
+                key=lambda entry: entry['balance'],
+                reverse=True
+            )
+        return self._ranking
+
+
+def _shared_instance() -> SharedWallet:
+    """
+    Module này được import theo 2 đường (bot chính: bot_files.utils.shared_wallet, command module:
+    utils.shared_wallet) thành 2 module object riêng - dùng lại ví của module đã import trước
+    để cả process chỉ có 1 bản dữ liệu ví trong RAM
+    """
+    for module_name in ('bot_files.utils.shared_wallet', 'utils.shared_wallet'):
+        module = sys.modules.get(module_name)
+        if module is not None and module.__dict__.get('shared_wallet') is not None:
+            return module.shared_wallet
+    return SharedWallet()
+
 
 # Global instance
-shared_wallet = SharedWallet()
+shared_wallet = _shared_instance()
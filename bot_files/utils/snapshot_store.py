@@ -0,0 +1,363 @@
+"""
+Snapshot store - backup dữ liệu local dạng snapshot: nội dung file cắt thành chunk, mỗi chunk
+lưu 1 lần theo sha256 (nén zstd nếu có, không thì gzip), mỗi snapshot chỉ là 1 manifest nhỏ
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024  # File lớn hơn được cắt thành nhiều chunk cố định
+CODEC_EXTENSIONS = {'zstd': '.zst', 'gzip': '.gz'}
+
+# Retention mặc định: giữ N snapshot mới nhất + snapshot cuối mỗi ngày/tuần
+DEFAULT_RETENTION = {'keep_last': 10, 'keep_daily': 7, 'keep_weekly': 4}
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    tmp_file = f"{path}.tmp{threading.get_ident()}"
+    with open(tmp_file, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_file, path)
+
+
+class SnapshotStore:
+    """
+    Class quản lý snapshot dữ liệu
+    
+    Cấu trúc thư mục (root):
+    - chunks/<2 ký tự đầu>/<sha256>.zst|.gz: nội dung đã nén, địa chỉ = hash nội dung gốc nên
+      file không đổi giữa các snapshot không tốn thêm dung lượng
+    - manifests/<snapshot_id>.json: thời điểm + danh sách file -> chunk
+    Restore 1 file chỉ đọc manifest và vài chunk của file đó. Mọi thao tác là I/O đồng bộ,
+    bot gọi qua các hàm *_async (chạy trong worker thread).
+    """
+    
+    def __init__(self, root: str = 'data_backups/snapshots', codec: Optional[str] = None,
+                 chunk_size: int = CHUNK_SIZE, compression_level: int = 6):
+        self.root = root
+        self.codec = codec or ('zstd' if ZSTD_AVAILABLE else 'gzip')
+        if self.codec == 'zstd' and not ZSTD_AVAILABLE:
+            logger.warning("zstandard chưa được cài đặt, snapshot dùng gzip")
+            self.codec = 'gzip'
+        self.chunk_size = chunk_size
+        self.compression_level = compression_level
+        self.chunks_dir = os.path.join(root, 'chunks')
+        self.manifests_dir = os.path.join(root, 'manifests')
+        self._lock = threading.Lock()  # Snapshot/retention/gc không chạy chồng nhau
+        self._manifest_cache: Dict[str, dict] = {}
+        self._snapshots_created = 0
+        self._files_restored = 0
+        self._last_snapshot_ms: Optional[float] = None
+        os.makedirs(self.chunks_dir, exist_ok=True)
+        os.makedirs(self.manifests_dir, exist_ok=True)
+    
+    # ---------- Chunk ----------
+    
+    def _chunk_path(self, digest: str, codec: str) -> str:
+        return os.path.join(self.chunks_dir, digest[:2], digest + CODEC_EXTENSIONS[codec])
+    
+    def _find_chunk(self, digest: str) -> Optional[str]:
+        for codec in CODEC_EXTENSIONS:
+            path = self._chunk_path(digest, codec)
+            if os.path.exists(path):
+                return path
+        return None
+    
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == 'zstd':
+            return zstandard.ZstdCompressor(level=self.compression_level).compress(data)
+        return gzip.compress(data, compresslevel=self.compression_level, mtime=0)
+    
+    @staticmethod
+    def _decompress(path: str, data: bytes) -> bytes:
+        if path.endswith(CODEC_EXTENSIONS['zstd']):
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError(f"Chunk {os.path.basename(path)} nén zstd nhưng chưa cài zstandard")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+    
+    def _put_chunk(self, data: bytes, stats: dict) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        if self._find_chunk(digest) is None:
+            compressed = self._compress(data)
+            path = self._chunk_path(digest, self.codec)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _atomic_write(path, compressed)
+            stats['new_chunks'] += 1
+            stats['stored_bytes'] += len(compressed)
+        return digest
+    
+    def read_chunk(self, digest: str) -> bytes:
+        path = self._find_chunk(digest)
+        if path is None:
+            raise FileNotFoundError(f"Thiếu chunk {digest[:12]}")
+        with open(path, 'rb') as f:
+            data = self._decompress(path, f.read())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Chunk {digest[:12]} bị hỏng (hash không khớp)")
+        return data
+    
+    # ---------- Manifest ----------
+    
+    def _manifest_path(self, snapshot_id: str) -> str:
+        return os.path.join(self.manifests_dir, f"{snapshot_id}.json")
+    
+    def get(self, snapshot_id: str) -> Optional[dict]:
+        """Manifest của 1 snapshot (None nếu không có)"""
+        manifest = self._manifest_cache.get(snapshot_id)
+        if manifest is None:
+            try:
+                with open(self._manifest_path(snapshot_id), 'r', encoding='utf-8') as f:
+                    manifest = self._manifest_cache[snapshot_id] = json.load(f)
+            except (OSError, ValueError):
+                return None
+        return manifest
+    
+    def list_snapshots(self) -> List[dict]:
+        """Tất cả manifest, mới nhất trước"""
+        snapshots = []
+        for name in os.listdir(self.manifests_dir):
+            if name.endswith('.json'):
+                manifest = self.get(name[:-len('.json')])
+                if manifest is not None:
+                    snapshots.append(manifest)
+        snapshots.sort(key=lambda manifest: manifest['created_at'], reverse=True)
+        return snapshots
+    
+    def resolve(self, ref: str) -> Optional[dict]:
+        """Tìm snapshot theo ID (hoặc tiền tố ID), 'latest', hoặc thời điểm 'YYYY-MM-DD[ HH:MM[:SS]]'"""
+        snapshots = self.list_snapshots()
+        if ref == 'latest':
+            return snapshots[0] if snapshots else None
+        manifest = self.get(ref)
+        if manifest is not None:
+            return manifest
+        matches = [manifest for manifest in snapshots if manifest['id'].startswith(ref)]
+        if len(matches) == 1:
+            return matches[0]
+        for fmt in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d'):
+            try:
+                at = datetime.strptime(ref, fmt)
+            except ValueError:
+                continue
+            if fmt == '%Y-%m-%d':
+                at = at.replace(hour=23, minute=59, second=59)
+            return self.at(at.timestamp())
+        return None
+    
+    def at(self, timestamp: float, path: Optional[str] = None) -> Optional[dict]:
+        """Snapshot mới nhất tạo trước/tại thời điểm timestamp (có chứa path nếu truyền vào)"""
+        for manifest in self.list_snapshots():
+            if manifest['created_at'] <= timestamp and (path is None or path in manifest['files']):
+                return manifest
+        return None
+    
+    # ---------- Snapshot ----------
+    
+    def create_snapshot(self, paths: Iterable[str], label: str = 'manual') -> dict:
+        """
+        Tạo snapshot các file (file không tồn tại được ghi vào 'missing')
+        
+        Returns:
+            Manifest của snapshot mới
+        """
+        with self._lock:
+            started = time.perf_counter()
+            created_at = time.time()
+            snapshot_id = f"{datetime.fromtimestamp(created_at).strftime('%Y%m%d_%H%M%S')}_{label}"
+            suffix = 1
+            while os.path.exists(self._manifest_path(snapshot_id)):
+                suffix += 1
+                snapshot_id = f"{datetime.fromtimestamp(created_at).strftime('%Y%m%d_%H%M%S')}_{label}_{suffix}"
+            stats = {'new_chunks': 0, 'stored_bytes': 0}
+            files, missing = {}, []
+            for path in paths:
+                try:
+                    with open(path, 'rb') as f:
+                        content = f.read()
+                    mtime = os.path.getmtime(path)
+                except FileNotFoundError:
+                    missing.append(path)
+                    continue
+                except OSError as e:
+                    logger.error(f"Lỗi đọc {path} khi snapshot: {e}")
+                    missing.append(path)
+                    continue
+                chunks = [
+                    self._put_chunk(content[offset:offset + self.chunk_size], stats)
+                    for offset in range(0, len(content), self.chunk_size)
+                ]
+                files[path] = {
+                    'sha256': hashlib.sha256(content).hexdigest(),
+                    'size': len(content),
+                    'mtime': mtime,
+                    'chunks': chunks,
+                }
+            
+            manifest = {
+                'id': snapshot_id,
+                'label': label,
+                'created_at': created_at,
+                'datetime': datetime.fromtimestamp(created_at).isoformat(),
+                'codec': self.codec,
+                'files': files,
+                'missing': missing,
+                'total_size': sum(entry['size'] for entry in files.values()),
+                'new_chunks': stats['new_chunks'],
+                'stored_bytes': stats['stored_bytes'],
+            }
+            _atomic_write(self._manifest_path(snapshot_id), json.dumps(manifest, indent=2, ensure_ascii=False).encode('utf-8'))
+            self._manifest_cache[snapshot_id] = manifest
+            self._snapshots_created += 1
+            self._last_snapshot_ms = round((time.perf_counter() - started) * 1000, 1)
+            logger.info(
+                f"Snapshot {snapshot_id}: {len(files)} file ({manifest['total_size']:,} bytes), "
+                f"{stats['new_chunks']} chunk mới ({stats['stored_bytes']:,} bytes) trong {self._last_snapshot_ms}ms"
+            )
+            return manifest
+    
+    # ---------- Restore ----------
+    
+    def read_file(self, snapshot_id: str, path: str) -> bytes:
+        """Nội dung 1 file trong snapshot"""
+        manifest = self.get(snapshot_id)
+        if manifest is None:
+            raise KeyError(f"Không có snapshot {snapshot_id}")
+        entry = manifest['files'].get(path)
+        if entry is None:
+            raise KeyError(f"Snapshot {snapshot_id} không có {path}")
+        content = b''.join(self.read_chunk(digest) for digest in entry['chunks'])
+        if hashlib.sha256(content).hexdigest() != entry['sha256']:
+            raise ValueError(f"Nội dung {path} trong snapshot {snapshot_id} không khớp hash")
+        return content
+    
+    def restore_file(self, snapshot_id: str, path: str, dest: Optional[str] = None) -> str:
+        """Ghi lại 1 file từ snapshot (ghi atomic, mặc định về đúng đường dẫn cũ)"""
+        content = self.read_file(snapshot_id, path)
+        dest = dest or path
+        os.makedirs(os.path.dirname(dest) or '.', exist_ok=True)
+        _atomic_write(dest, content)
+        self._files_restored += 1
+        logger.info(f"Đã restore {path} từ snapshot {snapshot_id} -> {dest}")
+        return dest
+    
+    def restore(self, snapshot_id: str, paths: Optional[Iterable[str]] = None) -> List[str]:
+        """Restore nhiều file (mặc định tất cả file trong snapshot), trả về danh sách đã restore"""
+        manifest = self.get(snapshot_id)
+        if manifest is None:
+            raise KeyError(f"Không có snapshot {snapshot_id}")
+        targets = list(paths) if paths is not None else list(manifest['files'])
+        return [self.restore_file(snapshot_id, path) for path in targets]
+    
+    def file_history(self, path: str) -> List[dict]:
+        """Các phiên bản khác nhau của 1 file qua các snapshot, mới nhất trước"""
+        history, seen = [], set()
+        for manifest in self.list_snapshots():
+            entry = manifest['files'].get(path)
+            if entry is not None and entry['sha256'] not in seen:
+                seen.add(entry['sha256'])
+                history.append({'snapshot': manifest['id'], 'created_at': manifest['created_at'], 'size': entry['size']})
+        return history
+    
+    # ---------- Retention ----------
+    
+    def select_expired(self, keep_last: int = 10, keep_daily: int = 7, keep_weekly: int = 4) -> List[str]:
+        """
+        ID các snapshot hết hạn theo retention: giữ keep_last snapshot mới nhất, snapshot mới nhất
+        của keep_daily ngày gần nhất và của keep_weekly tuần gần nhất (có snapshot)
+        """
+        snapshots = self.list_snapshots()
+        keep = {manifest['id'] for manifest in snapshots[:keep_last]}
+        days, weeks = set(), set()
+        for manifest in snapshots:
+            moment = datetime.fromtimestamp(manifest['created_at'])
+            day = moment.date()
+            week = moment.isocalendar()[:2]
+            if day not in days and len(days) < keep_daily:
+                days.add(day)
+                keep.add(manifest['id'])
+            if week not in weeks and len(weeks) < keep_weekly:
+                weeks.add(week)
+                keep.add(manifest['id'])
+        return [manifest['id'] for manifest in snapshots if manifest['id'] not in keep]
+    
+    def apply_retention(self, **policy) -> dict:
+        """Xóa snapshot hết hạn rồi dọn chunk không còn manifest nào dùng"""
+        policy = {**DEFAULT_RETENTION, **policy}
+        with self._lock:
+            expired = self.select_expired(**policy)
+            for snapshot_id in expired:
+                try:
+                    os.remove(self._manifest_path(snapshot_id))
+                except FileNotFoundError:
+                    pass
+                self._manifest_cache.pop(snapshot_id, None)
+            removed_chunks, freed_bytes = self._gc()
+        if expired:
+            logger.info(f"Retention: xóa {len(expired)} snapshot, {removed_chunks} chunk ({freed_bytes:,} bytes)")
+        return {'expired': expired, 'removed_chunks': removed_chunks, 'freed_bytes': freed_bytes}
+    
+    def _gc(self):
+        referenced = set()
+        for manifest in self.list_snapshots():
+            for entry in manifest['files'].values():
+                referenced.update(entry['chunks'])
+        removed, freed = 0, 0
+        for prefix in os.listdir(self.chunks_dir):
+            prefix_dir = os.path.join(self.chunks_dir, prefix)
+            for name in os.listdir(prefix_dir):
+                digest = name.split('.', 1)[0]
+                if digest not in referenced:
+                    path = os.path.join(prefix_dir, name)
+                    freed += os.path.getsize(path)
+                    os.remove(path)
+                    removed += 1
+        return removed, freed
+    
+    # ---------- Async (worker thread) ----------
+    
+    async def create_snapshot_async(self, paths: Iterable[str], label: str = 'manual',
+                                    retention: Optional[dict] = None) -> dict:
+        """Tạo snapshot (+ áp retention nếu truyền vào) trong worker thread"""
+        paths = list(paths)
+        manifest = await asyncio.to_thread(self.create_snapshot, paths, label)
+        if retention is not None:
+            await asyncio.to_thread(self.apply_retention, **retention)
+        return manifest
+    
+    async def restore_file_async(self, snapshot_id: str, path: str, dest: Optional[str] = None) -> str:
+        return await asyncio.to_thread(self.restore_file, snapshot_id, path, dest)
+    
+    def get_stats(self) -> dict:
+        """Thống kê snapshot store"""
+        stored_bytes, chunk_count = 0, 0
+        for prefix in os.listdir(self.chunks_dir):
+            for name in os.listdir(os.path.join(self.chunks_dir, prefix)):
+                chunk_count += 1
+                stored_bytes += os.path.getsize(os.path.join(self.chunks_dir, prefix, name))
+        snapshots = self.list_snapshots()
+        return {
+            'snapshots': len(snapshots),
+            'chunks': chunk_count,
+            'stored_bytes': stored_bytes,
+            'logical_bytes': sum(manifest['total_size'] for manifest in snapshots),
+            'codec': self.codec,
+            'created': self._snapshots_created,
+            'restored_files': self._files_restored,
+            'last_snapshot_ms': self._last_snapshot_ms,
+        }
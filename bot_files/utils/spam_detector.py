@@ -0,0 +1,258 @@
+"""
+Spam detector - phát hiện flood/spam trùng lặp/raid bằng count-min sketch theo cửa sổ trượt
+và SimHash nội dung, bộ nhớ cố định không phụ thuộc số user/kênh
+"""
+import re
+import time
+import unicodedata
+import logging
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4  # 4 band x 16 bit: 2 nội dung lệch <= 3 bit chắc chắn trùng ít nhất 1 band
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+_MASK64 = (1 << 64) - 1
+
+MAX_FEATURES = 64  # Số shingle tối đa đưa vào SimHash (giữ chi phí mỗi tin nhắn cố định)
+MIN_FINGERPRINT_LENGTH = 8  # Tin nhắn ngắn hơn ("ok", "gg") không xét trùng lặp
+
+# Ngưỡng mặc định cho mỗi server
+DEFAULT_THRESHOLDS = {
+    'flood_messages': 6,  # Tin nhắn / user / RATE_WINDOW giây
+    'duplicate_messages': 4,  # Tin nhắn gần giống nhau / user / CONTENT_WINDOW giây
+    'raid_messages': 8,  # Tin nhắn gần giống nhau / server / CONTENT_WINDOW giây (nhiều user)
+    'channel_flood_messages': 25,  # Tin nhắn / kênh / RATE_WINDOW giây - vượt thì giảm nửa ngưỡng flood
+}
+
+RATE_WINDOW = 5.0
+CONTENT_WINDOW = 30.0
+
+_URL_PATTERN = re.compile(r'https?://\S+')
+_MENTION_PATTERN = re.compile(r'<(?:@[!&]?|#)\d+>')
+_NON_WORD_PATTERN = re.compile(r'[^\w\s]+')
+_REPEAT_PATTERN = re.compile(r'(\w)\1{2,}')
+
+
+class SlidingCountMinSketch:
+    """
+    Count-min sketch đếm theo cửa sổ trượt
+    
+    Cửa sổ chia thành `slots` ô thời gian, mỗi ô là 1 bảng depth x width bộ đếm.
+    Sang ô mới thì xóa bảng cũ nhất, nên bộ nhớ luôn là slots * depth * width
+    số nguyên dù có bao nhiêu key. Ước lượng chỉ có thể lớn hơn số thật (không
+    bỏ sót), sai số ~ tổng số sự kiện trong cửa sổ / width.
+    """
+    
+    __slots__ = ('window', 'slots', 'slot_seconds', 'width', 'depth', '_tables', '_zero', '_current_slot')
+    
+    def __init__(self, window: float, slots: int = 5, width: int = 2048, depth: int = 4):
+        self.window = window
+        self.slots = slots
+        self.slot_seconds = window / slots
+        self.width = width
+        self.depth = depth
+        self._zero = array('I', [0]) * (width * depth)
+        self._tables = [array('I', self._zero) for _ in range(slots)]
+        self._current_slot = 0
+    
+    def _advance(self, now: float) -> None:
+        """Xóa các ô đã trôi ra khỏi cửa sổ"""
+        slot = int(now // self.slot_seconds)
+        gap = slot - self._current_slot
+        if gap <= 0:
+            return
+        for expired in range(self._current_slot + 1, self._current_slot + 1 + min(gap, self.slots)):
+            self._tables[expired % self.slots][:] = self._zero
+        self._current_slot = slot
+    
+    def _indexes(self, key) -> List[int]:
+        """Vị trí của key trên từng hàng (double hashing từ 1 lần hash)"""
+        h = hash(key)
+        h1 = h & 0xFFFFFFFF
+        h2 = ((h >> 32) & 0xFFFFFFFF) | 1
+        width = self.width
+        return [(h1 + row * h2) % width + row * width for row in range(self.depth)]
+    
+    def _estimate(self, indexes: List[int]) -> int:
+        tables = self._tables
+        return min(sum(table[index] for table in tables) for index in indexes)
+    
+    def add(self, key, now: float) -> int:
+        """Cộng 1 cho key, trả về số ước lượng trong cửa sổ (đã gồm lần này)"""
+        self._advance(now)
+        indexes = self._indexes(key)
+        table = self._tables[self._current_slot % self.slots]
+        for index in indexes:
+            table[index] += 1
+        return self._estimate(indexes)
+    
+    def estimate(self, key, now: float) -> int:
+        self._advance(now)
+        return self._estimate(self._indexes(key))
+    
+    @property
+    def memory_bytes(self) -> int:
+        return self.slots * self.width * self.depth * self._zero.itemsize
+
+
+def normalize_text(text: str) -> str:
+    """Chuẩn hóa nội dung: bỏ dấu, chữ thường, gộp link/mention, bỏ ký tự lặp"""
+    text = _URL_PATTERN.sub(' url ', text)
+    text = _MENTION_PATTERN.sub(' mention ', text)
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char)).replace('đ', 'd')
+    text = _NON_WORD_PATTERN.sub(' ', text)
+    text = _REPEAT_PATTERN.sub(r'\1\1', text)
+    return ' '.join(text.split())
+
+
+def simhash(text: str) -> int:
+    """
+    SimHash 64 bit của nội dung đã chuẩn hóa
+    
+    Dùng shingle 2 từ (tin nhắn >= 3 từ) hoặc 3 ký tự, tối đa MAX_FEATURES
+    shingle. Nội dung gần giống nhau cho SimHash lệch ít bit.
+    """
+    words = text.split()
+    if len(words) >= 3:
+        features = [f"{words[i]} {words[i + 1]}" for i in range(min(len(words) - 1, MAX_FEATURES))]
+    else:
+        features = [text[i:i + 3] for i in range(min(max(len(text) - 2, 1), MAX_FEATURES))]
+    
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        h = hash(feature) & _MASK64
+        for bit in range(SIMHASH_BITS):
+            if h >> bit & 1:
+                weights[bit] += 1
+            else:
+                weights[bit] -= 1
+    
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def simhash_bands(fingerprint: int) -> Tuple[int, ...]:
+    return tuple((fingerprint >> (band * _BAND_BITS)) & _BAND_MASK for band in range(SIMHASH_BANDS))
+
+
+class SpamVerdict:
+    """Kết quả phát hiện: lý do + số đếm đã vượt ngưỡng"""
+    
+    __slots__ = ('reason', 'count', 'threshold', 'channel_flood')
+    
+    def __init__(self, reason: str, count: int, threshold: int, channel_flood: bool = False):
+        self.reason = reason  # 'flood' | 'duplicate' | 'raid'
+        self.count = count
+        self.threshold = threshold
+        self.channel_flood = channel_flood
+    
+    def __repr__(self) -> str:
+        return f"SpamVerdict({self.reason!r}, {self.count}/{self.threshold})"
+
+
+class SpamDetector:
+    """
+    Class phát hiện spam/raid cho pipeline on_message
+    
+    Mỗi tin nhắn cập nhật các sketch:
+    - tốc độ của user (flood) và của kênh (kênh đang bị flood thì ngưỡng user giảm nửa)
+    - số tin nhắn gần giống nhau của user (spam lặp lại) và của cả server (raid:
+      nhiều tài khoản gửi cùng 1 nội dung), so khớp qua các band SimHash
+    Chi phí mỗi tin nhắn là hằng số; bộ nhớ cố định theo kích thước sketch.
+    """
+    
+    def __init__(self, width: int = 8192, depth: int = 4, offender_cooldown: float = 60.0, max_offenders: int = 4096):
+        # Sketch nội dung nhận SIMHASH_BANDS lần cộng mỗi tin nhắn trong cửa sổ dài hơn nên cần rộng hơn
+        content_width = width * 4
+        self.user_rate = SlidingCountMinSketch(RATE_WINDOW, width=width, depth=depth)
+        self.channel_rate = SlidingCountMinSketch(RATE_WINDOW, width=width // 4, depth=depth)
+        self.user_content = SlidingCountMinSketch(CONTENT_WINDOW, slots=3, width=content_width, depth=depth)
+        self.guild_content = SlidingCountMinSketch(CONTENT_WINDOW, slots=3, width=content_width, depth=depth)
+        self.offender_cooldown = offender_cooldown
+        self.max_offenders = max_offenders
+        self._recent_offenders: 'OrderedDict[Tuple[int, int], float]' = OrderedDict()
+        self._observed = 0
+        self._observe_time = 0.0
+        self._detections: Dict[str, int] = {'flood': 0, 'duplicate': 0, 'raid': 0}
+    
+    def observe(self, guild_id: int, channel_id: int, user_id: int, content: str,
+                thresholds: Optional[dict] = None, now: Optional[float] = None) -> Optional[SpamVerdict]:
+        """
+        Ghi nhận 1 tin nhắn và kiểm tra vượt ngưỡng
+        
+        Args:
+            thresholds: Ngưỡng của server (None = DEFAULT_THRESHOLDS)
+            now: Thời điểm tin nhắn (epoch, mặc định time.time() - dùng khi replay)
+        
+        Returns:
+            SpamVerdict nếu user vừa vi phạm (mỗi user chỉ bị báo 1 lần trong offender_cooldown giây)
+        """
+        started = time.perf_counter()
+        now = time.time() if now is None else now
+        thresholds = thresholds or DEFAULT_THRESHOLDS
+        self._observed += 1
+        
+        channel_count = self.channel_rate.add(channel_id, now)
+        channel_flood = channel_count >= thresholds['channel_flood_messages']
+        flood_threshold = thresholds['flood_messages']
+        if channel_flood:
+            flood_threshold = max(3, flood_threshold // 2)
+        
+        verdict = None
+        user_count = self.user_rate.add((guild_id, user_id), now)
+        if user_count >= flood_threshold:
+            verdict = SpamVerdict('flood', user_count, flood_threshold, channel_flood)
+        
+        normalized = normalize_text(content) if content else ''
+        if len(normalized) >= MIN_FINGERPRINT_LENGTH:
+            bands = simhash_bands(simhash(normalized))
+            duplicate_count = max(self.user_content.add((guild_id, user_id, band, value), now) for band, value in enumerate(bands))
+            raid_count = max(self.guild_content.add((guild_id, band, value), now) for band, value in enumerate(bands))
+            if verdict is None and raid_count >= thresholds['raid_messages'] and duplicate_count < raid_count:
+                verdict = SpamVerdict('raid', raid_count, thresholds['raid_messages'], channel_flood)
+            elif verdict is None and duplicate_count >= thresholds['duplicate_messages']:
+                verdict = SpamVerdict('duplicate', duplicate_count, thresholds['duplicate_messages'], channel_flood)
+        
+        if verdict is not None and not self._mark_offender((guild_id, user_id), now):
+            verdict = None  # Vừa bị xử lý, chờ hết cooldown
+        if verdict is not None:
+            self._detections[verdict.reason] += 1
+        
+        self._observe_time += time.perf_counter() - started
+        return verdict
+    
+    def _mark_offender(self, key: Tuple[int, int], now: float) -> bool:
+        """Ghi nhận offender, False nếu đã bị báo trong cooldown (dict giới hạn max_offenders)"""
+        offenders = self._recent_offenders
+        while offenders:
+            oldest_key, flagged_at = next(iter(offenders.items()))
+            if now - flagged_at < self.offender_cooldown and len(offenders) < self.max_offenders:
+                break
+            del offenders[oldest_key]
+        if key in offenders:
+            return False
+        offenders[key] = now
+        return True
+    
+    @property
+    def memory_bytes(self) -> int:
+        return sum(sketch.memory_bytes for sketch in (self.user_rate, self.channel_rate, self.user_content, self.guild_content))
+    
+    def get_stats(self) -> dict:
+        """Thống kê detector"""
+        return {
+            'observed': self._observed,
+            'detections': dict(self._detections),
+            'avg_observe_us': round(self._observe_time / self._observed * 1e6, 1) if self._observed else 0.0,
+            'sketch_memory_kb': self.memory_bytes // 1024,
+            'recent_offenders': len(self._recent_offenders),
+        }
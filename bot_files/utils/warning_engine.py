@@ -0,0 +1,444 @@
+"""
+Warning engine - lưu warnings dạng record compact + log append-only, chấm điểm
+có giảm dần theo thời gian và bậc xử phạt (warn -> timeout -> ban) cấu hình được
+"""
+import json
+import os
+import time
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Số warning gần nhất giữ trong RAM cho mỗi user (lịch sử đầy đủ nằm trong log)
+RECENT_KEEP = 50
+
+# Compact log khi số dòng vượt max(COMPACT_MIN_LINES, COMPACT_RATIO * số record đang giữ)
+COMPACT_MIN_LINES = 5000
+COMPACT_RATIO = 2
+
+ESCALATION_ACTIONS = ('timeout', 'ban')  # ban = ban khỏi server đang warn
+
+DEFAULT_ESCALATION = {
+    'decay_days': 7,  # Mỗi decay_days ngày không vi phạm thì trừ 1 điểm
+    'default': [
+        {'threshold': 3, 'action': 'timeout', 'duration': 60},
+        {'threshold': 5, 'action': 'timeout', 'duration': 3600},
+        {'threshold': 8, 'action': 'ban'},
+    ],
+    'guilds': {},
+}
+
+# Record compact: (epoch, lý do, người warn, guild_id)
+WarningRecord = Tuple[float, str, str, int]
+
+
+class EscalationStep:
+    """1 bậc xử phạt: đạt `threshold` điểm thì thực hiện `action`"""
+    
+    __slots__ = ('threshold', 'action', 'duration')
+    
+    def __init__(self, threshold: int, action: str, duration: int = 0):
+        if action not in ESCALATION_ACTIONS:
+            raise ValueError(f"Hành động không hợp lệ: {action}")
+        if threshold < 1:
+            raise ValueError("Ngưỡng điểm phải >= 1")
+        if action == 'timeout' and not 0 < duration <= 28 * 86400:
+            raise ValueError("Thời gian timeout phải trong khoảng 1 giây - 28 ngày")
+        self.threshold = int(threshold)
+        self.action = action
+        self.duration = int(duration)  # Giây, chỉ dùng cho timeout
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> 'EscalationStep':
+        return cls(int(data['threshold']), data['action'], int(data.get('duration', 0)))
+    
+    def to_dict(self) -> dict:
+        data = {'threshold': self.threshold, 'action': self.action}
+        if self.action == 'timeout':
+            data['duration'] = self.duration
+        return data
+    
+    def __repr__(self) -> str:
+        return f"EscalationStep({self.threshold}, {self.action!r}, {self.duration})"
+
+
+class EscalationLadder:
+    """Danh sách bậc xử phạt, tra bậc theo điểm O(1)"""
+    
+    __slots__ = ('steps', '_by_threshold')
+    
+    def __init__(self, steps: List[EscalationStep]):
+        self.steps = sorted(steps, key=lambda step: step.threshold)
+        self._by_threshold = {step.threshold: step for step in self.steps}
+        if len(self._by_threshold) != len(self.steps):
+            raise ValueError("Mỗi ngưỡng điểm chỉ được có 1 bậc")
+    
+    def step_for(self, points: int) -> Optional[EscalationStep]:
+        """
+        Bậc cần áp dụng khi điểm vừa tăng lên `points`
+        
+        Điểm tăng từng 1 nên chỉ cần tra đúng ngưỡng vừa chạm. Vượt bậc cao nhất
+        thì mỗi warning tiếp theo đều áp dụng lại bậc cao nhất.
+        """
+        step = self._by_threshold.get(points)
+        if step is None and self.steps and points > self.steps[-1].threshold:
+            step = self.steps[-1]
+        return step
+    
+    def next_step(self, points: int) -> Optional[EscalationStep]:
+        """Bậc kế tiếp user sẽ chạm (None nếu đã vượt bậc cao nhất)"""
+        for step in self.steps:
+            if step.threshold > points:
+                return step
+        return None
+    
+    def to_list(self) -> list:
+        return [step.to_dict() for step in self.steps]
+
+
+class GuildPoints:
+    """Điểm vi phạm của 1 user trong 1 server"""
+    
+    __slots__ = ('points', 'anchor')
+    
+    def __init__(self, points: int = 0, anchor: float = 0.0):
+        self.points = points  # Điểm hiện tại (đã trừ theo thời gian tại `anchor`)
+        self.anchor = anchor  # Mốc tính giảm điểm: warning gần nhất hoặc lần giảm điểm gần nhất
+    
+    def decay(self, now: float, period: float) -> None:
+        """Trừ 1 điểm cho mỗi `period` giây trọn vẹn kể từ mốc (O(1))"""
+        if self.points <= 0:
+            self.points = 0
+            return
+        elapsed_periods = int((now - self.anchor) // period)
+        if elapsed_periods > 0:
+            self.points = max(0, self.points - elapsed_periods)
+            self.anchor += elapsed_periods * period
+    
+    def add(self, timestamp: float, period: float) -> None:
+        self.decay(timestamp, period)
+        self.anchor = timestamp  # Tính lại giảm điểm từ warning mới nhất (giảm khi không vi phạm)
+        self.points += 1
+
+
+class UserWarnings:
+    """Trạng thái warnings của 1 user: lịch sử chung, điểm vi phạm tính riêng từng server"""
+    
+    __slots__ = ('total', 'guilds', 'recent')
+    
+    def __init__(self):
+        self.total = 0  # Tổng số warning từ trước tới nay (kể cả đã giảm điểm)
+        self.guilds: Dict[int, GuildPoints] = {}  # guild_id -> điểm trong server đó
+        self.recent: deque = deque(maxlen=RECENT_KEEP)
+    
+    def add(self, record: WarningRecord, period: float) -> GuildPoints:
+        """Thêm warning, cộng điểm cho server của warning (trả về điểm server đó)"""
+        score = self.guilds.get(record[3])
+        if score is None:
+            score = self.guilds[record[3]] = GuildPoints()
+        score.add(record[0], period)
+        self.total += 1
+        self.recent.append(record)
+        return score
+    
+    def points(self, guild_id: Optional[int], now: float, period: float) -> int:
+        """Điểm hiện tại trong 1 server (None = cộng tất cả server)"""
+        if guild_id is None:
+            scores = list(self.guilds.values())
+        else:
+            scores = [self.guilds[guild_id]] if guild_id in self.guilds else []
+        for score in scores:
+            score.decay(now, period)
+        return sum(score.points for score in scores)
+
+
+class WarningOutcome:
+    """Kết quả khi thêm 1 warning"""
+    
+    __slots__ = ('total', 'points', 'step', 'next_step')
+    
+    def __init__(self, total: int, points: int, step: Optional[EscalationStep], next_step: Optional[EscalationStep]):
+        self.total = total
+        self.points = points
+        self.step = step  # Bậc xử phạt cần áp dụng ngay (None = chỉ cảnh báo)
+        self.next_step = next_step
+
+
+class WarningEngine:
+    """
+    Class quản lý warnings
+    
+    Mỗi thay đổi được ghi thêm 1 dòng vào log (JSON lines) nên warn không phải
+    ghi lại cả file. Khi log dài gấp nhiều lần dữ liệu còn giữ thì compact: ghi
+    lại record gần nhất + dòng tóm tắt (tổng, điểm) của từng user rồi thay file
+    atomic. Điểm của user trong mỗi server là bộ đếm giảm dần (leaky bucket) nên
+    thêm warning và tra bậc xử phạt đều O(1), không phụ thuộc số warning lịch sử.
+    Bậc xử phạt của server chỉ xét điểm do warning trong chính server đó.
+    
+    Dòng log:
+        {"a": user_id, "t": epoch, "r": lý do, "b": người warn, "g": guild_id}  - thêm
+        {"c": user_id, "t": epoch}                                           - xóa hết
+        {"s": user_id, "n": tổng, "p": {guild_id: [điểm, mốc]}}              - tóm tắt sau compact
+    """
+    
+    def __init__(self, log_file: str = 'data/warnings_log.jsonl',
+                 config_file: str = 'data/warning_escalation.json',
+                 legacy_file: Optional[str] = None):
+        self.log_file = log_file
+        self.config_file = config_file
+        self.legacy_file = legacy_file
+        self._users: Dict[int, UserWarnings] = {}
+        self._log_lines = 0
+        self._compactions = 0
+        self._escalations = 0
+        self.decay_days = DEFAULT_ESCALATION['decay_days']
+        self.default_ladder = EscalationLadder([EscalationStep.from_dict(step) for step in DEFAULT_ESCALATION['default']])
+        self._guild_ladders: Dict[int, EscalationLadder] = {}
+    
+    @property
+    def decay_period(self) -> float:
+        return self.decay_days * 86400.0
+    
+    # ---------- Load ----------
+    
+    def load(self) -> None:
+        """Load cấu hình bậc xử phạt và replay log (import warnings.json cũ nếu chưa có log)"""
+        self._load_config()
+        self._users.clear()
+        self._log_lines = 0
+        try:
+            if os.path.exists(self.log_file):
+                with open(self.log_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            self._apply(json.loads(line))
+                            self._log_lines += 1
+                logger.info(f"Đã tải warnings của {len(self._users)} users ({self._log_lines} dòng log) từ {self.log_file}")
+            elif self.legacy_file and os.path.exists(self.legacy_file):
+                self._import_legacy()
+            else:
+                logger.info("Không tìm thấy file warnings, khởi tạo mới")
+        except Exception as e:
+            logger.error(f"Lỗi khi tải warnings: {e}")
+    
+    def _apply(self, entry: dict) -> None:
+        """Áp dụng 1 dòng log vào trạng thái trong RAM"""
+        if 'a' in entry:
+            user_id = int(entry['a'])
+            state = self._users.get(user_id)
+            if state is None:
+                state = self._users[user_id] = UserWarnings()
+            state.add((entry['t'], entry.get('r', ''), entry.get('b', ''), entry.get('g', 0)), self.decay_period)
+        elif 'c' in entry:
+            self._users.pop(int(entry['c']), None)
+        elif 's' in entry:
+            state = self._users.get(int(entry['s']))
+            if state is None:
+                state = self._users[int(entry['s'])] = UserWarnings()
+            state.total = entry['n']
+            if isinstance(entry['p'], dict):
+                state.guilds = {int(guild_id): GuildPoints(points, anchor) for guild_id, (points, anchor) in entry['p'].items()}
+            else:
+                # Tóm tắt định dạng cũ (điểm chung mọi server) - không gán được cho server nào
+                state.guilds = {0: GuildPoints(entry['p'], entry['k'])}
+    
+    def _import_legacy(self) -> None:
+        """Import warnings.json dạng {user_id: [{reason, warned_by, timestamp}]} rồi ghi log mới"""
+        with open(self.legacy_file, 'r', encoding='utf-8') as f:
+            legacy_data = json.load(f)
+        count = 0
+        for user_id, warnings_list in legacy_data.items():
+            for warning in warnings_list:
+                try:
+                    timestamp = datetime.fromisoformat(warning['timestamp']).timestamp()
+                except (KeyError, TypeError, ValueError):
+                    timestamp = time.time()
+                self._apply({'a': int(user_id), 't': timestamp, 'r': warning.get('reason', ''), 'b': warning.get('warned_by', '')})
+                count += 1
+        self.compact()
+        logger.info(f"Đã import {count} warnings của {len(self._users)} users từ {self.legacy_file}")
+    
+    # ---------- Cấu hình bậc xử phạt ----------
+    
+    def _load_config(self) -> None:
+        config = DEFAULT_ESCALATION
+        try:
+            if os.path.exists(self.config_file):
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+        except Exception as e:
+            logger.error(f"Lỗi khi tải cấu hình bậc xử phạt: {e}")
+        try:
+            self.decay_days = float(config.get('decay_days', DEFAULT_ESCALATION['decay_days']))
+            self.default_ladder = EscalationLadder([EscalationStep.from_dict(step) for step in config.get('default', DEFAULT_ESCALATION['default'])])
+            self._guild_ladders = {
+                int(guild_id): EscalationLadder([EscalationStep.from_dict(step) for step in steps])
+                for guild_id, steps in config.get('guilds', {}).items()
+            }
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error(f"Cấu hình bậc xử phạt không hợp lệ, dùng mặc định: {e}")
+    
+    def save_config(self) -> None:
+        """Lưu cấu hình bậc xử phạt (ghi atomic)"""
+        try:
+            os.makedirs(os.path.dirname(self.config_file) or '.', exist_ok=True)
+            config = {
+                'decay_days': self.decay_days,
+                'default': self.default_ladder.to_list(),
+                'guilds': {str(guild_id): ladder.to_list() for guild_id, ladder in self._guild_ladders.items()},
+            }
+            tmp_file = f"{self.config_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(config, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, self.config_file)
+        except Exception as e:
+            logger.error(f"Lỗi khi lưu cấu hình bậc xử phạt: {e}")
+    
+    def get_ladder(self, guild_id: Optional[int]) -> EscalationLadder:
+        return self._guild_ladders.get(guild_id, self.default_ladder)
+    
+    def has_guild_ladder(self, guild_id: int) -> bool:
+        return guild_id in self._guild_ladders
+    
+    def set_guild_ladder(self, guild_id: int, steps: List[EscalationStep]) -> EscalationLadder:
+        """Đặt bậc xử phạt riêng cho server (ValueError nếu không hợp lệ)"""
+        ladder = EscalationLadder(steps)
+        self._guild_ladders[guild_id] = ladder
+        self.save_config()
+        return ladder
+    
+    def reset_guild_ladder(self, guild_id: int) -> bool:
+        """Bỏ bậc xử phạt riêng, server dùng lại bậc mặc định"""
+        if self._guild_ladders.pop(guild_id, None) is None:
+            return False
+        self.save_config()
+        return True
+    
+    def set_decay_days(self, days: float) -> None:
+        if days <= 0:
+            raise ValueError("Số ngày giảm điểm phải > 0")
+        self.decay_days = days
+        self.save_config()
+    
+    # ---------- Warnings ----------
+    
+    def _append(self, entry: dict) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.log_file) or '.', exist_ok=True)
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+            self._log_lines += 1
+        except Exception as e:
+            logger.error(f"Lỗi khi ghi warnings log: {e}")
+    
+    def add_warning(self, user_id: int, reason: str, warned_by: str, guild_id: Optional[int] = None) -> WarningOutcome:
+        """
+        Thêm warning và xác định bậc xử phạt cần áp dụng
+        
+        Returns:
+            WarningOutcome: Tổng warnings, điểm hiện tại trong server, bậc cần áp dụng (nếu có)
+        """
+        record = (time.time(), reason, warned_by, guild_id or 0)
+        state = self._users.get(user_id)
+        if state is None:
+            state = self._users[user_id] = UserWarnings()
+        score = state.add(record, self.decay_period)
+        self._append({'a': user_id, 't': record[0], 'r': reason, 'b': warned_by, 'g': record[3]})
+        
+        ladder = self.get_ladder(guild_id)
+        step = ladder.step_for(score.points)
+        if step is not None:
+            self._escalations += 1
+        return WarningOutcome(state.total, score.points, step, ladder.next_step(score.points))
+    
+    def get_points(self, user_id: int, guild_id: Optional[int] = None) -> int:
+        """Điểm hiện tại của user trong server (None = tổng mọi server), đã trừ theo thời gian"""
+        state = self._users.get(user_id)
+        if state is None:
+            return 0
+        return state.points(guild_id, time.time(), self.decay_period)
+    
+    def get_total(self, user_id: int) -> int:
+        state = self._users.get(user_id)
+        return state.total if state else 0
+    
+    def get_warnings(self, user_id: int, limit: Optional[int] = None) -> list:
+        """
+        Warnings gần nhất của user (cũ -> mới) dạng dict để hiển thị
+        
+        Returns:
+            list: [{'reason', 'warned_by', 'timestamp' (ISO), 'guild_id'}]
+        """
+        state = self._users.get(user_id)
+        if state is None:
+            return []
+        records = list(state.recent)[-limit:] if limit else state.recent
+        return [
+            {
+                'reason': reason,
+                'warned_by': warned_by,
+                'timestamp': datetime.fromtimestamp(timestamp).isoformat(),
+                'guild_id': guild_id,
+            }
+            for timestamp, reason, warned_by, guild_id in records
+        ]
+    
+    def clear_user(self, user_id: int) -> bool:
+        """Xóa tất cả warnings của user"""
+        if self._users.pop(user_id, None) is None:
+            return False
+        self._append({'c': user_id, 't': time.time()})
+        return True
+    
+    def __len__(self) -> int:
+        return len(self._users)
+    
+    # ---------- Compact ----------
+    
+    def needs_compaction(self) -> bool:
+        live_records = sum(len(state.recent) + 1 for state in self._users.values())
+        return self._log_lines > max(COMPACT_MIN_LINES, COMPACT_RATIO * live_records)
+    
+    def compact(self) -> None:
+        """Ghi lại log chỉ gồm record gần nhất + tóm tắt của từng user (ghi atomic)"""
+        try:
+            os.makedirs(os.path.dirname(self.log_file) or '.', exist_ok=True)
+            lines = 0
+            tmp_file = f"{self.log_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                for user_id, state in self._users.items():
+                    for timestamp, reason, warned_by, guild_id in state.recent:
+                        f.write(json.dumps({'a': user_id, 't': timestamp, 'r': reason, 'b': warned_by, 'g': guild_id},
+                                           ensure_ascii=False, separators=(',', ':')) + '\n')
+                    # Dòng tóm tắt đặt sau record để ghi đè tổng/điểm khi replay
+                    scores = {str(guild_id): [score.points, score.anchor] for guild_id, score in state.guilds.items()}
+                    f.write(json.dumps({'s': user_id, 'n': state.total, 'p': scores},
+                                       separators=(',', ':')) + '\n')
+                    lines += len(state.recent) + 1
+            os.replace(tmp_file, self.log_file)
+            logger.info(f"Đã compact warnings log: {self._log_lines} -> {lines} dòng")
+            self._log_lines = lines
+            self._compactions += 1
+        except Exception as e:
+            logger.error(f"Lỗi khi compact warnings log: {e}")
+    
+    def maybe_compact(self) -> bool:
+        """Compact nếu log đã quá dài (gọi định kỳ từ batch save)"""
+        if self.needs_compaction():
+            self.compact()
+            return True
+        return False
+    
+    def get_stats(self) -> dict:
+        """Thống kê engine"""
+        return {
+            'users': len(self._users),
+            'log_lines': self._log_lines,
+            'compactions': self._compactions,
+            'escalations': self._escalations,
+            'guild_ladders': len(self._guild_ladders),
+            'decay_days': self.decay_days,
+        }
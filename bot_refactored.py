@@ -18,75 +18,24 @@ from collections import defaultdict, deque
 # Set UTF-8 encoding for stdout
 sys.stdout.reconfigure(encoding='utf-8')
 
-# Import các command classes
-from bot_files.commands.warn_commands import WarnCommands
-from bot_files.commands.mute_commands import MuteCommands
-from bot_files.commands.ai_commands import AICommands
-from bot_files.commands.admin_commands import AdminCommands
-from bot_files.commands.supreme_admin_commands import SupremeAdminCommands
-from bot_files.commands.info_commands import InfoCommands
-from bot_files.commands.priority_commands import PriorityCommands
-from bot_files.commands.network_commands import NetworkCommands
-from bot_files.commands.chat_commands import ChatCommands
-from bot_files.commands.taixiu_commands import TaiXiuCommands
-from bot_files.commands.backup_commands import BackupCommands
-from bot_files.commands.announce_commands import AnnounceCommands
-from bot_files.commands.spotify_commands import SpotifyCommands
-from bot_files.commands.moderation_commands import ModerationCommands
-from bot_files.commands.channel_commands import ChannelCommands
-from bot_files.commands.server_commands import ServerCommands
-from bot_files.commands.message_commands import MessageCommands
-from bot_files.commands.tiktok_commands import TikTokCommands
-from bot_files.commands.github_commands import GitHubCommands
-from bot_files.commands.video_commands import VideoCommands
-from bot_files.commands.music_commands import MusicCommands
-from bot_files.commands.feedback_commands import FeedbackCommands
-from bot_files.commands.slash_commands import SlashCommands
-from bot_files.commands.emoji_commands import EmojiCommands
-from bot_files.commands.dm_management_commands import DMManagementCommands
-from bot_files.commands.permission_commands import PermissionCommands
-from bot_files.commands.channel_permission_commands import ChannelPermissionCommands
-from bot_files.commands.maintenance_commands import MaintenanceCommands
-from bot_files.commands.github_backup_commands import GitHubBackupCommands
-from bot_files.commands.game_menu_commands import GameMenuCommands
-from bot_files.commands.rps_commands import RPSCommands
-from bot_files.commands.slot_commands import SlotCommands
-from bot_files.commands.blackjack_commands import BlackjackCommands
-from bot_files.commands.wallet_commands import WalletCommands
-from bot_files.commands.wallet_reload_commands import WalletReloadCommands
-from bot_files.commands.daily_commands import DailyCommands
-from bot_files.commands.github_download_commands import GitHubDownloadCommands
-from bot_files.commands.afk_commands import AFKCommands
-from bot_files.commands.ban_commands import BanCommands
-from bot_files.commands.auto_delete_commands import AutoDeleteCommands
-from bot_files.commands.purge_commands import PurgeCommands
-from bot_files.commands.anti_abuse_commands import AntiAbuseCommands
-from bot_files.commands.multibot_commands import MultiBotCommands
-from bot_files.commands.nickname_control_commands import NicknameControlCommands
-from bot_files.commands.admin_nickname_protection import AdminNicknameProtection
-# from bot_files.commands.fire_delete_commands import FireDeleteCommands  # DISABLED - Xóa tính năng fire delete
-from bot_files.commands.channel_restrict_commands import ChannelRestrictCommands
-from bot_files.commands.flip_coin_commands import FlipCoinCommands
-from bot_files.commands.admin_menu_commands import AdminMenuCommands
-from bot_files.commands.bye_commands import ByeCommands
-# from bot_files.commands.shop_commands import ShopCommands  # Đã xóa
-from bot_files.commands.unluck_commands import UnluckCommands
-# from bot_files.commands.leaderboard_commands import LeaderboardCommands  # Đã xóa
-from bot_files.commands.nickname_commands import NicknameCommands
-from bot_files.commands.reset_commands import ResetCommands
-# from bot_files.commands.getkey_commands import GetKeyCommands  # Đã xóa
-from bot_files.commands.complete_menu_commands import CompleteMenuCommands
-from bot_files.commands.auto_reply_commands import AutoReplyCommands
-from bot_files.commands.fishing_commands import FishingCommands
-from bot_files.commands.giveaway_commands import GiveawayCommands
-# from bot_files.commands.full_menu_commands import FullMenuCommands  # Đã tích hợp vào game_menu_commands
-# from bot_files.commands.channel_restriction_commands import ChannelRestrictionCommands  # Đã tắt
+# Command classes được tải theo bot_files/commands/manifest.json (xem utils/module_registry.py)
 
 from bot_files.utils.rate_limiter import RateLimiter
 from bot_files.utils.memory_manager import MemoryManager
 from bot_files.utils.network_optimizer import NetworkOptimizer
 from bot_files.utils.message_cache import message_cache
-from bot_files.utils.shared_wallet import SharedWallet
+from bot_files.utils.shared_wallet import shared_wallet
+from bot_files.utils.guild_stats_tracker import GuildStatsTracker
+from bot_files.utils.warning_engine import WarningEngine
+from bot_files.utils.admin_notifier import AdminNotifier
+from bot_files.utils.role_sync import RoleSyncService
+from bot_files.utils.module_registry import ModuleRegistry
+from bot_files.utils.command_sync import CommandTreeSyncer
+from bot_files.utils.lifecycle import LifecycleManager
+from bot_files.utils.metrics import metrics, MetricsServer
+from bot_files.utils.authorization_index import (
+    AuthorizationIndex, ALLOW_NO_LIMIT, DENY_BANNED, DENY_MAINTENANCE, DENY_DM, DENY_CHANNEL
+)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
@@ -96,6 +45,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+MUTED_ROLE_NAME = "Muted"
+
 class AutoReplyBotRefactored:
     def __init__(self, config_file: str = 'bot_files/data/config.json'):
         """
@@ -121,12 +72,12 @@ class AutoReplyBotRefactored:
             intents=intents,
             max_messages=1000,  # Giới hạn message cache để tiết kiệm RAM
             chunk_guilds_at_startup=False,  # Không load tất cả members lúc start
-            help_command=None  # Disable built-in help command
+            help_command=None,  # Disable built-in help command
+            http_trace=metrics.http_trace_config()  # Đo thời gian request tới Discord API theo host
         )
         
         # Optimized data structures
         self.cooldowns: Dict[int, datetime] = {}
-        self.warnings: Dict[int, deque] = defaultdict(lambda: deque(maxlen=50))  # Giới hạn 50 warnings/user
         self.user_command_history: Dict[int, deque] = defaultdict(lambda: deque(maxlen=1))  # 1 command per 3 seconds per user
         self.user_reply_history: Dict[int, deque] = defaultdict(lambda: deque(maxlen=1))  # 1 reply per 3 seconds per user
         self.admin_ids: Set[int] = set()  # Set nhanh hơn list cho lookup O(1)
@@ -135,16 +86,42 @@ class AutoReplyBotRefactored:
         self.supreme_admin_id: Optional[int] = None  # Supreme Administrator tối cao
         self._command_locks: Dict[str, asyncio.Lock] = {}  # Locks to prevent duplicate command execution
         
-        # Cache để giảm API calls và file I/O
-        self._role_cache: Dict[int, Optional[discord.Role]] = {}  # guild_id -> muted_role
-        
         # Initialize utilities với cài đặt bảo thủ hơn
         self.rate_limiter = RateLimiter(max_concurrent=2, queue_delay=45)
         self.memory_manager = MemoryManager(self)
         self.network_optimizer = NetworkOptimizer(self)
         
-        # Initialize shared wallet
-        self.shared_wallet = SharedWallet()
+        # Index quyền đã biên dịch cho global check (build sau khi setup commands)
+        self.auth_index = AuthorizationIndex(self)
+        
+        # Thống kê member theo trạng thái + timeout của từng server, cập nhật từ gateway events
+        self.guild_stats = GuildStatsTracker()
+        
+        # Gửi cảnh báo moderation cho admin (roster cache, chống lặp, hàng đợi có backoff)
+        self.admin_notifier = AdminNotifier(self)
+        
+        # Đồng bộ role theo rule (LRU cache role theo guild, thêm/gỡ role theo lô trong task nền)
+        self.role_sync = RoleSyncService(self)
+        self.role_sync.register_rule(
+            'muted', MUTED_ROLE_NAME,
+            desired=self._is_member_timed_out,
+            color=discord.Color.dark_grey(),
+            reason="Auto-created for muting users",
+            on_create=self._setup_muted_role
+        )
+        
+        # Sync slash command theo fingerprint (on_ready sau reconnect không sync lại nếu không đổi)
+        self.command_sync = CommandTreeSyncer(self.bot)
+        
+        # Warnings: log append-only + điểm giảm dần + bậc xử phạt
+        self.warning_engine = WarningEngine(
+            log_file=self.config.get('warnings_log_file', 'bot_files/data/warnings_log.jsonl'),
+            config_file=self.config.get('warning_escalation_file', 'bot_files/data/warning_escalation.json'),
+            legacy_file=self.config.get('warnings_file', 'warnings.json')
+        )
+        
+        # Ví chung: cùng 1 instance với utils.shared_wallet mà các command module import
+        self.shared_wallet = shared_wallet
         
         # Load data
         self.load_warnings()
@@ -152,9 +129,30 @@ class AutoReplyBotRefactored:
         self.load_priority_users()
         self.load_supreme_admin()
         
+        # Vòng đời kết nối: khởi động 1 lần + startup job nền + readiness probe
+        self.lifecycle = LifecycleManager()
+        
+        # Metrics (counter/gauge/histogram) export qua HTTP local /metrics + /ready
+        self.metrics = metrics
+        self.command_latency = metrics.histogram(
+            'bot_command_duration_seconds', 'Thời gian chạy lệnh prefix', ('command', 'status')
+        )
+        self.event_latency = metrics.histogram('bot_event_duration_seconds', 'Thời gian xử lý event', ('event',))
+        self.message_stage_latency = metrics.histogram(
+            'bot_on_message_stage_seconds', 'Thời gian từng bước xử lý on_message', ('stage',)
+        )
+        self.metrics_server = MetricsServer(
+            metrics,
+            host=self.config.get('metrics_host', '127.0.0.1'),
+            port=self.config.get('metrics_port', 9108),
+            readiness=self.lifecycle.readiness
+        )
+        metrics.add_collector('bot', self.collect_metrics)
+        
         # Setup events và commands
         try:
             logger.info("Đang setup events...")
+            self.setup_lifecycle()
             self.setup_events()
             logger.info("Đang setup commands...")
             self.setup_commands()
@@ -190,6 +188,8 @@ class AutoReplyBotRefactored:
                 "away": "Tôi hiện không có mặt. Vui lòng để lại tin nhắn."
             },
             "warnings_file": "bot_files/data/warnings.json",
+            "warnings_log_file": "bot_files/data/warnings_log.jsonl",
+            "warning_escalation_file": "bot_files/data/warning_escalation.json",
             "admin_file": "bot_files/data/admin.json",
             "priority_file": "bot_files/data/priority.json",
         }
@@ -229,24 +229,9 @@ class AutoReplyBotRefactored:
     
     def load_warnings(self) -> None:
         """
-        Tải danh sách warnings từ file JSON với deque optimization
+        Tải warnings từ log (lần đầu import từ warnings.json cũ)
         """
-        warnings_file = self.config.get('warnings_file', 'warnings.json')
-        try:
-            if os.path.exists(warnings_file):
-                with open(warnings_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Convert to deque with maxlen for memory efficiency
-                    for user_id_str, warnings_list in data.items():
-                        user_id = int(user_id_str)
-                        # Chỉ lấy 50 warnings gần nhất
-                        recent_warnings = warnings_list[-50:] if len(warnings_list) > 50 else warnings_list
-                        self.warnings[user_id] = deque(recent_warnings, maxlen=50)
-                logger.info(f"Đã tải {len(self.warnings)} user warnings từ {warnings_file}")
-            else:
-                logger.info("Không tìm thấy file warnings, khởi tạo mới")
-        except Exception as e:
-            logger.error(f"Lỗi khi tải warnings: {e}")
+        self.warning_engine.load()
     
     def load_admin_ids(self) -> None:
         """
@@ -320,6 +305,13 @@ class AutoReplyBotRefactored:
         """
         return self.supreme_admin_id is not None and user_id == self.supreme_admin_id
     
+    def refresh_auth_index(self) -> None:
+        """
+        Biên dịch lại index quyền cho global check - gọi sau mỗi lần đổi ban list,
+        admin, priority, maintenance hoặc command/channel permissions
+        """
+        self.auth_index.rebuild()
+    
     def is_admin(self, user_id: int) -> bool:
         """
         Kiểm tra xem user có phải là Admin không (bao gồm Supreme Admin)
@@ -423,37 +415,27 @@ class AutoReplyBotRefactored:
         else:
             await self.rate_limiter.execute_with_rate_limit(ctx, command_func, *args, **kwargs)
     
-    def add_warning(self, user_id: int, reason: str, warned_by: str) -> int:
-        """
-        Thêm warning cho user với deque optimization
+    def add_warning(self, user_id: int, reason: str, warned_by: str, guild_id: Optional[int] = None):
         """
-        warning_data = {
-            'reason': reason,
-            'warned_by': warned_by,
-            'timestamp': datetime.now().isoformat()
-        }
+        Thêm warning cho user (ghi log ngay, không cần batch save)
         
-        self.warnings[user_id].append(warning_data)
-        self.mark_for_save()
-        
-        return len(self.warnings[user_id])
+        Returns:
+            WarningOutcome: Tổng warnings, điểm hiện tại và bậc xử phạt cần áp dụng
+        """
+        return self.warning_engine.add_warning(user_id, reason, warned_by, guild_id)
     
-    def get_warnings(self, user_id: int) -> list:
+    def get_warnings(self, user_id: int, limit: Optional[int] = None) -> list:
         """
-        Lấy danh sách warnings của user
+        Lấy danh sách warnings gần nhất của user
         """
-        return list(self.warnings.get(user_id, []))
+        return self.warning_engine.get_warnings(user_id, limit)
     
     def clear_user_warnings(self, user_id: int):
         """
         Xóa tất cả warnings của user (reset về 0)
         """
-        if user_id in self.warnings:
-            del self.warnings[user_id]
+        if self.warning_engine.clear_user(user_id):
             logger.info(f"Đã xóa tất cả warnings của user ID {user_id}")
-        
-        # Trigger save để lưu thay đổi
-        self.memory_manager.trigger_save()
     
     def has_warn_permission(self, user_id: int, guild_permissions) -> bool:
         """
@@ -475,41 +457,24 @@ class AutoReplyBotRefactored:
     
     async def get_muted_role_cached(self, guild: discord.Guild) -> Optional[discord.Role]:
         """
-        Cache-optimized method để get muted role
+        Cache-optimized method để get muted role (tạo mới nếu server chưa có)
         """
-        # Check cache first
-        if guild.id in self._role_cache:
-            return self._role_cache[guild.id]
-        
-        # Find existing role
-        muted_role = discord.utils.get(guild.roles, name="Muted")
-        
-        if not muted_role:
+        return await self.role_sync.get_rule_role(guild, 'muted')
+    
+    async def _setup_muted_role(self, guild: discord.Guild, muted_role: discord.Role) -> None:
+        """Chặn gửi tin nhắn của role Muted mới tạo"""
+        # Batch setup permissions cho text channels only
+        text_channels = [ch for ch in guild.channels if isinstance(ch, discord.TextChannel)]
+        for channel in text_channels[:10]:  # Giới hạn 10 channels để tránh rate limit
             try:
-                # Create new role with optimized permissions
-                muted_role = await guild.create_role(
-                    name="Muted",
-                    color=discord.Color.dark_grey(),
-                    reason="Auto-created for muting users"
-                )
-                
-                # Batch setup permissions cho text channels only
-                text_channels = [ch for ch in guild.channels if isinstance(ch, discord.TextChannel)]
-                for channel in text_channels[:10]:  # Giới hạn 10 channels để tránh rate limit
-                    try:
-                        await channel.set_permissions(muted_role, send_messages=False)
-                    except discord.Forbidden:
-                        continue  # Skip nếu không có quyền
-                        
-                logger.info(f"Created Muted role for guild {guild.name}")
-                
+                await channel.set_permissions(muted_role, send_messages=False)
             except discord.Forbidden:
-                logger.warning(f"Cannot create Muted role in {guild.name}")
-                muted_role = None
-        
-        # Cache the result
-        self._role_cache[guild.id] = muted_role
-        return muted_role
+                continue  # Skip nếu không có quyền
+    
+    @staticmethod
+    def _is_member_timed_out(member: discord.Member) -> bool:
+        """Rule 'muted': member đang bị timeout thì giữ role Muted"""
+        return bool(member.timed_out_until and member.timed_out_until > datetime.now(member.timed_out_until.tzinfo))
     
     async def auto_unmute_after_delay(self, guild, member: discord.Member, delay_minutes: int = 1):
         """
@@ -520,7 +485,7 @@ class AutoReplyBotRefactored:
             await asyncio.sleep(delay_minutes * 60)
             
             # Tìm role "Muted"
-            muted_role = discord.utils.get(guild.roles, name="Muted")
+            muted_role = await self.role_sync.get_role(guild, MUTED_ROLE_NAME)
             if not muted_role:
                 return
             
@@ -556,6 +521,145 @@ class AutoReplyBotRefactored:
         except Exception as e:
             logger.error(f"Error in auto-unmute for {member}: {e}")
     
+    def setup_lifecycle(self) -> None:
+        """
+        Đăng ký công việc khởi động với lifecycle manager:
+        hook chạy 1 lần ở on_ready đầu tiên, startup job chạy nền, reconnect hook
+        """
+        lifecycle = self.lifecycle
+        
+        def start_utilities():
+            logger.info(f"Bot ID: {self.bot.user.id}")
+            logger.info(f"Auto-reply đã được {'bật' if self.config['enabled'] else 'tắt'}")
+            logger.info("Rate Limiting: 1 lệnh/3s, 1 reply/3s cho mỗi user")
+            # Start utilities sau khi có event loop
+            self.rate_limiter.start()
+            self.memory_manager.start()
+        
+        def register_views():
+            # Đăng ký persistent views (menu dùng chung + ván game đang chơi dở)
+            if hasattr(self, 'game_menu_commands'):
+                self.game_menu_commands.register_persistent_views()
+        
+        def start_module_warmup():
+            # Tải dần các command module lazy trong nền
+            if self.config.get('module_warmup', True):
+                self.module_registry.start_warmup()
+            else:
+                self.module_registry.profiler.mark_ready()
+            stats = self.module_registry.get_stats()
+            logger.info(f"Khởi động: {stats['startup_ms']:.0f}ms tới on_ready, module eager {stats['eager_ms']:.0f}ms, {stats['pending_lazy']} module lazy chưa tải")
+        
+        lifecycle.on_first_ready('utilities', start_utilities)
+        lifecycle.on_first_ready('persistent_views', register_views)
+        lifecycle.on_first_ready('module_warmup', start_module_warmup)
+        
+        async def start_dm_cleanup():
+            if hasattr(self, 'dm_management_commands'):
+                await self.dm_management_commands.start_cleanup_task()
+        
+        async def seed_guild_stats():
+            # Seed thống kê member các server (nhường event loop theo lô)
+            await self.guild_stats.seed_all(self.bot.guilds)
+        
+        async def sync_slash_commands():
+            # Sync slash commands (chỉ gọi API khi fingerprint cây lệnh đổi)
+            synced_count = await self.slash_commands.sync_commands()
+            logger.info(f"Synced {synced_count} slash commands")
+        
+        lifecycle.add_startup_job('slash_sync', sync_slash_commands)
+        lifecycle.add_startup_job('guild_stats_seed', seed_guild_stats)
+        lifecycle.add_startup_job('dm_cleanup', start_dm_cleanup)
+        lifecycle.add_startup_job('banner', self.print_startup_banner)
+        
+        # Theo dõi file ví để áp dụng chỉnh sửa từ bên ngoài (tắt bằng config wallet_watch: false)
+        if self.config.get('wallet_watch', True):
+            lifecycle.add_startup_job('wallet_watch', self.shared_wallet.start_watching)
+        
+        # Sau reconnect cache guild được gửi lại từ đầu: seed lại để bù event bị lỡ khi mất kết nối
+        lifecycle.on_reconnect('guild_stats_seed', seed_guild_stats)
+    
+    def print_startup_banner(self) -> None:
+        """In invite link, danh sách lệnh và admin (startup job, chạy sau khi bot đã nhận event)"""
+        # Hiển thị invite link
+        invite_link = self.get_invite_link()
+        logger.info(f"Invite link: {invite_link}")
+        print(f"{invite_link}")
+        print("\n📝 Lưu ý quan trọng:")
+        print("- Bot cần được mời vào server để có thể nhận DM từ thành viên")
+        print("- Hoặc người dùng phải bật 'Cho phép tin nhắn trực tiếp từ thành viên server'")
+        print("- Bot không thể bypass cài đặt riêng tư của người dùng")
+        print("\n⚠️  Lệnh có sẵn:")
+        print("  • ;help - Hướng dẫn sử dụng bot và lời chào")
+        print("  • ;menu hoặc /menu - Hiển thị menu tất cả lệnh có sẵn")
+        print("  • ;warn @user <lý do> - Cảnh báo user (tự động timeout/ban theo bậc ;warnladder)")
+        print("  • ;mute @user <thời gian> <lý do> - Mute user với thời gian tùy chỉnh")
+        print("  • ;unmute @user - Remove timeout user")
+        print("  • ;warnings [@user] - Xem lịch sử warnings")
+        print("  • ;muteinfo [@user] - Xem thông tin mute của user hoặc tất cả users")
+        print("  • ;amenconfig - Quản lý thông báo mute DM (admin)")
+        print("  • ;status - Xem trạng thái bot, CPU, RAM, ping")
+        print("  • ;nhom - Xem thông tin chi tiết server (members, channels, etc)")
+        print("  • ;taixiu tai/xiu <số tiền> - Chơi game tài xỉu")
+        print("  • ;taixiustats [@user] - Xem thống kê tài xỉu")
+        print("  • ;give @user <số tiền> - Give tiền cho member (admin)")
+        print("  • ;admin add/remove/list - Quản lý admin")
+        print("  • ;supremeadmin set/remove/info - Quản lý Supreme Admin (quyền tối cao)")
+        print("  • ;addpriority <user_id> - Cấp quyền bypass rate limiting")
+        print("  • ;removepriority <user_id> - Xóa quyền bypass")
+        print("  • ;listpriority - Xem danh sách priority users")
+        print("  • ;netping - Chẩn đoán kết nối và ping")
+        print("  • ;netstat - Thống kê network chi tiết")
+        print("  • ;dm <user_id> hoặc ;dm @user <nội dung> - Gửi DM cho user (không delay)")
+        print("  • ;chatroom <channel_id> <nội dung> - Gửi tin nhắn vào channel theo ID")
+        print("  • ;emoji <message_id> - Thêm emoji reaction ngẫu nhiên vào tin nhắn")
+        print("  • ;spotify <url> - Hiển thị bot đang nghe nhạc Spotify (admin, tự động tắt)")
+        print("  • ;stopmusic - Dừng hiển thị trạng thái nhạc (admin)")
+        print("  • ;debug <link> - Debug Python code với AI")
+        print("  • ;preview <link> - Preview code với AI")
+        print("  • ;ask <câu hỏi> - Hỏi CodeMaster AI")
+        print("  • @bot <tin nhắn> - Chat với AI (mention bot để trò chuyện)")
+        print("  • ;apistatus - Xem trạng thái các API Gemini (admin)")
+        print("  • ;switchapi - Chuyển sang API tiếp theo (admin)")
+        print("  • ;test - Kiểm tra bot hoạt động")
+        print("  • ;bot - Giới thiệu về bot creator")
+        print("  • ;bio <nội dung> - Cập nhật status bot (admin)")
+        print("  • ;tiktok <username> - Lấy thông tin tài khoản TikTok")
+        print("  • ;github <username> - Lấy thông tin tài khoản GitHub")
+        print("  • ;video <tên video> - Gửi video vào kênh hiện tại")
+        print("  • ;video add <URL> <tên> - Tải video từ URL (admin)")
+        print("  • ;listvideo - Xem danh sách video có sẵn")
+        print("  • ;feedback <nội dung> - Gửi feedback cho Supreme Admin")
+        print("  • ;feedbackstats - Xem thống kê feedback (Supreme Admin)")
+        print("  • ;reload [module] - Reload commands modules (Supreme Admin)")
+        print("  • ;listmodules - Xem danh sách modules có thể reload (Supreme Admin)")
+        print("  • ;checkdms [số lượng] - Xem tin nhắn DM gần đây (Supreme Admin)")
+        print("  • ;cleanupdms - Xóa DM cũ hơn 3 ngày (Supreme Admin)")
+        print("  • ;afk [lý do] - Đặt trạng thái AFK với lý do")
+        print("  • ;unafk - Bỏ trạng thái AFK thủ công")
+        print("  • ;afklist - Xem danh sách users đang AFK")
+        print("\n🔇 Hệ thống warn: Điểm tính riêng từng server, giảm dần khi không vi phạm, tự động timeout/ban khỏi server theo bậc (;warnladder)")
+        print("\n🚦 Rate Limiting: 1 lệnh/3s, 1 AI reply/3s cho mỗi user")
+        print("💡 Supreme Admin và Priority users được bypass rate limiting")
+        print("📱 Hỗ trợ cả prefix commands (;) và slash commands (/)")
+        
+        
+        # Log số lượng commands đã load
+        commands_count = len(self.bot.commands)
+        logger.info(f"Đã load {commands_count} commands: {[cmd.name for cmd in self.bot.commands]}")
+        print(f"📋 Đã load {commands_count} commands: {', '.join([cmd.name for cmd in self.bot.commands])}")
+        
+        # Log số lượng admin IDs
+        logger.info(f"Đã load {len(self.admin_ids)} admin IDs: {self.admin_ids}")
+        print(f"👑 Admin IDs được cấp quyền warn: {len(self.admin_ids)} người")
+        
+        # Log Supreme Admin
+        if self.supreme_admin_id:
+            logger.info(f"Supreme Admin ID: {self.supreme_admin_id}")
+            print(f"🔥 Supreme Admin (Quyền tối cao): {self.supreme_admin_id}")
+        else:
+            print("⚪ Chưa có Supreme Admin (sử dụng ;supremeadmin set <user_id>)")
+    
     def setup_events(self) -> None:
         """
         Thiết lập các event handler cho Discord bot
@@ -566,110 +670,28 @@ class AutoReplyBotRefactored:
             if not self.bot.user:
                 logger.error("Bot user is None in on_ready event")
                 return
-                
-            logger.info(f"Refactored bot đã đăng nhập thành công: {self.bot.user}")
-            logger.info(f"Bot ID: {self.bot.user.id}")
-            logger.info(f"Auto-reply đã được {'bật' if self.config['enabled'] else 'tắt'}")
-            logger.info("Rate Limiting: 1 lệnh/3s, 1 reply/3s cho mỗi user")
-            
-            # Start utilities sau khi có event loop
-            self.rate_limiter.start()
-            self.memory_manager.start()
-            
-            # Start DM cleanup task
-            if hasattr(self, 'dm_management_commands'):
-                asyncio.create_task(self.dm_management_commands.start_cleanup_task())
             
-            # Sync slash commands
-            try:
-                synced_count = await self.slash_commands.sync_commands()
-                logger.info(f"Synced {synced_count} slash commands")
-                print(f"🔄 Synced {synced_count} slash commands")
-            except Exception as e:
-                logger.error(f"Failed to sync slash commands: {e}")
-                print(f"❌ Failed to sync slash commands: {e}")
-            
-            # Hiển thị invite link
-            invite_link = self.get_invite_link()
-            logger.info(f"Invite link: {invite_link}")
-            print(f"{invite_link}")
-            print("\n📝 Lưu ý quan trọng:")
-            print("- Bot cần được mời vào server để có thể nhận DM từ thành viên")
-            print("- Hoặc người dùng phải bật 'Cho phép tin nhắn trực tiếp từ thành viên server'")
-            print("- Bot không thể bypass cài đặt riêng tư của người dùng")
-            print("\n⚠️  Lệnh có sẵn:")
-            print("  • ;help - Hướng dẫn sử dụng bot và lời chào")
-            print("  • ;menu hoặc /menu - Hiển thị menu tất cả lệnh có sẵn")
-            print("  • ;warn @user <lý do> - Cảnh báo user (timeout sau 3 lần)")
-            print("  • ;mute @user <thời gian> <lý do> - Mute user với thời gian tùy chỉnh")
-            print("  • ;unmute @user - Remove timeout user")
-            print("  • ;warnings [@user] - Xem lịch sử warnings")
-            print("  • ;muteinfo [@user] - Xem thông tin mute của user hoặc tất cả users")
-            print("  • ;amenconfig - Quản lý thông báo mute DM (admin)")
-            print("  • ;status - Xem trạng thái bot, CPU, RAM, ping")
-            print("  • ;nhom - Xem thông tin chi tiết server (members, channels, etc)")
-            print("  • ;taixiu tai/xiu <số tiền> - Chơi game tài xỉu")
-            print("  • ;taixiustats [@user] - Xem thống kê tài xỉu")
-            print("  • ;give @user <số tiền> - Give tiền cho member (admin)")
-            print("  • ;admin add/remove/list - Quản lý admin")
-            print("  • ;supremeadmin set/remove/info - Quản lý Supreme Admin (quyền tối cao)")
-            print("  • ;addpriority <user_id> - Cấp quyền bypass rate limiting")
-            print("  • ;removepriority <user_id> - Xóa quyền bypass")
-            print("  • ;listpriority - Xem danh sách priority users")
-            print("  • ;netping - Chẩn đoán kết nối và ping")
-            print("  • ;netstat - Thống kê network chi tiết")
-            print("  • ;dm <user_id> hoặc ;dm @user <nội dung> - Gửi DM cho user (không delay)")
-            print("  • ;chatroom <channel_id> <nội dung> - Gửi tin nhắn vào channel theo ID")
-            print("  • ;emoji <message_id> - Thêm emoji reaction ngẫu nhiên vào tin nhắn")
-            print("  • ;spotify <url> - Hiển thị bot đang nghe nhạc Spotify (admin, tự động tắt)")
-            print("  • ;stopmusic - Dừng hiển thị trạng thái nhạc (admin)")
-            print("  • ;debug <link> - Debug Python code với AI")
-            print("  • ;preview <link> - Preview code với AI")
-            print("  • ;ask <câu hỏi> - Hỏi CodeMaster AI")
-            print("  • @bot <tin nhắn> - Chat với AI (mention bot để trò chuyện)")
-            print("  • ;apistatus - Xem trạng thái các API Gemini (admin)")
-            print("  • ;switchapi - Chuyển sang API tiếp theo (admin)")
-            print("  • ;test - Kiểm tra bot hoạt động")
-            print("  • ;bot - Giới thiệu về bot creator")
-            print("  • ;bio <nội dung> - Cập nhật status bot (admin)")
-            print("  • ;tiktok <username> - Lấy thông tin tài khoản TikTok")
-            print("  • ;github <username> - Lấy thông tin tài khoản GitHub")
-            print("  • ;video <tên video> - Gửi video vào kênh hiện tại")
-            print("  • ;video add <URL> <tên> - Tải video từ URL (admin)")
-            print("  • ;listvideo - Xem danh sách video có sẵn")
-            print("  • ;feedback <nội dung> - Gửi feedback cho Supreme Admin")
-            print("  • ;feedbackstats - Xem thống kê feedback (Supreme Admin)")
-            print("  • ;reload [module] - Reload commands modules (Supreme Admin)")
-            print("  • ;listmodules - Xem danh sách modules có thể reload (Supreme Admin)")
-            print("  • ;checkdms [số lượng] - Xem tin nhắn DM gần đây (Supreme Admin)")
-            print("  • ;cleanupdms - Xóa DM cũ hơn 3 ngày (Supreme Admin)")
-            print("  • ;afk [lý do] - Đặt trạng thái AFK với lý do")
-            print("  • ;unafk - Bỏ trạng thái AFK thủ công")
-            print("  • ;afklist - Xem danh sách users đang AFK")
-            print("\n🔇 Hệ thống timeout: Tự động timeout 1 phút sau 3 warnings")
-            print("\n🚦 Rate Limiting: 1 lệnh/3s, 1 AI reply/3s cho mỗi user")
-            print("💡 Supreme Admin và Priority users được bypass rate limiting")
-            print("📱 Hỗ trợ cả prefix commands (;) và slash commands (/)")
-            
-            
-            # Log số lượng commands đã load
-            commands_count = len(self.bot.commands)
-            logger.info(f"Đã load {commands_count} commands: {[cmd.name for cmd in self.bot.commands]}")
-            print(f"📋 Đã load {commands_count} commands: {', '.join([cmd.name for cmd in self.bot.commands])}")
-            
-            # Log số lượng admin IDs
-            logger.info(f"Đã load {len(self.admin_ids)} admin IDs: {self.admin_ids}")
-            print(f"👑 Admin IDs được cấp quyền warn: {len(self.admin_ids)} người")
-            
-            # Log Supreme Admin
-            if self.supreme_admin_id:
-                logger.info(f"Supreme Admin ID: {self.supreme_admin_id}")
-                print(f"🔥 Supreme Admin (Quyền tối cao): {self.supreme_admin_id}")
-            else:
-                print("⚪ Chưa có Supreme Admin (sử dụng ;supremeadmin set <user_id>)")
+            # on_ready chạy lại sau mỗi lần reconnect - lifecycle chỉ khởi động ở lần đầu
+            logger.info(f"Refactored bot đã đăng nhập thành công: {self.bot.user} (lần {self.lifecycle.ready_count + 1})")
+            await self.lifecycle.handle_ready()
+        
+        @self.bot.event
+        async def on_resumed():
+            self.lifecycle.handle_resumed()
+        
+        @self.bot.event
+        async def on_disconnect():
+            self.lifecycle.handle_disconnect()
         
         @self.bot.event
         async def on_message(message):
+            with self.event_latency.time(event='on_message'):
+                await dispatch_message(message)
+        
+        # Mỗi bước của on_message được đo riêng (bot_on_message_stage_seconds{stage=...})
+        timed_stage = self.message_stage_latency.time
+        
+        async def dispatch_message(message):
             # Bỏ qua tin nhắn từ chính bot (kiểm tra bot đã sẵn sàng)
             if not self.bot.user or message.author == self.bot.user:
                 return
@@ -750,73 +772,88 @@ class AutoReplyBotRefactored:
             if message.content.startswith(';'):
                 logger.info(f"Command detected: {message.content} from {message.author}")
             
+            # Anti-spam/raid chạy đầu tiên (trừ commands) - spam thì dừng xử lý luôn
+            if hasattr(self, 'anti_abuse_commands') and not message.content.startswith(';'):
+                with timed_stage(stage='anti_spam'):
+                    if await self.anti_abuse_commands.check_message_for_spam(message):
+                        return
+            
             # Xử lý Auto Delete system trước tất cả (trừ commands)
             if hasattr(self, 'auto_delete_commands') and not message.content.startswith(';'):
-                await self.auto_delete_commands.handle_auto_delete_message(message)
-                # Nếu tin nhắn bị xóa, không xử lý gì thêm
-                try:
-                    # Kiểm tra tin nhắn còn tồn tại không
-                    await message.channel.fetch_message(message.id)
-                except discord.NotFound:
-                    # Tin nhắn đã bị xóa bởi auto delete
-                    return
-                except:
-                    pass
+                with timed_stage(stage='auto_delete'):
+                    await self.auto_delete_commands.handle_auto_delete_message(message)
+                    # Nếu tin nhắn bị xóa, không xử lý gì thêm
+                    try:
+                        # Kiểm tra tin nhắn còn tồn tại không
+                        await message.channel.fetch_message(message.id)
+                    except discord.NotFound:
+                        # Tin nhắn đã bị xóa bởi auto delete
+                        return
+                    except:
+                        pass
             
             # Xử lý Channel Restriction system (trừ commands)
             if hasattr(self, 'channel_restrict_commands') and not message.content.startswith(';'):
-                deleted = await self.channel_restrict_commands.handle_channel_restrict_message(message)
+                with timed_stage(stage='channel_restrict'):
+                    deleted = await self.channel_restrict_commands.handle_channel_restrict_message(message)
                 if deleted:
                     return  # Tin nhắn đã bị xóa do vi phạm channel restriction
             
             # Xử lý Auto-Reply system (trừ commands)
             if hasattr(self, 'auto_reply_commands') and not message.content.startswith(';'):
-                replied = await self.auto_reply_commands.handle_auto_reply(message)
+                with timed_stage(stage='auto_reply'):
+                    replied = await self.auto_reply_commands.handle_auto_reply(message)
                 # Không return ở đây để cho phép các handler khác chạy tiếp
             
             # Channel Restriction system đã được tắt - xóa bỏ để tránh spam logs
             
             # Xử lý AFK system trước khi xử lý commands
             if hasattr(self, 'afk_commands'):
-                # Xử lý user quay lại từ AFK (trừ khi là command AFK)
-                if not message.content.startswith(';afk') and not message.content.startswith(';unafk'):
-                    await self.afk_commands.handle_user_return(message)
+                with timed_stage(stage='afk'):
+                    # Xử lý user quay lại từ AFK (trừ khi là command AFK)
+                    if not message.content.startswith(';afk') and not message.content.startswith(';unafk'):
+                        await self.afk_commands.handle_user_return(message)
                 
-                # Xử lý mention users AFK (bao gồm Supreme Admin)
-                if message.mentions:
-                    await self.afk_commands.handle_afk_mention(message)
-                    # Xử lý riêng cho Supreme Admin mention
-                    await self.afk_commands.handle_supreme_admin_mention(message)
+                    # Xử lý mention users AFK (bao gồm Supreme Admin)
+                    if message.mentions:
+                        await self.afk_commands.handle_afk_mention(message)
+                        # Xử lý riêng cho Supreme Admin mention
+                        await self.afk_commands.handle_supreme_admin_mention(message)
                     
-                    # Xử lý Bye system - admin được mention sẽ tự động trả lời
-                    if hasattr(self, 'bye_commands'):
-                        await self.bye_commands.handle_bye_mention(message)
+                        # Xử lý Bye system - admin được mention sẽ tự động trả lời
+                        if hasattr(self, 'bye_commands'):
+                            await self.bye_commands.handle_bye_mention(message)
             
             # Kiểm tra Anti-Abuse trước khi xử lý commands (đặc biệt là ;ask)
             if hasattr(self, 'anti_abuse_commands'):
-                abuse_handled = await self.anti_abuse_commands.check_message_for_abuse(message)
+                with timed_stage(stage='anti_abuse'):
+                    abuse_handled = await self.anti_abuse_commands.check_message_for_abuse(message)
                 if abuse_handled:
                     return  # Đã xử lý xúc phạm, dừng hoàn toàn
             
             # Xử lý commands trước - KHÔNG xử lý gì khác nếu là command
             if message.content.startswith(';'):
-                await self.bot.process_commands(message)
+                with timed_stage(stage='commands'):
+                    await self.bot.process_commands(message)
                 return  # Dừng xử lý ở đây để tránh duplicate
             
             # Xử lý mention bot với AI response (chỉ khi KHÔNG phải command)
             if self.bot.user and self.bot.user in message.mentions:
                 # Anti-abuse đã được kiểm tra ở trên, tiếp tục với AI response
-                await self.handle_bot_mention(message)
+                with timed_stage(stage='bot_mention'):
+                    await self.handle_bot_mention(message)
                 return  # Dừng xử lý ở đây
             
             # Xử lý reply đến tin nhắn của bot
             if message.reference and message.reference.message_id:
-                await self.handle_reply_to_bot(message)
+                with timed_stage(stage='reply_to_bot'):
+                    await self.handle_reply_to_bot(message)
                 return
             
             # Chỉ xử lý tin nhắn riêng (DM) cho auto-reply
             if isinstance(message.channel, discord.DMChannel):
-                await self.handle_dm(message)
+                with timed_stage(stage='dm'):
+                    await self.handle_dm(message)
         
         # Thêm global check cho rate limiting
         @self.bot.check
@@ -828,8 +865,18 @@ class AutoReplyBotRefactored:
             if not self.bot.user:
                 return False
             
-            # Kiểm tra user có bị ban không
-            if hasattr(self, 'ban_commands') and self.ban_commands.is_user_banned(ctx.author.id):
+            # Ban, bảo trì, DM, channel permissions, bypass rate limit: 1 lần tra cứu index đã biên dịch
+            command_name = ctx.command.name if ctx.command else None
+            is_dm = isinstance(ctx.channel, discord.DMChannel)
+            verdict = self.auth_index.check(
+                ctx.author.id,
+                ctx.guild.id if ctx.guild else None,
+                ctx.channel.id,
+                command_name,
+                is_dm
+            )
+            
+            if verdict == DENY_BANNED:
                 # Log khi user bị ban cố gắng sử dụng lệnh
                 logger.warning(f"Banned user {ctx.author.id} ({ctx.author}) attempted to use command: {ctx.command}")
                 
@@ -837,85 +884,68 @@ class AutoReplyBotRefactored:
                 # (DM notification đã được xử lý trong on_message)
                 return False  # Chặn command
             
-            # Kiểm tra maintenance mode (cho phép close, open, maintenancestatus)
-            if hasattr(self, 'maintenance_manager'):
-                maintenance_allowed_commands = ['close', 'open', 'maintenancestatus', 'maintenance', 'lock', 'unlock', 'unmaintenance', 'mstatus']
-                command_name = ctx.command.name if ctx.command else None
+            if verdict == DENY_MAINTENANCE:
+                # Chỉ Supreme Admin mới có thể dùng lệnh trong maintenance mode
+                embed = discord.Embed(
+                    title="🔒 Bot đang bảo trì",
+                    description="Bot hiện đang trong chế độ bảo trì!",
+                    color=discord.Color.red()
+                )
                 
-                if self.maintenance_manager.is_maintenance_mode():
-                    # Chỉ Supreme Admin mới có thể dùng lệnh trong maintenance mode
-                    if not self.is_supreme_admin(ctx.author.id):
-                        # Check nếu là lệnh được phép (status check)
-                        if command_name not in maintenance_allowed_commands:
-                            embed = discord.Embed(
-                                title="🔒 Bot đang bảo trì",
-                                description="Bot hiện đang trong chế độ bảo trì!",
-                                color=discord.Color.red()
-                            )
-                            
-                            maintenance_data = self.maintenance_manager.maintenance_data
-                            closed_by = maintenance_data.get('closed_by', {})
-                            reason = maintenance_data.get('reason', 'Đang bảo trì hệ thống')
-                            
-                            embed.add_field(
-                                name="📝 Lý do",
-                                value=reason,
-                                inline=False
-                            )
-                            
-                            embed.add_field(
-                                name="👤 Thông báo bởi",
-                                value=closed_by.get('name', 'Admin'),
-                                inline=True
-                            )
-                            
-                            embed.set_footer(text="Vui lòng chờ bot hoạt động trở lại • Sử dụng ;maintenancestatus để xem chi tiết")
-                            
-                            await ctx.reply(embed=embed, mention_author=True)
-                            return False
+                maintenance_info = self.auth_index.maintenance_info
+                closed_by = maintenance_info.get('closed_by', {})
+                reason = maintenance_info.get('reason', 'Đang bảo trì hệ thống')
+                
+                embed.add_field(
+                    name="📝 Lý do",
+                    value=reason,
+                    inline=False
+                )
+                
+                embed.add_field(
+                    name="👤 Thông báo bởi",
+                    value=closed_by.get('name', 'Admin'),
+                    inline=True
+                )
+                
+                embed.set_footer(text="Vui lòng chờ bot hoạt động trở lại • Sử dụng ;maintenancestatus để xem chi tiết")
+                
+                await ctx.reply(embed=embed, mention_author=True)
+                return False
             
-            # Cho phép DM chỉ cho Admin
-            if isinstance(ctx.channel, discord.DMChannel):
+            if verdict == DENY_DM:
                 # Chỉ Admin và Supreme Admin có thể dùng lệnh qua DM
-                if self.is_admin(ctx.author.id) or self.is_supreme_admin(ctx.author.id):
-                    return True
+                await ctx.reply(
+                    "❌ **Chỉ Admin mới có thể sử dụng lệnh qua DM!**\n\n"
+                    "👤 **User thường:** Vui lòng sử dụng bot trong server\n"
+                    "👑 **Admin:** Có thể sử dụng bot mọi nơi",
+                    mention_author=True
+                )
+                return False
+            
+            if verdict == DENY_CHANNEL:
+                # Gợi ý DM chỉ cho admin
+                if self.auth_index.is_admin(ctx.author.id):
+                    await ctx.reply(
+                        "❌ **Bot không thể hoạt động trong kênh này!**\n"
+                        "💬 **Gợi ý:** Admin có thể sử dụng bot qua DM (tin nhắn riêng)",
+                        mention_author=True
+                    )
                 else:
                     await ctx.reply(
-                        "❌ **Chỉ Admin mới có thể sử dụng lệnh qua DM!**\n\n"
-                        "👤 **User thường:** Vui lòng sử dụng bot trong server\n"
-                        "👑 **Admin:** Có thể sử dụng bot mọi nơi",
+                        "❌ **Bot không thể hoạt động trong kênh này!**\n"
+                        "🔍 **Gợi ý:** Tìm kênh được phép hoặc liên hệ admin",
                         mention_author=True
                     )
-                    return False
+                return False
+            
+            # Supreme Admin, Priority users (và Admin qua DM) bypass rate limiting
+            if verdict == ALLOW_NO_LIMIT:
+                return True
             
-            # Kiểm tra channel permissions (chỉ cho guild, không cho DM)
-            if ctx.guild and hasattr(self, 'channel_permission_manager'):
-                # Lấy tên command (bỏ prefix)
-                command_name = ctx.command.name if ctx.command else None
-                
-                if not self.channel_permission_manager.is_channel_allowed(ctx.guild.id, ctx.channel.id, command_name):
-                    # Gợi ý DM chỉ cho admin
-                    if self.is_admin(ctx.author.id) or self.is_supreme_admin(ctx.author.id):
-                        await ctx.reply(
-                            "❌ **Bot không thể hoạt động trong kênh này!**\n"
-                            "💬 **Gợi ý:** Admin có thể sử dụng bot qua DM (tin nhắn riêng)",
-                            mention_author=True
-                        )
-                    else:
-                        await ctx.reply(
-                            "❌ **Bot không thể hoạt động trong kênh này!**\n"
-                            "🔍 **Gợi ý:** Tìm kênh được phép hoặc liên hệ admin",
-                            mention_author=True
-                        )
-                    return False
-                
             current_time = datetime.now()
             user_id = ctx.author.id
             
-            # Supreme Admin và Priority users bypass rate limiting
-            if self.is_supreme_admin(user_id) or user_id in self.priority_users:
-                return True
-            
             # Kiểm tra rate limit
             if self.is_user_rate_limited(user_id, current_time):
                 reset_time = self.get_rate_limit_reset_time(user_id, current_time)
@@ -930,6 +960,21 @@ class AutoReplyBotRefactored:
             self.add_user_command(user_id, current_time)
             return True
         
+        # Đo thời gian chạy lệnh (chỉ lệnh đã qua global check; after_invoke chạy cả khi lệnh lỗi)
+        @self.bot.before_invoke
+        async def start_command_timer(ctx):
+            ctx.metrics_started = time.perf_counter()
+        
+        @self.bot.after_invoke
+        async def record_command_latency(ctx):
+            started = getattr(ctx, 'metrics_started', None)
+            if started is not None and ctx.command:
+                self.command_latency.observe(
+                    time.perf_counter() - started,
+                    command=ctx.command.qualified_name,
+                    status='error' if ctx.command_failed else 'ok'
+                )
+        
         @self.bot.event
         async def on_command_error(ctx, error):
             """Xử lý lỗi commands"""
@@ -1025,6 +1070,9 @@ class AutoReplyBotRefactored:
         async def on_member_update(before, after):
             """Xử lý khi member update (nickname, roles, etc.)"""
             try:
+                # Cập nhật timeout cho thống kê server
+                self.guild_stats.on_member_update(before, after)
+                
                 # Xử lý Nickname Control system (cũ)
                 if hasattr(self, 'nickname_commands'):
                     await self.nickname_commands.handle_member_update(before, after)
@@ -1038,161 +1086,55 @@ class AutoReplyBotRefactored:
                     await self.admin_nickname_protection.handle_member_update(before, after)
             except Exception as e:
                 logger.error(f"Lỗi trong on_member_update: {e}")
+        
+        @self.bot.event
+        async def on_presence_update(before, after):
+            """Cập nhật bộ đếm trạng thái (online/idle/dnd/offline)"""
+            try:
+                self.guild_stats.on_presence_update(before, after)
+            except Exception as e:
+                logger.error(f"Lỗi trong on_presence_update: {e}")
+        
+        @self.bot.event
+        async def on_member_join(member):
+            """Cập nhật thống kê khi có member mới"""
+            try:
+                self.guild_stats.on_member_join(member)
+            except Exception as e:
+                logger.error(f"Lỗi trong on_member_join: {e}")
+        
+        @self.bot.event
+        async def on_member_remove(member):
+            """Cập nhật thống kê khi member rời server"""
+            try:
+                self.guild_stats.on_member_remove(member)
+            except Exception as e:
+                logger.error(f"Lỗi trong on_member_remove: {e}")
+        
+        @self.bot.event
+        async def on_guild_remove(guild):
+            """Bỏ thống kê và cache admin của server bot đã rời"""
+            try:
+                self.guild_stats.forget_guild(guild.id)
+                self.admin_notifier.forget_guild(guild.id)
+                self.role_sync.forget_guild(guild.id)
+            except Exception as e:
+                logger.error(f"Lỗi trong on_guild_remove: {e}")
     
     def setup_commands(self) -> None:
         """
-        Thiết lập các commands cho bot bằng cách sử dụng command classes
-        """
-        # Initialize command classes
-        self.ai_commands = AICommands(self)  # Store AI commands instance for mention responses
-        admin_commands = AdminCommands(self)
-        supreme_admin_commands = SupremeAdminCommands(self)
-        info_commands = InfoCommands(self)
-        priority_commands = PriorityCommands(self)
-        network_commands = NetworkCommands(self)
-        chat_commands = ChatCommands(self)
-        taixiu_commands = TaiXiuCommands(self)
-        backup_commands = BackupCommands(self)
-        announce_commands = AnnounceCommands(self)
-        spotify_commands = SpotifyCommands(self)
-        moderation_commands = ModerationCommands(self)
-        channel_commands = ChannelCommands(self)
-        server_commands = ServerCommands(self)
-        message_commands = MessageCommands(self)
-        tiktok_commands = TikTokCommands(self)
-        github_commands = GitHubCommands(self)
-        video_commands = VideoCommands(self)
-        music_commands = MusicCommands(self)
-        feedback_commands = FeedbackCommands(self)
-        slash_commands = SlashCommands(self)
-        emoji_commands = EmojiCommands(self)
-        dm_management_commands = DMManagementCommands(self)
-        permission_commands = PermissionCommands(self)
-        channel_permission_commands = ChannelPermissionCommands(self)
-        maintenance_commands = MaintenanceCommands(self)
-        github_backup_commands = GitHubBackupCommands(self)
-        game_menu_commands = GameMenuCommands(self)
-        rps_commands = RPSCommands(self)
-        slot_commands = SlotCommands(self)
-        blackjack_commands = BlackjackCommands(self)
-        self.wallet_commands = WalletCommands(self)
-        flip_coin_commands = FlipCoinCommands(self)
-        wallet_reload_commands = WalletReloadCommands(self)
-        daily_commands = DailyCommands(self)
-        github_download_commands = GitHubDownloadCommands(self)
-        admin_menu_commands = AdminMenuCommands(self)
-        # virustotal_commands = VirusTotalCommands(self)  # Đã xóa
-        
-        # Khởi tạo các command classes
-        self.warn_commands = WarnCommands(self)
-        self.mute_commands = MuteCommands(self)
-        self.afk_commands = AFKCommands(self)
-        self.ban_commands = BanCommands(self)
-        self.auto_delete_commands = AutoDeleteCommands(self)
-        self.purge_commands = PurgeCommands(self)
-        self.anti_abuse_commands = AntiAbuseCommands(self)
-        # self.fire_delete_commands = FireDeleteCommands(self)  # DISABLED - Xóa tính năng fire delete
-        self.channel_restrict_commands = ChannelRestrictCommands(self)
-        self.bye_commands = ByeCommands(self)
-        # self.shop_commands = ShopCommands(self)  # Đã xóa
-        self.unluck_commands = UnluckCommands(self)
-        # self.leaderboard_commands = LeaderboardCommands(self)  # Đã xóa
-        self.nickname_commands = NicknameCommands(self)
-        self.reset_commands = ResetCommands(self)
-        # self.getkey_commands = GetKeyCommands(self)  # Đã xóa
-        self.complete_menu_commands = CompleteMenuCommands(self)
-        self.auto_reply_commands = AutoReplyCommands(self)
-        self.fishing_commands = FishingCommands(self)
-        self.giveaway_commands = GiveawayCommands(self)
-        # self.full_menu_commands = FullMenuCommands(self)  # Đã tích hợp vào game_menu_commands
-        # self.channel_restriction_commands = ChannelRestrictionCommands(self)  # Đã tắt
-        
-        # Khởi tạo Anti-Abuse Commands
-        self.anti_abuse_commands = AntiAbuseCommands(self)
-        self.anti_abuse_commands.register_commands()
-        
-        # Khởi tạo Multi-Bot Commands
-        self.multibot_commands = MultiBotCommands(self)
-        self.multibot_commands.register_commands()
-        
-        # Khởi tạo Nickname Control Commands
-        self.nickname_control_commands = NicknameControlCommands(self)
-        self.nickname_control_commands.register_commands()
-        
-        # Khởi tạo Admin Nickname Protection
-        self.admin_nickname_protection = AdminNicknameProtection(self)
-        self.admin_nickname_protection.register_commands()
-        
-        # Register AI commands
-        self.ai_commands.register_commands()
-        
-        # Register other commands
-        admin_commands.register_commands()
-        supreme_admin_commands.register_commands()
-        info_commands.register_commands()
-        priority_commands.register_commands()
-        network_commands.register_commands()
-        chat_commands.register_commands()
-        taixiu_commands.register_commands()
-        backup_commands.register_commands()
-        announce_commands.register_commands()
-        spotify_commands.register_commands()
-        moderation_commands.register_commands()
-        channel_commands.register_commands()
-        server_commands.register_commands()
-        message_commands.register_commands()
-        tiktok_commands.register_commands()
-        github_commands.register_commands()
-        video_commands.register_commands()
-        music_commands.register_commands()
-        feedback_commands.register_commands()
-        slash_commands.register_commands()
-        emoji_commands.register_commands()
-        dm_management_commands.register_commands()
-        permission_commands.register_commands()
-        channel_permission_commands.register_commands()
-        maintenance_commands.register_commands()
-        github_backup_commands.register_commands()
-        game_menu_commands.register_commands()
-        rps_commands.register_commands()
-        slot_commands.register_commands()
-        blackjack_commands.register_commands()
-        self.wallet_commands.register_commands()
-        flip_coin_commands.register_commands()
-        wallet_reload_commands.register_commands()
-        daily_commands.register_commands()
-        github_download_commands.register_commands()
-        admin_menu_commands.register_commands()
-        # virustotal_commands.register_commands()  # Đã xóa
-        self.afk_commands.register_commands()
-        self.ban_commands.register_commands()
-        self.auto_delete_commands.register_commands()
-        self.purge_commands.register_commands()
-        self.anti_abuse_commands.register_commands()
-        # self.fire_delete_commands.register_commands()  # DISABLED - Xóa tính năng fire delete
-        self.channel_restrict_commands.register_commands()
-        self.bye_commands.register_commands()
-        # self.shop_commands.register_commands()  # Đã xóa
-        self.unluck_commands.register_commands()
-        # self.leaderboard_commands.register_commands()  # Đã xóa
-        self.nickname_commands.register_commands()
-        self.reset_commands.register_commands()
-        # self.getkey_commands.register_commands()  # Đã xóa
-        self.complete_menu_commands.register_commands()
-        self.auto_reply_commands.register_commands()
-        self.fishing_commands.register_commands()
-        self.giveaway_commands.register_commands()
-        # self.full_menu_commands.register_commands()  # Đã tích hợp vào game_menu_commands
-        # self.channel_restriction_commands.register_commands()  # Đã tắt
-        
-        # Store instances for syncing and DM handling
-        self.slash_commands = slash_commands
-        self.dm_management_commands = dm_management_commands
-        self.permission_manager = permission_commands
-        self.maintenance_manager = maintenance_commands
-        self.channel_permission_manager = channel_permission_commands
-        # afk_commands, ban_commands, auto_delete_commands đã được lưu ở trên
-        # fire_delete_commands đã bị vô hiệu hóa
+        Thiết lập các commands cho bot theo manifest
+        
+        Module eager (dùng trong events/on_message hoặc bởi module khác, slash commands,
+        persistent views) được khởi tạo ngay; module lazy chỉ đăng ký lệnh stub, được
+        import khi dùng lần đầu hoặc warm-up nền sau on_ready. Instance được gắn lên bot
+        theo tên `attr` trong manifest (vd: self.warn_commands, self.permission_manager).
+        """
+        self.module_registry = ModuleRegistry(self)
+        self.module_registry.setup()
+        
+        # Biên dịch ban list, maintenance, channel/command permissions thành index
+        self.refresh_auth_index()
         
         logger.info("Đã đăng ký tất cả commands từ các command classes")
     
@@ -1274,7 +1216,8 @@ class AutoReplyBotRefactored:
                 return
                 
             # Kiểm tra xem AI có khả dụng không
-            if not hasattr(self, 'ai_commands') or not self.ai_commands.gemini_model:
+            ai_commands = await self.module_registry.ensure_loaded('ai_commands')
+            if ai_commands is None or not ai_commands.gemini_model:
                 await message.reply("👋 Xin chào! Rất vui được gặp bạn! (AI hiện chưa được cấu hình)", mention_author=True)
                 return
             
@@ -1327,7 +1270,8 @@ class AutoReplyBotRefactored:
                 return  # Không phải reply tin nhắn của bot
             
             # Kiểm tra xem AI có khả dụng không
-            if not hasattr(self, 'ai_commands') or not self.ai_commands.gemini_model:
+            ai_commands = await self.module_registry.ensure_loaded('ai_commands')
+            if ai_commands is None or not ai_commands.gemini_model:
                 return  # AI không khả dụng, không trả lời
             
             # Kiểm tra rate limiting riêng cho reply (3 giây)
@@ -1382,6 +1326,53 @@ class AutoReplyBotRefactored:
         except Exception as e:
             logger.error(f"Lỗi khi xử lý reply từ {message.author}: {e}")
     
+    def collect_metrics(self):
+        """
+        Collector cho /metrics: đọc get_stats()/get_status() có sẵn của các utility lúc export
+        
+        Yields:
+            (tên, type, help, labels, giá trị)
+        """
+        yield 'bot_ready', 'gauge', 'Bot đã sẵn sàng nhận event (1/0)', {}, int(self.lifecycle.is_ready())
+        yield 'bot_gateway_disconnects_total', 'counter', 'Số lần mất kết nối gateway', {}, self.lifecycle.disconnect_count
+        yield 'bot_guilds', 'gauge', 'Số server bot đang ở', {}, len(self.bot.guilds)
+        latency = self.bot.latency
+        if latency == latency and latency != float('inf'):  # NaN/inf khi chưa kết nối
+            yield 'bot_gateway_latency_seconds', 'gauge', 'Độ trễ heartbeat gateway', {}, latency
+        
+        status = self.rate_limiter.get_status()
+        yield 'bot_rate_limiter_active_commands', 'gauge', 'Lệnh đang chạy trong rate limiter', {}, status['active_commands']
+        yield 'bot_rate_limiter_queue_size', 'gauge', 'Lệnh đang chờ trong hàng đợi', {}, status['queue_size']
+        yield 'bot_rate_limiter_api_calls', 'gauge', 'Số API call trong phút hiện tại', {}, status['api_calls']
+        
+        for kind, value in self.memory_manager.get_memory_stats().items():
+            yield 'bot_memory_objects', 'gauge', 'Số phần tử trong các cấu trúc dữ liệu của bot', {'kind': kind}, int(value)
+        
+        network = self.network_optimizer.get_network_stats()
+        ping_stats = network['ping_stats']
+        if network['ping_samples'] and network['api_samples']:
+            for kind in ('ws', 'api'):
+                for stat in ('avg', 'min', 'max'):
+                    yield 'bot_ping_ms', 'gauge', 'Ping đo được gần đây (ms)', {'kind': kind, 'stat': stat}, ping_stats[f'{kind}_{stat}']
+        yield 'bot_connection_issues', 'gauge', 'Số sự cố kết nối đang ghi nhận', {}, network['connection_issues']
+        
+        # Cache: tổng request hit/miss (tính rate bằng PromQL) + tỉ lệ hit từ lúc khởi động
+        cache_stats = message_cache.get_stats()
+        role_stats = self.role_sync.get_stats()
+        caches = {
+            'message': (cache_stats['hit_count'], cache_stats['access_count'] - cache_stats['hit_count'], cache_stats['cache_size']),
+            'role': (role_stats['cache_hits'], role_stats['cache_misses'], role_stats['cached_roles']),
+        }
+        for cache, (hits, misses, size) in caches.items():
+            yield 'bot_cache_requests_total', 'counter', 'Số lần tra cache', {'cache': cache, 'result': 'hit'}, hits
+            yield 'bot_cache_requests_total', 'counter', 'Số lần tra cache', {'cache': cache, 'result': 'miss'}, misses
+            yield 'bot_cache_entries', 'gauge', 'Số phần tử trong cache', {'cache': cache}, size
+            if hits + misses:
+                yield 'bot_cache_hit_ratio', 'gauge', 'Tỉ lệ hit của cache từ lúc khởi động', {'cache': cache}, hits / (hits + misses)
+        
+        modules = self.module_registry.get_stats()
+        yield 'bot_modules_loaded', 'gauge', 'Số command module đã tải', {}, modules['loaded']
+        yield 'bot_modules_pending_lazy', 'gauge', 'Số module lazy chưa tải', {}, modules['pending_lazy']
     
     async def run(self) -> None:
         """
@@ -1401,6 +1392,13 @@ class AutoReplyBotRefactored:
             # Start message cache cleanup task
             message_cache.start_cleanup_task()
             
+            # Endpoint /metrics + /ready chạy trước khi login để theo dõi được cả lúc khởi động
+            if self.config.get('metrics_enabled', True):
+                try:
+                    await self.metrics_server.start()
+                except OSError as e:
+                    logger.error(f"Không mở được metrics endpoint {self.metrics_server.host}:{self.metrics_server.port}: {e}")
+            
             await self.bot.start(token)
         except discord.LoginFailure:
             logger.error("Token không hợp lệ! Vui lòng kiểm tra lại token")
@@ -1426,6 +1424,17 @@ class AutoReplyBotRefactored:
         if hasattr(self, 'dm_management_commands'):
             self.dm_management_commands.stop_cleanup_task()
         
+        # Dừng theo dõi file ví
+        self.shared_wallet.stop_file_watching()
+        
+        # Lưu và dừng game sessions
+        if hasattr(self, 'game_menu_commands'):
+            self.game_menu_commands.stop_sessions()
+        
+        # Lưu daily quota (give limit...) còn chờ ghi
+        if hasattr(self, 'taixiu_commands'):
+            self.taixiu_commands.shutdown()
+        
         # Cancel all mute tasks
         for task in self.mute_tasks.values():
             task.cancel()
@@ -1434,6 +1443,9 @@ class AutoReplyBotRefactored:
         if hasattr(self, 'nickname_commands'):
             asyncio.create_task(self.nickname_commands.cleanup_tasks())
         
+        # Đóng metrics endpoint
+        asyncio.create_task(self.metrics_server.stop())
+        
         asyncio.create_task(self.bot.close())
 
 
@@ -12,6 +12,7 @@ from datetime import datetime
 # Import class từ file chính
 sys.path.insert(0, os.path.dirname(__file__))
 from create_bot_resource import BotResourceManager
+from resource_bundle import ResourceBundle
 
 def print_header():
     """In header"""
@@ -24,10 +25,14 @@ def check_files():
     """Kiểm tra files cần thiết"""
     print("\n🔍 KIỂM TRA FILES...")
     
-    resource_exists = os.path.exists("bot_resource.json")
+    bundle_exists = os.path.exists("bot_resource.bres")
+    legacy_exists = os.path.exists("bot_resource.json")
+    resource_exists = bundle_exists or legacy_exists
     bot_files_exists = os.path.exists("bot_files")
     
-    print(f"   📄 bot_resource.json: {'✅ Có' if resource_exists else '❌ Không có'}")
+    print(f"   📦 bot_resource.bres: {'✅ Có' if bundle_exists else '❌ Không có'}")
+    if legacy_exists:
+        print("   📄 bot_resource.json (định dạng cũ): ✅ Có")
     print(f"   📁 bot_files/: {'✅ Có' if bot_files_exists else '❌ Không có'}")
     
     return resource_exists, bot_files_exists
@@ -53,7 +58,7 @@ def auto_setup():
         return manager.extract_resource_file(force=True)
     
     if resource_exists and bot_files_exists:
-        print("🔄 Cả 2 đều có, update resource file...")
+        print("🔄 Cả 2 đều có, update resource bundle (chỉ file đã đổi)...")
         return manager.update_resource_file()
     
     return False
@@ -63,7 +68,7 @@ def create_deployment_package():
     print("\n📦 TẠO DEPLOYMENT PACKAGE...")
     
     # Kiểm tra files cần thiết
-    required_files = ["bot_refactored.py", "bot_resource.json"]
+    required_files = ["bot_refactored.py", "bot_resource.bres"]
     missing_files = [f for f in required_files if not os.path.exists(f)]
     
     if missing_files:
@@ -77,8 +82,9 @@ def create_deployment_package():
     # Copy files cần thiết
     files_to_copy = [
         "bot_refactored.py",
-        "bot_resource.json", 
+        "bot_resource.bres",
         "create_bot_resource.py",
+        "resource_bundle.py",
         "run_bot.bat",
         "run_bot.py"
     ]
@@ -106,8 +112,8 @@ def main():
     print("=" * 40)
     
     # Kiểm tra resource file
-    if not os.path.exists("bot_resource.json"):
-        print("❌ Không tìm thấy bot_resource.json!")
+    if not os.path.exists("bot_resource.bres"):
+        print("❌ Không tìm thấy bot_resource.bres!")
         return
     
     # Extract bot_files
@@ -130,12 +136,13 @@ if __name__ == "__main__":
         f.write(setup_script)
     
     # Tạo README cho deployment
+    bundle_files = len(ResourceBundle("bot_resource.bres").files)
     readme_content = f'''# Bot Deployment Package
 
 ## 📋 Nội dung package
 - bot_refactored.py - File main chạy bot
-- bot_resource.json - Resource chứa tất cả bot_files
-- create_bot_resource.py - Tool quản lý resource
+- bot_resource.bres - Bundle nén chứa tất cả bot_files
+- create_bot_resource.py, resource_bundle.py - Tool quản lý resource
 - setup_deployment.py - Script setup tự động
 - run_bot.bat / run_bot.py - Scripts chạy bot
 
@@ -153,8 +160,8 @@ python bot_refactored.py
 
 ## 📊 Thông tin
 - Tạo lúc: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-- Tổng files trong resource: 233
-- Kích thước resource: ~28MB
+- Tổng files trong resource: {bundle_files}
+- Kích thước resource: {os.path.getsize("bot_resource.bres"):,} bytes
 
 ## 💡 Lưu ý
 - Resource file chứa tất cả bot_files được nén
@@ -179,9 +186,9 @@ def main():
         print(f"\n📋 MENU:")
         print("1. 🔍 Kiểm tra trạng thái")
         print("2. 🔄 Auto setup (tạo/extract/update)")
-        print("3. 📦 Tạo resource từ bot_files/")
+        print("3. 📦 Tạo lại toàn bộ resource từ bot_files/")
         print("4. 📂 Extract resource thành bot_files/")
-        print("5. 🔄 Update resource file")
+        print("5. 🔄 Update resource (chỉ file đã đổi)")
         print("6. 📊 Xem thông tin resource")
         print("7. 📦 Tạo deployment package")
         print("8. 🚀 Chạy bot")
@@ -192,41 +199,41 @@ def main():
         if choice == "1":
             print("\n" + "="*50)
             check_files()
-            
+        
         elif choice == "2":
             print("\n" + "="*50)
             if auto_setup():
                 print("✅ Auto setup thành công!")
             else:
                 print("❌ Auto setup thất bại!")
-                
+        
         elif choice == "3":
             print("\n" + "="*50)
             manager = BotResourceManager()
             manager.create_resource_file()
-            
+        
         elif choice == "4":
             print("\n" + "="*50)
             manager = BotResourceManager()
             manager.extract_resource_file()
-            
+        
         elif choice == "5":
             print("\n" + "="*50)
             manager = BotResourceManager()
             manager.update_resource_file()
-            
+        
         elif choice == "6":
             print("\n" + "="*50)
             manager = BotResourceManager()
             manager.info()
-            
+        
         elif choice == "7":
             print("\n" + "="*50)
             if create_deployment_package():
                 print("✅ Tạo deployment package thành công!")
             else:
                 print("❌ Tạo deployment package thất bại!")
-                
+        
         elif choice == "8":
             print("\n" + "="*50)
             if os.path.exists("bot_refactored.py"):
@@ -234,11 +241,11 @@ def main():
                 os.system("python bot_refactored.py")
             else:
                 print("❌ Không tìm thấy bot_refactored.py!")
-                
+        
         elif choice == "9":
             print("\n👋 Tạm biệt!")
             break
-            
+        
         else:
             print("❌ Lựa chọn không hợp lệ!")
 
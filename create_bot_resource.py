@@ -3,6 +3,9 @@
 """
 Script tạo file resource chứa tất cả nội dung bot_files
 Có thể extract lại thành folder bot_files nếu cần
+
+Mặc định dùng bundle nén (bot_resource.bres, xem resource_bundle.py): tạo theo kiểu stream,
+update chỉ nén lại file đã đổi, extract song song. bot_resource.json cũ vẫn extract/xem được.
 """
 
 import os
@@ -12,16 +15,49 @@ import zipfile
 import shutil
 from datetime import datetime
 import tempfile
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from resource_bundle import ResourceBundle, BundleError, create_bundle, update_bundle
 
 class BotResourceManager:
     """Quản lý resource file cho bot"""
     
     def __init__(self):
-        self.resource_file = "bot_resource.json"
+        self.resource_file = "bot_resource.json"  # Định dạng JSON cũ
+        self.bundle_file = "bot_resource.bres"
         self.bot_files_folder = "bot_files"
-        
+    
+    def _print_bundle_stats(self, stats):
+        print("📊 Thống kê:")
+        print(f"   • Tổng files: {stats['files']}")
+        print(f"   • Thêm: {stats['added']} • Đổi: {stats['changed']} • Xóa: {stats['removed']} • Không đổi: {stats['unchanged']}")
+        print(f"   • Tổng kích thước: {stats['raw_bytes']:,} bytes")
+        print(f"   • Kích thước bundle: {stats['bundle_bytes']:,} bytes")
+        print(f"   • Thời gian: {stats['seconds']}s")
+        for name, error in stats['errors']:
+            print(f"   ⚠️  Bỏ qua {name}: {error}")
+    
     def create_resource_file(self):
-        """Tạo file resource từ folder bot_files"""
+        """Tạo bundle resource từ folder bot_files"""
+        print("🔄 Tạo bot resource bundle...")
+        
+        if not os.path.exists(self.bot_files_folder):
+            print(f"❌ Không tìm thấy folder: {self.bot_files_folder}")
+            return False
+        
+        try:
+            stats = create_bundle(self.bot_files_folder, self.bundle_file)
+        except Exception as e:
+            print(f"❌ Lỗi ghi bundle: {e}")
+            return False
+        
+        print(f"\n✅ Tạo thành công: {self.bundle_file}")
+        self._print_bundle_stats(stats)
+        return True
+    
+    def create_json_resource_file(self):
+        """Tạo file resource JSON (định dạng cũ) từ folder bot_files"""
         print("🔄 Tạo bot resource file...")
         
         if not os.path.exists(self.bot_files_folder):
@@ -75,7 +111,7 @@ class BotResourceManager:
                     total_size += file_info["size"]
                     
                     print(f"   ✅ {relative_path} ({file_type})")
-                    
+                
                 except Exception as e:
                     print(f"   ⚠️  Bỏ qua {relative_path}: {e}")
         
@@ -95,19 +131,27 @@ class BotResourceManager:
             print(f"   • Kích thước resource: {os.path.getsize(self.resource_file):,} bytes")
             
             return True
-            
+        
         except Exception as e:
             print(f"❌ Lỗi ghi file resource: {e}")
             return False
     
     def extract_resource_file(self, force=False):
-        """Extract file resource thành folder bot_files"""
+        """Extract resource (bundle, hoặc JSON cũ nếu chưa có bundle) thành folder bot_files"""
         print("🔄 Extract bot resource file...")
         
-        if not os.path.exists(self.resource_file):
-            print(f"❌ Không tìm thấy file resource: {self.resource_file}")
+        use_bundle = os.path.exists(self.bundle_file)
+        if not use_bundle and not os.path.exists(self.resource_file):
+            print(f"❌ Không tìm thấy file resource: {self.bundle_file} / {self.resource_file}")
             return False
         
+        if use_bundle:
+            try:
+                bundle = ResourceBundle(self.bundle_file)
+            except (OSError, BundleError) as e:
+                print(f"❌ Lỗi đọc bundle: {e}")
+                return False
+        
         # Kiểm tra folder đích
         if os.path.exists(self.bot_files_folder):
             if not force:
@@ -122,6 +166,16 @@ class BotResourceManager:
             shutil.move(self.bot_files_folder, backup_name)
             print(f"💾 Backup folder cũ: {backup_name}")
         
+        if use_bundle:
+            extracted_files, errors = bundle.extract(self.bot_files_folder)
+            for relative_path, error in errors:
+                print(f"   ❌ Lỗi extract {relative_path}: {error}")
+            print("\n✅ Extract thành công!")
+            print("📊 Thống kê:")
+            print(f"   • Files extracted: {extracted_files}/{len(bundle.files)}")
+            print(f"   • Folder: {self.bot_files_folder}")
+            return not errors
+        
         # Đọc resource file
         try:
             with open(self.resource_file, 'r', encoding='utf-8') as f:
@@ -155,7 +209,7 @@ class BotResourceManager:
                 
                 extracted_files += 1
                 print(f"   ✅ {relative_path}")
-                
+            
             except Exception as e:
                 print(f"   ❌ Lỗi extract {relative_path}: {e}")
         
@@ -167,17 +221,30 @@ class BotResourceManager:
         return True
     
     def update_resource_file(self):
-        """Update file resource từ folder bot_files hiện tại"""
-        print("🔄 Update bot resource file...")
+        """Update bundle từ folder bot_files hiện tại (chỉ nén lại file đã đổi)"""
+        print("🔄 Update bot resource bundle...")
         
-        # Backup resource cũ nếu có
-        if os.path.exists(self.resource_file):
-            backup_name = f"{self.resource_file}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            shutil.copy2(self.resource_file, backup_name)
-            print(f"💾 Backup resource cũ: {backup_name}")
+        if not os.path.exists(self.bot_files_folder):
+            print(f"❌ Không tìm thấy folder: {self.bot_files_folder}")
+            return False
         
-        # Tạo resource mới
-        return self.create_resource_file()
+        def show(name, status):
+            if status != 'touched':
+                print(f"   {'➕' if status == 'added' else '🗑️ ' if status == 'removed' else '✏️ '} {name}")
+        
+        try:
+            stats = update_bundle(self.bot_files_folder, self.bundle_file, on_file=show)
+        except (OSError, BundleError) as e:
+            print(f"❌ Lỗi update bundle: {e}")
+            return False
+        
+        print(f"\n✅ Update thành công: {self.bundle_file}")
+        self._print_bundle_stats(stats)
+        return True
+    
+    def read_resource_file(self, relative_path):
+        """Đọc 1 file trong bundle mà không extract cả bundle"""
+        return ResourceBundle(self.bundle_file).read(relative_path)
     
     def _is_binary_file(self, file_path):
         """Kiểm tra file có phải binary không"""
@@ -203,6 +270,10 @@ class BotResourceManager:
     
     def info(self):
         """Hiển thị thông tin resource file"""
+        if os.path.exists(self.bundle_file):
+            self._bundle_info()
+            return
+        
         if not os.path.exists(self.resource_file):
             print(f"❌ Không tìm thấy resource file: {self.resource_file}")
             return
@@ -233,9 +304,33 @@ class BotResourceManager:
             print(f"\n📊 TOP 10 FILES LỚN NHẤT:")
             for path, info in files_by_size:
                 print(f"   {info['size']:>8,} bytes - {path}")
-                
+        
         except Exception as e:
             print(f"❌ Lỗi đọc resource file: {e}")
+    
+    def _bundle_info(self):
+        try:
+            bundle = ResourceBundle(self.bundle_file)
+        except (OSError, BundleError) as e:
+            print(f"❌ Lỗi đọc bundle: {e}")
+            return
+        
+        index = bundle.index
+        metadata = index.get('metadata', {})
+        print("📋 THÔNG TIN RESOURCE BUNDLE")
+        print("=" * 40)
+        print(f"File: {self.bundle_file}")
+        print(f"Tạo lúc: {metadata.get('created_at', '?')}")
+        if metadata.get('updated_at'):
+            print(f"Update lúc: {metadata['updated_at']}")
+        print(f"Tổng files: {index['total_files']}")
+        print(f"Tổng kích thước: {index['total_size']:,} bytes")
+        print(f"Kích thước bundle: {os.path.getsize(self.bundle_file):,} bytes")
+        
+        files_by_size = sorted(bundle.files.items(), key=lambda x: x[1]['size'], reverse=True)[:10]
+        print("\n📊 TOP 10 FILES LỚN NHẤT:")
+        for path, info in files_by_size:
+            print(f"   {info['size']:>8,} bytes ({info['length']:>8,} nén) - {path}")
 
 def main():
     """Main function"""
@@ -250,30 +345,43 @@ def main():
         print("2. Extract resource file thành bot_files/")
         print("3. Update resource file")
         print("4. Xem thông tin resource file")
-        print("5. Thoát")
+        print("5. Lấy 1 file từ resource (không extract cả bundle)")
+        print("6. Thoát")
         
-        choice = input("\nChọn (1-5): ").strip()
+        choice = input("\nChọn (1-6): ").strip()
         
         if choice == "1":
             print("\n" + "="*50)
             manager.create_resource_file()
-            
+        
         elif choice == "2":
             print("\n" + "="*50)
             manager.extract_resource_file()
-            
+        
         elif choice == "3":
             print("\n" + "="*50)
             manager.update_resource_file()
-            
+        
         elif choice == "4":
             print("\n" + "="*50)
             manager.info()
-            
+        
         elif choice == "5":
+            print("\n" + "="*50)
+            relative_path = input("Đường dẫn trong bot_files (vd: commands/shop_commands.py): ").strip()
+            try:
+                content = manager.read_resource_file(relative_path)
+                output = os.path.basename(relative_path)
+                with open(output, 'wb') as f:
+                    f.write(content)
+                print(f"✅ Đã ghi {len(content):,} bytes ra {output}")
+            except (OSError, KeyError, BundleError) as e:
+                print(f"❌ Không lấy được {relative_path}: {e}")
+        
+        elif choice == "6":
             print("\n👋 Tạm biệt!")
             break
-            
+        
         else:
             print("❌ Lựa chọn không hợp lệ!")
 
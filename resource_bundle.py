@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Định dạng resource bundle (.bres) cho bot_files - thay cho bot_resource.json
+
+Cấu trúc file:
+    MAGIC | dữ liệu file 1 | dữ liệu file 2 | ... | index (JSON nén zlib) | footer
+    footer = offset index (8 byte) + độ dài index (8 byte) + MAGIC
+- Mỗi file nén riêng bằng zlib (file nén không lợi thì lưu thẳng), ghi tuần tự nên tạo bundle
+  không cần giữ cả thư mục trong RAM
+- Index lưu offset, sha256, size, mtime của từng file: đọc 1 file chỉ cần footer + index + seek
+- Update chỉ đọc/nén lại file đã đổi, file không đổi được copy nguyên dữ liệu đã nén
+- Extract song song bằng thread (zlib nhả GIL khi giải nén)
+"""
+
+import os
+import json
+import time
+import zlib
+import struct
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+MAGIC = b'BOTRES01'
+FOOTER = struct.Struct('<QQ8s')
+READ_SIZE = 1024 * 1024
+DEFAULT_EXCLUDES = {'__pycache__'}  # Thư mục bỏ qua (file .pyc đổi liên tục, tự sinh lại được)
+
+
+class BundleError(Exception):
+    """Bundle không hợp lệ hoặc bị hỏng"""
+
+
+def iter_source_files(source_dir, exclude=DEFAULT_EXCLUDES):
+    """(đường dẫn tương đối kiểu posix, đường dẫn thật) của các file trong source_dir, sắp xếp ổn định"""
+    for root, dirs, files in os.walk(source_dir):
+        dirs[:] = sorted(d for d in dirs if d not in exclude)
+        for file in sorted(files):
+            path = os.path.join(root, file)
+            yield os.path.relpath(path, source_dir).replace(os.sep, '/'), path
+
+
+class ResourceBundle:
+    """Đọc bundle: random access từng file và extract song song"""
+    
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise BundleError(f"{path} không phải resource bundle")
+            f.seek(-FOOTER.size, os.SEEK_END)
+            index_offset, index_length, magic = FOOTER.unpack(f.read(FOOTER.size))
+            if magic != MAGIC:
+                raise BundleError(f"{path} thiếu footer (ghi dở?)")
+            f.seek(index_offset)
+            self.index = json.loads(zlib.decompress(f.read(index_length)))
+        self.files = self.index['files']
+    
+    def names(self):
+        return list(self.files)
+    
+    def _read_raw(self, f, entry):
+        f.seek(entry['offset'])
+        return f.read(entry['length'])
+    
+    @staticmethod
+    def _decode(name, entry, raw):
+        data = zlib.decompress(raw) if entry['method'] == 'zlib' else raw
+        if hashlib.sha256(data).hexdigest() != entry['sha256']:
+            raise BundleError(f"{name} bị hỏng (sha256 không khớp)")
+        return data
+    
+    def read(self, name):
+        """Nội dung 1 file (chỉ đọc đúng phần dữ liệu của file đó)"""
+        entry = self.files.get(name)
+        if entry is None:
+            raise KeyError(name)
+        with open(self.path, 'rb') as f:
+            return self._decode(name, entry, self._read_raw(f, entry))
+    
+    def extract(self, dest_dir, names=None, workers=None):
+        """
+        Extract file ra dest_dir bằng nhiều thread
+        
+        Returns:
+            (số file đã extract, danh sách (tên, lỗi))
+        """
+        names = list(names) if names is not None else self.names()
+        workers = workers or min(8, (os.cpu_count() or 1) + 2)
+        batches = [names[i::workers] for i in range(workers)]
+        root = os.path.realpath(dest_dir)
+        
+        def extract_batch(batch):
+            done, errors = 0, []
+            with open(self.path, 'rb') as f:  # Mỗi thread 1 file handle riêng
+                for name in batch:
+                    try:
+                        # Chặn entry thoát khỏi dest_dir (đường dẫn tuyệt đối hoặc '..')
+                        target = os.path.realpath(os.path.join(root, *name.split('/')))
+                        if os.path.isabs(name) or os.path.commonpath([root, target]) != root or target == root:
+                            raise BundleError(f"Đường dẫn không hợp lệ trong bundle: {name}")
+                        entry = self.files[name]
+                        data = self._decode(name, entry, self._read_raw(f, entry))
+                        os.makedirs(os.path.dirname(target), exist_ok=True)
+                        with open(target, 'wb') as out:
+                            out.write(data)
+                        os.utime(target, (entry['mtime'], entry['mtime']))
+                        done += 1
+                    except Exception as e:
+                        errors.append((name, str(e)))
+            return done, errors
+        
+        extracted, errors = 0, []
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for done, batch_errors in pool.map(extract_batch, [batch for batch in batches if batch]):
+                extracted += done
+                errors.extend(batch_errors)
+        return extracted, errors
+
+
+class BundleWriter:
+    """Ghi bundle mới vào file tạm, close() ghi index + footer rồi os.replace (không bao giờ để bundle ghi dở)"""
+    
+    def __init__(self, path, level=6):
+        self.path = path
+        self.level = level
+        self.tmp_path = f"{path}.tmp"
+        self.files = {}
+        self.raw_bytes = 0
+        self._f = open(self.tmp_path, 'wb')
+        self._f.write(MAGIC)
+    
+    def add_file(self, name, path):
+        """Đọc + nén từng khối của file, trả về entry"""
+        stat = os.stat(path)
+        offset = self._f.tell()
+        digest = hashlib.sha256()
+        compressor = zlib.compressobj(self.level)
+        size = 0
+        with open(path, 'rb') as f:
+            first = f.read(READ_SIZE)
+            # File nhỏ: nén 1 lần, lưu thẳng nếu nén không nhỏ hơn (ảnh, zip...)
+            if len(first) < READ_SIZE:
+                compressed = zlib.compress(first, self.level)
+                method, payload = ('zlib', compressed) if len(compressed) < len(first) else ('store', first)
+                self._f.write(payload)
+                digest.update(first)
+                size = len(first)
+            else:
+                method = 'zlib'
+                chunk = first
+                while chunk:
+                    digest.update(chunk)
+                    size += len(chunk)
+                    self._f.write(compressor.compress(chunk))
+                    chunk = f.read(READ_SIZE)
+                self._f.write(compressor.flush())
+        entry = self.files[name] = {
+            'offset': offset,
+            'length': self._f.tell() - offset,
+            'size': size,
+            'sha256': digest.hexdigest(),
+            'mtime': stat.st_mtime,
+            'mtime_ns': stat.st_mtime_ns,
+            'method': method,
+        }
+        self.raw_bytes += size
+        return entry
+    
+    def copy_entry(self, name, entry, source):
+        """Copy nguyên dữ liệu đã nén của 1 entry từ bundle cũ (source là file handle đang mở)"""
+        source.seek(entry['offset'])
+        offset = self._f.tell()
+        remaining = entry['length']
+        while remaining:
+            chunk = source.read(min(READ_SIZE, remaining))
+            if not chunk:
+                raise BundleError(f"Bundle cũ bị cắt ở {name}")
+            self._f.write(chunk)
+            remaining -= len(chunk)
+        self.files[name] = {**entry, 'offset': offset}
+        self.raw_bytes += entry['size']
+    
+    def close(self, metadata=None):
+        index = {
+            'version': 1,
+            'metadata': metadata or {},
+            'total_files': len(self.files),
+            'total_size': self.raw_bytes,
+            'files': self.files,
+        }
+        index_offset = self._f.tell()
+        payload = zlib.compress(json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), self.level)
+        self._f.write(payload)
+        self._f.write(FOOTER.pack(index_offset, len(payload), MAGIC))
+        self._f.close()
+        os.replace(self.tmp_path, self.path)
+        return index
+    
+    def abort(self):
+        self._f.close()
+        try:
+            os.remove(self.tmp_path)
+        except FileNotFoundError:
+            pass
+
+
+def create_bundle(source_dir, bundle_path, exclude=DEFAULT_EXCLUDES, level=6, on_file=None):
+    """Tạo bundle mới từ source_dir, trả về thống kê"""
+    started = time.perf_counter()
+    writer = BundleWriter(bundle_path, level)
+    errors = []
+    try:
+        for name, path in iter_source_files(source_dir, exclude):
+            try:
+                writer.add_file(name, path)
+                if on_file:
+                    on_file(name, 'added')
+            except OSError as e:
+                errors.append((name, str(e)))
+        index = writer.close({'created_at': datetime.now().isoformat(), 'source': os.path.basename(os.path.abspath(source_dir))})
+    except BaseException:
+        writer.abort()
+        raise
+    return {
+        'files': index['total_files'],
+        'added': index['total_files'],
+        'changed': 0,
+        'removed': 0,
+        'unchanged': 0,
+        'raw_bytes': index['total_size'],
+        'bundle_bytes': os.path.getsize(bundle_path),
+        'errors': errors,
+        'seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+def update_bundle(source_dir, bundle_path, exclude=DEFAULT_EXCLUDES, level=6, on_file=None):
+    """
+    Update bundle theo source_dir: file cùng size + mtime với index được coi là không đổi (không đọc
+    lại), file khác được hash/nén lại; dữ liệu file không đổi copy nguyên từ bundle cũ
+    """
+    if not os.path.exists(bundle_path):
+        return create_bundle(source_dir, bundle_path, exclude, level, on_file)
+    
+    started = time.perf_counter()
+    old = ResourceBundle(bundle_path)
+    writer = BundleWriter(bundle_path, level)
+    stats = {'added': 0, 'changed': 0, 'unchanged': 0}
+    errors = []
+    seen = set()
+    try:
+        with open(bundle_path, 'rb') as source:
+            for name, path in iter_source_files(source_dir, exclude):
+                seen.add(name)
+                entry = old.files.get(name)
+                try:
+                    stat = os.stat(path)
+                    if entry is not None and entry['size'] == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+                        writer.copy_entry(name, entry, source)
+                        stats['unchanged'] += 1
+                        continue
+                    new_entry = writer.add_file(name, path)
+                except OSError as e:
+                    errors.append((name, str(e)))
+                    continue
+                if entry is None:
+                    stats['added'] += 1
+                    status = 'added'
+                elif entry['sha256'] == new_entry['sha256']:
+                    stats['unchanged'] += 1  # Chỉ đổi mtime
+                    status = 'touched'
+                else:
+                    stats['changed'] += 1
+                    status = 'changed'
+                if on_file:
+                    on_file(name, status)
+        removed = [name for name in old.files if name not in seen]
+        if on_file:
+            for name in removed:
+                on_file(name, 'removed')
+        metadata = {**old.index.get('metadata', {}), 'updated_at': datetime.now().isoformat()}
+        index = writer.close(metadata)
+    except BaseException:
+        writer.abort()
+        raise
+    return {
+        'files': index['total_files'],
+        **stats,
+        'removed': len(removed),
+        'raw_bytes': index['total_size'],
+        'bundle_bytes': os.path.getsize(bundle_path),
+        'errors': errors,
+        'seconds': round(time.perf_counter() - started, 3),
+    }